@@ -4,16 +4,24 @@ Import as:
 import core.information_bars.bars as cinbabar
 """
 
+import functools
 import logging
-from typing import Generator, Iterable, List, Optional, Tuple, Union
+from typing import Callable, Generator, Iterable, List, Optional, Union
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
 
 import helpers.hdbg as hdbg
+import helpers.hnumba as hnumba
 
 _LOG = logging.getLogger(__name__)
 
+# Tick data as path(s) to csv / Parquet files, a df, or an iterable of Arrow
+# record batches / dfs.
+TickData = Union[str, Iterable[str], pd.DataFrame, Iterable[pa.RecordBatch]]
+
 # #############################################################################
 
 
@@ -33,6 +41,136 @@ def _crop_data_frame_in_batches(
     return generator_object
 
 
+# Index of the fields of the state of the bar under construction.
+_OPEN_PRICE = 0
+_HIGH_PRICE = 1
+_LOW_PRICE = 2
+_PREV_PRICE = 3
+_PREV_TICK_RULE = 4
+_CUM_TICKS = 5
+_CUM_DOLLAR_VALUE = 6
+_CUM_VOLUME = 7
+_CUM_BUY_VOLUME = 8
+_STATE_SIZE = 9
+
+# Map the metrics to the corresponding field of the state.
+_METRIC_TO_STATE_IDX = {
+    "cum_ticks": _CUM_TICKS,
+    "cum_dollar_value": _CUM_DOLLAR_VALUE,
+    "cum_volume": _CUM_VOLUME,
+}
+
+_BAR_COLUMNS = [
+    "date_time",
+    "tick_num",
+    "open",
+    "high",
+    "low",
+    "close",
+    "volume",
+    "cum_buy_volume",
+    "cum_ticks",
+    "cum_dollar_value",
+]
+
+
+def _get_empty_state() -> np.ndarray:
+    """
+    Return the state of a bar builder that hasn't processed any tick.
+    """
+    state = np.zeros(_STATE_SIZE)
+    state[_OPEN_PRICE] = np.nan
+    state[_HIGH_PRICE] = -np.inf
+    state[_LOW_PRICE] = np.inf
+    state[_PREV_PRICE] = np.nan
+    return state
+
+
+def _extract_bars_kernel(
+    prices: np.ndarray,
+    volumes: np.ndarray,
+    thresholds: np.ndarray,
+    metric_idx: int,
+    state: np.ndarray,
+    bar_tick_idxs: np.ndarray,
+    bar_values: np.ndarray,
+) -> int:
+    """
+    Accumulate ticks into bars, sampling a bar when the metric reaches the
+    threshold.
+
+    This is written with loops on arrays so that it can be compiled with
+    numba.
+
+    :param prices: prices of the ticks
+    :param volumes: volumes of the ticks
+    :param thresholds: threshold to use when sampling at each tick
+    :param metric_idx: index in `state` of the metric to compare against the
+        threshold
+    :param state: state of the bar under construction, updated in place
+    :param bar_tick_idxs: output index of the tick closing each bar
+    :param bar_values: output open, high, low, close, volume, cum_buy_volume,
+        cum_ticks, cum_dollar_value of each bar
+    :return: number of sampled bars
+    """
+    num_bars = 0
+    for i in range(prices.shape[0]):
+        price = prices[i]
+        volume = volumes[i]
+        # Apply the tick rule as defined on page 29 of Advances in Financial
+        # Machine Learning.
+        if np.isnan(state[_PREV_PRICE]):
+            tick_diff = 0.0
+        else:
+            tick_diff = price - state[_PREV_PRICE]
+        if tick_diff != 0:
+            state[_PREV_TICK_RULE] = np.sign(tick_diff)
+        signed_tick = state[_PREV_TICK_RULE]
+        state[_PREV_PRICE] = price
+        if np.isnan(state[_OPEN_PRICE]):
+            state[_OPEN_PRICE] = price
+        # Update high low prices.
+        if price > state[_HIGH_PRICE]:
+            state[_HIGH_PRICE] = price
+        if price < state[_LOW_PRICE]:
+            state[_LOW_PRICE] = price
+        # Calculations.
+        state[_CUM_TICKS] += 1
+        state[_CUM_DOLLAR_VALUE] += price * volume
+        state[_CUM_VOLUME] += volume
+        if signed_tick == 1:
+            state[_CUM_BUY_VOLUME] += volume
+        # If threshold reached then take a sample.
+        if state[metric_idx] >= thresholds[i]:
+            bar_tick_idxs[num_bars] = i
+            bar_values[num_bars, 0] = state[_OPEN_PRICE]
+            bar_values[num_bars, 1] = max(state[_HIGH_PRICE], state[_OPEN_PRICE])
+            bar_values[num_bars, 2] = min(state[_LOW_PRICE], state[_OPEN_PRICE])
+            bar_values[num_bars, 3] = price
+            bar_values[num_bars, 4] = state[_CUM_VOLUME]
+            bar_values[num_bars, 5] = state[_CUM_BUY_VOLUME]
+            bar_values[num_bars, 6] = state[_CUM_TICKS]
+            bar_values[num_bars, 7] = state[_CUM_DOLLAR_VALUE]
+            num_bars += 1
+            # Reset cache.
+            state[_OPEN_PRICE] = np.nan
+            state[_HIGH_PRICE] = -np.inf
+            state[_LOW_PRICE] = np.inf
+            state[_CUM_TICKS] = 0
+            state[_CUM_DOLLAR_VALUE] = 0
+            state[_CUM_VOLUME] = 0
+            state[_CUM_BUY_VOLUME] = 0
+    return num_bars
+
+
+@functools.lru_cache()
+def _get_extract_bars_kernel() -> Callable[..., int]:
+    """
+    Return the bar extraction kernel, compiled with numba if available.
+    """
+    return hnumba.jit(_extract_bars_kernel)
+
+
 class _StandardBars:
     """
     Contains all of the logic to construct the standard bars from chapter 2.
@@ -57,21 +195,12 @@ class _StandardBars:
         :param threshold:
         :param batch_size: Number of rows to read in from the csv, per batch.
         """
+        hdbg.dassert_in(metric, _METRIC_TO_STATE_IDX)
         # Base properties.
         self.metric = metric
         self.batch_size = batch_size
-        self.prev_tick_rule = 0
-        # Cache properties.
-        self.open_price: Optional[float] = None
-        self.prev_price: Optional[float] = None
-        self.close_price: Optional[float] = None
-        self.high_price, self.low_price = -np.inf, np.inf
-        self.cum_statistics = {
-            "cum_ticks": 0,
-            "cum_dollar_value": 0,
-            "cum_volume": 0,
-            "cum_buy_volume": 0,
-        }
+        # State of the bar under construction, carried across batches.
+        self._state = _get_empty_state()
         # Tick number when bar was formed.
         self.tick_num = 0
         # Threshold at which to sample.
@@ -82,7 +211,7 @@ class _StandardBars:
 
     def batch_run(
         self,
-        file_path_or_df: Union[str, Iterable[str], pd.DataFrame],
+        file_path_or_df: TickData,
         to_csv: bool = False,
         output_path: Optional[str] = None,
     ) -> Union[pd.DataFrame, None]:
@@ -91,8 +220,9 @@ class _StandardBars:
         financial data structure in the form of a DataFrame. The csv file or
         DataFrame must have only 3 columns: date_time, price, & volume.
 
-        :param file_path_or_df: Path to the csv file(s) or Pandas Data Frame containing
-        raw tick data in the format[date_time, price, volume]
+        :param file_path_or_df: Path to the csv / Parquet file(s), Pandas Data
+        Frame or iterable of Arrow record batches / Pandas Data Frames
+        containing raw tick data in the format[date_time, price, volume]
         :param to_csv: Flag for writing the results of bars generation to local csv file,
         or to in-memory DataFrame
         :param output_path: Path to results file, if to_csv = True
@@ -105,42 +235,43 @@ class _StandardBars:
             if output_path:
                 # Clean output csv file.
                 open(output_path, "w").close()
-        _LOG.debug("Reading data in batches:")
-        # Read csv in batches.
-        count = 0
         final_bars = []
-        cols = [
-            "date_time",
-            "tick_num",
-            "open",
-            "high",
-            "low",
-            "close",
-            "volume",
-            "cum_buy_volume",
-            "cum_ticks",
-            "cum_dollar_value",
-        ]
-        for batch in self._batch_iterator(file_path_or_df):
-            _LOG.debug("Batch number: %d", count)
-            list_bars = self.run(data=batch)
+        for bars_df in self.iterate_bars(file_path_or_df):
             if to_csv is True:
-                pd.DataFrame(list_bars, columns=cols).to_csv(
-                    output_path, header=header, index=False, mode="a"
-                )
+                bars_df.to_csv(output_path, header=header, index=False, mode="a")
                 header = False
-            else:
+            elif not bars_df.empty:
                 # Append to bars list.
-                final_bars += list_bars
-            count += 1
+                final_bars.append(bars_df)
         _LOG.debug("Returning bars")
         # Return a DataFrame.
         if final_bars:
-            bars_df = pd.DataFrame(final_bars, columns=cols)
+            bars_df = pd.concat(final_bars, ignore_index=True)
             return bars_df
         # Processed DataFrame is stored in .csv file, return None.
         return None
 
+    def iterate_bars(
+        self,
+        file_path_or_df: TickData,
+    ) -> Generator[pd.DataFrame, None, None]:
+        """
+        Read the data in batches and yield the bars sampled in each batch.
+
+        The state of the bar under construction is carried across batches, so
+        that the tick history is never materialized.
+
+        :param file_path_or_df: same as in `batch_run()`
+        :return: generator of DataFrames of bars, one per batch
+        """
+        _LOG.debug("Reading data in batches:")
+        for count, batch in enumerate(self._batch_iterator(file_path_or_df)):
+            _LOG.debug("Batch number: %d", count)
+            bars_df = self._extract_bars(batch)
+            # Set flag to True: notify function to use cache.
+            self.flag = True
+            yield bars_df
+
     def run(self, data: Union[list, tuple, pd.DataFrame]) -> list:
         """
         Read a List, Tuple, or Dataframe and then constructs the financial data
@@ -152,14 +283,15 @@ class _StandardBars:
         :return: Financial data structure
         """
         if isinstance(data, (list, tuple)):
-            values = data
+            df = pd.DataFrame(list(data))
         elif isinstance(data, pd.DataFrame):
-            values = data.values
+            df = data
         else:
             raise ValueError("data is neither list nor tuple nor pd.DataFrame")
-        list_bars = self._extract_bars(data=values)
+        bars_df = self._extract_bars(df)
         # Set flag to True: notify function to use cache.
         self.flag = True
+        list_bars: list = bars_df.to_numpy(dtype=object).tolist()
         return list_bars
 
     @staticmethod
@@ -188,40 +320,74 @@ class _StandardBars:
             ) from ex
 
     def _batch_iterator(
-        self, file_path_or_df: Union[str, Iterable[str], pd.DataFrame]
+        self,
+        file_path_or_df: TickData,
     ) -> Generator[pd.DataFrame, None, None]:
         """
         Iterate over rows.
 
-        :param file_path_or_df: Path to the csv file(s) or Pandas Data Frame containing
-        raw tick data in the format[date_time, price, volume]
+        :param file_path_or_df: Path to the csv / Parquet file(s), Pandas Data
+        Frame or iterable of Arrow record batches / Pandas Data Frames
+        containing raw tick data in the format[date_time, price, volume]
         """
-        if isinstance(file_path_or_df, (list, tuple)):
-            # Assert format of all files.
-            for file_path in file_path_or_df:
-                self._read_first_row(file_path)
-            for file_path in file_path_or_df:
-                for batch in pd.read_csv(
-                    file_path, chunksize=self.batch_size, parse_dates=[0]
-                ):
-                    yield batch
-        elif isinstance(file_path_or_df, str):
-            self._read_first_row(file_path_or_df)
-            for batch in pd.read_csv(
-                file_path_or_df, chunksize=self.batch_size, parse_dates=[0]
-            ):
-                yield batch
+        if isinstance(file_path_or_df, str):
+            yield from self._file_batch_iterator(file_path_or_df)
         elif isinstance(file_path_or_df, pd.DataFrame):
             for batch in _crop_data_frame_in_batches(
                 file_path_or_df, self.batch_size
             ):
                 yield batch
+        elif isinstance(file_path_or_df, (list, tuple)) and all(
+            isinstance(file_path, str) for file_path in file_path_or_df
+        ):
+            # Assert format of all files.
+            for file_path in file_path_or_df:
+                self._read_first_row(file_path)
+            for file_path in file_path_or_df:
+                yield from self._file_batch_iterator(
+                    file_path, check_format=False
+                )
+        elif isinstance(file_path_or_df, Iterable):
+            # Consume the batches lazily.
+            for batch in file_path_or_df:
+                if isinstance(batch, (pa.RecordBatch, pa.Table)):
+                    batch = batch.to_pandas()
+                hdbg.dassert_isinstance(batch, pd.DataFrame)
+                yield batch
         else:
             raise ValueError(
                 "file_path_or_df is neither string(path to a csv file), "
-                "iterable of strings, nor pd.DataFrame"
+                "iterable of strings, pd.DataFrame, nor iterable of batches"
             )
 
+    def _file_batch_iterator(
+        self, file_path: str, *, check_format: bool = True
+    ) -> Generator[pd.DataFrame, None, None]:
+        """
+        Iterate over the rows of a csv or Parquet file.
+
+        :param file_path: Path to the file containing raw tick data in the
+        format[date_time, price, volume]
+        :param check_format: whether to assert the format of the file
+        """
+        if file_path.endswith((".parquet", ".pq")):
+            parquet_file = pq.ParquetFile(file_path)
+            if check_format:
+                hdbg.dassert_eq(
+                    len(parquet_file.schema_arrow),
+                    3,
+                    "Must have only 3 columns: date_time, price, & volume.",
+                )
+            for batch in parquet_file.iter_batches(batch_size=self.batch_size):
+                yield batch.to_pandas()
+        else:
+            if check_format:
+                self._read_first_row(file_path)
+            for batch in pd.read_csv(
+                file_path, chunksize=self.batch_size, parse_dates=[0]
+            ):
+                yield batch
+
     def _read_first_row(self, file_path: str) -> None:
         """
         Read first row of the CSV file.
@@ -229,154 +395,78 @@ class _StandardBars:
         :param file_path: Path to the csv file containing raw tick data
         in the format[date_time, price, volume]
         """
+        if file_path.endswith((".parquet", ".pq")):
+            # The Parquet files are checked when they are read.
+            return
         # Read in the first row & assert format.
         first_row = pd.read_csv(file_path, nrows=1)
         self._assert_csv(first_row)
 
-    def _extract_bars(self, data: Union[list, tuple, np.ndarray]) -> list:
-        """
-        Compile the various bars: dollar, volume, or tick, in a for loop.
-
-        We did investigate the use of trying to solve this in a vectorised
-        manner but found that a For loop worked well.
-
-        :param data: (tuple) Contains 3 columns - date_time, price, and volume.
-        :return: Extracted bars
-        """
-        # Iterate over rows.
-        list_bars: List[list] = []
-        for row in data:
-            # Set variables.
-            date_time = row[0]
-            self.tick_num += 1
-            price = float(row[1])
-            volume = row[2]
-            dollar_value = price * volume
-            signed_tick = self._apply_tick_rule(price)
-            if isinstance(self.threshold, (int, float)):
-                # If the threshold is fixed, it's used for every sampling.
-                threshold = self.threshold
-            else:
-                # If the threshold is changing, then the threshold defined just before
-                # sampling time is used
-                threshold = self.threshold.iloc[
-                    self.threshold.index.get_loc(date_time, method="pad")
-                ]
-            if self.open_price is None:
-                self.open_price = price
-            # Update high low prices.
-            self.high_price, self.low_price = self._update_high_low(price)
-            # Calculations.
-            self.cum_statistics["cum_ticks"] += 1
-            self.cum_statistics["cum_dollar_value"] += dollar_value
-            self.cum_statistics["cum_volume"] += volume
-            if signed_tick == 1:
-                self.cum_statistics["cum_buy_volume"] += volume
-            # If threshold reached then take a sample.
-            if self.cum_statistics[self.metric] >= threshold:
-                self._create_bars(
-                    date_time, price, self.high_price, self.low_price, list_bars
-                )
-                # Reset cache.
-                self._reset_cache()
-        return list_bars
-
-    def _reset_cache(self) -> None:
-        """
-        Describe how cache should be reset when new bar is sampled.
+    def _get_thresholds(self, date_times: pd.Series) -> np.ndarray:
         """
-        self.open_price = None
-        self.high_price, self.low_price = -np.inf, np.inf
-        self.cum_statistics = {
-            "cum_ticks": 0,
-            "cum_dollar_value": 0,
-            "cum_volume": 0,
-            "cum_buy_volume": 0,
-        }
-
-    def _update_high_low(self, price: float) -> Tuple[float, float]:
-        """
-        Update the high and low prices using the current price.
+        Get the threshold to use at each tick.
 
-        :param price: Current price
-        :return: Updated high and low prices
+        :param date_times: timestamps of the ticks
+        :return: array of thresholds
         """
-        if price > self.high_price:
-            high_price = price
+        if isinstance(self.threshold, (int, float)):
+            # If the threshold is fixed, it's used for every sampling.
+            thresholds = np.full(len(date_times), self.threshold, dtype=float)
         else:
-            high_price = self.high_price
-
-        if price < self.low_price:
-            low_price = price
-        else:
-            low_price = self.low_price
-        return high_price, low_price
+            # If the threshold is changing, then the threshold defined just before
+            # sampling time is used
+            hdbg.dassert_isinstance(self.threshold, pd.Series)
+            hdbg.dassert(self.threshold.index.is_monotonic_increasing)
+            idxs = self.threshold.index.searchsorted(date_times, side="right") - 1
+            hdbg.dassert_lte(
+                0, idxs.min(), "No threshold defined for the first tick"
+            )
+            thresholds = self.threshold.to_numpy(dtype=float)[idxs]
+        return thresholds
 
-    def _create_bars(
-        self,
-        date_time: str,
-        price: float,
-        high_price: float,
-        low_price: float,
-        list_bars: list,
-    ) -> None:
+    def _extract_bars(self, data: pd.DataFrame) -> pd.DataFrame:
         """
-        Construct a bar which has the following fields: date_time, open, high,
-        low, close, volume, cum_buy_volume, cum_ticks, cum_dollar_value. These
-        bars are appended to list_bars, which is later used to construct the
-        final bars DataFrame.
-
-        :param date_time: Timestamp of the bar
-        :param price: The current price
-        :param high_price: Highest price in the period
-        :param low_price: Lowest price in the period
-        :param list_bars: List to which we append the bars
-        """
-        # Create bars.
-        open_price = self.open_price
-        high_price = max(high_price, open_price)
-        low_price = min(low_price, open_price)
-        close_price = price
-        volume = self.cum_statistics["cum_volume"]
-        cum_buy_volume = self.cum_statistics["cum_buy_volume"]
-        cum_ticks = self.cum_statistics["cum_ticks"]
-        cum_dollar_value = self.cum_statistics["cum_dollar_value"]
-        # Update bars.
-        list_bars.append(
-            [
-                date_time,
-                self.tick_num,
-                open_price,
-                high_price,
-                low_price,
-                close_price,
-                volume,
-                cum_buy_volume,
-                cum_ticks,
-                cum_dollar_value,
-            ]
-        )
+        Compile the various bars: dollar, volume, or tick.
 
-    def _apply_tick_rule(self, price: float) -> int:
-        """
-        Apply the tick rule as defined on page 29 of Advances in Financial
-        Machine Learning.
+        The ticks are processed by a kernel looping on arrays, which is
+        compiled with numba when available.
 
-        :param price: Price at time t
-        :return: The signed tick
+        :param data: Contains 3 columns - date_time, price, and volume.
+        :return: Extracted bars
         """
-        if self.prev_price is not None:
-            tick_diff = price - self.prev_price
-        else:
-            tick_diff = 0
-        if tick_diff != 0:
-            signed_tick: int = np.sign(tick_diff)
-            self.prev_tick_rule = signed_tick
-        else:
-            signed_tick = self.prev_tick_rule
-        # Update previous price used for tick rule calculations.
-        self.prev_price = price
-        return signed_tick
+        date_times = data.iloc[:, 0]
+        prices = data.iloc[:, 1].to_numpy(dtype=float)
+        volumes = data.iloc[:, 2].to_numpy(dtype=float)
+        thresholds = self._get_thresholds(date_times)
+        # Preallocate the outputs for the worst case of one bar per tick.
+        num_ticks = len(data)
+        bar_tick_idxs = np.zeros(num_ticks, dtype=np.int64)
+        bar_values = np.zeros((num_ticks, 8))
+        kernel = _get_extract_bars_kernel()
+        num_bars = kernel(
+            prices,
+            volumes,
+            thresholds,
+            _METRIC_TO_STATE_IDX[self.metric],
+            self._state,
+            bar_tick_idxs,
+            bar_values,
+        )
+        bar_tick_idxs = bar_tick_idxs[:num_bars]
+        bar_values = bar_values[:num_bars]
+        # Package the bars.
+        bars_df = pd.DataFrame(bar_values, columns=_BAR_COLUMNS[2:])
+        bars_df.insert(0, "tick_num", self.tick_num + bar_tick_idxs + 1)
+        bars_df.insert(
+            0, "date_time", date_times.iloc[bar_tick_idxs].reset_index(drop=True)
+        )
+        bars_df["cum_ticks"] = bars_df["cum_ticks"].astype(np.int64)
+        if pd.api.types.is_integer_dtype(data.iloc[:, 2]):
+            # Preserve the type of the volumes.
+            for col in ["volume", "cum_buy_volume"]:
+                bars_df[col] = bars_df[col].astype(np.int64)
+        self.tick_num += num_ticks
+        return bars_df
 
     def _get_imbalance(
         self, price: float, signed_tick: int, volume: float
@@ -404,7 +494,7 @@ class _StandardBars:
 
 
 def get_dollar_bars(
-    file_path_or_df: Union[str, Iterable[str], pd.DataFrame],
+    file_path_or_df: TickData,
     threshold: Union[float, int, pd.Series] = 70000000,
     batch_size: int = 20000000,
     to_csv: bool = False,
@@ -414,7 +504,8 @@ def get_dollar_bars(
     Create the dollar bars: date_time, open, high, low, close, volume,
     cum_buy_volume, cum_ticks, cum_dollar_value.
 
-    :param file_path_or_df: Path to the csv file(s) or Pandas Data Frame containing
+    :param file_path_or_df: Path to the csv / Parquet file(s), Pandas Data
+    Frame or iterable of Arrow record batches / Pandas Data Frames containing
     raw tick data in the format[date_time, price, volume]
     :param threshold: A cumulative value above this threshold triggers a sample to be taken.
     If a series is given, then at each sampling time the closest previous threshold is used.
@@ -437,7 +528,7 @@ def get_dollar_bars(
 
 
 def get_volume_bars(
-    file_path_or_df: Union[str, Iterable[str], pd.DataFrame],
+    file_path_or_df: TickData,
     threshold: Union[float, int, pd.Series] = 70000000,
     batch_size: int = 20000000,
     to_csv: bool = False,
@@ -447,7 +538,8 @@ def get_volume_bars(
     Create the volume bars: date_time, open, high, low, close, volume,
     cum_buy_volume, cum_ticks, cum_dollar_value.
 
-    :param file_path_or_df: Path to the csv file(s) or Pandas Data Frame containing
+    :param file_path_or_df: Path to the csv / Parquet file(s), Pandas Data
+    Frame or iterable of Arrow record batches / Pandas Data Frames containing
     raw tick data in the format[date_time, price, volume]
     :param threshold: A cumulative value above this threshold triggers a sample to be taken.
     If a series is given, then at each sampling time the closest previous threshold is used.
@@ -470,7 +562,7 @@ def get_volume_bars(
 
 
 def get_tick_bars(
-    file_path_or_df: Union[str, Iterable[str], pd.DataFrame],
+    file_path_or_df: TickData,
     threshold: Union[float, int, pd.Series] = 70000000,
     batch_size: int = 20000000,
     to_csv: bool = False,
@@ -480,7 +572,8 @@ def get_tick_bars(
     Create the tick bars: date_time, open, high, low, close, volume,
     cum_buy_volume, cum_ticks, cum_dollar_value.
 
-    :param file_path_or_df: Path to the csv file(s) or Pandas Data Frame containing
+    :param file_path_or_df: Path to the csv / Parquet file(s), Pandas Data
+    Frame or iterable of Arrow record batches / Pandas Data Frames containing
     raw tick data in the format[date_time, price, volume]
     :param threshold: A cumulative value above this threshold triggers a sample to be taken.
     If a series is given, then at each sampling time the closest previous threshold is used.
@@ -500,3 +593,29 @@ def get_tick_bars(
         output_path=output_path,
     )
     return tick_bars
+
+
+def iterate_bars(
+    file_path_or_df: TickData,
+    metric: str,
+    threshold: Union[float, int, pd.Series],
+    batch_size: int = 20000000,
+) -> Generator[pd.DataFrame, None, None]:
+    """
+    Yield the bars sampled in each batch of tick data.
+
+    This is the streaming version of `get_dollar_bars()`, `get_volume_bars()`
+    and `get_tick_bars()`: the state of the bar under construction is carried
+    across batches, so that the tick history is never materialized.
+
+    :param file_path_or_df: same as in `get_dollar_bars()`
+    :param metric: `cum_dollar_value`, `cum_volume` or `cum_ticks` for dollar,
+        volume and tick bars, respectively
+    :param threshold: same as in `get_dollar_bars()`
+    :param batch_size: same as in `get_dollar_bars()`
+    :return: generator of DataFrames of bars, one per batch
+    """
+    bars = _StandardBars(
+        metric=metric, threshold=threshold, batch_size=batch_size
+    )
+    yield from bars.iterate_bars(file_path_or_df)
@@ -6,6 +6,10 @@ import core.information_bars.test.test_bars as bttbar
 
 import os
 
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
 import core.information_bars.bars as cinbabar
 import helpers.hpandas as hpandas
 import helpers.hunit_test as hunitest
@@ -48,3 +52,70 @@ class TestBars(hunitest.TestCase):
         file_name = os.path.join(self.get_input_dir(), file_name)
         file_name = os.path.abspath(file_name)
         return file_name
+
+
+class TestBars2(hunitest.TestCase):
+    """
+    Test that the bars are the same when the data is streamed in batches.
+    """
+
+    def test_iterate_bars1(self) -> None:
+        """
+        Test streaming Arrow record batches.
+        """
+        df = self._get_tick_data()
+        expected = cinbabar.get_dollar_bars(df, threshold=1000)
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        batches = iter(table.to_batches(max_chunksize=7))
+        actual = pd.concat(
+            cinbabar.iterate_bars(batches, "cum_dollar_value", 1000),
+            ignore_index=True,
+        )
+        self.assert_equal(
+            hpandas.df_to_str(actual, num_rows=None),
+            hpandas.df_to_str(expected, num_rows=None),
+        )
+
+    def test_iterate_bars2(self) -> None:
+        """
+        Test reading a Parquet file in batches.
+        """
+        df = self._get_tick_data()
+        expected = cinbabar.get_volume_bars(df, threshold=50)
+        file_path = os.path.join(self.get_scratch_space(), "ticks.parquet")
+        df.to_parquet(file_path, index=False)
+        actual = cinbabar.get_volume_bars(file_path, threshold=50, batch_size=5)
+        self.assert_equal(
+            hpandas.df_to_str(actual, num_rows=None),
+            hpandas.df_to_str(expected, num_rows=None),
+        )
+
+    def test_iterate_bars3(self) -> None:
+        """
+        Test a time-varying threshold.
+        """
+        df = self._get_tick_data()
+        threshold = pd.Series(
+            [5, 10], index=[df["date_time"].iloc[0], df["date_time"].iloc[20]]
+        )
+        actual = cinbabar.get_tick_bars(df, threshold=threshold, batch_size=6)
+        self.assertEqual(actual["cum_ticks"].to_list(), [5] * 4 + [10] * 2)
+        self.assertEqual(actual["tick_num"].to_list(), [5, 10, 15, 20, 30, 40])
+
+    @staticmethod
+    def _get_tick_data() -> pd.DataFrame:
+        """
+        Generate tick data with format [date_time, price, volume].
+        """
+        num_ticks = 45
+        rng = np.random.default_rng(seed=1)
+        df = pd.DataFrame(
+            {
+                "date_time": pd.date_range(
+                    "2022-01-01 09:30:00", periods=num_ticks, freq="s"
+                ),
+                "price": np.round(100 + rng.normal(size=num_ticks).cumsum(), 2),
+                "volume": rng.integers(1, 10, size=num_ticks),
+            }
+        )
+        return df
@@ -4,9 +4,10 @@ Import as:
 import core.signal_processing.ema_smoothing as cspremsm
 """
 
+import abc
 import functools
 import logging
-from typing import Any, Optional, Union
+from typing import Any, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -590,3 +591,505 @@ def get_trend_residual_decomp(
         raise ValueError(f"Unrecognized nan_mode `{nan_mode}`")
     df["residual"] = detrended
     return df
+
+
+# #############################################################################
+# Online estimators
+# #############################################################################
+
+
+class _OnlineEstimator(abc.ABC):
+    """
+    Compute an EMA-family operator incrementally.
+
+    `update()` processes only the new rows of a signal and returns the same
+    values that the corresponding batch function returns on the whole
+    history. The state is made of plain numpy arrays, so that the estimator
+    can be pickled to checkpoint it between bars or processes.
+    """
+
+    def __init__(self) -> None:
+        # Name of the series or columns of the df of the processed signal.
+        self._name: Optional[Any] = None
+        self._columns: Optional[pd.Index] = None
+        # Last output row.
+        self._value: Optional[np.ndarray] = None
+
+    def update(
+        self, *signals: Union[pd.DataFrame, pd.Series]
+    ) -> Union[pd.DataFrame, pd.Series]:
+        """
+        Process the new rows of the signal(s).
+
+        :param signals: new rows of the signal(s), with the same index and
+            same columns as the previously processed ones
+        :return: the values of the operator for the new rows
+        """
+        hdbg.dassert_lte(1, len(signals))
+        signal = signals[0]
+        hdbg.dassert_isinstance(signal, (pd.DataFrame, pd.Series))
+        for other_signal in signals[1:]:
+            hdbg.dassert_isinstance(other_signal, type(signal))
+            hdbg.dassert(other_signal.index.equals(signal.index))
+        if self._value is None:
+            # Store the layout of the signal.
+            if isinstance(signal, pd.DataFrame):
+                self._columns = signal.columns
+            elif all(other.name == signal.name for other in signals):
+                # Like pandas, keep the name only if it is shared.
+                self._name = signal.name
+        elif isinstance(signal, pd.DataFrame):
+            hdbg.dassert_is_not(self._columns, None)
+            hdbg.dassert(signal.columns.equals(self._columns))
+        else:
+            hdbg.dassert_is(self._columns, None)
+        xs = [
+            np.asarray(signal.to_numpy(), dtype=float).reshape(len(signal), -1)
+            for signal in signals
+        ]
+        for x in xs:
+            hdbg.dassert_eq(x.shape, xs[0].shape)
+        out = self._update(*xs)
+        if self._value is None:
+            self._value = np.full(out.shape[1], np.nan)
+        if out.shape[0] > 0:
+            self._value = out[-1].copy()
+        return self._to_pandas(out, signal.index)
+
+    def value(self) -> Optional[Union[pd.Series, float]]:
+        """
+        Return the value of the operator for the last processed row.
+
+        :return: a series indexed by the columns of the signal for a df, a
+            float for a series, `None` if no row has been processed
+        """
+        if self._value is None:
+            return None
+        if self._columns is not None:
+            return pd.Series(self._value, index=self._columns)
+        return float(self._value[0])
+
+    @abc.abstractmethod
+    def _update(self, *xs: np.ndarray) -> np.ndarray:
+        """
+        Process the new rows of the signal(s) stored as 2D arrays.
+        """
+        ...
+
+    def _to_pandas(
+        self, out: np.ndarray, index: pd.Index
+    ) -> Union[pd.DataFrame, pd.Series]:
+        if self._columns is not None:
+            return pd.DataFrame(out, index=index, columns=self._columns)
+        return pd.Series(out[:, 0], index=index, name=self._name)
+
+
+class _EmaStage:
+    """
+    Store the state of a single `ewm(adjust=True, ignore_na=False).mean()`.
+
+    The update reproduces the recursion of the pandas implementation, so that
+    the results are the same up to the last bit.
+    """
+
+    def __init__(self, tau: float, min_periods: int) -> None:
+        hdbg.dassert_lt(0, tau)
+        com = csprspfu.calculate_com_from_tau(tau)
+        alpha = 1.0 / (1.0 + com)
+        self._old_wt_factor = 1.0 - alpha
+        # Like pandas, require at least one observation.
+        self._min_periods = max(int(min_periods), 1)
+        # The state is initialized when the first row is processed.
+        self._weighted: Optional[np.ndarray] = None
+        self._old_wt: Optional[np.ndarray] = None
+        self._nobs: Optional[np.ndarray] = None
+
+    def update(self, x: np.ndarray) -> np.ndarray:
+        if self._weighted is None:
+            num_cols = x.shape[1]
+            self._weighted = np.full(num_cols, np.nan)
+            self._old_wt = np.ones(num_cols)
+            self._nobs = np.zeros(num_cols, dtype=np.int64)
+        weighted = self._weighted
+        old_wt = self._old_wt
+        nobs = self._nobs
+        out = np.empty_like(x)
+        for i in range(x.shape[0]):
+            cur = x[i]
+            is_observation = ~np.isnan(cur)
+            nobs = nobs + is_observation
+            is_started = ~np.isnan(weighted)
+            # Decay the weight of the past, also for missing observations.
+            old_wt = np.where(is_started, old_wt * self._old_wt_factor, old_wt)
+            to_update = is_started & is_observation
+            # Like pandas, skip the update for constant values to avoid
+            # numerical errors.
+            with np.errstate(invalid="ignore"):
+                updated = (old_wt * weighted + cur) / (old_wt + 1.0)
+            weighted = np.where(to_update & (weighted != cur), updated, weighted)
+            old_wt = np.where(to_update, old_wt + 1.0, old_wt)
+            # Start from the first observation.
+            weighted = np.where(~is_started & is_observation, cur, weighted)
+            out[i] = np.where(nobs >= self._min_periods, weighted, np.nan)
+        self._weighted = weighted
+        self._old_wt = old_wt
+        self._nobs = nobs
+        return out
+
+
+class _Delay:
+    """
+    Store the last rows of a signal to shift it by `delay` rows.
+    """
+
+    def __init__(self, delay: int) -> None:
+        hdbg.dassert_lte(0, delay, "Requested delay=%i is non-causal.", delay)
+        self._delay = int(delay)
+        self._buffer: Optional[np.ndarray] = None
+
+    def update(self, x: np.ndarray) -> np.ndarray:
+        if self._delay == 0:
+            return x
+        if self._buffer is None:
+            self._buffer = np.full((self._delay, x.shape[1]), np.nan)
+        x_tmp = np.concatenate([self._buffer, x])
+        self._buffer = x_tmp[-self._delay :]
+        return x_tmp[: x.shape[0]]
+
+
+class _SmoothMovingAverage:
+    """
+    Array version of `OnlineSmoothMovingAverage`.
+    """
+
+    def __init__(
+        self, tau: float, min_periods: int, min_depth: int, max_depth: int
+    ) -> None:
+        hdbg.dassert_isinstance(min_depth, int)
+        hdbg.dassert_isinstance(max_depth, int)
+        hdbg.dassert_lte(1, min_depth)
+        hdbg.dassert_lte(min_depth, max_depth)
+        self._min_depth = min_depth
+        # The iterated EMA of depth `n` is the output of the `n`-th stage.
+        self._stages = [_EmaStage(tau, min_periods) for _ in range(max_depth)]
+
+    def update(self, x: np.ndarray) -> np.ndarray:
+        # Accumulate in the same order of `compute_smooth_moving_average()`.
+        total = 0
+        for depth, stage in enumerate(self._stages, 1):
+            x = stage.update(x)
+            if depth >= self._min_depth:
+                total = total + x
+        denom = float(len(self._stages) - self._min_depth + 1)
+        return total / denom
+
+
+class OnlineEma(_OnlineEstimator):
+    """
+    Compute `compute_ema()` incrementally.
+    """
+
+    def __init__(self, tau: float, min_periods: int, depth: int = 1) -> None:
+        """
+        Constructor.
+
+        :param tau: as in `compute_ema()`
+        :param min_periods: as in `compute_ema()`
+        :param depth: as in `compute_ema()`
+        """
+        super().__init__()
+        hdbg.dassert_isinstance(depth, int)
+        hdbg.dassert_lte(1, depth)
+        self._sma = _SmoothMovingAverage(tau, min_periods, depth, depth)
+
+    def _update(self, x: np.ndarray) -> np.ndarray:  # type: ignore[override]
+        return self._sma.update(x)
+
+
+class OnlineSmoothMovingAverage(_OnlineEstimator):
+    """
+    Compute `compute_smooth_moving_average()` incrementally.
+    """
+
+    def __init__(
+        self,
+        tau: float,
+        min_periods: int = 0,
+        min_depth: int = 1,
+        max_depth: int = 1,
+    ) -> None:
+        """
+        Constructor.
+
+        :param tau, min_periods, min_depth, max_depth: as in
+            `compute_smooth_moving_average()`
+        """
+        super().__init__()
+        self._sma = _SmoothMovingAverage(tau, min_periods, min_depth, max_depth)
+
+    def _update(self, x: np.ndarray) -> np.ndarray:  # type: ignore[override]
+        return self._sma.update(x)
+
+
+class OnlineRollingMoment(_OnlineEstimator):
+    """
+    Compute `compute_rolling_moment()` incrementally.
+    """
+
+    def __init__(
+        self,
+        tau: float,
+        min_periods: int = 0,
+        min_depth: int = 1,
+        max_depth: int = 1,
+        p_moment: float = 2,
+    ) -> None:
+        """
+        Constructor.
+
+        :param tau, min_periods, min_depth, max_depth, p_moment: as in
+            `compute_rolling_moment()`
+        """
+        super().__init__()
+        self._p_moment = p_moment
+        self._sma = _SmoothMovingAverage(tau, min_periods, min_depth, max_depth)
+
+    def _update(self, x: np.ndarray) -> np.ndarray:  # type: ignore[override]
+        return self._sma.update(np.abs(x) ** self._p_moment)
+
+
+class OnlineRollingNorm(_OnlineEstimator):
+    """
+    Compute `compute_rolling_norm()` incrementally.
+    """
+
+    def __init__(
+        self,
+        tau: float,
+        min_periods: int = 0,
+        min_depth: int = 1,
+        max_depth: int = 1,
+        p_moment: float = 2,
+        delay: int = 0,
+    ) -> None:
+        """
+        Constructor.
+
+        :param tau, min_periods, min_depth, max_depth, p_moment, delay: as in
+            `compute_rolling_norm()`
+        """
+        super().__init__()
+        self._p_moment = p_moment
+        self._delay = _Delay(delay)
+        self._sma = _SmoothMovingAverage(tau, min_periods, min_depth, max_depth)
+
+    def _update(self, x: np.ndarray) -> np.ndarray:  # type: ignore[override]
+        x = self._delay.update(x)
+        x_p = self._sma.update(np.abs(x) ** self._p_moment)
+        return x_p ** (1.0 / self._p_moment)
+
+
+class OnlineRollingVar(_OnlineEstimator):
+    """
+    Compute `compute_rolling_var()` incrementally.
+    """
+
+    def __init__(
+        self,
+        tau: float,
+        min_periods: int = 0,
+        min_depth: int = 1,
+        max_depth: int = 1,
+        p_moment: float = 2,
+    ) -> None:
+        """
+        Constructor.
+
+        :param tau, min_periods, min_depth, max_depth, p_moment: as in
+            `compute_rolling_var()`
+        """
+        super().__init__()
+        self._p_moment = p_moment
+        self._sma = _SmoothMovingAverage(tau, min_periods, min_depth, max_depth)
+        self._moment_sma = _SmoothMovingAverage(
+            tau, min_periods, min_depth, max_depth
+        )
+
+    def _update(self, x: np.ndarray) -> np.ndarray:  # type: ignore[override]
+        x_ma = self._sma.update(x)
+        return self._moment_sma.update(np.abs(x - x_ma) ** self._p_moment)
+
+
+class OnlineRollingStd(OnlineRollingVar):
+    """
+    Compute `compute_rolling_std()` incrementally.
+    """
+
+    def _update(self, x: np.ndarray) -> np.ndarray:  # type: ignore[override]
+        return super()._update(x) ** (1.0 / self._p_moment)
+
+
+class OnlineRollingDemean(_OnlineEstimator):
+    """
+    Compute `compute_rolling_demean()` incrementally.
+    """
+
+    def __init__(
+        self,
+        tau: float,
+        min_periods: int = 0,
+        min_depth: int = 1,
+        max_depth: int = 1,
+    ) -> None:
+        """
+        Constructor.
+
+        :param tau, min_periods, min_depth, max_depth: as in
+            `compute_rolling_demean()`
+        """
+        super().__init__()
+        self._sma = _SmoothMovingAverage(tau, min_periods, min_depth, max_depth)
+
+    def _update(self, x: np.ndarray) -> np.ndarray:  # type: ignore[override]
+        return x - self._sma.update(x)
+
+
+class OnlineRollingZscore(_OnlineEstimator):
+    """
+    Compute `compute_rolling_zscore()` incrementally.
+    """
+
+    def __init__(
+        self,
+        tau: float,
+        min_periods: int = 0,
+        min_depth: int = 1,
+        max_depth: int = 1,
+        p_moment: float = 2,
+        demean: bool = True,
+        delay: int = 0,
+        atol: float = 0,
+    ) -> None:
+        """
+        Constructor.
+
+        :param tau, min_periods, min_depth, max_depth, p_moment, demean,
+            delay, atol: as in `compute_rolling_zscore()`
+        """
+        super().__init__()
+        self._p_moment = p_moment
+        self._atol = atol
+        self._sma: Optional[_SmoothMovingAverage] = None
+        self._ma_delay: Optional[_Delay] = None
+        if demean:
+            self._sma = _SmoothMovingAverage(
+                tau, min_periods, min_depth, max_depth
+            )
+            self._ma_delay = _Delay(delay)
+        self._moment_sma = _SmoothMovingAverage(
+            tau, min_periods, min_depth, max_depth
+        )
+        self._std_delay = _Delay(delay)
+
+    def _update(self, x: np.ndarray) -> np.ndarray:  # type: ignore[override]
+        if self._sma is not None:
+            x_ma = self._sma.update(x)
+            x_p = self._moment_sma.update(np.abs(x - x_ma) ** self._p_moment)
+            numerator = x - self._ma_delay.update(x_ma)
+        else:
+            x_p = self._moment_sma.update(np.abs(x) ** self._p_moment)
+            numerator = x
+        x_std = x_p ** (1.0 / self._p_moment)
+        denominator = self._std_delay.update(x_std).copy()
+        denominator[np.abs(denominator) <= self._atol] = np.nan
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ret = numerator / denominator
+        return ret
+
+
+class OnlineRollingCov(_OnlineEstimator):
+    """
+    Compute `compute_rolling_cov()` incrementally.
+
+    `update()` accepts the new rows of `srs1` and `srs2`.
+    """
+
+    def __init__(
+        self,
+        tau: float,
+        demean: bool = True,
+        min_periods: int = 0,
+        min_depth: int = 1,
+        max_depth: int = 1,
+    ) -> None:
+        """
+        Constructor.
+
+        :param tau, demean, min_periods, min_depth, max_depth: as in
+            `compute_rolling_cov()`
+        """
+        super().__init__()
+        sma_args = (tau, min_periods, min_depth, max_depth)
+        self._demean = demean
+        self._sma1 = _SmoothMovingAverage(*sma_args)
+        self._sma2 = _SmoothMovingAverage(*sma_args)
+        self._prod_sma = _SmoothMovingAverage(*sma_args)
+
+    def _update(  # type: ignore[override]
+        self, x1: np.ndarray, x2: np.ndarray
+    ) -> np.ndarray:
+        x1_adj, x2_adj = self._get_adjusted(x1, x2)
+        return self._prod_sma.update(x1_adj * x2_adj)
+
+    def _get_adjusted(
+        self, x1: np.ndarray, x2: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        if self._demean:
+            x1 = x1 - self._sma1.update(x1)
+            x2 = x2 - self._sma2.update(x2)
+        return x1, x2
+
+
+class OnlineRollingCorr(OnlineRollingCov):
+    """
+    Compute `compute_rolling_corr()` incrementally.
+
+    `update()` accepts the new rows of `srs1` and `srs2`.
+    """
+
+    def __init__(
+        self,
+        tau: float,
+        demean: bool = True,
+        min_periods: int = 0,
+        min_depth: int = 1,
+        max_depth: int = 1,
+        p_moment: float = 2,
+    ) -> None:
+        """
+        Constructor.
+
+        :param tau, demean, min_periods, min_depth, max_depth, p_moment: as in
+            `compute_rolling_corr()`
+        """
+        super().__init__(tau, demean, min_periods, min_depth, max_depth)
+        self._p_moment = p_moment
+        sma_args = (tau, min_periods, min_depth, max_depth)
+        self._moment_sma1 = _SmoothMovingAverage(*sma_args)
+        self._moment_sma2 = _SmoothMovingAverage(*sma_args)
+
+    def _update(  # type: ignore[override]
+        self, x1: np.ndarray, x2: np.ndarray
+    ) -> np.ndarray:
+        x1_adj, x2_adj = self._get_adjusted(x1, x2)
+        smooth_prod = self._prod_sma.update(x1_adj * x2_adj)
+        p_moment = self._p_moment
+        x1_std = self._moment_sma1.update(np.abs(x1_adj) ** p_moment) ** (
+            1.0 / p_moment
+        )
+        x2_std = self._moment_sma2.update(np.abs(x2_adj) ** p_moment) ** (
+            1.0 / p_moment
+        )
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ret = smooth_prod / (x1_std * x2_std)
+        return ret
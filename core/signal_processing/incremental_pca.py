@@ -4,14 +4,16 @@ Import as:
 import core.signal_processing.incremental_pca as csprinpc
 """
 
+import functools
 import logging
-from typing import Dict, List, Tuple
+from typing import Callable, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 
 import core.signal_processing.special_functions as csprspfu
 import helpers.hdbg as hdbg
+import helpers.hnumba as hnumba
 
 _LOG = logging.getLogger(__name__)
 
@@ -51,50 +53,179 @@ def compute_ipca(
         df.shape[1],
         msg="Dimension should be greater than or equal to the number of principal components.",
     )
-    hdbg.dassert_lt(0, tau)
-    com = csprspfu.calculate_com_from_tau(tau)
-    alpha = 1.0 / (com + 1.0)
-    _LOG.debug("com = %0.2f", com)
-    _LOG.debug("alpha = %0.2f", alpha)
     # TODO(Paul): Consider requiring that the caller do this instead.
     # Fill NaNs with zero.
     df.fillna(0, inplace=True)
-    lambdas: Dict[int, list] = {k: [] for k in range(num_pc)}
-    # V's are eigenvectors with norm equal to corresponding eigenvalue.
-    vs: Dict[int, list] = {k: [] for k in range(num_pc)}
-    unit_eigenvecs: Dict[int, list] = {k: [] for k in range(num_pc)}
-    step = 0
-    for n in df.index:
+    ipca = IncrementalPca(num_pc, tau)
+    lambda_df, unit_eigenvec_dfs = ipca.update(df)
+    return lambda_df, unit_eigenvec_dfs
+
+
+class IncrementalPca:
+    """
+    Compute incremental PCA storing the state to process new observations.
+
+    The state consists of the current (unnormalized) eigenvector estimates, so
+    that the result of processing a dataframe in multiple chunks is the same as
+    processing it at once with `compute_ipca()`.
+    """
+
+    def __init__(self, num_pc: int, tau: float) -> None:
+        """
+        Constructor.
+
+        :param num_pc: as in `compute_ipca()`
+        :param tau: as in `compute_ipca()`
+        """
+        hdbg.dassert_isinstance(
+            num_pc, int, msg="Specify an integral number of principal components."
+        )
+        hdbg.dassert_lt(0, num_pc)
+        hdbg.dassert_lt(0, tau)
+        self._num_pc = num_pc
+        com = csprspfu.calculate_com_from_tau(tau)
+        self._alpha = 1.0 / (com + 1.0)
+        _LOG.debug("com = %0.2f", com)
+        _LOG.debug("alpha = %0.2f", self._alpha)
+        # Columns of the processed observations.
+        self._columns: Optional[pd.Index] = None
+        # Eigenvectors with norm equal to corresponding eigenvalue, one per row.
+        self._vs: Optional[np.ndarray] = None
+        # Number of initialized eigenvectors.
+        self._num_initialized = 0
+
+    def get_eigenvectors(self) -> Optional[pd.DataFrame]:
+        """
+        Return the current unnormalized eigenvector estimates.
+
+        :return: df with a row for each initialized eigenvector, `None` if no
+            observation has been processed
+        """
+        if self._vs is None:
+            return None
+        df = pd.DataFrame(
+            self._vs[: self._num_initialized], columns=self._columns
+        )
+        return df
+
+    def update(self, df: pd.DataFrame) -> Tuple[pd.DataFrame, List[pd.DataFrame]]:
+        """
+        Update the state with new observations.
+
+        :param df: new centered observations, with the same columns as the
+            previous ones. NaNs are treated as zeros
+        :return: same as `compute_ipca()` for the rows of `df`
+        """
+        hdbg.dassert_isinstance(df, pd.DataFrame)
+        if self._columns is None:
+            hdbg.dassert_lte(
+                self._num_pc,
+                df.shape[1],
+                msg="Dimension should be greater than or equal to the number of principal components.",
+            )
+            self._columns = df.columns
+            self._vs = np.zeros((self._num_pc, df.shape[1]))
+        else:
+            hdbg.dassert(
+                df.columns.equals(self._columns),
+                "Columns should be the same as the ones of the previous observations",
+            )
+        x = df.fillna(0).to_numpy(dtype=float)
+        num_rows = x.shape[0]
+        # Preallocate the outputs.
+        lambdas = np.full((num_rows, self._num_pc), np.nan)
+        unit_eigenvecs = np.full((self._num_pc, num_rows, x.shape[1]), np.nan)
+        # Index of the first row where each eigenvector has been estimated.
+        first_rows = np.full(self._num_pc, num_rows)
+        kernel = _get_ipca_kernel()
+        self._num_initialized = kernel(
+            x,
+            self._vs,
+            self._num_initialized,
+            self._alpha,
+            lambdas,
+            unit_eigenvecs,
+            first_rows,
+        )
+        _LOG.debug("Completed %s steps of incremental PCA.", num_rows)
+        # Package the outputs.
+        lambda_df = pd.DataFrame(lambdas, index=df.index)
+        unit_eigenvec_dfs = []
+        for i in range(self._num_pc):
+            first_row = first_rows[i]
+            unit_eigenvec_df = pd.DataFrame(
+                unit_eigenvecs[i, first_row:],
+                index=df.index[first_row:],
+                columns=df.columns,
+            )
+            unit_eigenvec_dfs.append(unit_eigenvec_df)
+        return lambda_df, unit_eigenvec_dfs
+
+
+def _compute_ipca_kernel(
+    x: np.ndarray,
+    vs: np.ndarray,
+    num_initialized: int,
+    alpha: float,
+    lambdas: np.ndarray,
+    unit_eigenvecs: np.ndarray,
+    first_rows: np.ndarray,
+) -> int:
+    """
+    Run incremental PCA on the rows of `x`, updating the arrays in place.
+
+    This is the array version of the loop over `_compute_ipca_step()`, written
+    so that it can be compiled with numba.
+
+    :param x: observations with shape (num_rows, dim)
+    :param vs: unnormalized eigenvector estimates with shape (num_pc, dim)
+    :param num_initialized: number of initialized eigenvectors
+    :param alpha: as in `_compute_ipca_step()`
+    :param lambdas: output eigenvalues with shape (num_rows, num_pc)
+    :param unit_eigenvecs: output unit eigenvectors with shape (num_pc,
+        num_rows, dim)
+    :param first_rows: output index of the first row where each eigenvector
+        is estimated, `num_rows` if never
+    :return: updated number of initialized eigenvectors
+    """
+    num_rows = x.shape[0]
+    num_pc = vs.shape[0]
+    for n in range(num_rows):
         # Initialize u(n).
-        u = df.loc[n].copy()
-        for i in range(min(num_pc, step + 1)):
-            # Initialize ith eigenvector.
-            if i == step:
+        u = x[n].copy()
+        for i in range(min(num_pc, num_initialized + 1)):
+            if i == num_initialized:
+                # Initialize ith eigenvector.
                 v = u.copy()
-                if np.linalg.norm(v):
-                    _LOG.debug("Initializing eigenvector %s...", i)
-                    step += 1
+                if np.sum(v * v) > 0:
+                    num_initialized += 1
             else:
                 # Main update step for eigenvector i.
-                u, v = _compute_ipca_step(u, vs[i][-1], alpha)
+                v_prev = vs[i]
+                norm_prev = np.sqrt(np.sum(v_prev * v_prev))
+                if norm_prev == 0:
+                    v = v_prev * 0
+                else:
+                    dot = np.sum(u * v_prev)
+                    v = (1 - alpha) * v_prev + alpha * u * dot / norm_prev
+                    u = u - dot * v_prev / norm_prev**2
             # Bookkeeping.
-            v.name = n
-            vs[i].append(v)
-            norm = np.linalg.norm(v)
-            lambdas[i].append(norm)
-            unit_eigenvecs[i].append(v / norm)
-    _LOG.debug("Completed %s steps of incremental PCA.", len(df))
-    # Convert lambda dict of lists to list of series.
-    # Convert unit_eigenvecs dict of lists to list of dataframes.
-    lambdas_srs = []
-    unit_eigenvec_dfs = []
-    for i in range(num_pc):
-        lambdas_srs.append(
-            pd.Series(index=df.index[-len(lambdas[i]) :], data=lambdas[i])
-        )
-        unit_eigenvec_dfs.append(pd.concat(unit_eigenvecs[i], axis=1).transpose())
-    lambda_df = pd.concat(lambdas_srs, axis=1)
-    return lambda_df, unit_eigenvec_dfs
+            vs[i] = v
+            if first_rows[i] == num_rows:
+                first_rows[i] = n
+            norm = np.sqrt(np.sum(v * v))
+            lambdas[n, i] = norm
+            if norm > 0:
+                unit_eigenvecs[i, n] = v / norm
+    return num_initialized
+
+
+@functools.lru_cache()
+def _get_ipca_kernel() -> Callable[..., int]:
+    """
+    Return the incremental PCA kernel, compiled with numba if available.
+    """
+    return hnumba.jit(_compute_ipca_kernel)
 
 
 def _compute_ipca_step(
@@ -1,5 +1,6 @@
 import datetime
 import logging
+import pickle
 from typing import List
 
 import numpy as np
@@ -684,3 +685,105 @@ class Test_compute_rolling_annualized_sharpe_ratio(hunitest.TestCase):
             realization, tau=16, points_per_year=260.875
         )
         self.check_string(hpandas.df_to_str(rolling_sr, num_rows=None))
+
+
+class Test_online_estimators1(hunitest.TestCase):
+    """
+    Check that the online estimators reproduce the batch functions exactly.
+    """
+
+    def test_ema1(self) -> None:
+        df = self._get_df()
+        expected = cspremsm.compute_ema(df, tau=5, min_periods=3, depth=3)
+        estimator = cspremsm.OnlineEma(tau=5, min_periods=3, depth=3)
+        self._check(estimator, [df], expected)
+
+    def test_smooth_moving_average1(self) -> None:
+        df = self._get_df()
+        expected = cspremsm.compute_smooth_moving_average(
+            df, tau=4, min_periods=2, min_depth=2, max_depth=4
+        )
+        estimator = cspremsm.OnlineSmoothMovingAverage(
+            tau=4, min_periods=2, min_depth=2, max_depth=4
+        )
+        self._check(estimator, [df], expected)
+
+    def test_rolling_norm1(self) -> None:
+        df = self._get_df()
+        expected = cspremsm.compute_rolling_norm(
+            df, tau=4, max_depth=2, p_moment=3, delay=2
+        )
+        estimator = cspremsm.OnlineRollingNorm(
+            tau=4, max_depth=2, p_moment=3, delay=2
+        )
+        self._check(estimator, [df], expected)
+
+    def test_rolling_std1(self) -> None:
+        srs = self._get_df()["a"]
+        expected = cspremsm.compute_rolling_std(srs, tau=4, min_periods=5)
+        estimator = cspremsm.OnlineRollingStd(tau=4, min_periods=5)
+        self._check(estimator, [srs], expected)
+
+    def test_rolling_zscore1(self) -> None:
+        df = self._get_df()
+        expected = cspremsm.compute_rolling_zscore(df, tau=4, delay=1, atol=0.1)
+        estimator = cspremsm.OnlineRollingZscore(tau=4, delay=1, atol=0.1)
+        self._check(estimator, [df], expected)
+
+    def test_rolling_zscore2(self) -> None:
+        df = self._get_df()
+        expected = cspremsm.compute_rolling_zscore(
+            df, tau=4, demean=False, delay=3
+        )
+        estimator = cspremsm.OnlineRollingZscore(tau=4, demean=False, delay=3)
+        self._check(estimator, [df], expected)
+
+    def test_rolling_corr1(self) -> None:
+        df = self._get_df()
+        expected = cspremsm.compute_rolling_corr(
+            df["a"], df["c"], tau=4, max_depth=2
+        )
+        estimator = cspremsm.OnlineRollingCorr(tau=4, max_depth=2)
+        self._check(estimator, [df["a"], df["c"]], expected)
+
+    def _check(
+        self,
+        estimator: cspremsm._OnlineEstimator,
+        signals: List[pd.DataFrame],
+        expected: pd.DataFrame,
+    ) -> None:
+        """
+        Feed the signals in chunks, checkpointing the estimator between them.
+        """
+        cuts = [0, 1, 7, 60, 61, 150, len(signals[0])]
+        actual = []
+        for start, end in zip(cuts[:-1], cuts[1:]):
+            estimator = pickle.loads(pickle.dumps(estimator))
+            chunks = [signal.iloc[start:end] for signal in signals]
+            actual.append(estimator.update(*chunks))
+        actual = pd.concat(actual)
+        self.assert_equal(str(type(actual)), str(type(expected)))
+        self.assertTrue(actual.index.equals(expected.index))
+        if isinstance(expected, pd.DataFrame):
+            self.assertTrue(actual.columns.equals(expected.columns))
+        np.testing.assert_array_equal(actual.to_numpy(), expected.to_numpy())
+        # Check the last value.
+        value = estimator.value()
+        np.testing.assert_array_equal(value, expected.iloc[-1])
+
+    @staticmethod
+    def _get_df() -> pd.DataFrame:
+        """
+        Generate a df with leading, interspersed NaNs and constant values.
+        """
+        num_rows = 200
+        rng = np.random.default_rng(seed=0)
+        df = pd.DataFrame(
+            rng.standard_normal((num_rows, 3)),
+            index=pd.date_range("2022-01-01", periods=num_rows, freq="T"),
+            columns=["a", "b", "c"],
+        )
+        df.iloc[[0, 1, 5, 6, 50], 0] = np.nan
+        df.iloc[:10, 1] = np.nan
+        df.iloc[100:105, 2] = 3.0
+        return df
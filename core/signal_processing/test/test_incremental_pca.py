@@ -1,18 +1,18 @@
 import logging
+from typing import Dict, List, Tuple
 
 import numpy as np
 import pandas as pd
-import pytest
 
 import core.artificial_signal_generators as carsigen
 import core.signal_processing.incremental_pca as csprinpc
+import core.signal_processing.special_functions as csprspfu
 import helpers.hpandas as hpandas
 import helpers.hunit_test as hunitest
 
 _LOG = logging.getLogger(__name__)
 
 
-@pytest.mark.skip("See CmTask5898.")
 class Test_compute_ipca(hunitest.TestCase):
     def test1(self) -> None:
         """
@@ -139,7 +139,146 @@ class Test_compute_ipca(hunitest.TestCase):
         return df
 
 
-@pytest.mark.skip("See CmTask5898.")
+class Test_IncrementalPca(hunitest.TestCase):
+    def test1(self) -> None:
+        """
+        Check that processing the data in chunks is the same as at once.
+        """
+        df = self._get_df(seed=1)
+        df.iloc[0:1, :] = np.nan
+        df.iloc[5:8, 3:5] = np.nan
+        num_pc = 3
+        tau = 16
+        expected_lambda_df, expected_unit_eigenvec_dfs = csprinpc.compute_ipca(
+            df.copy(), num_pc, tau
+        )
+        # Process the data in chunks.
+        ipca = csprinpc.IncrementalPca(num_pc, tau)
+        results = [ipca.update(df.iloc[:1]), ipca.update(df.iloc[1:25])]
+        results.append(ipca.update(df.iloc[25:]))
+        lambda_df = pd.concat([result[0] for result in results])
+        self.assert_dfs_close(lambda_df, expected_lambda_df)
+        for i in range(num_pc):
+            unit_eigenvec_df = pd.concat([result[1][i] for result in results])
+            self.assert_dfs_close(unit_eigenvec_df, expected_unit_eigenvec_dfs[i])
+        # Check the state.
+        eigenvec_df = ipca.get_eigenvectors()
+        self.assertEqual(eigenvec_df.shape, (num_pc, df.shape[1]))
+
+    def test2(self) -> None:
+        """
+        Check that the input is not modified and NaNs are treated as zeros.
+        """
+        df = self._get_df(seed=1)
+        df.iloc[2:4, 8:] = np.nan
+        df_copy = df.copy()
+        num_pc = 2
+        tau = 8
+        ipca = csprinpc.IncrementalPca(num_pc, tau)
+        lambda_df, _ = ipca.update(df)
+        self.assertTrue(df.equals(df_copy))
+        expected_lambda_df, _ = csprinpc.compute_ipca(df.fillna(0), num_pc, tau)
+        self.assert_dfs_close(lambda_df, expected_lambda_df)
+
+    def test3(self) -> None:
+        """
+        Check that observations with different columns are rejected.
+        """
+        df = self._get_df(seed=1)
+        ipca = csprinpc.IncrementalPca(2, 8)
+        ipca.update(df.iloc[:10])
+        with self.assertRaises(AssertionError):
+            ipca.update(df.iloc[10:, :-1])
+
+    def test4(self) -> None:
+        """
+        Check that the results are the same as with `_compute_ipca_step()` on
+        random data.
+        """
+        rng = np.random.default_rng(seed=0)
+        for num_rows, num_cols, num_pc, tau in [
+            (30, 5, 2, 4),
+            (50, 10, 3, 16),
+            (20, 4, 4, 8),
+        ]:
+            data = rng.standard_normal((num_rows, num_cols))
+            # Add leading, interspersed and full-row NaNs.
+            data[:2, :2] = np.nan
+            data[rng.random((num_rows, num_cols)) < 0.1] = np.nan
+            data[5] = np.nan
+            index = pd.date_range("2000-01-01", periods=num_rows, freq="B")
+            df = pd.DataFrame(data, index=index)
+            expected_lambda_df, expected_unit_eigenvec_dfs = (
+                self._compute_ipca_with_steps(df.fillna(0), num_pc, tau)
+            )
+            # Process the data in two chunks.
+            ipca = csprinpc.IncrementalPca(num_pc, tau)
+            results = [ipca.update(df.iloc[:10]), ipca.update(df.iloc[10:])]
+            lambda_df = pd.concat([result[0] for result in results])
+            self.assert_dfs_close(lambda_df, expected_lambda_df)
+            for i in range(num_pc):
+                unit_eigenvec_df = pd.concat(
+                    [result[1][i] for result in results]
+                )
+                self.assert_dfs_close(
+                    unit_eigenvec_df, expected_unit_eigenvec_dfs[i]
+                )
+
+    @staticmethod
+    def _compute_ipca_with_steps(
+        df: pd.DataFrame, num_pc: int, tau: float
+    ) -> Tuple[pd.DataFrame, List[pd.DataFrame]]:
+        """
+        Compute incremental PCA with the loop over `_compute_ipca_step()`.
+
+        This is the implementation of `compute_ipca()` before the NumPy
+        kernel.
+        """
+        com = csprspfu.calculate_com_from_tau(tau)
+        alpha = 1.0 / (com + 1.0)
+        lambdas: Dict[int, list] = {k: [] for k in range(num_pc)}
+        vs: Dict[int, list] = {k: [] for k in range(num_pc)}
+        unit_eigenvecs: Dict[int, list] = {k: [] for k in range(num_pc)}
+        step = 0
+        for n in df.index:
+            u = df.loc[n].copy()
+            for i in range(min(num_pc, step + 1)):
+                if i == step:
+                    v = u.copy()
+                    if np.linalg.norm(v):
+                        step += 1
+                else:
+                    u, v = csprinpc._compute_ipca_step(u, vs[i][-1], alpha)
+                v.name = n
+                vs[i].append(v)
+                norm = np.linalg.norm(v)
+                lambdas[i].append(norm)
+                unit_eigenvecs[i].append(v / norm)
+        lambdas_srs = []
+        unit_eigenvec_dfs = []
+        for i in range(num_pc):
+            lambdas_srs.append(
+                pd.Series(index=df.index[-len(lambdas[i]) :], data=lambdas[i])
+            )
+            unit_eigenvec_dfs.append(
+                pd.concat(unit_eigenvecs[i], axis=1).transpose()
+            )
+        lambda_df = pd.concat(lambdas_srs, axis=1)
+        return lambda_df, unit_eigenvec_dfs
+
+    @staticmethod
+    def _get_df(seed: int) -> pd.DataFrame:
+        """
+        Generate a dataframe via `carsigen.MultivariateNormalProcess()`.
+        """
+        mn_process = carsigen.MultivariateNormalProcess()
+        mn_process.set_cov_from_inv_wishart_draw(dim=10, seed=seed)
+        df = mn_process.generate_sample(
+            {"start": "2000-01-01", "periods": 40, "freq": "B"}, seed=seed
+        )
+        return df
+
+
 class Test__compute_ipca_step(hunitest.TestCase):
     def test1(self) -> None:
         """
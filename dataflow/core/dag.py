@@ -4,10 +4,14 @@ Import as:
 import dataflow.core.dag as dtfcordag
 """
 
+import concurrent.futures
 import itertools
 import json
 import logging
 import os
+import queue
+import threading
+import time
 from typing import Any, Callable, Dict, List, Optional, Tuple, Union, cast
 
 import networkx as networ
@@ -88,6 +92,7 @@ class DAG(hobject.PrintableMixin):
         self._save_node_df_out_stats = False
         self._profile_execution = False
         self._dst_dir: Optional[str] = None
+        self._node_io_writer: Optional[_NodeIoWriter] = None
         self.set_debug_mode(
             self._save_node_io,
             self._save_node_df_out_stats,
@@ -95,7 +100,17 @@ class DAG(hobject.PrintableMixin):
             self._dst_dir,
         )
         # Disable freeing nodes.
+        # When enabled, the outputs of a node are freed as soon as all the nodes
+        # consuming them have been executed. The outputs of the sinks and of
+        # the nodes in `nids_to_keep` are never freed.
         self.force_free_nodes = False
+        self.nids_to_keep: List[dtfcornode.NodeId] = []
+        # Run one node at a time by default.
+        self._execution_mode = "serial"
+        self._num_workers = 1
+        self.set_execution_mode(self._execution_mode, self._num_workers)
+        # Run `predict()` on all the rows by default.
+        self._incremental_predict = False
 
     def __repr__(self) -> str:
         """
@@ -139,6 +154,8 @@ class DAG(hobject.PrintableMixin):
         save_node_df_out_stats: bool,
         profile_execution: bool,
         dst_dir: Optional[str],
+        *,
+        node_io_writer_kwargs: Optional[Dict[str, Any]] = None,
     ) -> None:
         """
         Set the debug parameters.
@@ -158,6 +175,10 @@ class DAG(hobject.PrintableMixin):
         :param profile_execution: if not `None`, store information about the
             execution of the nodes
         :param dst_dir: directory to save node interface and execution profiling info
+        :param node_io_writer_kwargs: if not `None`, save the node interface
+            from a background thread instead of while running the nodes,
+            using a `_NodeIoWriter` built with these params. The pending
+            writes are completed by `flush_node_io()`
         """
         hdbg.dassert_in(
             save_node_io,
@@ -177,6 +198,13 @@ class DAG(hobject.PrintableMixin):
         self._save_node_df_out_stats = save_node_df_out_stats
         self._profile_execution = profile_execution
         self._dst_dir = dst_dir
+        # Complete the writes of the previous writer, if any, and stop its
+        # thread.
+        if self._node_io_writer is not None:
+            self._node_io_writer.stop()
+        self._node_io_writer = None
+        if node_io_writer_kwargs is not None:
+            self._node_io_writer = _NodeIoWriter(**node_io_writer_kwargs)
         if self._dst_dir:
             hio.create_dir(self._dst_dir, incremental=False)
         if any(
@@ -196,6 +224,53 @@ class DAG(hobject.PrintableMixin):
                 dst_dir, None, "Need to specify a directory to save the data"
             )
 
+    def set_execution_mode(self, execution_mode: str, num_workers: int) -> None:
+        """
+        Set how the nodes are scheduled when running the DAG.
+
+        In the parallel modes the nodes are grouped by dependency level (i.e.,
+        nodes whose predecessors have all been executed) and the nodes of a
+        level are run concurrently, e.g., independent feature pipelines that
+        are joined by a `YConnector`. The outputs are the same as in "serial"
+        mode, since each node receives the same inputs and the topological ids
+        used to tag the debug info are assigned in the same order.
+
+        :param execution_mode: how to run the nodes
+            - "serial": run one node at a time following a topological sort
+            - "threading": run the nodes of a level on a pool of threads
+            - "multiprocessing": run the methods of the nodes of a level on a
+              pool of processes. The nodes, their inputs, and their outputs must
+              be picklable. The node instances are replaced with the copies
+              updated by the worker processes, so that the state learned in
+              `fit()` is preserved
+        :param num_workers: max number of nodes to run concurrently
+        """
+        hdbg.dassert_in(
+            execution_mode, ("serial", "threading", "multiprocessing")
+        )
+        hdbg.dassert_isinstance(num_workers, int)
+        hdbg.dassert_lte(1, num_workers)
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug(hprint.to_str("execution_mode num_workers"))
+        self._execution_mode = execution_mode
+        self._num_workers = num_workers
+
+    def set_incremental_predict(self, incremental_predict: bool) -> None:
+        """
+        Set whether `predict()` reuses the outputs of the previous run.
+
+        This is useful when the DAG is run repeatedly on a growing or sliding
+        window of data, e.g., once per bar in a real-time system, since most of
+        the rows have already been processed in the previous bar.
+
+        When enabled, the nodes supporting it (see
+        `FitPredictNode.supports_incremental_predict()`) are run with
+        `predict_incrementally()` in the main process, while the other nodes
+        are run with `predict()` on all the rows as usual.
+        """
+        hdbg.dassert_isinstance(incremental_predict, bool)
+        self._incremental_predict = incremental_predict
+
     # /////////////////////////////////////////////////////////////////////////////
     # Accessor.
     # /////////////////////////////////////////////////////////////////////////////
@@ -493,8 +568,8 @@ class DAG(hobject.PrintableMixin):
             `get_outputs(method)`
         """
         sinks = self.get_sinks()
-        for id_, nid in enumerate(networ.topological_sort(self._nx_dag)):
-            self._run_node(id_, nid, method)
+        nids = list(networ.topological_sort(self._nx_dag))
+        self._run_nodes(nids, method)
         return {sink: self.get_node(sink).get_outputs(method) for sink in sinks}
 
     def run_leq_node(
@@ -523,19 +598,24 @@ class DAG(hobject.PrintableMixin):
         )
         # The `ancestors` filter only returns nodes strictly less than `nid`,
         # and so we need to add `nid` back.
-        nids = itertools.chain(ancestors, [nid])
+        nids = list(itertools.chain(ancestors, [nid]))
         # Execute all the ancestors of `nid`.
-        if progress_bar:
-            nids = tqdm(list(nids), desc="run_leq_node")
-        for id_, pred_nid in enumerate(nids):
-            if _LOG.isEnabledFor(logging.DEBUG):
-                _LOG.debug("Executing node '%s'", pred_nid)
-            self._run_node(id_, pred_nid, method)
+        self._run_nodes(nids, method, progress_bar=progress_bar)
         # Retrieve the output the node.
         node = self.get_node(nid)
         node_output = node.get_outputs(method)
         return node_output
 
+    def flush_node_io(self) -> None:
+        """
+        Wait until the node interface is saved by the background writer.
+
+        This is a no-op if the node interface is saved while running the
+        nodes.
+        """
+        if self._node_io_writer is not None:
+            self._node_io_writer.flush()
+
     # /////////////////////////////////////////////////////////////////////////////
     # Private methods.
     # /////////////////////////////////////////////////////////////////////////////
@@ -661,33 +741,27 @@ class DAG(hobject.PrintableMixin):
             obj = pd.DataFrame(obj)
         if isinstance(obj, pd.DataFrame):
             df = obj
-            if self._save_node_df_out_stats:
-                # Save high level description about the df.
-                _LOG.debug("Saving node df out stats...")
-                txt = hpandas.df_to_str(
+            if self._node_io_writer is None:
+                _write_df_to_file(
                     df,
-                    print_dtypes=True,
-                    print_shape_info=True,
-                    print_memory_usage=True,
-                    print_nan_info=True,
+                    file_name,
+                    self._save_node_io,
+                    self._save_node_df_out_stats,
                 )
-                hio.to_file(file_name + ".txt", txt)
-            # Save content of the df.
-            if self._save_node_io == "df_as_csv":
-                csv_file_name = f"{file_name}.csv.gz"
-                df.to_csv(csv_file_name, compression="gzip")
-            elif self._save_node_io == "df_as_pq":
-                parquet_file_name = f"{file_name}.parquet"
-                hparque.to_parquet(df, parquet_file_name)
-            elif self._save_node_io == "df_as_csv_and_pq":
-                csv_file_name = f"{file_name}.csv.gz"
-                df.to_csv(csv_file_name, compression="gzip")
-                parquet_file_name = f"{file_name}.parquet"
-                hparque.to_parquet(df, parquet_file_name)
             else:
-                raise ValueError(f"Invalid save_node_io='{self._save_node_io}'")
-            if _LOG.isEnabledFor(logging.DEBUG):
-                _LOG.debug("Saved log dir in '%s'", file_name)
+                # Save a copy of the df, so that the write is not affected by
+                # the nodes modifying the df in place after it is enqueued
+                # (e.g., with `fillna(inplace=True)`). A shallow copy shares
+                # the data with the df and only protects from columns being
+                # added or removed.
+                deep = self._node_io_writer.deep_copy
+                self._node_io_writer.put(
+                    _write_df_to_file,
+                    df.copy(deep=deep),
+                    file_name,
+                    self._save_node_io,
+                    self._save_node_df_out_stats,
+                )
         else:
             _LOG.warning(
                 "Can't save node input / output of type '%s': %s",
@@ -695,16 +769,108 @@ class DAG(hobject.PrintableMixin):
                 obj,
             )
 
+    def _run_nodes(
+        self,
+        nids: List[dtfcornode.NodeId],
+        method: dtfcornode.Method,
+        *,
+        progress_bar: bool = False,
+    ) -> None:
+        """
+        Run the requested `method` on the nodes `nids` according to the
+        execution mode.
+
+        :param nids: nodes to run in topological order. All the predecessors of
+            a node need to be in `nids`
+        """
+        ref_counter = None
+        if self.force_free_nodes:
+            ref_counter = _NodeOutputRefCounter(
+                self._nx_dag, nids, self.nids_to_keep
+            )
+        if self._execution_mode == "serial":
+            if progress_bar:
+                nids = tqdm(nids, desc="run_nodes")
+            for id_, nid in enumerate(nids):
+                if _LOG.isEnabledFor(logging.DEBUG):
+                    _LOG.debug("Executing node '%s'", nid)
+                self._run_node(id_, nid, method, ref_counter=ref_counter)
+            return
+        # Use the same topological ids as in the serial execution.
+        topological_ids = {nid: id_ for id_, nid in enumerate(nids)}
+        # Group the nodes in levels: the nodes in a level depend only on nodes
+        # in the previous levels and so they can be run concurrently.
+        levels = list(networ.topological_generations(self._nx_dag.subgraph(nids)))
+        if progress_bar:
+            levels = tqdm(levels, desc="run_nodes")
+        process_executor = None
+        if self._execution_mode == "multiprocessing":
+            # The threads drive the execution of the nodes in the main process
+            # and offload the computation of the node method to the processes.
+            process_executor = concurrent.futures.ProcessPoolExecutor(
+                max_workers=self._num_workers
+            )
+        try:
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=self._num_workers
+            ) as executor:
+                for level in levels:
+                    # Submit the nodes in a deterministic order.
+                    level = sorted(level, key=lambda nid: topological_ids[nid])
+                    if _LOG.isEnabledFor(logging.DEBUG):
+                        _LOG.debug("Executing nodes %s", level)
+                    futures = [
+                        executor.submit(
+                            self._run_node,
+                            topological_ids[nid],
+                            nid,
+                            method,
+                            ref_counter=ref_counter,
+                            process_executor=process_executor,
+                        )
+                        for nid in level
+                    ]
+                    # Wait for all the nodes of the level, propagating the
+                    # first exception.
+                    for future in futures:
+                        future.result()
+        finally:
+            if process_executor is not None:
+                process_executor.shutdown()
+
+    def _is_incremental_predict(
+        self, node: dtfcornode.Node, method: dtfcornode.Method
+    ) -> bool:
+        """
+        Return whether `method` should be run incrementally on `node`.
+        """
+        ret = (
+            self._incremental_predict
+            and method == "predict"
+            and hasattr(node, "predict_incrementally")
+            and node.supports_incremental_predict()
+        )
+        return ret
+
     def _run_node(
         self,
         topological_id: int,
         nid: dtfcornode.NodeId,
         method: dtfcornode.Method,
+        *,
+        ref_counter: Optional["_NodeOutputRefCounter"] = None,
+        process_executor: Optional[concurrent.futures.Executor] = None,
     ) -> None:
         """
         Run the requested `method` on a single node.
 
         This method DOES NOT run (or re-run) ancestors of `nid`.
+
+        :param ref_counter: if not `None`, free the node outputs that are not
+            needed anymore after running the node
+        :param process_executor: if not `None`, run the node method in a worker
+            process and replace the node with the updated copy returned by the
+            worker
         """
         if _LOG.isEnabledFor(logging.DEBUG):
             _LOG.debug(
@@ -732,26 +898,25 @@ class DAG(hobject.PrintableMixin):
             for input_name, value in kvs.items():
                 # Retrieve output from store.
                 kwargs[input_name] = pred_node.get_output(method, value)
-                if self.force_free_nodes:
-                    _LOG.warning(
-                        "Forcing deallocation of pred_node=%s", pred_node
-                    )
-                    # TODO(gp): We should move this after using the data deallocating
-                    # all the nodes whose output has been used. For linear pipelines,
-                    # this check is not needed.
-                    pred_node.free()
             # TODO(gp): Save info for inputs, if needed.
         if _LOG.isEnabledFor(logging.DEBUG):
             _LOG.debug("kwargs are %s", kwargs)
         # Execute `node.method()`.
         with htimer.TimedScope(logging.DEBUG, "node_execution") as ts:
             node = self.get_node(nid)
-            try:
-                output = getattr(node, method)(**kwargs)
-            except AttributeError as e:
-                raise AttributeError(
-                    f"An exception occurred in node '{nid}'\n{str(e)}"
-                ) from e
+            if self._is_incremental_predict(node, method):
+                # The state of the previous run is stored in the node, so run
+                # it in the main process.
+                output = node.predict_incrementally(**kwargs)
+            elif process_executor is None:
+                output = _run_node_method(node, method, kwargs)
+            else:
+                future = process_executor.submit(
+                    _run_node_method_in_worker, node, method, kwargs
+                )
+                node, output = future.result()
+                # Replace the node with the copy updated by the worker.
+                self._nx_dag.nodes[nid]["stage"] = node
         # Update the node.
         for output_name in node.output_names:
             value = output[output_name]
@@ -763,6 +928,10 @@ class DAG(hobject.PrintableMixin):
                 self._write_node_interface_to_dst_dir(
                     topological_id, nid, method, output_name, value
                 )
+        # Free the outputs whose consumers have all been executed.
+        if ref_counter is not None:
+            for nid_to_free, output_name in ref_counter.release(nid):
+                self.get_node(nid_to_free).free_output(method, output_name)
         # Save system info after execution the node.
         if self._profile_execution:
             file_tag = "after_execution"
@@ -780,6 +949,295 @@ class DAG(hobject.PrintableMixin):
             )
 
 
+class _NodeOutputRefCounter:
+    """
+    Count the consumers of each node output that still need to be executed.
+    """
+
+    def __init__(
+        self,
+        nx_dag: networ.DiGraph,
+        nids: List[dtfcornode.NodeId],
+        nids_to_keep: List[dtfcornode.NodeId],
+    ) -> None:
+        """
+        Constructor.
+
+        :param nx_dag: the graph to execute
+        :param nids: the nodes that are going to be executed. Only consumers
+            among these nodes are counted
+        :param nids_to_keep: nodes whose outputs are never freed, in addition to
+            the sinks of the subgraph induced by `nids`
+        """
+        hdbg.dassert_no_duplicates(nids)
+        hdbg.dassert_is_subset(nids_to_keep, nx_dag.nodes)
+        self._nx_dag = nx_dag.subgraph(nids)
+        sinks = [nid for nid in nids if self._nx_dag.out_degree(nid) == 0]
+        nids_to_skip = set(sinks) | set(nids_to_keep)
+        # Map nid -> output name -> number of consumers to execute.
+        self._counts: Dict[dtfcornode.NodeId, Dict[str, int]] = {}
+        for nid in nids:
+            if nid in nids_to_skip:
+                continue
+            self._counts[nid] = {
+                output_name: 0
+                for output_name in nx_dag.nodes[nid]["stage"].output_names
+            }
+        for pred_nid, nid, kvs in self._nx_dag.edges(data=True):
+            if pred_nid in nids_to_skip:
+                continue
+            for output_name in kvs.values():
+                self._counts[pred_nid][output_name] += 1
+        # Nodes of the same level can be executed concurrently.
+        self._lock = threading.Lock()
+
+    def release(
+        self, nid: dtfcornode.NodeId
+    ) -> List[Tuple[dtfcornode.NodeId, str]]:
+        """
+        Update the counts after `nid` has been executed.
+
+        :return: the (nid, output name) pairs that are not needed anymore, i.e.,
+            the inputs of `nid` that have no other consumer to execute and the
+            outputs of `nid` that have no consumer at all
+        """
+        released = []
+        with self._lock:
+            for pred_nid in self._nx_dag.predecessors(nid):
+                counts = self._counts.get(pred_nid)
+                if counts is None:
+                    continue
+                for output_name in self._nx_dag.edges[pred_nid, nid].values():
+                    counts[output_name] -= 1
+                    hdbg.dassert_lte(0, counts[output_name])
+                    if counts[output_name] == 0:
+                        released.append((pred_nid, output_name))
+            for output_name, count in self._counts.get(nid, {}).items():
+                if count == 0:
+                    released.append((nid, output_name))
+        return released
+
+
+# #############################################################################
+# _NodeIoWriter
+# #############################################################################
+
+
+class _NodeIoWriter:
+    """
+    Save the node interface from a background thread.
+
+    The DAG enqueues the writes in a bounded queue while running the nodes, so
+    that writing files is not on the critical path of the DAG execution. If
+    the queue is full, a write is either delayed until there is space in the
+    queue (i.e., it is late) or dropped.
+
+    Errors are raised to the DAG at the next `put()` or in `flush()`.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_queue_size: int = 100,
+        drop_if_full: bool = False,
+        deep_copy: bool = True,
+    ) -> None:
+        """
+        Constructor.
+
+        :param max_queue_size: max number of writes waiting to be executed
+        :param drop_if_full: drop a write if the queue is full, instead of
+            blocking the DAG until there is space in the queue
+        :param deep_copy: enqueue a deep copy of the dfs to write. A shallow
+            copy is cheaper, but it is safe only if the nodes don't modify
+            their dfs in place
+        """
+        self._drop_if_full = drop_if_full
+        self.deep_copy = deep_copy
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._thread = threading.Thread(
+            target=self._run, name="NodeIoWriter", daemon=True
+        )
+        self._exception: Optional[BaseException] = None
+        # Statistics about the writes. The writes can be enqueued by multiple
+        # threads, e.g., when the DAG is run in "threading" mode.
+        self._lock = threading.Lock()
+        self._num_writes = 0
+        self._num_late_writes = 0
+        self._num_dropped_writes = 0
+        self._max_write_latency_in_secs = 0.0
+        self._thread.start()
+
+    def put(self, func: Callable, *args: Any) -> None:
+        """
+        Enqueue the write `func(*args)`.
+        """
+        hdbg.dassert(self._thread.is_alive(), "NodeIoWriter is stopped")
+        self._raise_if_failed()
+        try:
+            self._queue.put_nowait((func, args))
+            return
+        except queue.Full:
+            pass
+        if self._drop_if_full:
+            _LOG.warning(
+                "NodeIoWriter queue is full with %s items, dropping write",
+                self._queue.qsize(),
+            )
+            with self._lock:
+                self._num_dropped_writes += 1
+            return
+        _LOG.warning(
+            "NodeIoWriter queue is full with %s items, waiting",
+            self._queue.qsize(),
+        )
+        with self._lock:
+            self._num_late_writes += 1
+        self._queue.put((func, args))
+
+    def flush(self) -> None:
+        """
+        Wait until all the enqueued writes are executed.
+        """
+        self._queue.join()
+        _LOG.info("NodeIoWriter flushed: %s", self.get_stats())
+        self._raise_if_failed()
+
+    def stop(self) -> None:
+        """
+        Complete the enqueued writes and stop the background thread.
+
+        The writer can't be used after it is stopped.
+        """
+        if not self._thread.is_alive():
+            return
+        # Wait for the enqueued writes before stopping the thread so that the
+        # write errors are still reported.
+        self._queue.join()
+        self._queue.put(None)
+        self._thread.join()
+        _LOG.info("NodeIoWriter stopped: %s", self.get_stats())
+        self._raise_if_failed()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Return the queue depth and statistics about the writes.
+        """
+        stats = {
+            "queue_depth": self._queue.qsize(),
+            "num_writes": self._num_writes,
+            "num_late_writes": self._num_late_writes,
+            "num_dropped_writes": self._num_dropped_writes,
+            "max_write_latency_in_secs": self._max_write_latency_in_secs,
+        }
+        return stats
+
+    def _raise_if_failed(self) -> None:
+        if self._exception is not None:
+            raise RuntimeError("NodeIoWriter failed") from self._exception
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            if item is None:
+                # `stop()` was called.
+                self._queue.task_done()
+                break
+            func, args = item
+            try:
+                # Skip the remaining writes after an error.
+                if self._exception is None:
+                    start_time = time.time()
+                    func(*args)
+                    latency_in_secs = time.time() - start_time
+                    self._num_writes += 1
+                    self._max_write_latency_in_secs = max(
+                        self._max_write_latency_in_secs, latency_in_secs
+                    )
+            except Exception as e:  # pylint: disable=broad-except
+                _LOG.error("NodeIoWriter failed to write: %s", str(e))
+                self._exception = e
+            finally:
+                self._queue.task_done()
+
+
+# #############################################################################
+
+
+def _write_df_to_file(
+    df: pd.DataFrame,
+    file_name: str,
+    save_node_io: str,
+    save_node_df_out_stats: bool,
+) -> None:
+    """
+    Save a node input / output df.
+
+    :param file_name: path of the files without the extension
+    :param save_node_io, save_node_df_out_stats: same as in
+        `DAG.set_debug_mode()`
+    """
+    hio.create_enclosing_dir(file_name, incremental=True)
+    if save_node_df_out_stats:
+        # Save high level description about the df.
+        _LOG.debug("Saving node df out stats...")
+        txt = hpandas.df_to_str(
+            df,
+            print_dtypes=True,
+            print_shape_info=True,
+            print_memory_usage=True,
+            print_nan_info=True,
+        )
+        hio.to_file(file_name + ".txt", txt)
+    # Save content of the df.
+    if save_node_io == "df_as_csv":
+        csv_file_name = f"{file_name}.csv.gz"
+        df.to_csv(csv_file_name, compression="gzip")
+    elif save_node_io == "df_as_pq":
+        parquet_file_name = f"{file_name}.parquet"
+        hparque.to_parquet(df, parquet_file_name)
+    elif save_node_io == "df_as_csv_and_pq":
+        csv_file_name = f"{file_name}.csv.gz"
+        df.to_csv(csv_file_name, compression="gzip")
+        parquet_file_name = f"{file_name}.parquet"
+        hparque.to_parquet(df, parquet_file_name)
+    else:
+        raise ValueError(f"Invalid save_node_io='{save_node_io}'")
+    if _LOG.isEnabledFor(logging.DEBUG):
+        _LOG.debug("Saved log dir in '%s'", file_name)
+
+
+def _run_node_method(
+    node: dtfcornode.Node,
+    method: dtfcornode.Method,
+    kwargs: Dict[str, Any],
+) -> dtfcornode.NodeOutput:
+    """
+    Execute `node.method(**kwargs)`.
+    """
+    try:
+        output = getattr(node, method)(**kwargs)
+    except AttributeError as e:
+        raise AttributeError(
+            f"An exception occurred in node '{node.nid}'\n{str(e)}"
+        ) from e
+    return output
+
+
+def _run_node_method_in_worker(
+    node: dtfcornode.Node,
+    method: dtfcornode.Method,
+    kwargs: Dict[str, Any],
+) -> Tuple[dtfcornode.Node, dtfcornode.NodeOutput]:
+    """
+    Execute `node.method(**kwargs)` in a worker process.
+
+    :return: the node with the state updated by the execution and the output
+    """
+    output = _run_node_method(node, method, kwargs)
+    return node, output
+
+
 # TODO(Grisha): consider creating a class `DagStatsComputer` and moving the
 # function (together with `DAG._write_prof_stats_to_dst_dir()`) there.
 def load_prof_stats_from_dst_dir(
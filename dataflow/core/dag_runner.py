@@ -126,12 +126,14 @@ class DagRunner(abc.ABC, hobject.PrintableMixin):
                 raise ValueError("Invalid method='%s'" % method)
 
     def _run_dag_helper(
-        self, method: dtfcornode.Method
+        self, method: dtfcornode.Method, *, flush_node_io: bool = True
     ) -> Tuple[pd.DataFrame, dtfcorvisi.NodeInfo]:
         """
         Run the DAG for the given method.
 
         :param method: method to run
+        :param flush_node_io: wait until the node interface is saved, see
+            `DAG.flush_node_io()`
         :return: the dataframe for the only output and the associated
             Info
         """
@@ -139,6 +141,8 @@ class DagRunner(abc.ABC, hobject.PrintableMixin):
         # TODO(gp): Add a check for `df_out`.
         df_out = self.dag.run_leq_node(nid, method)["df_out"]
         info = dtfcorvisi.extract_info(self.dag, [method])
+        if flush_node_io:
+            self.dag.flush_node_io()
         return df_out, info
 
     # TODO(gp): This could be folded into `_run_dag_helper()` if we collapse
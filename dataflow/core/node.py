@@ -3,6 +3,7 @@ Import as:
 
 import dataflow.core.node as dtfcornode
 """
+
 import abc
 import logging
 from typing import Any, Dict, List, Optional
@@ -137,6 +138,14 @@ class Node(_Node):
             output_name,
             self.nid,
         )
+        hdbg.dassert_in(
+            output_name,
+            self._output_vals[method].keys(),
+            "%s of node %s has no stored value for %s (it might have been freed)",
+            output_name,
+            self.nid,
+            method,
+        )
         return self._output_vals[method][output_name]
 
     def get_outputs(self, method: Method) -> NodeOutput:
@@ -221,6 +230,25 @@ class Node(_Node):
         #     only_warning=only_warning,
         # )
 
+    def free_output(self, method: Method, output_name: str) -> None:
+        """
+        Deallocate the value of output `output_name` for the requested
+        `method`.
+
+        Note that this should be called only after the output is not
+        needed anymore.
+        """
+        hdbg.dassert_in(method, self._output_vals.keys())
+        hdbg.dassert_in(output_name, self._output_vals[method].keys())
+        if _LOG.isEnabledFor(logging.DEBUG):
+            _LOG.debug(
+                "Freeing output '%s' of node '%s' for method '%s'",
+                output_name,
+                self._nid,
+                method,
+            )
+        del self._output_vals[method][output_name]
+
     def _store_output(self, method: Method, output_name: str, value: Any) -> None:
         """
         Store the output for `name` and the specific `method`.
@@ -16,6 +16,7 @@ import pandas as pd
 import dataflow.core.node as dtfcornode
 import dataflow.core.utils as dtfcorutil
 import helpers.hdbg as hdbg
+import helpers.hpandas as hpandas
 
 _LOG = logging.getLogger(__name__)
 
@@ -35,6 +36,9 @@ class FitPredictNode(dtfcornode.Node, abc.ABC):
 
     Nodes may store a dictionary of information for each method
     following the method's invocation.
+
+    Nodes can support incremental prediction (see `predict_incrementally()`)
+    by declaring a lookback or by keeping an online state.
     """
 
     # Represent the output of a `FitPredictNode`, mapping an output name to a
@@ -58,6 +62,13 @@ class FitPredictNode(dtfcornode.Node, abc.ABC):
             outputs = ["df_out"]
         super().__init__(nid, inputs, outputs)
         self._info: collections.OrderedDict = collections.OrderedDict()
+        # `None` means that incremental prediction is not supported.
+        self._incremental_lookback: Optional[Union[int, pd.Timedelta]] = None
+        # Columns and hashes of the rows of the input, and output of the
+        # previous incremental prediction.
+        self._incremental_state: Optional[
+            Tuple[pd.Index, pd.Series, pd.DataFrame]
+        ] = None
 
     # //////////////////////////////////////////////////////////////////////////
     # fit / predict.
@@ -78,6 +89,184 @@ class FitPredictNode(dtfcornode.Node, abc.ABC):
     def set_fit_state(self, fit_state: "FitPredictNode.NodeState") -> None:
         _ = self, fit_state
 
+    # //////////////////////////////////////////////////////////////////////////
+    # Incremental predict.
+    # //////////////////////////////////////////////////////////////////////////
+
+    def get_incremental_lookback(self) -> Optional[Union[int, pd.Timedelta]]:
+        """
+        Return the lookback needed to compute `predict()` on the new rows.
+
+        A node supports incremental prediction with a lookback if its output at
+        each timestamp depends only on the input rows in a window ending at
+        that timestamp, e.g., a rolling z-score over 10 rows has a lookback of
+        10 rows.
+
+        :return: the length of the window as number of rows or as time span,
+            `None` if there is no finite lookback
+        """
+        return self._incremental_lookback
+
+    def set_incremental_lookback(
+        self, lookback: Optional[Union[int, pd.Timedelta]]
+    ) -> None:
+        """
+        Declare the lookback needed to compute `predict()` on the new rows.
+
+        Nodes with an infinite memory (e.g., EMA smoothing) don't have a
+        lookback: they predict incrementally only if they have an online
+        state (see `has_online_state()`).
+
+        :param lookback: same as the return value of
+            `get_incremental_lookback()`
+        """
+        hdbg.dassert(
+            not self.has_online_state(),
+            "Node '%s' predicts incrementally with its online state",
+            self.nid,
+        )
+        if isinstance(lookback, int):
+            hdbg.dassert_lte(1, lookback)
+        elif lookback is not None:
+            hdbg.dassert_isinstance(lookback, pd.Timedelta)
+            hdbg.dassert_lt(pd.Timedelta(0), lookback)
+        self._incremental_lookback = lookback
+        self._incremental_state = None
+
+    def has_online_state(self) -> bool:
+        """
+        Return whether the node computes the output for the new rows from a
+        state updated with the previous rows (see `_predict_online()`).
+        """
+        _ = self
+        return False
+
+    def supports_incremental_predict(self) -> bool:
+        """
+        Return whether `predict_incrementally()` returns the same output as
+        `predict()` on the entire history.
+        """
+        ret = (
+            self.has_online_state()
+            or self.get_incremental_lookback() is not None
+        )
+        return ret
+
+    def get_incremental_state(self) -> "FitPredictNode.NodeState":
+        """
+        Return the state of the incremental prediction, e.g., to checkpoint it
+        between bars.
+        """
+        state = {"_incremental_state": copy.deepcopy(self._incremental_state)}
+        return state
+
+    def set_incremental_state(self, state: "FitPredictNode.NodeState") -> None:
+        self._incremental_state = copy.deepcopy(state["_incremental_state"])
+
+    def predict_incrementally(
+        self, df_in: pd.DataFrame
+    ) -> "FitPredictNode.NodeOutput":
+        """
+        Run `predict()` only on the rows that were not processed by the
+        previous call.
+
+        The output for the older rows is reused from the previous call, while
+        the output for the new rows is computed:
+        - from the online state, if the node has one
+        - otherwise, from the new rows and the ones in the lookback window
+          before them
+
+        Thus, the output for the first rows of `df_in` can differ from the
+        output of `predict(df_in)`, since they were computed with more history.
+
+        The output is computed from scratch if the previous call can't be
+        reused, i.e. if any of the rows processed by the previous call in the
+        window of `df_in` changed, e.g., because the data was revised. The
+        rows are compared through their hashes, so that the previous input
+        doesn't need to be stored.
+        """
+        hdbg.dassert(
+            self.supports_incremental_predict(),
+            "Node '%s' doesn't support incremental prediction",
+            self.nid,
+        )
+        hdbg.dassert_eq(self.input_names, ["df_in"])
+        hdbg.dassert_eq(self.output_names, ["df_out"])
+        hdbg.dassert_isinstance(df_in.index, pd.DatetimeIndex)
+        hpandas.dassert_strictly_increasing_index(df_in)
+        df_out = None
+        row_hashes = pd.util.hash_pandas_object(df_in, index=True)
+        if self._incremental_state is not None and not df_in.empty:
+            prev_columns, prev_row_hashes, prev_df_out = self._incremental_state
+            last_timestamp = prev_row_hashes.index[-1]
+            # Check that the rows processed by the previous call didn't change,
+            # e.g., they were not revised, added or removed.
+            is_unchanged = (
+                df_in.columns.equals(prev_columns)
+                and last_timestamp in df_in.index
+                and row_hashes[row_hashes.index <= last_timestamp].equals(
+                    prev_row_hashes[prev_row_hashes.index >= df_in.index[0]]
+                )
+            )
+            if is_unchanged:
+                if df_in.index[-1] == last_timestamp and self.has_online_state():
+                    # There are no new rows to update the state with.
+                    new_df_out = prev_df_out.iloc[:0]
+                else:
+                    new_df_out = self._predict_new_rows(df_in, last_timestamp)
+                if new_df_out.columns.equals(prev_df_out.columns):
+                    # Reuse the previous output in the window of `df_in`.
+                    mask = (prev_df_out.index >= df_in.index[0]) & (
+                        prev_df_out.index <= last_timestamp
+                    )
+                    prev_df_out = prev_df_out[mask]
+                    df_out = pd.concat([prev_df_out, new_df_out])
+        if df_out is None:
+            _LOG.debug("Running predict on all the rows for nid=%s", self.nid)
+            if self.has_online_state():
+                self._reset_online_state()
+                df_out = self._predict_online(df_in)
+            else:
+                df_out = self.predict(df_in)["df_out"]
+        if df_in.empty:
+            self._incremental_state = None
+        else:
+            self._incremental_state = (df_in.columns, row_hashes, df_out)
+        return {"df_out": df_out}
+
+    def _predict_new_rows(
+        self, df_in: pd.DataFrame, last_timestamp: pd.Timestamp
+    ) -> pd.DataFrame:
+        """
+        Compute the output for the rows of `df_in` after `last_timestamp`.
+        """
+        if self.has_online_state():
+            df_out = self._predict_online(df_in[df_in.index > last_timestamp])
+        else:
+            lookback = self.get_incremental_lookback()
+            idx = df_in.index.get_loc(last_timestamp)
+            if isinstance(lookback, int):
+                df_tail = df_in.iloc[max(idx + 1 - lookback, 0) :]
+            else:
+                df_tail = df_in[df_in.index > last_timestamp - lookback]
+            df_out = self.predict(df_tail)["df_out"]
+            df_out = df_out[df_out.index > last_timestamp]
+        return df_out
+
+    def _predict_online(self, df_in: pd.DataFrame) -> pd.DataFrame:
+        """
+        Compute the output for the new rows, updating the online state.
+
+        :param df_in: rows after the ones processed by the previous calls
+        """
+        raise NotImplementedError
+
+    def _reset_online_state(self) -> None:
+        """
+        Reset the online state, before processing the rows from scratch.
+        """
+        raise NotImplementedError
+
     # //////////////////////////////////////////////////////////////////////////
     # Info.
     # //////////////////////////////////////////////////////////////////////////
@@ -4,6 +4,7 @@ Import as:
 import dataflow.core.nodes.transformers as dtfconotra
 """
 import collections
+import copy
 import inspect
 import logging
 from typing import (
@@ -22,6 +23,7 @@ import numpy as np
 import pandas as pd
 
 import core.finance as cofinanc
+import core.signal_processing.ema_smoothing as cspremsm
 import dataflow.core.node as dtfcornode
 import dataflow.core.nodes.base as dtfconobas
 import dataflow.core.utils as dtfcorutil
@@ -31,6 +33,19 @@ _LOG = logging.getLogger(__name__)
 
 _ResamplingRule = Union[pd.DateOffset, pd.Timedelta, str]
 
+# Map the EMA-family functions to the online estimators returning the same
+# values incrementally.
+_ONLINE_ESTIMATORS = {
+    cspremsm.compute_ema: cspremsm.OnlineEma,
+    cspremsm.compute_smooth_moving_average: cspremsm.OnlineSmoothMovingAverage,
+    cspremsm.compute_rolling_moment: cspremsm.OnlineRollingMoment,
+    cspremsm.compute_rolling_norm: cspremsm.OnlineRollingNorm,
+    cspremsm.compute_rolling_var: cspremsm.OnlineRollingVar,
+    cspremsm.compute_rolling_std: cspremsm.OnlineRollingStd,
+    cspremsm.compute_rolling_demean: cspremsm.OnlineRollingDemean,
+    cspremsm.compute_rolling_zscore: cspremsm.OnlineRollingZscore,
+}
+
 
 # #############################################################################
 # Column transformers.
@@ -327,11 +342,45 @@ class GroupedColDfToDfTransformer(dtfconobas.Transformer):
         self._permitted_exceptions = permitted_exceptions
         # The leaf col names are determined from the dataframe at runtime.
         self._leaf_cols = None
+        # Online estimators of `transformer_func` for each leaf col, used to
+        # predict incrementally.
+        self._online_estimators: Dict[Any, Any] = {}
+
+    def has_online_state(self) -> bool:
+        """
+        Use the online estimators of the EMA-family functions, e.g.,
+        `compute_rolling_norm()`.
+        """
+        return self._transformer_func in _ONLINE_ESTIMATORS
+
+    def get_incremental_state(self) -> dtfconobas.FitPredictNode.NodeState:
+        state = super().get_incremental_state()
+        state["_online_estimators"] = copy.deepcopy(self._online_estimators)
+        return state
+
+    def set_incremental_state(
+        self, state: dtfconobas.FitPredictNode.NodeState
+    ) -> None:
+        super().set_incremental_state(state)
+        self._online_estimators = copy.deepcopy(state["_online_estimators"])
+
+    def _predict_online(self, df_in: pd.DataFrame) -> pd.DataFrame:
+        hdbg.dassert_no_duplicates(df_in.columns)
+        df_out, info = self._transform(df_in, online=True)
+        hdbg.dassert_no_duplicates(df_out.columns)
+        self._set_info("predict", info)
+        return df_out
+
+    def _reset_online_state(self) -> None:
+        self._online_estimators = {}
 
     def _transform(
-        self, df: pd.DataFrame
+        self, df: pd.DataFrame, *, online: bool = False
     ) -> Tuple[pd.DataFrame, collections.OrderedDict]:
-        #
+        """
+        :param online: process the new rows with the online estimators instead
+            of the entire history with `transformer_func`
+        """
         if self._join_output_with_input:
             df_in = df.copy()
         #
@@ -345,10 +394,21 @@ class GroupedColDfToDfTransformer(dtfconobas.Transformer):
         func_info = info["func_info"]
         out_dfs = {}
         for key in self._leaf_cols:
+            if online:
+                if key not in self._online_estimators:
+                    estimator_class = _ONLINE_ESTIMATORS[self._transformer_func]
+                    self._online_estimators[key] = estimator_class(
+                        **self._transformer_kwargs
+                    )
+                func = self._online_estimators[key].update
+                func_kwargs = {}
+            else:
+                func = self._transformer_func
+                func_kwargs = self._transformer_kwargs
             df_out, key_info = _apply_func_to_data(
                 in_dfs[key],
-                self._transformer_func,
-                self._transformer_kwargs,
+                func,
+                func_kwargs,
                 self._drop_nans,
                 self._reindex_like_input,
                 self._permitted_exceptions,
@@ -425,11 +485,45 @@ class CrossSectionalDfToDfTransformer(dtfconobas.Transformer):
         self._permitted_exceptions = permitted_exceptions
         # The leaf col names are determined from the dataframe at runtime.
         self._leaf_cols = None
+        # Online estimators of `transformer_func` for each leaf col, used to
+        # predict incrementally.
+        self._online_estimators: Dict[Any, Any] = {}
+
+    def has_online_state(self) -> bool:
+        """
+        Use the online estimators of the EMA-family functions, e.g.,
+        `compute_rolling_norm()`.
+        """
+        return self._transformer_func in _ONLINE_ESTIMATORS
+
+    def get_incremental_state(self) -> dtfconobas.FitPredictNode.NodeState:
+        state = super().get_incremental_state()
+        state["_online_estimators"] = copy.deepcopy(self._online_estimators)
+        return state
+
+    def set_incremental_state(
+        self, state: dtfconobas.FitPredictNode.NodeState
+    ) -> None:
+        super().set_incremental_state(state)
+        self._online_estimators = copy.deepcopy(state["_online_estimators"])
+
+    def _predict_online(self, df_in: pd.DataFrame) -> pd.DataFrame:
+        hdbg.dassert_no_duplicates(df_in.columns)
+        df_out, info = self._transform(df_in, online=True)
+        hdbg.dassert_no_duplicates(df_out.columns)
+        self._set_info("predict", info)
+        return df_out
+
+    def _reset_online_state(self) -> None:
+        self._online_estimators = {}
 
     def _transform(
-        self, df: pd.DataFrame
+        self, df: pd.DataFrame, *, online: bool = False
     ) -> Tuple[pd.DataFrame, collections.OrderedDict]:
-        #
+        """
+        :param online: process the new rows with the online estimators instead
+            of the entire history with `transformer_func`
+        """
         if self._join_output_with_input:
             df_in = df.copy()
         #
@@ -862,6 +956,34 @@ class Resample(dtfconobas.Transformer):
         self._resample_kwargs = resample_kwargs or {}
         self._agg_func_kwargs = agg_func_kwargs or {}
 
+    def get_incremental_lookback(self) -> Optional[pd.Timedelta]:
+        """
+        Use the resampling frequency as lookback, if not set explicitly.
+
+        A bar labeled with `t` depends only on the input rows in `(t - rule,
+        t]` as long as the bars are closed and labeled on the right and their
+        boundaries don't depend on the first input timestamp.
+        """
+        lookback = super().get_incremental_lookback()
+        if lookback is not None:
+            return lookback
+        is_right = all(
+            self._resample_kwargs.get(key, "right") == "right"
+            for key in ("closed", "label")
+        )
+        is_fixed_origin = self._resample_kwargs.get("origin", "start_day") in (
+            "start_day",
+            "epoch",
+        )
+        offset = pd.tseries.frequencies.to_offset(self._rule)
+        if is_right and is_fixed_origin and isinstance(offset, pd.offsets.Tick):
+            rule = pd.Timedelta(offset)
+            # With `origin="start_day"` the bins are aligned on the first day
+            # of the data, so the rule must divide a day.
+            if pd.Timedelta("1D") % rule == pd.Timedelta(0):
+                lookback = rule
+        return lookback
+
     def _transform(
         self, df: pd.DataFrame
     ) -> Tuple[pd.DataFrame, collections.OrderedDict]:
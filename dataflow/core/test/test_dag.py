@@ -1,8 +1,17 @@
 import logging
 import os
+import threading
+from typing import Any, Dict, List, Optional
 
+import numpy as np
+import pandas as pd
+
+import core.signal_processing.ema_smoothing as cspremsm
 import dataflow.core.dag as dtfcordag
 import dataflow.core.node as dtfcornode
+import dataflow.core.nodes.base as dtfconobas
+import dataflow.core.nodes.sources as dtfconosou
+import dataflow.core.nodes.transformers as dtfconotra
 import dataflow.core.visualization as dtfcorvisu
 import helpers.hprint as hprint
 import helpers.hunit_test as hunitest
@@ -528,3 +537,532 @@ class Test_dataflow_core_DAG5(_TestDataflowHelper):
         #
         dag1.compose(dag2)
         self._check(dag1)
+
+
+# #############################################################################
+# Test_dataflow_core_DAG6
+# #############################################################################
+
+
+def _add_one(df: pd.DataFrame) -> pd.DataFrame:
+    return df + 1
+
+
+def _multiply_by_two(df: pd.DataFrame) -> pd.DataFrame:
+    return df * 2
+
+
+def _join(df_in1: pd.DataFrame, df_in2: pd.DataFrame) -> pd.DataFrame:
+    return df_in1.join(df_in2, lsuffix=".1", rsuffix=".2")
+
+
+class Test_dataflow_core_DAG6(hunitest.TestCase):
+    """
+    Check that the execution modes return the same results.
+    """
+
+    def test_run_dag1(self) -> None:
+        """
+        Run a DAG with two independent branches with threads.
+        """
+        self._test_run_dag("threading", 2)
+
+    def test_run_dag2(self) -> None:
+        """
+        Run a DAG with two independent branches with processes.
+        """
+        self._test_run_dag("multiprocessing", 2)
+
+    def test_run_leq_node1(self) -> None:
+        """
+        Run a DAG up to a node in one of the branches with threads.
+        """
+        dag = self._get_dag()
+        dag.set_execution_mode("threading", 2)
+        df_out = dag.run_leq_node("branch2", "fit")["df_out"]
+        expected = self._get_dag().run_leq_node("branch2", "fit")["df_out"]
+        self.assert_dfs_close(df_out, expected)
+
+    def test_force_free_nodes1(self) -> None:
+        """
+        Free the outputs of the nodes with threads.
+        """
+        dag = self._get_dag()
+        dag.set_execution_mode("threading", 2)
+        dag.force_free_nodes = True
+        df_out = dag.run_dag("fit")["join"]["df_out"]
+        expected = self._get_dag().run_dag("fit")["join"]["df_out"]
+        self.assert_dfs_close(df_out, expected)
+
+    @staticmethod
+    def _get_dag() -> dtfcordag.DAG:
+        """
+        Build a DAG like:
+
+        ```
+                  -> branch1 ->
+        read_data               join
+                  -> branch2 ->
+        ```
+        """
+        dag = dtfcordag.DAG()
+        index = pd.date_range("2022-01-01 09:00", periods=5, freq="T")
+        df = pd.DataFrame({"x": np.arange(5.0)}, index=index)
+        dag.add_node(dtfconosou.DfDataSource("read_data", df))
+        dag.add_node(dtfconotra.FunctionWrapper("branch1", func=_add_one))
+        dag.add_node(dtfconotra.FunctionWrapper("branch2", func=_multiply_by_two))
+        dag.add_node(dtfconobas.YConnector("join", connector_func=_join))
+        dag.connect("read_data", "branch1")
+        dag.connect("read_data", "branch2")
+        dag.connect("branch1", ("join", "df_in1"))
+        dag.connect("branch2", ("join", "df_in2"))
+        return dag
+
+    def _test_run_dag(self, execution_mode: str, num_workers: int) -> None:
+        # Run the DAG serially.
+        dag = self._get_dag()
+        expected = {}
+        for method in ["fit", "predict"]:
+            expected[method] = dag.run_dag(method)["join"]["df_out"]
+        # Run the DAG in parallel.
+        dag = self._get_dag()
+        dag.set_execution_mode(execution_mode, num_workers)
+        for method in ["fit", "predict"]:
+            df_out = dag.run_dag(method)["join"]["df_out"]
+            self.assert_dfs_close(df_out, expected[method])
+        # Check that the node state learned in `fit()` is preserved.
+        self.assertListEqual(dag.get_node("join").get_df_in1_col_names(), ["x"])
+
+
+# #############################################################################
+# Test_dataflow_core_DAG7
+# #############################################################################
+
+
+class Test_dataflow_core_DAG7(hunitest.TestCase):
+    """
+    Check freeing node outputs once all their consumers have been executed.
+    """
+
+    def test_run_dag1(self) -> None:
+        """
+        Free all the outputs but the ones of the sink.
+        """
+        dag = Test_dataflow_core_DAG6._get_dag()
+        dag.force_free_nodes = True
+        dag.run_dag("fit")
+        actual = self._get_stored_outputs(dag, "fit")
+        expected = {
+            "read_data": [],
+            "branch1": [],
+            "branch2": [],
+            "join": ["df_out"],
+        }
+        self.assertDictEqual(actual, expected)
+
+    def test_run_dag2(self) -> None:
+        """
+        Keep the outputs of the requested nodes.
+        """
+        dag = Test_dataflow_core_DAG6._get_dag()
+        dag.force_free_nodes = True
+        dag.nids_to_keep = ["branch1"]
+        dag.run_dag("fit")
+        actual = self._get_stored_outputs(dag, "fit")
+        expected = {
+            "read_data": [],
+            "branch1": ["df_out"],
+            "branch2": [],
+            "join": ["df_out"],
+        }
+        self.assertDictEqual(actual, expected)
+
+    def test_run_leq_node1(self) -> None:
+        """
+        Keep the output of the requested node, which is not a sink.
+        """
+        dag = Test_dataflow_core_DAG6._get_dag()
+        dag.force_free_nodes = True
+        node_output = dag.run_leq_node("branch2", "fit")
+        self.assertListEqual(list(node_output.keys()), ["df_out"])
+        actual = self._get_stored_outputs(dag, "fit")
+        expected = {
+            "read_data": [],
+            "branch1": None,
+            "branch2": ["df_out"],
+            "join": None,
+        }
+        self.assertDictEqual(actual, expected)
+
+    def test_get_output1(self) -> None:
+        """
+        Check that accessing a freed output asserts.
+        """
+        dag = Test_dataflow_core_DAG6._get_dag()
+        dag.force_free_nodes = True
+        dag.run_dag("fit")
+        with self.assertRaises(AssertionError):
+            dag.get_node("branch1").get_output("fit", "df_out")
+
+    @staticmethod
+    def _get_stored_outputs(
+        dag: dtfcordag.DAG, method: dtfcornode.Method
+    ) -> Dict[dtfcornode.NodeId, Optional[List[str]]]:
+        """
+        Return the names of the outputs stored by each node.
+
+        The value is `None` if the node has not been executed.
+        """
+        stored_outputs = {}
+        for nid in dag.nx_dag.nodes:
+            node = dag.get_node(nid)
+            try:
+                outputs = list(node.get_outputs(method).keys())
+            except AssertionError:
+                outputs = None
+            stored_outputs[nid] = outputs
+        return stored_outputs
+
+
+# #############################################################################
+# Test_dataflow_core_DAG8
+# #############################################################################
+
+
+def _rolling_sum(df: pd.DataFrame) -> pd.DataFrame:
+    return df.rolling(3, min_periods=1).sum()
+
+
+class Test_dataflow_core_DAG8(hunitest.TestCase):
+    """
+    Check that running `predict()` incrementally on a sliding window of data
+    returns the same results as running it on all the rows.
+    """
+
+    def test_resample1(self) -> None:
+        """
+        Infer the lookback from the resampling rule.
+        """
+        node = self._get_resample_node()
+        self.assertEqual(node.get_incremental_lookback(), pd.Timedelta("5T"))
+        self._test_predict_incrementally(node)
+
+    def test_resample2(self) -> None:
+        """
+        Check that the lookback is not inferred when the bars are closed on the
+        left.
+        """
+        node = dtfconotra.Resample(
+            "resample",
+            rule="5T",
+            agg_func="mean",
+            resample_kwargs={"closed": "left"},
+        )
+        self.assertIsNone(node.get_incremental_lookback())
+
+    def test_rolling1(self) -> None:
+        """
+        Use the lookback declared for a node.
+        """
+        node = dtfconotra.FunctionWrapper("rolling", func=_rolling_sum)
+        self.assertIsNone(node.get_incremental_lookback())
+        node.set_incremental_lookback(3)
+        self._test_predict_incrementally(node)
+
+    def test_revised_data1(self) -> None:
+        """
+        Check that `predict()` is run on all the rows if the last processed row
+        changes.
+        """
+        node = dtfconotra.FunctionWrapper("rolling", func=_rolling_sum)
+        node.set_incremental_lookback(3)
+        df = self._get_data()
+        node.predict_incrementally(df.iloc[:20])
+        df_revised = df.copy()
+        df_revised.iloc[19] = -1.0
+        df_out = node.predict_incrementally(df_revised.iloc[:21])["df_out"]
+        expected = _rolling_sum(df_revised.iloc[:21])
+        self.assert_dfs_close(df_out, expected)
+
+    def test_revised_data2(self) -> None:
+        """
+        Check that `predict()` is run on all the rows if a row before the last
+        processed one changes.
+        """
+        node = dtfconotra.FunctionWrapper("rolling", func=_rolling_sum)
+        node.set_incremental_lookback(3)
+        df = self._get_data()
+        node.predict_incrementally(df.iloc[:20])
+        df_revised = df.copy()
+        df_revised.iloc[10] = -1.0
+        df_out = node.predict_incrementally(df_revised.iloc[:21])["df_out"]
+        expected = _rolling_sum(df_revised.iloc[:21])
+        self.assert_dfs_close(df_out, expected)
+
+    def test_revised_data3(self) -> None:
+        """
+        Check that `predict()` is run on all the rows if the columns change,
+        since the hashes of the rows don't depend on the column names.
+        """
+        node = dtfconotra.FunctionWrapper("rolling", func=_rolling_sum)
+        node.set_incremental_lookback(3)
+        df = self._get_data()
+        node.predict_incrementally(df.iloc[:20])
+        df_renamed = df.rename(columns={"x": "y"})
+        df_out = node.predict_incrementally(df_renamed.iloc[:21])["df_out"]
+        expected = _rolling_sum(df_renamed.iloc[:21])
+        self.assert_dfs_close(df_out, expected)
+        self.assertEqual(df_out.columns.tolist(), ["y"])
+
+    def test_online_state1(self) -> None:
+        """
+        Check that a node with an online state returns the same output as
+        `predict()` on the entire history, when run on a sliding window.
+        """
+        node = self._get_rolling_norm_node()
+        self.assertTrue(node.has_online_state())
+        self.assertTrue(node.supports_incremental_predict())
+        df = self._get_multiindex_data()
+        for end in range(10, len(df) + 1):
+            df_window = df.iloc[max(end - 10, 0) : end]
+            df_out = node.predict_incrementally(df_window)["df_out"]
+            expected = node.predict(df.iloc[:end])["df_out"]
+            self.assert_dfs_close(df_out, expected.loc[df_window.index])
+
+    def test_online_state2(self) -> None:
+        """
+        Check that a node restored from the incremental state of another node
+        continues from where the other node stopped.
+        """
+        node = self._get_rolling_norm_node()
+        df = self._get_multiindex_data()
+        node.predict_incrementally(df.iloc[:30])
+        restored_node = self._get_rolling_norm_node()
+        restored_node.set_incremental_state(node.get_incremental_state())
+        df_out = restored_node.predict_incrementally(df.iloc[10:40])["df_out"]
+        expected = node.predict(df.iloc[:40])["df_out"]
+        self.assert_dfs_close(df_out, expected.iloc[10:])
+
+    def test_online_state3(self) -> None:
+        """
+        Check that the online state is reset when a processed row changes.
+        """
+        node = self._get_rolling_norm_node()
+        df = self._get_multiindex_data()
+        node.predict_incrementally(df.iloc[:30])
+        df_revised = df.copy()
+        df_revised.iloc[20] = 5.0
+        df_out = node.predict_incrementally(df_revised.iloc[10:31])["df_out"]
+        expected = node.predict(df_revised.iloc[10:31])["df_out"]
+        self.assert_dfs_close(df_out, expected)
+
+    def test_no_exact_state1(self) -> None:
+        """
+        Check that nodes without a lookback or an online state are not run
+        incrementally.
+        """
+        node = dtfconotra.FunctionWrapper("rolling", func=_rolling_sum)
+        self.assertFalse(node.supports_incremental_predict())
+        with self.assertRaises(AssertionError):
+            node.predict_incrementally(self._get_data())
+        # A lookback can't be declared for a node with an online state.
+        node = self._get_rolling_norm_node()
+        with self.assertRaises(AssertionError):
+            node.set_incremental_lookback(100)
+
+    def test_run_dag1(self) -> None:
+        """
+        Run a DAG incrementally on a sliding window.
+        """
+        df = self._get_data()
+        dag = self._get_dag(df)
+        dag.set_incremental_predict(True)
+        expected_dag = self._get_dag(df)
+        for end in range(30, len(df)):
+            df_window = df.iloc[end - 30 : end]
+            for dag_ in [dag, expected_dag]:
+                dag_.get_node("read_data").df = df_window
+            df_out = dag.run_dag("predict")["resample"]["df_out"]
+            expected = expected_dag.run_dag("predict")["resample"]["df_out"]
+            # Skip the first bar, which is computed with more history.
+            self.assert_dfs_close(df_out.iloc[1:], expected.iloc[1:])
+
+    @staticmethod
+    def _get_data() -> pd.DataFrame:
+        index = pd.date_range("2022-01-01 09:31", periods=60, freq="T")
+        df = pd.DataFrame({"x": np.arange(60.0) ** 2}, index=index)
+        return df
+
+    @staticmethod
+    def _get_multiindex_data() -> pd.DataFrame:
+        index = pd.date_range("2022-01-01 09:31", periods=60, freq="T")
+        columns = pd.MultiIndex.from_product([["ret"], [101, 102]])
+        values = np.sin(np.arange(120.0)).reshape(60, 2)
+        df = pd.DataFrame(values, index=index, columns=columns)
+        df.iloc[5, 0] = np.nan
+        return df
+
+    @staticmethod
+    def _get_rolling_norm_node() -> dtfconotra.GroupedColDfToDfTransformer:
+        node = dtfconotra.GroupedColDfToDfTransformer(
+            "compute_vol",
+            in_col_groups=[("ret",)],
+            out_col_group=(),
+            transformer_func=cspremsm.compute_rolling_norm,
+            transformer_kwargs={"tau": 8, "min_periods": 3},
+            col_mapping={"ret": "ret.vol"},
+        )
+        return node
+
+    @staticmethod
+    def _get_resample_node() -> dtfconotra.Resample:
+        node = dtfconotra.Resample("resample", rule="5T", agg_func="mean")
+        return node
+
+    def _get_dag(self, df: pd.DataFrame) -> dtfcordag.DAG:
+        dag = dtfcordag.DAG()
+        dag.add_node(dtfconosou.DfDataSource("read_data", df))
+        dag.add_node(self._get_resample_node())
+        dag.connect("read_data", "resample")
+        return dag
+
+    def _test_predict_incrementally(self, node: dtfconobas.FitPredictNode) -> None:
+        """
+        Run the node on a growing window of data, one row at a time.
+        """
+        df = self._get_data()
+        for end in range(1, len(df) + 1):
+            df_in = df.iloc[:end]
+            df_out = node.predict_incrementally(df_in)["df_out"]
+            expected = node.predict(df_in)["df_out"]
+            self.assert_dfs_close(df_out, expected)
+
+
+# #############################################################################
+# Test_dataflow_core_DAG9
+# #############################################################################
+
+
+class Test_dataflow_core_DAG9(hunitest.TestCase):
+    """
+    Check saving the node interface from a background thread.
+    """
+
+    def test_run_dag1(self) -> None:
+        """
+        Check that the files are the same as when saved synchronously.
+        """
+        expected = self._run_dag("sync", None)
+        actual = self._run_dag("async", {"max_queue_size": 2})
+        self.assertEqual(len(actual), 8)
+        self.assertDictEqual(actual, expected)
+
+    def test_run_dag2(self) -> None:
+        """
+        Check that the writes are dropped when the queue is full.
+        """
+        dag = Test_dataflow_core_DAG6._get_dag()
+        dst_dir = os.path.join(self.get_scratch_space(), "dag")
+        node_io_writer_kwargs = {"max_queue_size": 1, "drop_if_full": True}
+        dag.set_debug_mode(
+            "df_as_csv",
+            False,
+            False,
+            dst_dir,
+            node_io_writer_kwargs=node_io_writer_kwargs,
+        )
+        # Block the writer until all the nodes are executed.
+        event = threading.Event()
+        dag._node_io_writer.put(event.wait)
+        dag.run_dag("fit")
+        event.set()
+        dag.flush_node_io()
+        stats = dag._node_io_writer.get_stats()
+        # One write is queued and the rest are dropped.
+        self.assertEqual(stats["num_writes"], 2)
+        self.assertEqual(stats["num_dropped_writes"], 3)
+        files = os.listdir(os.path.join(dst_dir, "node_io.data"))
+        self.assertEqual(len(files), 1)
+
+    def test_run_dag3(self) -> None:
+        """
+        Check that a df modified in place after being enqueued is saved as it
+        was when enqueued.
+        """
+        dag = Test_dataflow_core_DAG6._get_dag()
+        dst_dir = os.path.join(self.get_scratch_space(), "dag")
+        dag.set_debug_mode(
+            "df_as_csv",
+            False,
+            False,
+            dst_dir,
+            node_io_writer_kwargs={"max_queue_size": 2},
+        )
+        # Block the writer until the df is modified.
+        event = threading.Event()
+        dag._node_io_writer.put(event.wait)
+        df = pd.DataFrame({"col1": [1.0, np.nan, 3.0]})
+        expected = str(df)
+        dag._write_node_interface_to_dst_dir(0, "node", "fit", "df_out", df)
+        # Modify the df in place, as some nodes do.
+        df.fillna(0.0, inplace=True)
+        event.set()
+        dag.flush_node_io()
+        node_io_dir = os.path.join(dst_dir, "node_io.data")
+        (file_name,) = os.listdir(node_io_dir)
+        actual = pd.read_csv(os.path.join(node_io_dir, file_name), index_col=0)
+        self.assert_equal(str(actual), expected)
+
+    def test_set_debug_mode1(self) -> None:
+        """
+        Check that the writer is stopped when the debug mode is set again.
+        """
+        dag = Test_dataflow_core_DAG6._get_dag()
+        dst_dir = os.path.join(self.get_scratch_space(), "dag")
+        node_io_writer_kwargs = {"max_queue_size": 2}
+        dag.set_debug_mode(
+            "df_as_pq",
+            False,
+            False,
+            dst_dir,
+            node_io_writer_kwargs=node_io_writer_kwargs,
+        )
+        dag.run_dag("fit")
+        node_io_writer = dag._node_io_writer
+        dag.set_debug_mode("", False, False, None)
+        # The enqueued writes are completed before stopping the thread.
+        self.assertFalse(node_io_writer._thread.is_alive())
+        self.assertEqual(node_io_writer.get_stats()["num_writes"], 4)
+        self.assertIsNone(dag._node_io_writer)
+
+    def _run_dag(
+        self, tag: str, node_io_writer_kwargs: Optional[Dict[str, Any]]
+    ) -> Dict[str, str]:
+        """
+        Run a DAG saving the node interface.
+
+        :return: file name -> file content
+        """
+        dag = Test_dataflow_core_DAG6._get_dag()
+        dst_dir = os.path.join(self.get_scratch_space(), tag)
+        dag.set_debug_mode(
+            "df_as_pq",
+            True,
+            False,
+            dst_dir,
+            node_io_writer_kwargs=node_io_writer_kwargs,
+        )
+        dag.run_dag("fit")
+        dag.flush_node_io()
+        node_io_dir = os.path.join(dst_dir, "node_io.data")
+        files = {}
+        for file_name in sorted(os.listdir(node_io_dir)):
+            path = os.path.join(node_io_dir, file_name)
+            if file_name.endswith(".parquet"):
+                content = str(pd.read_parquet(path))
+            else:
+                with open(path) as f:
+                    content = f.read()
+            # Remove the wall clock time from the file name.
+            files[file_name.split(".20")[0] + file_name[-4:]] = content
+        return files
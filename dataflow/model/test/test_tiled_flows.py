@@ -268,3 +268,81 @@ end_ts
         actual = hpandas.df_to_str(bar_metrics, num_rows=None, precision=2)
         expected = exp
         self.assert_equal(actual, expected, fuzzy_match=True)
+
+
+class Test_annotate_forecasts_by_tile2(hunitest.TestCase):
+    """
+    Check that evaluating the tiles with state carried over from the previous
+    tile returns the same results as evaluating all the data at once.
+    """
+
+    def test_stitch_tiles1(self) -> None:
+        """
+        Evaluate the tiles serially.
+        """
+        self._test_stitch_tiles(num_workers=1)
+
+    def test_stitch_tiles2(self) -> None:
+        """
+        Evaluate the tiles in parallel, prefetching the next tile.
+        """
+        self._test_stitch_tiles(prefetch=True, num_workers=2)
+
+    def _test_stitch_tiles(self, **kwargs: Any) -> None:
+        # Generate data spanning two yearly tiles.
+        start_datetime = pd.Timestamp(
+            "2021-12-29 09:30:00", tz="America/New_York"
+        )
+        end_datetime = pd.Timestamp("2022-01-04 16:00:00", tz="America/New_York")
+        asset_ids = [100, 200]
+        df = cfidaexa.get_forecast_price_based_dataframe(
+            start_datetime,
+            end_datetime,
+            asset_ids,
+            bar_duration="30T",
+        )
+        dir_name = os.path.join(self.get_scratch_space(), "tiled_results")
+        parquet_df = Test_evaluate_weighted_forecasts.convert_to_parquet_format(
+            df
+        )
+        hparque.to_partitioned_parquet(
+            parquet_df, ["asset_id", "year", "month"], dst_dir=dir_name
+        )
+        annotate_forecasts_kwargs = {
+            "style": "longitudinal",
+            "quantization": 0,
+            "liquidate_at_end_of_day": False,
+            "initialize_beginning_of_day_trades_to_zero": False,
+            "target_dollar_risk_per_name": 1e2,
+        }
+        # Evaluate the tiles.
+        portfolio_df, bar_metrics = dtfmotiflo.annotate_forecasts_by_tile(
+            dir_name,
+            datetime.date(2021, 12, 1),
+            datetime.date(2022, 1, 31),
+            "asset_id",
+            "price",
+            "volatility",
+            "prediction",
+            annotate_forecasts_kwargs=annotate_forecasts_kwargs,
+            stitch_tiles=True,
+            **kwargs,
+        )
+        # Evaluate all the data at once.
+        forecast_evaluator = dtfmfefrpr.ForecastEvaluatorFromPrices(
+            "price", "volatility", "prediction"
+        )
+        expected_portfolio_df, expected_bar_metrics = (
+            forecast_evaluator.annotate_forecasts(
+                df[["price", "volatility", "prediction"]],
+                **annotate_forecasts_kwargs,
+            )
+        )
+        self.assert_dfs_close(bar_metrics, expected_bar_metrics)
+        # The data read from Parquet has named axes.
+        expected_holdings_shares = expected_portfolio_df[
+            "holdings_shares"
+        ].rename_axis(index="end_ts", columns="asset_id")
+        self.assert_dfs_close(
+            portfolio_df["holdings_shares"], expected_holdings_shares
+        )
@@ -4,6 +4,8 @@ Import as:
 import dataflow.model.tiled_flows as dtfmotiflo
 """
 
+import collections
+import concurrent.futures
 import datetime
 import logging
 
@@ -11,7 +13,7 @@ import pandas as pd
 
 _LOG = logging.getLogger(__name__)
 
-from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+from typing import Any, Deque, Dict, Iterator, List, Optional, Tuple, Union
 
 from tqdm.autonotebook import tqdm
 
@@ -152,6 +154,9 @@ def annotate_forecasts_by_tile(
     return_portfolio_df: bool = True,
     forecast_evaluator: Any = dtfmfefrpr.ForecastEvaluatorFromPrices,
     optimizer_config_dict: Optional[dict] = None,
+    prefetch: bool = False,
+    stitch_tiles: bool = False,
+    num_workers: int = 1,
 ) -> Tuple[Optional[pd.DataFrame], pd.DataFrame]:
     """
     Combine yearly tiled loading with forecast evaluation.
@@ -171,6 +176,9 @@ def annotate_forecasts_by_tile(
     :param forecast_evaluator: a forecast evaluator object.
     :param optimizer_config_dict: optional configuration dictionary. If
      not None, forecast with optimization.
+    :param prefetch: as in `annotate_forecasts_for_tiles()`
+    :param stitch_tiles: as in `annotate_forecasts_for_tiles()`
+    :param num_workers: as in `annotate_forecasts_for_tiles()`
     :return: (portfolio_df, bar_metrics), unless `return_portfolio_df=False`,
         in which case the first element of the tuple is `None`.
     """
@@ -193,13 +201,20 @@ def annotate_forecasts_by_tile(
         args.append(optimizer_config_dict)
     fepo = forecast_evaluator(*args)
     # Process the dataframes in the interator.
+    tile_iter = ({"df": df} for df in backtest_df_iter)
+    results_iter = annotate_forecasts_for_tiles(
+        tile_iter,
+        fepo,
+        annotate_forecasts_kwargs,
+        return_portfolio_df=return_portfolio_df,
+        prefetch=prefetch,
+        stitch_tiles=stitch_tiles,
+        num_workers=num_workers,
+    )
     bar_metrics = []
     portfolio_df = []
-    for df in backtest_df_iter:
-        portfolio_df_slice, bar_metrics_slice = fepo.annotate_forecasts(
-            df,
-            **annotate_forecasts_kwargs,
-        )
+    for results in results_iter:
+        portfolio_df_slice, bar_metrics_slice = results["df"]
         bar_metrics.append(bar_metrics_slice)
         if return_portfolio_df:
             portfolio_df.append(portfolio_df_slice)
@@ -226,6 +241,9 @@ def evaluate_weighted_forecasts(
     target_freq_str: Optional[str] = None,
     preapply_gaussian_ranking: bool = False,
     index_mode: str = "assert_equal",
+    prefetch: bool = False,
+    stitch_tiles: bool = False,
+    num_workers: int = 1,
 ) -> pd.DataFrame:
     """
     Mix forecasts with weights and evaluate the portfolio.
@@ -263,6 +281,9 @@ def evaluate_weighted_forecasts(
         Gaussian ranking. May be useful if predictions are on different
         scales.
     :param index_mode: same as `mode` in `apply_index_mode()`
+    :param prefetch: as in `annotate_forecasts_for_tiles()`
+    :param stitch_tiles: as in `annotate_forecasts_for_tiles()`
+    :param num_workers: as in `annotate_forecasts_for_tiles()`
     :return: bar metrics dataframe
     """
     forecast_evaluator = dtfmfefrpr.ForecastEvaluatorFromPrices(
@@ -309,7 +330,56 @@ def evaluate_weighted_forecasts(
         [price_col],
         asset_ids=asset_ids,
     )
+    # Mix the forecasts of each tile.
+    tile_iter = _yield_weighted_forecast_tiles(
+        pred_dict_iter,
+        volatility_iter,
+        vol_col,
+        price_iter,
+        price_col,
+        weights,
+        target_freq_str,
+        preapply_gaussian_ranking,
+        index_mode,
+    )
+    results_iter = annotate_forecasts_for_tiles(
+        tile_iter,
+        forecast_evaluator,
+        annotate_forecasts_kwargs,
+        return_portfolio_df=False,
+        prefetch=prefetch,
+        stitch_tiles=stitch_tiles,
+        num_workers=num_workers,
+    )
     bar_metrics = []
+    for results in results_iter:
+        bar_metrics_dict = {key: stats for key, (_, stats) in results.items()}
+        bar_metrics_df = pd.concat(
+            bar_metrics_dict.values(),
+            axis=1,
+            keys=bar_metrics_dict.keys(),
+        )
+        bar_metrics.append(bar_metrics_df)
+    bar_metrics = pd.concat(bar_metrics)
+    return bar_metrics
+
+
+def _yield_weighted_forecast_tiles(
+    pred_dict_iter: Iterator[Dict[str, pd.DataFrame]],
+    volatility_iter: Iterator[pd.DataFrame],
+    vol_col: Union[int, str],
+    price_iter: Iterator[pd.DataFrame],
+    price_col: Union[int, str],
+    weights: pd.DataFrame,
+    target_freq_str: Optional[str],
+    preapply_gaussian_ranking: bool,
+    index_mode: str,
+) -> Iterator[Dict[str, pd.DataFrame]]:
+    """
+    Yield the dataframes to evaluate for each tile, keyed by weights column.
+
+    Params are as in `evaluate_weighted_forecasts()`.
+    """
     for dfs in pred_dict_iter:
         volatility = next(volatility_iter)[vol_col]
         price = next(price_iter)[price_col]
@@ -338,29 +408,173 @@ def evaluate_weighted_forecasts(
             # if target_freq_str is not None:
             #     val *= scale_factor
             dfs[key] = val
-        bar_metrics_dict = {}
         weighted_sum = hpandas.compute_weighted_sum(
             dfs, weights, index_mode=index_mode
         )
+        tile = {}
         for key, val in weighted_sum.items():
-            df = pd.concat(
+            tile[key] = pd.concat(
                 [val, volatility, price],
                 axis=1,
                 keys=["prediction", "volatility", "price"],
             )
-            _, stats = forecast_evaluator.annotate_forecasts(
-                df,
-                **annotate_forecasts_kwargs,
-            )
-            bar_metrics_dict[key] = stats
-        bar_metrics_df = pd.concat(
-            bar_metrics_dict.values(),
-            axis=1,
-            keys=bar_metrics_dict.keys(),
-        )
-        bar_metrics.append(bar_metrics_df)
-    bar_metrics = pd.concat(bar_metrics)
-    return bar_metrics
+        yield tile
+
+
+# #############################################################################
+# Tile evaluation
+# #############################################################################
+
+
+def annotate_forecasts_for_tiles(
+    tile_iter: Iterator[Dict[Any, pd.DataFrame]],
+    forecast_evaluator: Any,
+    annotate_forecasts_kwargs: Dict[str, Any],
+    *,
+    return_portfolio_df: bool = True,
+    prefetch: bool = False,
+    stitch_tiles: bool = False,
+    num_workers: int = 1,
+) -> Iterator[Dict[Any, Tuple[Optional[pd.DataFrame], pd.DataFrame]]]:
+    """
+    Run `annotate_forecasts()` on each dataframe of a sequence of time tiles.
+
+    :param tile_iter: iterator over consecutive time tiles, each one storing
+        the dataframes to evaluate (e.g., one per set of forecast weights)
+    :param forecast_evaluator: object with an `annotate_forecasts()` method,
+        e.g., `ForecastEvaluatorFromPrices`
+    :param annotate_forecasts_kwargs: kwargs for `annotate_forecasts()`
+    :param return_portfolio_df: if `False`, return `None` instead of the
+        portfolio dataframes
+    :param prefetch: load the next tile in a background thread while the
+        current one is evaluated
+    :param stitch_tiles: evaluate each tile together with the last day of the
+        previous tile and apply the burn-in only to the first tile, so that the
+        holdings at the beginning of a tile are carried over from the previous
+        tile and the results match evaluating all the data at once. This
+        assumes that the holdings at the beginning of a day depend only on the
+        previous day, as in `ForecastEvaluatorFromPrices` without buy / sell
+        prices
+    :param num_workers: number of processes evaluating tiles in parallel;
+        `forecast_evaluator` and the tiles must be picklable
+    :return: iterator over the results of the tiles, in the same order as
+        `tile_iter`, mapping the key of each dataframe to the portfolio
+        dataframe and the bar metrics
+    """
+    hdbg.dassert_isinstance(num_workers, int)
+    hdbg.dassert_lte(1, num_workers)
+    if prefetch:
+        tile_iter = _yield_prefetched(tile_iter)
+    if num_workers == 1:
+        executor = None
+    else:
+        executor = concurrent.futures.ProcessPoolExecutor(max_workers=num_workers)
+    # Store the results of the tiles being evaluated, in order.
+    pending_results: Deque[Dict[Any, Any]] = collections.deque()
+    prev_tile: Dict[Any, pd.DataFrame] = {}
+    try:
+        for tile_idx, tile in enumerate(tile_iter):
+            kwargs = annotate_forecasts_kwargs.copy()
+            if stitch_tiles and tile_idx > 0:
+                # The warm-up bars have been processed with the previous tile.
+                kwargs["burn_in_bars"] = 0
+                kwargs["burn_in_days"] = 0
+            results = {}
+            for key, df in tile.items():
+                start_timestamp = None
+                if stitch_tiles and key in prev_tile and not df.empty:
+                    start_timestamp = df.index[0]
+                    df_in = pd.concat([_get_last_day(prev_tile[key]), df], axis=0)
+                else:
+                    df_in = df
+                func_args = (
+                    forecast_evaluator,
+                    df_in,
+                    kwargs,
+                    start_timestamp,
+                    return_portfolio_df,
+                )
+                if executor is None:
+                    results[key] = _annotate_forecasts(*func_args)
+                else:
+                    results[key] = executor.submit(
+                        _annotate_forecasts, *func_args
+                    )
+            if stitch_tiles:
+                prev_tile = tile
+            pending_results.append(results)
+            # Limit the number of tiles held in memory.
+            while len(pending_results) >= num_workers:
+                yield _get_results(pending_results.popleft())
+        while pending_results:
+            yield _get_results(pending_results.popleft())
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+
+def _annotate_forecasts(
+    forecast_evaluator: Any,
+    df: pd.DataFrame,
+    annotate_forecasts_kwargs: Dict[str, Any],
+    start_timestamp: Optional[pd.Timestamp],
+    return_portfolio_df: bool,
+) -> Tuple[Optional[pd.DataFrame], pd.DataFrame]:
+    """
+    Annotate forecasts, discarding the results before `start_timestamp`.
+    """
+    portfolio_df, bar_metrics = forecast_evaluator.annotate_forecasts(
+        df,
+        **annotate_forecasts_kwargs,
+    )
+    if start_timestamp is not None:
+        portfolio_df = portfolio_df.loc[start_timestamp:]
+        bar_metrics = bar_metrics.loc[start_timestamp:]
+    if not return_portfolio_df:
+        portfolio_df = None
+    return portfolio_df, bar_metrics
+
+
+def _get_results(
+    results: Dict[Any, Any],
+) -> Dict[Any, Tuple[Optional[pd.DataFrame], pd.DataFrame]]:
+    """
+    Wait for the results computed by worker processes, if any.
+    """
+    results = {
+        key: val.result() if isinstance(val, concurrent.futures.Future) else val
+        for key, val in results.items()
+    }
+    return results
+
+
+def _get_last_day(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    Return the rows of the last day of `df`.
+    """
+    if df.empty:
+        return df
+    last_date = df.index[-1].date()
+    df = df[df.index.date == last_date]
+    return df
+
+
+_END_OF_ITERATOR = object()
+
+
+def _yield_prefetched(iterator: Iterator[Any]) -> Iterator[Any]:
+    """
+    Yield the elements of `iterator`, fetching the next one in a background
+    thread.
+    """
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        future = executor.submit(next, iterator, _END_OF_ITERATOR)
+        while True:
+            item = future.result()
+            if item is _END_OF_ITERATOR:
+                break
+            future = executor.submit(next, iterator, _END_OF_ITERATOR)
+            yield item
 
 
 def compute_forecast_correlations(
@@ -35,6 +35,10 @@ class RealTimeDagRunner(dtfcore.DagRunner):
     See:
     - `real_time.py` for definitions of different types of real-time executions
     - `_AbstractRealTimeDataSource` and descendants for nodes with real-time semantic
+
+    Since the DAG is run on a window of data that slides by one bar at a time,
+    `DAG.set_incremental_predict()` can be used to avoid recomputing the nodes
+    on the rows processed in the previous bars.
     """
 
     def __init__(
@@ -130,9 +134,18 @@ class RealTimeDagRunner(dtfcore.DagRunner):
         # We need to set the first bar outside the loop so that
         # `predict_at_datetime()` can recover the current bar time.
         self._apply_current_bar_timestamp()
-        async for result_bundle in self.predict_at_datetime():
-            self._apply_current_bar_timestamp()
-            result_bundles.append(result_bundle)
+        try:
+            async for result_bundle in self.predict_at_datetime():
+                self._apply_current_bar_timestamp()
+                result_bundles.append(result_bundle)
+        finally:
+            # The node interface is saved in the background during the bars,
+            # so wait for it only at the end of the run.
+            self.dag.flush_node_io()
+            nid = self.dag.get_unique_sink()
+            node = self.dag.get_node(nid)
+            if isinstance(node, dtfsysinod.ProcessForecastsNode):
+                node.close()
         return result_bundles
 
     async def predict_at_datetime(self) -> dtfcore.ResultBundle:
@@ -274,7 +287,7 @@ class RealTimeDagRunner(dtfcore.DagRunner):
             _LOG.debug("Waiting for real-time nodes to be ready: done")
         # Execute the DAG.
         with htimer.TimedScope(logging.INFO, "_run_dag_helper") as ts2:
-            df_out, info = self._run_dag_helper(method)
+            df_out, info = self._run_dag_helper(method, flush_node_io=False)
         # Wait for the sinks to complete.
         # TODO(gp): Find ProcessForecast. We can also create an abstract class
         #  AwaitableNode with a `wait()` method and then wait on all the
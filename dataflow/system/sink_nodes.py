@@ -77,6 +77,13 @@ class ProcessForecastsNode(dtfcore.FitPredictNode):
             restrictions_df=restrictions_df,
         )
 
+    def close(self) -> None:
+        """
+        Close the logs of the Portfolio and of its Broker at the end of the run.
+        """
+        self._portfolio.close_log()
+        self._portfolio.broker.close()
+
     # ///////////////////////////////////////////////////////////////////////////
     # Private methods
     # ///////////////////////////////////////////////////////////////////////////
@@ -624,6 +624,31 @@ def apply_dag_property(
     if force_free_nodes:
         _LOG.warning("Setting force free nodes")
         dag.force_free_nodes = force_free_nodes
+    # 3) execution_mode_config
+    execution_mode_config = system.config.get_and_mark_as_used(
+        ("dag_property_config", "execution_mode_config"), default_value=None
+    )
+    if _LOG.isEnabledFor(logging.DEBUG):
+        _LOG.debug(hprint.to_str("execution_mode_config"))
+    if execution_mode_config:
+        _LOG.warning("Setting execution mode")
+        dag.set_execution_mode(**execution_mode_config)
+    # 4) incremental_predict_config
+    # E.g., `{"lookbacks": {"compute_ret_0": 2}}` to run `predict()`
+    # incrementally, declaring the lookbacks of the nodes with a finite memory
+    # that can't infer it.
+    incremental_predict_config = system.config.get_and_mark_as_used(
+        ("dag_property_config", "incremental_predict_config"),
+        default_value=None,
+    )
+    if _LOG.isEnabledFor(logging.DEBUG):
+        _LOG.debug(hprint.to_str("incremental_predict_config"))
+    if incremental_predict_config:
+        _LOG.warning("Setting incremental predict")
+        lookbacks = incremental_predict_config.get("lookbacks", {})
+        for nid, lookback in lookbacks.items():
+            dag.get_node(nid).set_incremental_lookback(lookback)
+        dag.set_incremental_predict(True)
     return system
 
 
@@ -808,6 +833,9 @@ def get_DataFramePortfolio_from_System(
     pricing_method = system.config.get_and_mark_as_used(
         ("portfolio_config", "pricing_method")
     )
+    log_format = system.config.get_and_mark_as_used(
+        ("portfolio_config", "log_format"), default_value="csv"
+    )
     portfolio = oms.get_DataFramePortfolio_example1(
         event_loop,
         market_data=market_data,
@@ -815,6 +843,7 @@ def get_DataFramePortfolio_from_System(
         pricing_method=pricing_method,
         asset_ids=asset_ids,
         column_remap=column_remap,
+        log_format=log_format,
     )
     return portfolio
 
@@ -837,6 +866,9 @@ def get_DatabasePortfolio_from_System(
         ],
         pricing_method=system.config["portfolio_config", "pricing_method"],
         asset_ids=system.config["market_data_config", "asset_ids"],
+        log_format=system.config.get(
+            ("portfolio_config", "log_format"), "csv"
+        ),
     )
     # TODO(gp): We should pass the column_remap to the Portfolio builder,
     # instead of injecting it after the fact.
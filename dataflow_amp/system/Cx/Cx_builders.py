@@ -363,6 +363,9 @@ def get_Cx_portfolio_prod_instance1(
     mark_to_market_col = system.config.get_and_mark_as_used(
         ("portfolio_config", "mark_to_market_col")
     )
+    log_format = system.config.get_and_mark_as_used(
+        ("portfolio_config", "log_format"), default_value="csv"
+    )
     portfolio = obccccpo.get_CcxtPortfolio_prod_instance1(
         run_mode,
         cf_config_strategy,
@@ -375,6 +378,7 @@ def get_Cx_portfolio_prod_instance1(
         broker_config,
         log_dir,
         mark_to_market_col,
+        log_format=log_format,
     )
     return portfolio
 
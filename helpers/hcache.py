@@ -7,6 +7,7 @@ import helpers.hcache as hcache
 """
 
 import atexit
+import collections
 import copy
 import functools
 import logging
@@ -95,6 +96,12 @@ def get_global_cache_info(
         path = _get_global_cache_path(cache_type, tag=tag)
         description = f"global {cache_type}"
         cache_info = _get_cache_size(path, description)
+        max_bytes = _GLOBAL_CACHE_MAX_BYTES[cache_type]
+        if max_bytes is not None:
+            cache_info += (
+                f", max_size={hintros.format_size(max_bytes)}"
+                f", eviction_policy={_GLOBAL_CACHE_EVICTION_POLICY[cache_type]}"
+            )
         txt.append(cache_info)
     txt = "\n".join(txt)
     return txt
@@ -301,6 +308,7 @@ def clear_global_cache(
             "The path '%s' is not valid",
             abs_path,
         )
+    _reset_cache_usages(cache_path)
     if destroy:
         _LOG.warning("Destroying '%s' ...", cache_path)
         hio.delete_dir(cache_path)
@@ -321,6 +329,181 @@ def clear_global_cache(
     _LOG.info("After clear_global_cache: %s", info_after)
 
 
+# #############################################################################
+# Cache size bounds
+# #############################################################################
+
+
+def _dassert_is_valid_eviction_policy(eviction_policy: str) -> None:
+    """
+    Assert that `eviction_policy` is a valid eviction policy.
+
+    - "lru": evict the least recently used entries first
+    - "lfu": evict the least frequently used entries first, breaking ties with
+      the least recently used
+    """
+    hdbg.dassert_in(eviction_policy, ["lru", "lfu"])
+
+
+def _get_cache_item_size(location: str, func_id: str, args_id: str) -> int:
+    """
+    Return the size in bytes of a cached value stored in a local Joblib store.
+    """
+    item_path = os.path.join(location, func_id, args_id)
+    size_in_bytes = 0
+    for dir_path, _, file_names in os.walk(item_path):
+        for file_name in file_names:
+            size_in_bytes += os.path.getsize(os.path.join(dir_path, file_name))
+    return size_in_bytes
+
+
+class _CacheUsage:
+    """
+    Track the size and the accesses of the entries of a Joblib store to bound
+    its size.
+
+    The usage is seeded with the entries already in the store (e.g., left by a
+    previous session or by another process) using their size and last access
+    time on disk, so that the bound applies to the entire store. The accesses
+    after that are counted by the current process only.
+    """
+
+    def __init__(self, store_backend: Any) -> None:
+        self._store_backend = store_backend
+        # Map `(func_id, args_id)` to `[size_in_bytes, num_accesses,
+        # last_access]`, where `last_access` is a logical clock.
+        self._entries: Dict[Tuple[str, str], List[int]] = {}
+        self._clock = 0
+        self._num_evictions: Dict[str, int] = collections.defaultdict(int)
+        self._seed_from_store()
+
+    def get_size_in_bytes(self, func_id: Optional[str] = None) -> int:
+        """
+        Return the size of the tracked entries, optionally of one function.
+        """
+        size_in_bytes = sum(
+            entry[0]
+            for (func_id_, _), entry in self._entries.items()
+            if func_id is None or func_id_ == func_id
+        )
+        return size_in_bytes
+
+    def get_num_evictions(self, func_id: str) -> int:
+        return self._num_evictions[func_id]
+
+    def touch(self, func_id: str, args_id: str) -> None:
+        """
+        Record an access to an entry, measuring its size if it's not tracked.
+        """
+        self._clock += 1
+        key = (func_id, args_id)
+        if key in self._entries:
+            entry = self._entries[key]
+            entry[1] += 1
+            entry[2] = self._clock
+        else:
+            size_in_bytes = _get_cache_item_size(
+                self._store_backend.location, func_id, args_id
+            )
+            self._entries[key] = [size_in_bytes, 1, self._clock]
+
+    def evict(
+        self,
+        max_bytes: int,
+        eviction_policy: str,
+        *,
+        func_id: Optional[str] = None,
+    ) -> None:
+        """
+        Remove entries from the store until their size is within `max_bytes`.
+
+        :param func_id: only consider the entries of this function, e.g., to
+            enforce a function bound instead of a global one
+        """
+        _dassert_is_valid_eviction_policy(eviction_policy)
+        size_in_bytes = self.get_size_in_bytes(func_id)
+        if size_in_bytes <= max_bytes:
+            return
+        keys = [
+            key for key in self._entries if func_id is None or key[0] == func_id
+        ]
+        if eviction_policy == "lru":
+            keys.sort(key=lambda key: self._entries[key][2])
+        elif eviction_policy == "lfu":
+            keys.sort(key=lambda key: self._entries[key][1:])
+        for key in keys:
+            if size_in_bytes <= max_bytes:
+                break
+            _LOG.debug("Evicting %s from '%s'", key, self._store_backend.location)
+            self._store_backend.clear_item(list(key))
+            size_in_bytes -= self._entries.pop(key)[0]
+            self._num_evictions[key[0]] += 1
+
+    def _seed_from_store(self) -> None:
+        """
+        Track the entries already in the store, from the least recently
+        accessed one.
+
+        The entries are seeded as never accessed by the current process.
+        """
+        location = self._store_backend.location
+        items = self._store_backend.get_items()
+        items = sorted(items, key=lambda item: item.last_access)
+        for item in items:
+            # The path of an item is `{location}/{func_id}/{args_id}`.
+            rel_path = os.path.relpath(item.path, location)
+            func_id, args_id = os.path.split(rel_path)
+            self._clock += 1
+            self._entries[(func_id, args_id)] = [item.size, 0, self._clock]
+
+
+# Map the location of a Joblib store to the usage of its entries.
+_CACHE_USAGES: Dict[str, _CacheUsage] = {}
+
+
+def _get_cache_usage(store_backend: Any) -> _CacheUsage:
+    location = store_backend.location
+    if location not in _CACHE_USAGES:
+        _CACHE_USAGES[location] = _CacheUsage(store_backend)
+    return _CACHE_USAGES[location]
+
+
+def _reset_cache_usages(cache_path: str) -> None:
+    """
+    Forget the usage of the stores under `cache_path`, e.g., after clearing it.
+    """
+    for location in list(_CACHE_USAGES):
+        if location.startswith(cache_path):
+            del _CACHE_USAGES[location]
+
+
+# Max size in bytes of the global caches for each cache type, `None` means
+# unbounded.
+_GLOBAL_CACHE_MAX_BYTES: Dict[str, Optional[int]] = {"mem": None, "disk": None}
+_GLOBAL_CACHE_EVICTION_POLICY: Dict[str, str] = {"mem": "lru", "disk": "lru"}
+
+
+def set_global_cache_max_bytes(
+    cache_type: str, max_bytes: Optional[int], *, eviction_policy: str = "lru"
+) -> None:
+    """
+    Bound the size of the global cache of a given type.
+
+    The bound is enforced after storing or accessing a value, evicting the
+    values of all the functions using the global cache.
+
+    :param cache_type: type of a cache
+    :param max_bytes: max size in bytes, `None` to remove the bound
+    :param eviction_policy: "lru" or "lfu"
+    """
+    _dassert_is_valid_cache_type(cache_type)
+    if max_bytes is not None:
+        hdbg.dassert_lte(0, max_bytes)
+    _dassert_is_valid_eviction_policy(eviction_policy)
+    _GLOBAL_CACHE_MAX_BYTES[cache_type] = max_bytes
+    _GLOBAL_CACHE_EVICTION_POLICY[cache_type] = eviction_policy
+
+
 # #############################################################################
 
 
@@ -371,6 +554,9 @@ class _Cached:
         tag: Optional[str] = None,
         disk_cache_path: Optional[str] = None,
         aws_profile: Optional[str] = "am",
+        mem_cache_max_bytes: Optional[int] = None,
+        disk_cache_max_bytes: Optional[int] = None,
+        eviction_policy: str = "lru",
     ):
         """
         Construct the class.
@@ -387,6 +573,11 @@ class _Cached:
             when running unit tests we want to use a different cache)
         :param disk_cache_path: path of the function-specific cache
         :param aws_profile: the AWS profile to use in case of S3 backend
+        :param mem_cache_max_bytes, disk_cache_max_bytes: max size in bytes of
+            the values of this function in the memory and disk caches, `None`
+            for unbounded
+        :param eviction_policy: policy to pick the values to evict when a cache
+            exceeds its max size, i.e. "lru" or "lfu"
         """
         # Make the class have the same attributes (e.g., `__name__`, `__doc__`,
         # `__dict__`) as the called function.
@@ -403,6 +594,18 @@ class _Cached:
         self._tag = tag
         self._disk_cache_path = disk_cache_path
         self._aws_profile = aws_profile
+        self._max_bytes = {
+            "mem": mem_cache_max_bytes,
+            "disk": disk_cache_max_bytes,
+        }
+        for max_bytes in self._max_bytes.values():
+            if max_bytes is not None:
+                hdbg.dassert_lte(0, max_bytes)
+        _dassert_is_valid_eviction_policy(eviction_policy)
+        self._eviction_policy = eviction_policy
+        # Count the hits and misses for each cache type.
+        self._num_hits = {cache_type: 0 for cache_type in _get_cache_types()}
+        self._num_misses = {cache_type: 0 for cache_type in _get_cache_types()}
         #
         self._reset_cache_tracing()
         # Create the memory and disk cache objects for this function.
@@ -489,6 +692,29 @@ class _Cached:
             # Function-specific cache: print the paths of the local cache.
             cache_type = "disk"
             txt.append(f"local {cache_type} cache path={self._disk_cache_path}")
+        # Report the usage of each cache.
+        for cache_type in _get_cache_types():
+            memorized_result = self._get_memorized_result(cache_type)
+            store_backend = memorized_result.store_backend
+            func_id = jmemor._build_func_identifier(self._func)
+            usage = _CACHE_USAGES.get(store_backend.location)
+            size_in_bytes = (
+                0 if usage is None else usage.get_size_in_bytes(func_id)
+            )
+            num_evictions = (
+                0 if usage is None else usage.get_num_evictions(func_id)
+            )
+            max_bytes = self._max_bytes[cache_type]
+            max_size = (
+                "None" if max_bytes is None else hintros.format_size(max_bytes)
+            )
+            txt.append(
+                f"{cache_type} cache: hits={self._num_hits[cache_type]}"
+                f" misses={self._num_misses[cache_type]}"
+                f" evictions={num_evictions}"
+                f" size={hintros.format_size(size_in_bytes)}"
+                f" max_size={max_size}"
+            )
         txt = "\n".join(txt)
         return txt
 
@@ -630,6 +856,7 @@ class _Cached:
                 "The path '%s' is not valid",
                 abs_path,
             )
+        _reset_cache_usages(cache_path)
         if destroy:
             _LOG.warning("Destroying '%s' ...", cache_path)
             hio.delete_dir(cache_path)
@@ -869,6 +1096,40 @@ class _Cached:
         memorized_result.store_backend.dump_item([func_id, args_id], obj)
         #
 
+    def _update_cache_usage(
+        self, cache_type: str, func_id: str, args_id: str, is_hit: bool
+    ) -> None:
+        """
+        Update the counters and enforce the size bounds after accessing a value.
+
+        :param cache_type: type of a cache
+        :param func_id: digest of the function obtained from `_get_identifiers()`
+        :param args_id: digest of arguments obtained from `_get_identifiers()`
+        :param is_hit: whether the value was retrieved from the cache or it was
+            stored in it
+        """
+        if is_hit:
+            self._num_hits[cache_type] += 1
+        else:
+            self._num_misses[cache_type] += 1
+        memorized_result = self._get_memorized_result(cache_type)
+        store_backend = memorized_result.store_backend
+        if not isinstance(store_backend, jmemor.FileSystemStoreBackend):
+            # The size of the values can be computed only for local stores.
+            return
+        usage = _get_cache_usage(store_backend)
+        usage.touch(func_id, args_id)
+        # Enforce the bound for this function.
+        max_bytes = self._max_bytes[cache_type]
+        if max_bytes is not None:
+            usage.evict(max_bytes, self._eviction_policy, func_id=func_id)
+        # Enforce the bound for the global cache.
+        uses_global_cache = cache_type == "mem" or not self.has_function_cache()
+        max_bytes = _GLOBAL_CACHE_MAX_BYTES[cache_type]
+        if uses_global_cache and max_bytes is not None:
+            eviction_policy = _GLOBAL_CACHE_EVICTION_POLICY[cache_type]
+            usage.evict(max_bytes, eviction_policy)
+
     # ///////////////////////////////////////////////////////////////////////////
 
     def _reset_cache_tracing(self) -> None:
@@ -896,6 +1157,7 @@ class _Cached:
                 logging.INFO, "Loading cached version from disk"
             ):
                 obj = self._disk_cached_func(*args, **kwargs)
+            self._update_cache_usage("disk", func_id, args_id, is_hit=True)
             if self._check_only_if_present:
                 raise CachedValueException(func_info)
         else:
@@ -914,6 +1176,7 @@ class _Cached:
                 logging.INFO, "Updating cached version on disk"
             ):
                 obj = self._disk_cached_func(*args, **kwargs)
+            self._update_cache_usage("disk", func_id, args_id, is_hit=False)
             # obj = self._execute_intrinsic_function(*args, **kwargs)
             # The function was not cached in disk, so now we need to update the
             # memory cache.
@@ -941,6 +1204,7 @@ class _Cached:
                 logging.INFO, "Loading cached version from memory"
             ):
                 obj = self._memory_cached_func(*args, **kwargs)
+            self._update_cache_usage("mem", func_id, args_id, is_hit=True)
         else:
             # INV: we know that we didn't hit the memory cache, but we don't know
             # about the disk cache.
@@ -959,6 +1223,7 @@ class _Cached:
             # The function was not cached in memory, so now we need to update the
             # memory cache.
             self._store_cached_version("mem", func_id, args_id, obj)
+            self._update_cache_usage("mem", func_id, args_id, is_hit=False)
         return obj
 
     def _execute_intrinsic_function(self, *args: Any, **kwargs: Any) -> Any:
@@ -1021,6 +1286,9 @@ def cache(
     tag: Optional[str] = None,
     disk_cache_path: Optional[str] = None,
     aws_profile: Optional[str] = None,
+    mem_cache_max_bytes: Optional[int] = None,
+    disk_cache_max_bytes: Optional[int] = None,
+    eviction_policy: str = "lru",
 ) -> Union[Callable, _Cached]:
     """
     Decorate a function with a cache.
@@ -1036,6 +1304,10 @@ def cache(
         return x + y
 
     @hcache.cache(use_mem_cache=False)
+    def add(x: int, y: int) -> int:
+        return x + y
+
+    @hcache.cache(mem_cache_max_bytes=2**30, eviction_policy="lfu")
     def add(x: int, y: int) -> int:
         return x + y
     ```
@@ -1050,6 +1322,9 @@ def cache(
             tag=tag,
             disk_cache_path=disk_cache_path,
             aws_profile=aws_profile,
+            mem_cache_max_bytes=mem_cache_max_bytes,
+            disk_cache_max_bytes=disk_cache_max_bytes,
+            eviction_policy=eviction_policy,
         )
 
     return wrapper
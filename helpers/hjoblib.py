@@ -5,16 +5,21 @@ import helpers.hjoblib as hjoblib
 """
 
 import concurrent.futures
+import contextlib
+import inspect
 import logging
 import math
 import os
 import pprint
 import random
+import shutil
 import sys
+import tempfile
 import traceback
+import uuid
 from functools import wraps
 from multiprocessing import Process, Queue
-from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
 
 import joblib
 from joblib._store_backends import StoreBackendBase, StoreBackendMixin
@@ -457,6 +462,165 @@ def processify(func):
     return wrapper
 
 
+# #############################################################################
+# Transport of the task results.
+# #############################################################################
+
+# By default the result of each task is pickled and sent back to the parent
+# process. With the `arrow_ipc` transport the tasks returning a dataframe write
+# it to an Arrow IPC file (in shared memory, when available) and return only a
+# reference to it, which is memory-mapped by the parent process. The columns
+# that don't need a conversion (e.g., numeric columns without missing values)
+# are not copied, but are read-only views of the memory-mapped file, which is
+# unlinked as soon as it is loaded. This avoids pickling large results and
+# holding both the pickled and unpickled copies in memory.
+_VALID_RESULT_TRANSPORTS = ("pickle", "arrow_ipc")
+_INDEX_FREQ_METADATA_KEY = b"parallel_execute.index_freq"
+
+
+class _ArrowIpcResult:
+    """
+    Reference to a task result stored in an Arrow IPC file.
+    """
+
+    def __init__(self, file_name: str) -> None:
+        self.file_name = file_name
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}(file_name='{self.file_name}')"
+
+
+@contextlib.contextmanager
+def _result_transport_dir(
+    result_transport: str, result_transport_dir: Optional[str]
+) -> Iterator[Optional[str]]:
+    """
+    Create a dir to store the results of the tasks of a workload.
+
+    The dir is removed on exit, together with the results left behind, e.g.,
+    by failing tasks.
+
+    :param result_transport: same as in `parallel_execute()`
+    :param result_transport_dir: dir where to create the dir storing the results
+        - `None` to use shared memory, when available, or the temp dir
+    :return: path to the created dir or `None` if the results are pickled
+    """
+    if result_transport != "arrow_ipc":
+        yield None
+        return
+    if result_transport_dir is None:
+        shm_dir = "/dev/shm"
+        if os.path.isdir(shm_dir) and os.access(shm_dir, os.W_OK):
+            result_transport_dir = shm_dir
+        else:
+            result_transport_dir = tempfile.gettempdir()
+    hio.create_dir(result_transport_dir, incremental=True)
+    dir_name = tempfile.mkdtemp(
+        prefix="tmp.parallel_execute.", dir=result_transport_dir
+    )
+    _LOG.debug("Storing task results in '%s'", dir_name)
+    try:
+        yield dir_name
+    finally:
+        shutil.rmtree(dir_name, ignore_errors=True)
+
+
+def _store_result_as_arrow_ipc(res: Any, dir_name: str) -> Any:
+    """
+    Store a task result in an Arrow IPC file.
+
+    :param res: result of a task
+    :param dir_name: dir where to store the file
+    :return: reference to the file storing the result or `res` itself, if it
+        is not a dataframe or it can't be converted to Arrow
+    """
+    import pandas as pd
+    import pyarrow as pa
+
+    if not isinstance(res, pd.DataFrame):
+        return res
+    try:
+        table = pa.Table.from_pandas(res, preserve_index=True)
+    except (pa.ArrowException, TypeError, ValueError) as e:
+        _LOG.warning(
+            "Can't convert the result to Arrow, using pickle: exception='%s'",
+            str(e),
+        )
+        return res
+    # Arrow doesn't store the frequency of the index, so we save it in the
+    # metadata of the table.
+    freq = getattr(res.index, "freqstr", None)
+    if freq is not None:
+        metadata = {**table.schema.metadata, _INDEX_FREQ_METADATA_KEY: freq}
+        table = table.replace_schema_metadata(metadata)
+    # Use a file name that is unique across processes.
+    file_name = os.path.join(dir_name, f"{os.getpid()}.{uuid.uuid4().hex}.arrow")
+    with pa.OSFile(file_name, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+    return _ArrowIpcResult(file_name)
+
+
+def _load_result_from_arrow_ipc(res: Any) -> Any:
+    """
+    Load a task result stored by `_store_result_as_arrow_ipc()`.
+
+    The file is memory-mapped and unlinked after loading it. The columns that
+    can be converted without a copy keep referencing the memory-mapped data,
+    which stays valid until the dataframe is released.
+
+    :param res: result of a task
+    :return: the dataframe stored in the file or `res` itself, if it is not a
+        reference to a file
+    """
+    import pyarrow as pa
+
+    if not isinstance(res, _ArrowIpcResult):
+        return res
+    with pa.memory_map(res.file_name, "r") as source:
+        table = pa.ipc.open_file(source).read_all()
+    freq = table.schema.metadata.get(_INDEX_FREQ_METADATA_KEY)
+    # Convert each column to a separate block to avoid copying the columns
+    # into consolidated blocks, and release the Arrow buffers while converting.
+    df = table.to_pandas(split_blocks=True, self_destruct=True)
+    del table
+    if freq is not None:
+        df.index.freq = freq.decode()
+    os.remove(res.file_name)
+    return df
+
+
+def _get_joblib_parallel_kwargs(transport_dir: Optional[str]) -> Dict[str, Any]:
+    """
+    Return the params for `joblib.Parallel` to transport the results.
+
+    When the results are stored in files, they are returned as a generator, if
+    the joblib version supports it, so that each file is loaded as soon as the
+    task completes.
+    """
+    kwargs = {}
+    if (
+        transport_dir is not None
+        and "return_as" in inspect.signature(joblib.Parallel).parameters
+    ):
+        kwargs["return_as"] = "generator"
+    return kwargs
+
+
+def _transport_result_as_arrow_ipc(func: Callable, dir_name: str) -> Callable:
+    """
+    Wrap a workload function so that its result is stored as Arrow IPC file.
+    """
+
+    @wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        res = func(*args, **kwargs)
+        res = _store_result_as_arrow_ipc(res, dir_name)
+        return res
+
+    return wrapper
+
+
 def _parallel_execute_decorator(
     task_idx: int,
     task_len: int,
@@ -469,6 +633,8 @@ def _parallel_execute_decorator(
     func_name: str,
     processify_func: bool,
     task: Task,
+    *,
+    result_transport_dir: Optional[str] = None,
 ) -> Any:
     """
     Parameters have the same meaning as in `parallel_execute()`.
@@ -481,7 +647,10 @@ def _parallel_execute_decorator(
             - if `abort_on_error=False` the exception is not propagated, but the
               return value is the string representation of the exception
     :param processify_func: switch to enable wrapping a function into a process
-    :return: the return value of the workload function or the exception string
+    :param result_transport_dir: dir where to store the dataframe results as
+        Arrow IPC files, if not `None`
+    :return: the return value of the workload function (or a reference to the
+        file storing it) or the exception string
     """
     # Validate very carefully all the parameters.
     hdbg.dassert_lte(0, task_idx)
@@ -525,6 +694,12 @@ def _parallel_execute_decorator(
         logging.DEBUG, f"Execute '{workload_func.__name__}'"
     ) as ts:
         try:
+            if result_transport_dir is not None:
+                # Store the result before it's returned by the process created
+                # by `processify()`, if any.
+                workload_func = _transport_result_as_arrow_ipc(
+                    workload_func, result_transport_dir
+                )
             if processify_func:
                 _LOG.debug("Using processify")
                 # Wrap the function into a process to enforce de-allocating
@@ -581,6 +756,8 @@ def parallel_execute(
     log_file: str,
     *,
     backend: str = "loky",
+    result_transport: str = "pickle",
+    result_transport_dir: Optional[str] = None,
 ) -> Optional[List[Any]]:
     """
     Run a workload in parallel using joblib or asyncio.
@@ -598,6 +775,12 @@ def parallel_execute(
     :param log_file: file used to log information about the execution
     :param backend: specify the backend type (e.g., joblib `loky` or
         `asyncio_process_executor`)
+    :param result_transport: how the tasks send their results back
+        - `pickle`: pickle the results
+        - `arrow_ipc`: write the dataframe results to Arrow IPC files that are
+          memory-mapped by the caller, pickling the other results
+    :param result_transport_dir: dir where to store the Arrow IPC files
+        - `None` to use shared memory, when available, or the temp dir
 
     :return: list with the results from executing `func` or the exception of the
         failing function
@@ -614,6 +797,7 @@ def parallel_execute(
             "dry_run num_threads incremental num_attempts abort_on_error"
         )
     )
+    hdbg.dassert_in(result_transport, _VALID_RESULT_TRANSPORTS)
     # Parse the workload.
     validate_workload(workload)
     workload_func, func_name, tasks = workload
@@ -633,6 +817,43 @@ def parallel_execute(
         _LOG.warning("Exiting without executing workload, as per user request")
         return None
     # Run.
+    with _result_transport_dir(
+        result_transport, result_transport_dir
+    ) as transport_dir:
+        res = _execute_workload(
+            workload,
+            num_threads,
+            incremental,
+            abort_on_error,
+            num_attempts,
+            log_file,
+            backend,
+            transport_dir,
+        )
+    _LOG.info("Saved log info in '%s'", log_file)
+    return res
+
+
+def _execute_workload(
+    workload: Workload,
+    num_threads: Union[str, int],
+    incremental: bool,
+    abort_on_error: bool,
+    num_attempts: int,
+    log_file: str,
+    backend: str,
+    transport_dir: Optional[str],
+) -> List[Any]:
+    """
+    Execute the tasks of a workload.
+
+    Parameters have the same meaning as in `parallel_execute()`.
+
+    :param transport_dir: dir where the tasks store the dataframe results as
+        Arrow IPC files, if not `None`. The results are loaded as soon as
+        each task completes
+    """
+    workload_func, func_name, tasks = workload
     task_len = len(tasks)
     tqdm_out = htqdm.TqdmToLogger(_LOG, level=logging.INFO)
     tqdm_iter = tqdm(
@@ -669,8 +890,9 @@ def parallel_execute(
                 func_name,
                 processify_func,
                 task,
+                result_transport_dir=transport_dir,
             )
-            res.append(res_tmp)
+            res.append(_load_result_from_arrow_ipc(res_tmp))
     else:
         # Execute the tasks in parallel.
         num_threads = int(num_threads)
@@ -680,7 +902,10 @@ def parallel_execute(
             # from joblib.externals.loky import set_loky_pickler
             # set_loky_pickler('cloudpickle')
             res = joblib.Parallel(
-                n_jobs=num_threads, backend=backend, verbose=200
+                n_jobs=num_threads,
+                backend=backend,
+                verbose=200,
+                **_get_joblib_parallel_kwargs(transport_dir),
             )(
                 joblib.delayed(_parallel_execute_decorator)(
                     task_idx,
@@ -694,11 +919,13 @@ def parallel_execute(
                     func_name,
                     processify_func,
                     task,
+                    result_transport_dir=transport_dir,
                 )
                 # We can't use `tqdm_iter` since this only shows the submission of
                 # the jobs but not their completion.
                 for task_idx, task in enumerate(tasks)
             )
+            res = [_load_result_from_arrow_ipc(res_tmp) for res_tmp in res]
         elif backend in ("asyncio_threading", "asyncio_multiprocessing"):
             if backend == "asyncio_threading":
                 executor = concurrent.futures.ThreadPoolExecutor
@@ -718,13 +945,17 @@ def parallel_execute(
                 func_name,
                 processify_func,
                 args_[1],
+                result_transport_dir=transport_dir,
             )
             args = list(enumerate(tasks))
             use_progress_bar = True
             if not use_progress_bar:
                 # Implementation without progress bar.
                 with executor(max_workers=num_threads) as executor_:
-                    res = list(executor_.map(func, args))
+                    res = [
+                        _load_result_from_arrow_ipc(res_tmp)
+                        for res_tmp in executor_.map(func, args)
+                    ]
             else:
                 # Implementation with progress bar.
                 res = []
@@ -736,11 +967,10 @@ def parallel_execute(
                         _LOG.debug("done submitting")
                         for future in concurrent.futures.as_completed(futures):
                             res_tmp = future.result()
-                            res.append(res_tmp)
+                            res.append(_load_result_from_arrow_ipc(res_tmp))
                             pbar.update(1)
         else:
             raise ValueError(f"Invalid backend='{backend}'")
-    _LOG.info("Saved log info in '%s'", log_file)
     return res
 
 
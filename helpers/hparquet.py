@@ -9,7 +9,7 @@ import datetime
 import glob
 import logging
 import os
-from typing import Any, Iterator, List, Optional, Tuple, Union
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -88,6 +88,7 @@ def from_parquet(
     log_level: int = logging.DEBUG,
     report_stats: bool = False,
     aws_profile: hs3.AwsProfile = None,
+    use_manifest: bool = False,
 ) -> pd.DataFrame:
     """
     Load a dataframe from a Parquet file.
@@ -106,9 +107,13 @@ def from_parquet(
     :param report_stats: whether to report Parquet file size or not
     :param aws_profile: AWS profile to use if and only if using an S3 path,
         otherwise `None` for local path
+    :param use_manifest: use the stored dataset manifest to prune the files
+        and the row groups that can't match `filters` before opening them,
+        instead of discovering the dataset. The manifest is not updated, see
+        `update_parquet_dataset_manifest()`
     :return: data from Parquet dataset
     """
-    _LOG.debug(hprint.to_str("file_name columns filters schema"))
+    _LOG.debug(hprint.to_str("file_name columns filters schema use_manifest"))
     hdbg.dassert_isinstance(file_name, str)
     hs3.dassert_is_valid_aws_profile(file_name, aws_profile)
     if hs3.is_s3_path(file_name):
@@ -149,6 +154,17 @@ def from_parquet(
             tiles = _get_parquet_tiles_from_file_path(last_pq_file)
             for col, value in tiles:
                 df[col] = value
+        elif use_manifest:
+            table = _read_table_with_manifest(
+                file_name,
+                filesystem,
+                columns,
+                filters,
+                schema,
+            )
+            df = table.to_pandas(coerce_temporal_nanoseconds=True)
+            if isinstance(df.index, pd.DatetimeIndex):
+                df.index = df.index.as_unit("ns")
         else:
             if schema is not None:
                 # Pass partition columns types explicitly.
@@ -631,6 +647,525 @@ ParquetAndFilter = List[ParquetFilter]
 ParquetOrAndFilter = List[ParquetAndFilter]
 
 
+# #############################################################################
+# Dataset manifest
+# #############################################################################
+
+# The manifest of a Parquet dataset stores one row per row group with:
+# - the path of the file relative to the dataset dir, its size and modification
+#   time
+# - the partition values from the path, e.g., `year=2022/month=1`
+# - the number of rows and the min / max statistics of the timestamp columns
+#   from the Parquet footer
+# Pyarrow skips files starting with "_" when discovering a dataset, so the
+# manifest is stored in the dataset dir without being read as data.
+_MANIFEST_FILE_NAME = "_manifest.parquet"
+# Prefixes of the files and dirs that are not part of a dataset, like in
+# `pyarrow.dataset.dataset()`.
+_IGNORED_PREFIXES = (".", "_")
+_MANIFEST_FILE_COLUMNS = ["file_path", "file_size", "file_mtime_ns"]
+# Partition columns with values increasing over time, e.g., from
+# `add_date_partition_columns()`, so that only the last partition and the new
+# ones need to be listed to update the manifest.
+_TIME_PARTITION_COLUMNS = ("date", "year", "month", "day", "weekofyear")
+
+
+def _get_pyarrow_filesystem(
+    filesystem: Optional[Any],
+) -> pafs.FileSystem:
+    """
+    Convert the filesystem used by `from_parquet()` into a pyarrow one.
+    """
+    if filesystem is None:
+        filesystem = pafs.LocalFileSystem()
+    elif not isinstance(filesystem, pafs.FileSystem):
+        # E.g., an `s3fs` filesystem.
+        filesystem = pafs.PyFileSystem(pafs.FSSpecHandler(filesystem))
+    return filesystem
+
+
+def _get_file_row(
+    dir_name: str, file_info: pafs.FileInfo
+) -> Optional[Tuple[str, int, int]]:
+    """
+    Return the manifest columns of a data file or `None` if it's ignored.
+    """
+    file_path = os.path.relpath(file_info.path, dir_name)
+    if any(part.startswith(_IGNORED_PREFIXES) for part in file_path.split("/")):
+        return None
+    mtime_ns = -1 if file_info.mtime_ns is None else file_info.mtime_ns
+    return file_path, file_info.size, mtime_ns
+
+
+def _get_time_partition_value(dir_path: str) -> Optional[Any]:
+    """
+    Return the value of a time partition dir, e.g., 3 for `.../month=3`.
+
+    :return: `None` if the dir is not a time partition
+    """
+    tiles = _get_parquet_tiles_from_file_path(os.path.basename(dir_path))
+    if not tiles or tiles[0][0] not in _TIME_PARTITION_COLUMNS:
+        return None
+    return tiles[0][1]
+
+
+def _list_dataset_files(
+    dir_name: str,
+    filesystem: pafs.FileSystem,
+    *,
+    stored_files: Optional[pd.DataFrame] = None,
+) -> pd.DataFrame:
+    """
+    List the data files in a Parquet dataset dir.
+
+    :param stored_files: files of the stored manifest with the columns in
+        `_MANIFEST_FILE_COLUMNS`
+        - `None` to list the entire dataset dir recursively
+        - otherwise the time partitions older than the last stored one at the
+          same level are not listed and their files are taken from
+          `stored_files`, e.g., with monthly tiles only the dirs of the
+          current month and of the new months are listed
+    :return: dataframe with the file paths relative to `dir_name`, sizes and
+        modification times, sorted by path
+    """
+    rows = []
+    if stored_files is None:
+        selector = pafs.FileSelector(dir_name, recursive=True)
+        for file_info in filesystem.get_file_info(selector):
+            if file_info.type == pafs.FileType.File:
+                rows.append(_get_file_row(dir_name, file_info))
+    else:
+        # Index the stored files and sub dirs by their parent dir, e.g.,
+        # `asset_id=100` -> {`asset_id=100/year=2022`}.
+        stored_rows_by_dir = collections.defaultdict(list)
+        stored_sub_dirs_by_dir = collections.defaultdict(set)
+        for row in stored_files[_MANIFEST_FILE_COLUMNS].itertuples(
+            index=False, name=None
+        ):
+            parts = row[0].split("/")
+            stored_rows_by_dir["/".join(parts[:-1])].append(row)
+            for idx in range(len(parts) - 1):
+                stored_sub_dirs_by_dir["/".join(parts[:idx])].add(
+                    "/".join(parts[: idx + 1])
+                )
+        # Walk the dataset dir one level at a time, starting from its root.
+        dir_paths = [""]
+        while dir_paths:
+            dir_path = dir_paths.pop()
+            selector = pafs.FileSelector(os.path.join(dir_name, dir_path))
+            sub_dir_paths = []
+            for file_info in filesystem.get_file_info(selector):
+                if file_info.type == pafs.FileType.File:
+                    rows.append(_get_file_row(dir_name, file_info))
+                elif file_info.type == pafs.FileType.Directory:
+                    sub_dir_path = os.path.relpath(file_info.path, dir_name)
+                    if not os.path.basename(sub_dir_path).startswith(
+                        _IGNORED_PREFIXES
+                    ):
+                        sub_dir_paths.append(sub_dir_path)
+            # Find the last stored time partition at this level.
+            stored_sub_dir_paths = stored_sub_dirs_by_dir.get(dir_path, set())
+            stored_values = [
+                _get_time_partition_value(sub_dir_path)
+                for sub_dir_path in stored_sub_dir_paths
+            ]
+            stored_values = [
+                value for value in stored_values if value is not None
+            ]
+            last_value = max(stored_values) if stored_values else None
+            for sub_dir_path in sub_dir_paths:
+                value = _get_time_partition_value(sub_dir_path)
+                if (
+                    sub_dir_path in stored_sub_dir_paths
+                    and value is not None
+                    and value < last_value
+                ):
+                    # Reuse the stored files of an older time partition.
+                    stored_dir_paths = [sub_dir_path]
+                    while stored_dir_paths:
+                        stored_dir_path = stored_dir_paths.pop()
+                        rows.extend(stored_rows_by_dir.get(stored_dir_path, []))
+                        stored_dir_paths.extend(
+                            stored_sub_dirs_by_dir.get(stored_dir_path, [])
+                        )
+                else:
+                    dir_paths.append(sub_dir_path)
+    rows = [row for row in rows if row is not None]
+    files = pd.DataFrame(rows, columns=_MANIFEST_FILE_COLUMNS)
+    files = files.sort_values("file_path", ignore_index=True)
+    return files
+
+
+def _get_row_group_stats(
+    dir_name: str,
+    file_path: str,
+    file_size: int,
+    file_mtime_ns: int,
+    filesystem: pafs.FileSystem,
+) -> List[Dict[str, Any]]:
+    """
+    Read the metadata of a Parquet file and return one manifest row per row
+    group.
+    """
+    metadata = pq.read_metadata(
+        os.path.join(dir_name, file_path), filesystem=filesystem
+    )
+    arrow_schema = metadata.schema.to_arrow_schema()
+    timestamp_columns = [
+        field.name for field in arrow_schema if pa.types.is_timestamp(field.type)
+    ]
+    partition_values = dict(_get_parquet_tiles_from_file_path(file_path))
+    rows = []
+    for row_group_idx in range(metadata.num_row_groups):
+        row_group = metadata.row_group(row_group_idx)
+        row = {
+            "file_path": file_path,
+            "file_size": file_size,
+            "file_mtime_ns": file_mtime_ns,
+            "row_group": row_group_idx,
+            "num_rows": row_group.num_rows,
+        }
+        row.update(partition_values)
+        for column_idx in range(row_group.num_columns):
+            column = row_group.column(column_idx)
+            column_name = column.path_in_schema
+            if column_name not in timestamp_columns:
+                continue
+            stats = column.statistics
+            if stats is None or not stats.has_min_max:
+                # Missing statistics make the row group not prunable.
+                continue
+            row[f"min.{column_name}"] = stats.min
+            row[f"max.{column_name}"] = stats.max
+        rows.append(row)
+    return rows
+
+
+def _get_manifest_filesystem(
+    dir_name: str, aws_profile: hs3.AwsProfile
+) -> Tuple[str, pafs.FileSystem]:
+    """
+    Return the path and the pyarrow filesystem of a dataset dir.
+    """
+    hs3.dassert_is_valid_aws_profile(dir_name, aws_profile)
+    if hs3.is_s3_path(dir_name):
+        if isinstance(aws_profile, str):
+            filesystem = get_pyarrow_s3fs(aws_profile)
+        else:
+            filesystem = aws_profile
+        dir_name = dir_name[len("s3://") :]
+    else:
+        filesystem = None
+    filesystem = _get_pyarrow_filesystem(filesystem)
+    dir_name = dir_name.rstrip("/")
+    hdbg.dassert_eq(
+        filesystem.get_file_info(dir_name).type,
+        pafs.FileType.Directory,
+        "Dataset dir '%s' doesn't exist",
+        dir_name,
+    )
+    return dir_name, filesystem
+
+
+def update_parquet_dataset_manifest(
+    dir_name: str,
+    *,
+    incremental: bool = True,
+    aws_profile: hs3.AwsProfile = None,
+) -> pd.DataFrame:
+    """
+    Build or update the manifest of a Parquet dataset and store it.
+
+    This is a maintenance step to run after writing the dataset, e.g., after
+    `to_partitioned_parquet()`, so that the readers only load the stored
+    manifest. Only the footers of the files that were added or modified since
+    the last update are read.
+
+    E.g.,
+    ```
+                         file_path  file_size  file_mtime_ns  row_group  num_rows  year  month          min.timestamp          max.timestamp
+    0  year=2022/month=1/data.parquet       3052  1667...             0      1440  2022      1  2022-01-01 00:00:00+00:00  2022-01-01 23:59:00+00:00
+    ```
+
+    :param dir_name: path to a Parquet dataset dir
+    :param incremental: list only the last time partitions of the stored
+        manifest and the new ones (see `_list_dataset_files()`), instead of
+        the entire dataset. Use `False` after changing older partitions, e.g.,
+        for a backfill
+    :param aws_profile: AWS profile to use if and only if using an S3 path
+    :return: manifest with one row per row group
+    """
+    dir_name, filesystem = _get_manifest_filesystem(dir_name, aws_profile)
+    manifest_path = os.path.join(dir_name, _MANIFEST_FILE_NAME)
+    manifest_info = filesystem.get_file_info(manifest_path)
+    if manifest_info.type == pafs.FileType.File:
+        manifest = pq.read_table(manifest_path, filesystem=filesystem).to_pandas()
+    else:
+        manifest = pd.DataFrame(columns=_MANIFEST_FILE_COLUMNS)
+    # Find the files that changed since the manifest was stored.
+    stored_files = manifest[_MANIFEST_FILE_COLUMNS].drop_duplicates()
+    files = _list_dataset_files(
+        dir_name,
+        filesystem,
+        stored_files=stored_files if incremental and not manifest.empty else None,
+    )
+    files = files.merge(
+        stored_files, how="left", on=_MANIFEST_FILE_COLUMNS, indicator=True
+    )
+    is_new_file = files["_merge"] == "left_only"
+    new_files = files[is_new_file]
+    n_removed_files = stored_files.shape[0] - (~is_new_file).sum()
+    _LOG.debug(
+        "Found %s new or modified files and %s removed files in '%s'",
+        new_files.shape[0],
+        n_removed_files,
+        dir_name,
+    )
+    if new_files.empty and n_removed_files == 0:
+        return manifest
+    # Keep the rows of the unchanged files and read the footers of the new ones.
+    unchanged_file_paths = files.loc[~is_new_file, "file_path"]
+    manifest = manifest[manifest["file_path"].isin(unchanged_file_paths)]
+    rows = []
+    for file_path, file_size, file_mtime_ns in new_files[
+        _MANIFEST_FILE_COLUMNS
+    ].itertuples(index=False):
+        rows.extend(
+            _get_row_group_stats(
+                dir_name, file_path, file_size, file_mtime_ns, filesystem
+            )
+        )
+    new_manifest = pd.DataFrame(rows)
+    manifest = pd.concat([df for df in [manifest, new_manifest] if not df.empty])
+    manifest = manifest.sort_values(["file_path", "row_group"], ignore_index=True)
+    # Store the updated manifest.
+    pq.write_table(
+        pa.Table.from_pandas(manifest, preserve_index=False),
+        manifest_path,
+        filesystem=filesystem,
+    )
+    return manifest
+
+
+def has_parquet_dataset_manifest(
+    dir_name: str,
+    *,
+    aws_profile: hs3.AwsProfile = None,
+) -> bool:
+    """
+    Return whether a Parquet dataset has a stored manifest.
+
+    :param dir_name: path to a Parquet dataset dir
+    :param aws_profile: AWS profile to use if and only if using an S3 path
+    """
+    dir_name, filesystem = _get_manifest_filesystem(dir_name, aws_profile)
+    manifest_path = os.path.join(dir_name, _MANIFEST_FILE_NAME)
+    file_type = filesystem.get_file_info(manifest_path).type
+    return file_type == pafs.FileType.File
+
+
+def get_parquet_dataset_manifest(
+    dir_name: str,
+    *,
+    aws_profile: hs3.AwsProfile = None,
+) -> pd.DataFrame:
+    """
+    Load the manifest stored by `update_parquet_dataset_manifest()`.
+
+    The dataset is not listed, so the files written after the last update
+    of the manifest are not visible.
+
+    :param dir_name: path to a Parquet dataset dir
+    :param aws_profile: AWS profile to use if and only if using an S3 path
+    :return: manifest with one row per row group
+    """
+    dir_name, filesystem = _get_manifest_filesystem(dir_name, aws_profile)
+    manifest = _load_parquet_dataset_manifest(dir_name, filesystem)
+    return manifest
+
+
+def _load_parquet_dataset_manifest(
+    dir_name: str, filesystem: pafs.FileSystem
+) -> pd.DataFrame:
+    """
+    Implement `get_parquet_dataset_manifest()` for a pyarrow filesystem.
+    """
+    manifest_path = os.path.join(dir_name, _MANIFEST_FILE_NAME)
+    hdbg.dassert_eq(
+        filesystem.get_file_info(manifest_path).type,
+        pafs.FileType.File,
+        "No manifest in '%s': call `update_parquet_dataset_manifest()` first",
+        dir_name,
+    )
+    manifest = pq.read_table(manifest_path, filesystem=filesystem).to_pandas()
+    return manifest
+
+
+def _get_manifest_mask(
+    manifest: pd.DataFrame, column: str, op: str, value: Any
+) -> pd.Series:
+    """
+    Return the manifest rows that might contain data matching a condition.
+    """
+    min_column = f"min.{column}"
+    max_column = f"max.{column}"
+    if column in manifest.columns:
+        # The condition is on a partition column, so it's evaluated exactly.
+        values = manifest[column]
+        if op in ("=", "=="):
+            mask = values == value
+        elif op == "!=":
+            mask = values != value
+        elif op == "<":
+            mask = values < value
+        elif op == "<=":
+            mask = values <= value
+        elif op == ">":
+            mask = values > value
+        elif op == ">=":
+            mask = values >= value
+        elif op == "in":
+            mask = values.isin(value)
+        elif op == "not in":
+            mask = ~values.isin(value)
+        else:
+            raise ValueError(f"Invalid op='{op}'")
+        # Files outside the partition can't be pruned.
+        mask |= values.isna()
+    elif min_column in manifest.columns:
+        # The condition is on a column with statistics, so a row group is
+        # kept if its [min, max] range intersects the condition.
+        mins = manifest[min_column]
+        maxs = manifest[max_column]
+        if op in ("=", "=="):
+            mask = (mins <= value) & (value <= maxs)
+        elif op == "<":
+            mask = mins < value
+        elif op == "<=":
+            mask = mins <= value
+        elif op == ">":
+            mask = maxs > value
+        elif op == ">=":
+            mask = maxs >= value
+        elif op == "in":
+            mask = pd.Series(False, index=manifest.index)
+            for value_ in value:
+                mask |= (mins <= value_) & (value_ <= maxs)
+        else:
+            # E.g., `!=` can't be decided from the range.
+            mask = pd.Series(True, index=manifest.index)
+        mask |= mins.isna() | maxs.isna()
+    else:
+        mask = pd.Series(True, index=manifest.index)
+    return mask
+
+
+def prune_parquet_dataset_manifest(
+    manifest: pd.DataFrame,
+    filters: Optional[Union[ParquetAndFilter, ParquetOrAndFilter]],
+) -> pd.DataFrame:
+    """
+    Keep the manifest rows that might contain data matching the filters.
+
+    The pruning is conservative, i.e. the data in the remaining row groups
+    still needs to be filtered.
+
+    :param manifest: manifest from `get_parquet_dataset_manifest()`
+    :param filters: Parquet filters in the format used by `from_parquet()`
+    :return: pruned manifest
+    """
+    if not filters:
+        return manifest
+    if isinstance(filters[0], tuple):
+        # Convert an AND filter into an OR-AND one.
+        filters = [filters]
+    mask = pd.Series(False, index=manifest.index)
+    for and_filter in filters:
+        and_mask = pd.Series(True, index=manifest.index)
+        for column, op, value in and_filter:
+            and_mask &= _get_manifest_mask(manifest, column, op, value)
+        mask |= and_mask
+    _LOG.debug(
+        "Kept %s row groups",
+        hprint.perc(int(mask.sum()), manifest.shape[0]),
+    )
+    return manifest[mask]
+
+
+def _read_table_with_manifest(
+    dir_name: str,
+    filesystem: Optional[Any],
+    columns: Optional[List[str]],
+    filters: Optional[List[Any]],
+    schema: Optional[List[Tuple[str, pa.DataType]]],
+) -> pa.Table:
+    """
+    Read a Parquet dataset opening only the row groups that can match the
+    filters.
+
+    See `from_parquet()` for params description.
+    """
+    filesystem = _get_pyarrow_filesystem(filesystem)
+    dir_name = dir_name.rstrip("/")
+    manifest = _load_parquet_dataset_manifest(dir_name, filesystem)
+    hdbg.dassert_lt(0, manifest.shape[0], "Empty dataset '%s'", dir_name)
+    # Discover the dataset schema and the partitions from the file paths in
+    # the manifest, like `from_parquet()` does from the listed files, so that
+    # the partition columns have the same types, e.g., `int32` or `string` for
+    # values that don't fit.
+    if schema is not None:
+        # Pass partition columns types explicitly.
+        schema = pa.schema(schema)
+    partitioning = ds.partitioning(schema, flavor="hive")
+    options = ds.FileSystemFactoryOptions(partition_base_dir=dir_name)
+    if isinstance(partitioning, ds.Partitioning):
+        options.partitioning = partitioning
+    else:
+        options.partitioning_factory = partitioning
+    file_paths = [
+        os.path.join(dir_name, file_path)
+        for file_path in manifest["file_path"].unique()
+    ]
+    file_format = ds.ParquetFileFormat()
+    factory = ds.FileSystemDatasetFactory(
+        filesystem, file_paths, file_format, options
+    )
+    discovered_dataset = factory.finish()
+    dataset_schema = discovered_dataset.schema
+    partition_expressions = {
+        fragment.path: fragment.partition_expression
+        for fragment in discovered_dataset.get_fragments()
+    }
+    # Build a fragment for each file with the row groups that survived pruning.
+    manifest = prune_parquet_dataset_manifest(manifest, filters)
+    fragments = []
+    for file_path, file_manifest in manifest.groupby("file_path", sort=False):
+        file_path = os.path.join(dir_name, file_path)
+        fragment = file_format.make_fragment(
+            file_path,
+            filesystem=filesystem,
+            partition_expression=partition_expressions[file_path],
+            row_groups=file_manifest["row_group"].tolist(),
+        )
+        fragments.append(fragment)
+    dataset = ds.FileSystemDataset(
+        fragments, dataset_schema, file_format, filesystem
+    )
+    # Read also the index columns, like `pq.ParquetDataset.read_pandas()`.
+    if columns:
+        hdbg.dassert_is_subset(columns, dataset_schema.names)
+        pandas_metadata = dataset_schema.pandas_metadata or {}
+        index_columns = [
+            column
+            for column in pandas_metadata.get("index_columns", [])
+            if isinstance(column, str) and column not in columns
+        ]
+        columns = columns + index_columns
+    expression = None if not filters else pq.filters_to_expression(filters)
+    table = dataset.to_table(columns=columns, filter=expression)
+    return table
+
+
 # TODO(gp): @Nikola add light unit tests for `by_year_week` and for additional_filter.
 # TODO(gp): Can we return a single type?
 def get_parquet_filters_from_timestamp_interval(
@@ -824,6 +1359,7 @@ def to_partitioned_parquet(
     dst_dir: str,
     *,
     aws_profile: hs3.AwsProfile = None,
+    update_manifest: bool = False,
 ) -> None:
     """
     Save the given dataframe as Parquet file partitioned along the given
@@ -833,6 +1369,8 @@ def to_partitioned_parquet(
     :param partition_columns: partitioning columns
     :param dst_dir: location of partitioned dataset
     :param aws_profile: the name of an AWS profile or a s3fs filesystem
+    :param update_manifest: update the dataset manifest after writing (see
+        `update_parquet_dataset_manifest()`)
 
     E.g., in case of partition using `date`, the file layout looks like:
     ```
@@ -890,6 +1428,8 @@ def to_partitioned_parquet(
             partition_cols=partition_columns,
             filesystem=filesystem,
         )
+    if update_manifest:
+        update_parquet_dataset_manifest(dst_dir, aws_profile=aws_profile)
 
 
 def list_and_merge_pq_files(
@@ -941,6 +1481,12 @@ def list_and_merge_pq_files(
     else:
         # For local filesystem, use glob.glob
         parquet_files = glob.glob(f"{root_dir}/**/*.parquet", recursive=True)
+    # Skip the files that are not part of the dataset, e.g., the manifest.
+    parquet_files = [
+        file_path
+        for file_path in parquet_files
+        if not os.path.basename(file_path).startswith(_IGNORED_PREFIXES)
+    ]
     _LOG.debug("Parquet files: '%s'", parquet_files)
     # Get paths only to the lowest level of dataset folders.
     dataset_folders = set(f.rsplit("/", 1)[0] for f in parquet_files)
@@ -462,6 +462,13 @@ def get_latest_pq_in_s3_dir(s3_path: str, aws_profile: str) -> str:
     hdbg.dassert_type_is(aws_profile, str)
     s3fs_ = get_s3fs(aws_profile)
     pq_files = s3fs_.glob(f"{s3_path}/**.parquet", detail=True)
+    # Skip the files that are not part of the dataset, e.g., the manifest
+    # `_manifest.parquet`.
+    pq_files = {
+        path: info
+        for path, info in pq_files.items()
+        if not os.path.basename(path).startswith((".", "_"))
+    }
     # Sort the files by the date they were modified for the last time.
     sorted_files = sorted(
         pq_files.items(), key=lambda t: t[1]["LastModified"], reverse=True
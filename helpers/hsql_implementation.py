@@ -10,7 +10,19 @@ import logging
 import os
 import re
 import time
-from typing import Any, Dict, List, Optional, Tuple, Union, cast
+import uuid
+import weakref
+from typing import (
+    Any,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+    cast,
+)
 
 import pandas as pd
 import psycopg2 as psycop
@@ -382,6 +394,38 @@ def get_table_names(connection: DbConnection) -> List[str]:
     return tables
 
 
+# Cache of the table names per DB connection used to validate the table before
+# inserting data, without querying the DB catalog at every insert.
+_TABLE_NAMES_CACHE: "weakref.WeakKeyDictionary[DbConnection, Set[str]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def dassert_table_exists(connection: DbConnection, table_name: str) -> None:
+    """
+    Check that a table exists using the cached table names.
+
+    The cache is refreshed when the table is not found, so that tables created
+    after the table names are cached are found. Tables dropped through
+    another connection are not detected and the query using the table fails.
+
+    :param connection: database connection
+    :param table_name: table name
+    """
+    table_names = _TABLE_NAMES_CACHE.get(connection)
+    if table_names is None or table_name not in table_names:
+        table_names = set(get_table_names(connection))
+        _TABLE_NAMES_CACHE[connection] = table_names
+    hdbg.dassert_in(table_name, table_names)
+
+
+def clear_table_names_cache(connection: DbConnection) -> None:
+    """
+    Clear the cached table names for a connection.
+    """
+    _TABLE_NAMES_CACHE.pop(connection, None)
+
+
 def get_tables_size(
     connection: DbConnection,
     only_public: bool = True,
@@ -526,6 +570,7 @@ def remove_table(
     if cascade:
         query = " ".join([query, "CASCADE"])
     connection.cursor().execute(query)
+    clear_table_names_cache(connection)
 
 
 def remove_all_tables(connection: DbConnection, cascade: bool = False) -> None:
@@ -599,6 +644,54 @@ def execute_query_to_df(
 # #############################################################################
 
 
+def execute_query_to_df_in_chunks(
+    connection: DbConnection,
+    query: str,
+    chunk_size: int,
+) -> Iterator[pd.DataFrame]:
+    """
+    Execute a query and return the results in chunks.
+
+    The rows are streamed from the DB through a named server-side cursor, so
+    that only `chunk_size` rows are held in memory at once, instead of the
+    entire result set like in `execute_query_to_df()`.
+
+    :param connection: connection to the DB
+    :param query: query to execute
+    :param chunk_size: number of rows per chunk
+    :return: iterator over dfs with at most `chunk_size` rows
+    """
+    hdbg.dassert_lte(1, chunk_size)
+    # Named cursors are server-side cursors, which exist only inside a
+    # transaction. A cursor held across transactions (i.e., `WITH HOLD`) would
+    # be materialized by Postgres when the transaction commits, so with a
+    # connection in autocommit mode we run the cursor in an explicit
+    # transaction, which is ended when the iteration is over.
+    autocommit = connection.autocommit
+    if autocommit:
+        connection.autocommit = False
+    cursor_name = f"chunked_query_{uuid.uuid4().hex}"
+    try:
+        with connection.cursor(name=cursor_name) as cursor:
+            cursor.itersize = chunk_size
+            cursor.execute(query)
+            columns = None
+            while True:
+                rows = cursor.fetchmany(chunk_size)
+                if not rows:
+                    break
+                if columns is None:
+                    # The description is available only after the first fetch.
+                    columns = [desc[0] for desc in cursor.description]
+                yield pd.DataFrame(rows, columns=columns)
+    finally:
+        if autocommit:
+            # End the transaction started for the cursor, which only reads
+            # data, and restore the connection mode.
+            connection.rollback()
+            connection.autocommit = True
+
+
 def csv_to_series(csv_as_txt: str, sep: str = ",") -> pd.Series:
     """
     Convert a text with (key, value) separated by `sep` into a `pd.Series`.
@@ -637,7 +730,7 @@ def copy_rows_with_copy_from(
     :param table_name: name of the table for insertion
     """
     # The target table needs to exist.
-    hdbg.dassert_in(table_name, get_table_names(connection))
+    dassert_table_exists(connection, table_name)
     # Read the data.
     buffer = io.StringIO()
     df.to_csv(buffer, index=False, header=False)
@@ -714,7 +807,7 @@ def execute_insert_query(
     else:
         df = obj
     hdbg.dassert_isinstance(df, pd.DataFrame)
-    hdbg.dassert_in(table_name, get_table_names(connection))
+    dassert_table_exists(connection, table_name)
     _LOG.debug("df=\n%s", hpandas.df_to_str(df, use_tabulate=False))
     # Transform dataframe into list of tuples.
     values = [tuple(v) for v in df.to_numpy()]
@@ -749,7 +842,7 @@ def execute_insert_on_conflict_do_nothing_query(
     else:
         df = obj
     hdbg.dassert_isinstance(df, pd.DataFrame)
-    hdbg.dassert_in(table_name, get_table_names(connection))
+    dassert_table_exists(connection, table_name)
     _LOG.debug("df=\n%s", hpandas.df_to_str(df, use_tabulate=False))
     # Transform dataframe into list of tuples.
     values = [tuple(v) for v in df.to_numpy()]
@@ -777,6 +870,175 @@ def execute_insert_on_conflict_do_nothing_query(
         raise e
 
 
+def create_copy_merge_query(
+    columns: List[str],
+    table_name: str,
+    staging_table_name: str,
+    unique_columns: List[str],
+    on_conflict: str,
+) -> str:
+    """
+    Create a query to insert the data from a staging table into a table.
+
+    :param columns: columns to insert
+    :param table_name: name of the table for insertion
+    :param staging_table_name: name of the table with the data to insert
+    :param unique_columns: set of columns which should be unique record-wise
+    :param on_conflict: what to do when a unique constraint is violated
+        - "do_nothing": keep the existing row
+        - "update": update the existing row with the new values
+    :return: sql query, e.g.,
+        ```
+        INSERT INTO ccxt_ohlcv_spot(timestamp,open,currency_pair)
+        SELECT timestamp,open,currency_pair FROM ccxt_ohlcv_spot_staging
+        ON CONFLICT (timestamp,currency_pair) DO UPDATE SET open = EXCLUDED.open
+        ```
+    """
+    hdbg.dassert_in(on_conflict, ["do_nothing", "update"])
+    hdbg.dassert_lt(0, len(unique_columns))
+    hdbg.dassert_is_subset(unique_columns, columns)
+    columns_str = ",".join(columns)
+    unique_columns_str = ",".join(unique_columns)
+    update_columns = [col for col in columns if col not in unique_columns]
+    if on_conflict == "update" and update_columns:
+        updates = ", ".join(f"{col} = EXCLUDED.{col}" for col in update_columns)
+        conflict_action = f"DO UPDATE SET {updates}"
+    else:
+        conflict_action = "DO NOTHING"
+    query = (
+        f"INSERT INTO {table_name}({columns_str}) "
+        f"SELECT {columns_str} FROM {staging_table_name} "
+        f"ON CONFLICT ({unique_columns_str}) {conflict_action}"
+    )
+    _LOG.debug("query=%s", query)
+    return query
+
+
+def execute_copy_insert_query(
+    connection: DbConnection,
+    df: pd.DataFrame,
+    table_name: str,
+    *,
+    unique_columns: Optional[List[str]] = None,
+    on_conflict: Optional[str] = None,
+) -> None:
+    """
+    Insert a df into the database using `COPY`.
+
+    The data is serialized as CSV in a single pass and streamed to the DB,
+    instead of being converted into a Python tuple per row like in
+    `execute_insert_query()`.
+
+    If `on_conflict` is not None, the data is copied into a temporary staging
+    table and then merged into the target table with an `INSERT ... ON
+    CONFLICT`.
+
+    :param connection: connection to the DB
+    :param df: data to insert
+    :param table_name: name of the table for insertion
+    :param unique_columns: set of columns which should be unique record-wise,
+        required if `on_conflict` is not None
+    :param on_conflict: what to do when a unique constraint is violated
+        - None: insert the data directly, raising if a constraint is violated
+        - "do_nothing", "update": see `create_copy_merge_query()`
+    """
+    hdbg.dassert_isinstance(df, pd.DataFrame)
+    dassert_table_exists(connection, table_name)
+    columns = list(df.columns)
+    columns_str = ",".join(columns)
+    # Serialize the data. Missing values are written as empty fields, which
+    # `COPY` interprets as NULL, like `None` in `execute_insert_query()`.
+    # A float NaN is instead inserted as 'NaN' by `execute_insert_query()`,
+    # so the NaNs of the float columns are written explicitly.
+    nan_columns = [
+        column
+        for column in columns
+        if pd.api.types.is_float_dtype(df[column]) and df[column].isna().any()
+    ]
+    if nan_columns:
+        df = df.copy(deep=False)
+        for column in nan_columns:
+            # Postgres parses "nan" and "inf" as float values, and the other
+            # values are formatted like in `to_csv()`.
+            df[column] = df[column].astype(str)
+    buffer = io.StringIO()
+    df.to_csv(buffer, index=False, header=False)
+    buffer.seek(0)
+    try:
+        with connection.cursor() as cursor:
+            if on_conflict is None:
+                # Copy the data directly into the target table.
+                copy_query = (
+                    f"COPY {table_name}({columns_str}) FROM STDIN "
+                    "WITH (FORMAT csv)"
+                )
+                cursor.copy_expert(copy_query, buffer)
+            else:
+                # Use a unique name qualified with the temporary schema of the
+                # session, so that a permanent table is never shadowed or
+                # dropped, and concurrent inserts don't share a staging table.
+                staging_table_name = f"pg_temp.copy_staging_{uuid.uuid4().hex}"
+                merge_query = create_copy_merge_query(
+                    columns,
+                    table_name,
+                    staging_table_name,
+                    unique_columns or [],
+                    on_conflict,
+                )
+                # Create a staging table with only the columns to insert, so
+                # that the constraints of the other columns are not copied.
+                # Temporary tables are visible only to the current session.
+                cursor.execute(
+                    f"CREATE TEMP TABLE {staging_table_name} AS "
+                    f"SELECT {columns_str} FROM {table_name} WITH NO DATA"
+                )
+                copy_query = (
+                    f"COPY {staging_table_name}({columns_str}) FROM STDIN "
+                    "WITH (FORMAT csv)"
+                )
+                cursor.copy_expert(copy_query, buffer)
+                cursor.execute(merge_query)
+                cursor.execute(f"DROP TABLE {staging_table_name}")
+        connection.commit()
+    except Exception as e:
+        _LOG.error(
+            "Failed to copy data into '%s' with the '%s'",
+            table_name,
+            str(e),
+        )
+        connection.rollback()
+        raise e
+
+
+def execute_copy_insert_on_conflict_do_nothing_query(
+    connection: DbConnection,
+    df: pd.DataFrame,
+    table_name: str,
+    unique_columns: List[str],
+) -> None:
+    """
+    Insert a df into the database using `COPY`, skipping duplicates.
+
+    Same as `execute_insert_on_conflict_do_nothing_query()` but using
+    `execute_copy_insert_query()`.
+
+    :param connection: connection to the DB
+    :param df: data to insert
+    :param table_name: name of the table for insertion
+    :param unique_columns: set of columns which should be unique record-wise.
+       If unique_columns is an empty list, the data is inserted without the
+       UNIQUE constraint.
+    """
+    on_conflict = "do_nothing" if unique_columns else None
+    execute_copy_insert_query(
+        connection,
+        df,
+        table_name,
+        unique_columns=unique_columns,
+        on_conflict=on_conflict,
+    )
+
+
 def execute_query(connection: DbConnection, query: str) -> List[tuple]:
     """
     Use for generic simple operations.
@@ -1,7 +1,8 @@
 import logging
+import re
 import tempfile
 import time
-from typing import Any, Callable, Tuple
+from typing import Any, Callable, List, Tuple
 
 import numpy as np
 import pandas as pd
@@ -931,5 +932,143 @@ class TestCacheEnableCheckOnlyIfPresent1(_ResetGlobalCacheHelper):
         self._execute_and_check_state(f, cf, 2, 2, exp_cf_state=cache_from)
 
 
+# #############################################################################
+
+
+class TestCacheSizeBounds1(_ResetGlobalCacheHelper):
+    def get_cached_function(self, **cached_kwargs: Any) -> hcache._Cached:
+        """
+        Create a cached function using only the memory cache.
+        """
+        _, cf = self._get_f_cf_functions(use_disk_cache=False, **cached_kwargs)
+        return cf
+
+    @staticmethod
+    def get_entry_size(cf: hcache._Cached) -> int:
+        """
+        Return the size of the only value cached in memory for `cf`.
+        """
+        location = cf._memory_cached_func.store_backend.location
+        usage = hcache._CACHE_USAGES[location]
+        return usage.get_size_in_bytes()
+
+    def run_and_check(
+        self, cf: hcache._Cached, vals: List[int], exp_cached_vals: List[int]
+    ) -> None:
+        """
+        Call `cf(val, val)` for all `vals` and check which values stay cached.
+        """
+        for val in vals:
+            cf(val, val)
+        cf.enable_read_only(True)
+        cached_vals = []
+        for val in sorted(set(vals)):
+            try:
+                cf(val, val)
+                cached_vals.append(val)
+            except hcache.NotCachedValueException:
+                pass
+        self.assertEqual(cached_vals, exp_cached_vals)
+
+    def test_lru1(self) -> None:
+        """
+        Check that the least recently used value is evicted.
+        """
+        cf = self.get_cached_function()
+        cf(0, 0)
+        entry_size = self.get_entry_size(cf)
+        # Allow to store 2 values.
+        cf = self.get_cached_function(
+            mem_cache_max_bytes=int(2.5 * entry_size), eviction_policy="lru"
+        )
+        self.run_and_check(cf, [1, 1, 1, 2, 3], [2, 3])
+
+    def test_lfu1(self) -> None:
+        """
+        Check that the least frequently used value is evicted.
+        """
+        cf = self.get_cached_function()
+        cf(0, 0)
+        entry_size = self.get_entry_size(cf)
+        # Allow to store 2 values.
+        cf = self.get_cached_function(
+            mem_cache_max_bytes=int(2.5 * entry_size), eviction_policy="lfu"
+        )
+        self.run_and_check(cf, [1, 1, 1, 2, 3], [1, 3])
+
+    def test_global_bound1(self) -> None:
+        """
+        Check that the global bound evicts the values of all the functions.
+        """
+        cf1 = self.get_cached_function()
+
+        def subtract(x: int, y: int) -> int:
+            return x - y
+
+        cf2 = hcache._Cached(subtract, tag=self.cache_tag, use_disk_cache=False)
+        cf1(0, 0)
+        entry_size = self.get_entry_size(cf1)
+        # Allow to store 2 values across all the functions.
+        hcache.set_global_cache_max_bytes("mem", int(2.5 * entry_size))
+        try:
+            cf2(1, 1)
+            cf2(2, 2)
+        finally:
+            hcache.set_global_cache_max_bytes("mem", None)
+        # The least recently used value, i.e. the one of `cf1`, is evicted.
+        self.assertIn("evictions=1", cf1.get_function_cache_info())
+        self.assertIn("evictions=0", cf2.get_function_cache_info())
+
+    def test_seed_from_store1(self) -> None:
+        """
+        Check that the values already in the store count toward the bound.
+        """
+        cf = self.get_cached_function()
+        for val in [0, 1, 2]:
+            cf(val, val)
+        location = cf._memory_cached_func.store_backend.location
+        entry_size = hcache._CACHE_USAGES[location].get_size_in_bytes() // 3
+        # Simulate a new session by forgetting the usage of the store.
+        hcache._reset_cache_usages(location)
+        # Allow to store 2 values, without clearing the store.
+        cf = hcache._Cached(
+            _get_add_function(),
+            tag=self.cache_tag,
+            use_disk_cache=False,
+            mem_cache_max_bytes=int(2.5 * entry_size),
+            eviction_policy="lru",
+        )
+        cf(3, 3)
+        # The 2 least recently used values from the store are evicted.
+        cf.enable_read_only(True)
+        cached_vals = []
+        for val in [0, 1, 2, 3]:
+            try:
+                cf(val, val)
+                cached_vals.append(val)
+            except hcache.NotCachedValueException:
+                pass
+        self.assertEqual(cached_vals, [2, 3])
+
+    def test_get_function_cache_info1(self) -> None:
+        """
+        Check the counters reported for a function.
+        """
+        cf = self.get_cached_function()
+        cf(0, 0)
+        entry_size = self.get_entry_size(cf)
+        cf = self.get_cached_function(mem_cache_max_bytes=int(1.5 * entry_size))
+        for val in [1, 1, 2]:
+            cf(val, val)
+        actual = cf.get_function_cache_info()
+        # Remove the sizes since they depend on the serialization.
+        actual = re.sub(r" size=.* max_size=.*", "", actual)
+        expected = r"""
+        has function-specific cache=False
+        mem cache: hits=1 misses=2 evictions=1
+        disk cache: hits=0 misses=0 evictions=0
+        """
+        self.assert_equal(actual, expected, fuzzy_match=True)
+
+
 # TODO(gp): Add a test for verbose mode in __call__
-# TODO(gp): get_function_cache_info
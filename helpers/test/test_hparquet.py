@@ -2,6 +2,7 @@ import datetime
 import logging
 import os
 import random
+import shutil
 from typing import Any, List, Optional, Tuple
 
 import pandas as pd
@@ -1333,3 +1334,213 @@ class TestBuildFilterWithOnlyEqualities(hunitest.TestCase):
         actual = str(filters)
         expected = r"[]"
         self.assert_equal(actual, expected)
+
+
+# #############################################################################
+
+
+class TestParquetDatasetManifest1(hunitest.TestCase):
+    @staticmethod
+    def write_tile(dir_name: str, asset_id: int, year: int, month: int) -> None:
+        """
+        Write a tile with 1 day of hourly data split into 2 row groups.
+        """
+        index = pd.date_range(
+            pd.Timestamp(year=year, month=month, day=1, tz="UTC"),
+            periods=24,
+            freq="H",
+            name="timestamp",
+        )
+        df = pd.DataFrame({"close": range(24)}, index=index)
+        tile_dir = os.path.join(
+            dir_name, f"asset_id={asset_id}", f"year={year}", f"month={month}"
+        )
+        os.makedirs(tile_dir, exist_ok=True)
+        table = pyarrow.Table.from_pandas(df)
+        parquet.write_table(
+            table, os.path.join(tile_dir, "data.parquet"), row_group_size=12
+        )
+
+    def get_dataset(self) -> str:
+        dir_name = os.path.join(self.get_scratch_space(), "data.parquet")
+        for asset_id in [100, 200]:
+            for month in [1, 2]:
+                self.write_tile(dir_name, asset_id, 2022, month)
+        return dir_name
+
+    @staticmethod
+    def manifest_to_str(manifest: pd.DataFrame) -> str:
+        # Drop the columns that depend on the file system.
+        manifest = manifest.drop(columns=["file_size", "file_mtime_ns"])
+        return hpandas.df_to_str(manifest, num_rows=None)
+
+    def test_get_manifest1(self) -> None:
+        """
+        Check that the manifest contains the partitions and the statistics of
+        each row group.
+        """
+        dir_name = self.get_dataset()
+        manifest = hparque.update_parquet_dataset_manifest(dir_name)
+        actual = self.manifest_to_str(manifest)
+        expected = r"""
+                                   file_path  row_group  num_rows  asset_id  year  month             min.timestamp             max.timestamp
+        0  asset_id=100/year=2022/month=1/data.parquet          0        12       100  2022      1 2022-01-01 00:00:00+00:00 2022-01-01 11:00:00+00:00
+        1  asset_id=100/year=2022/month=1/data.parquet          1        12       100  2022      1 2022-01-01 12:00:00+00:00 2022-01-01 23:00:00+00:00
+        2  asset_id=100/year=2022/month=2/data.parquet          0        12       100  2022      2 2022-02-01 00:00:00+00:00 2022-02-01 11:00:00+00:00
+        3  asset_id=100/year=2022/month=2/data.parquet          1        12       100  2022      2 2022-02-01 12:00:00+00:00 2022-02-01 23:00:00+00:00
+        4  asset_id=200/year=2022/month=1/data.parquet          0        12       200  2022      1 2022-01-01 00:00:00+00:00 2022-01-01 11:00:00+00:00
+        5  asset_id=200/year=2022/month=1/data.parquet          1        12       200  2022      1 2022-01-01 12:00:00+00:00 2022-01-01 23:00:00+00:00
+        6  asset_id=200/year=2022/month=2/data.parquet          0        12       200  2022      2 2022-02-01 00:00:00+00:00 2022-02-01 11:00:00+00:00
+        7  asset_id=200/year=2022/month=2/data.parquet          1        12       200  2022      2 2022-02-01 12:00:00+00:00 2022-02-01 23:00:00+00:00
+        """
+        self.assert_equal(actual, expected, fuzzy_match=True)
+
+    def test_update1(self) -> None:
+        """
+        Check that the stored manifest picks up new tiles only when updated.
+        """
+        dir_name = self.get_dataset()
+        hparque.update_parquet_dataset_manifest(dir_name)
+        # Add a new tile.
+        self.write_tile(dir_name, 100, 2022, 3)
+        # The stored manifest is used as is.
+        manifest = hparque.get_parquet_dataset_manifest(dir_name)
+        self.assertEqual(manifest.shape[0], 8)
+        # The new tile is added to the manifest.
+        manifest = hparque.update_parquet_dataset_manifest(dir_name)
+        self.assertEqual(manifest.shape[0], 10)
+        self.assertEqual(
+            manifest["file_path"].iloc[4],
+            "asset_id=100/year=2022/month=3/data.parquet",
+        )
+        # The updated manifest is stored.
+        manifest = hparque.get_parquet_dataset_manifest(dir_name)
+        self.assertEqual(manifest.shape[0], 10)
+
+    def test_update2(self) -> None:
+        """
+        Check that an incremental update lists only the last time partitions
+        and the new ones.
+        """
+        dir_name = self.get_dataset()
+        hparque.update_parquet_dataset_manifest(dir_name)
+        # Add a file to an old and to the last time partition.
+        for month in [1, 2]:
+            tile_dir = os.path.join(
+                dir_name, "asset_id=200", "year=2022", f"month={month}"
+            )
+            shutil.copy(
+                os.path.join(tile_dir, "data.parquet"),
+                os.path.join(tile_dir, "data2.parquet"),
+            )
+        # Only the file in the last time partition is added.
+        manifest = hparque.update_parquet_dataset_manifest(dir_name)
+        self.assertEqual(manifest.shape[0], 10)
+        self.assertNotIn(
+            "asset_id=200/year=2022/month=1/data2.parquet",
+            manifest["file_path"].tolist(),
+        )
+        self.assertIn(
+            "asset_id=200/year=2022/month=2/data2.parquet",
+            manifest["file_path"].tolist(),
+        )
+        # A full update lists all the partitions.
+        manifest = hparque.update_parquet_dataset_manifest(
+            dir_name, incremental=False
+        )
+        self.assertEqual(manifest.shape[0], 12)
+
+    def test_prune1(self) -> None:
+        """
+        Check pruning on a partition column and a column with statistics.
+        """
+        dir_name = self.get_dataset()
+        manifest = hparque.update_parquet_dataset_manifest(dir_name)
+        filters = [
+            ("asset_id", "in", [200]),
+            ("timestamp", ">=", pd.Timestamp("2022-01-01 15:00:00+00:00")),
+            ("timestamp", "<=", pd.Timestamp("2022-02-01 05:00:00+00:00")),
+        ]
+        manifest = hparque.prune_parquet_dataset_manifest(manifest, filters)
+        actual = str(manifest[["file_path", "row_group"]].values.tolist())
+        expected = r"""
+        [['asset_id=200/year=2022/month=1/data.parquet', 1], ['asset_id=200/year=2022/month=2/data.parquet', 0]]
+        """
+        self.assert_equal(actual, expected, fuzzy_match=True)
+
+    def test_from_parquet1(self) -> None:
+        """
+        Check that reading with and without the manifest returns the same data.
+        """
+        dir_name = self.get_dataset()
+        hparque.update_parquet_dataset_manifest(dir_name)
+        filters_list = [
+            None,
+            [("year", "==", 2022), ("month", "==", 2)],
+            [[("asset_id", "=", 100)], [("month", "=", 1)]],
+            [
+                ("asset_id", "in", [200]),
+                ("timestamp", ">=", pd.Timestamp("2022-01-01 15:00:00+00:00")),
+                ("timestamp", "<=", pd.Timestamp("2022-02-01 05:00:00+00:00")),
+            ],
+            [("asset_id", "==", 300)],
+        ]
+        for columns in [None, ["close", "asset_id"]]:
+            for filters in filters_list:
+                expected = hparque.from_parquet(
+                    dir_name, columns=columns, filters=filters
+                )
+                actual = hparque.from_parquet(
+                    dir_name, columns=columns, filters=filters, use_manifest=True
+                )
+                pd.testing.assert_frame_equal(actual, expected)
+
+    def test_from_parquet2(self) -> None:
+        """
+        Check that reading doesn't build the manifest.
+        """
+        dir_name = self.get_dataset()
+        with self.assertRaises(AssertionError):
+            hparque.from_parquet(dir_name, use_manifest=True)
+        manifest_path = os.path.join(dir_name, "_manifest.parquet")
+        self.assertFalse(os.path.exists(manifest_path))
+
+    def test_from_parquet3(self) -> None:
+        """
+        Check reading with the manifest partitions with values that don't fit
+        `int32`, e.g., real asset ids.
+        """
+        dir_name = os.path.join(self.get_scratch_space(), "data.parquet")
+        for asset_id in [100, 3065029174]:
+            self.write_tile(dir_name, asset_id, 2022, 1)
+        hparque.update_parquet_dataset_manifest(dir_name)
+        filters_list = [
+            None,
+            [("timestamp", ">=", pd.Timestamp("2022-01-01 15:00:00+00:00"))],
+        ]
+        for filters in filters_list:
+            expected = hparque.from_parquet(dir_name, filters=filters)
+            actual = hparque.from_parquet(
+                dir_name, filters=filters, use_manifest=True
+            )
+            pd.testing.assert_frame_equal(actual, expected)
+            self.assertEqual(
+                sorted(actual["asset_id"].unique()), ["100", "3065029174"]
+            )
+
+    def test_list_and_merge1(self) -> None:
+        """
+        Check that merging the files of a dataset skips the manifest.
+        """
+        dir_name = self.get_dataset()
+        tile_dir = os.path.join(dir_name, "asset_id=100", "year=2022", "month=2")
+        shutil.copy(
+            os.path.join(tile_dir, "data.parquet"),
+            os.path.join(tile_dir, "data2.parquet"),
+        )
+        hparque.update_parquet_dataset_manifest(dir_name)
+        hparque.list_and_merge_pq_files(dir_name)
+        self.assertEqual(os.listdir(tile_dir), ["data.parquet"])
+        # The merged tile is stored in a single row group.
+        manifest = hparque.update_parquet_dataset_manifest(dir_name)
+        self.assertEqual(manifest.shape[0], 7)
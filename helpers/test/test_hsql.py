@@ -1,4 +1,10 @@
+import unittest.mock as umock
+
+import numpy as np
+import pandas as pd
+
 import helpers.hsql as hsql
+import helpers.hsql_implementation as hsqlimpl
 import helpers.hunit_test as hunitest
 
 
@@ -22,3 +28,90 @@ class TestCreateInOperator(hunitest.TestCase):
         actual = hsql.create_in_operator(values, column)
         expected = "exchange_id IN ('ftx')"
         self.assertEqual(actual, expected)
+
+
+class TestCreateCopyMergeQuery(hunitest.TestCase):
+    def test1(self) -> None:
+        """
+        Test creating a query ignoring the duplicates.
+        """
+        columns = ["timestamp", "open", "currency_pair"]
+        unique_columns = ["timestamp", "currency_pair"]
+        actual = hsql.create_copy_merge_query(
+            columns, "ohlcv", "ohlcv_staging", unique_columns, "do_nothing"
+        )
+        expected = (
+            "INSERT INTO ohlcv(timestamp,open,currency_pair) "
+            "SELECT timestamp,open,currency_pair FROM ohlcv_staging "
+            "ON CONFLICT (timestamp,currency_pair) DO NOTHING"
+        )
+        self.assertEqual(actual, expected)
+
+    def test2(self) -> None:
+        """
+        Test creating a query updating the duplicates.
+        """
+        columns = ["timestamp", "open", "close", "currency_pair"]
+        unique_columns = ["timestamp", "currency_pair"]
+        actual = hsql.create_copy_merge_query(
+            columns, "ohlcv", "ohlcv_staging", unique_columns, "update"
+        )
+        expected = (
+            "INSERT INTO ohlcv(timestamp,open,close,currency_pair) "
+            "SELECT timestamp,open,close,currency_pair FROM ohlcv_staging "
+            "ON CONFLICT (timestamp,currency_pair) "
+            "DO UPDATE SET open = EXCLUDED.open, close = EXCLUDED.close"
+        )
+        self.assertEqual(actual, expected)
+
+
+class TestDassertTableExists(hunitest.TestCase):
+    def test1(self) -> None:
+        """
+        Test that the table names are queried only when a table is not cached.
+        """
+        connection = umock.MagicMock()
+        with umock.patch.object(
+            hsqlimpl, "get_table_names", return_value=["table1"]
+        ) as get_table_names:
+            hsql.dassert_table_exists(connection, "table1")
+            hsql.dassert_table_exists(connection, "table1")
+            self.assertEqual(get_table_names.call_count, 1)
+            # A table created after caching is found by refreshing the cache.
+            get_table_names.return_value = ["table1", "table2"]
+            hsql.dassert_table_exists(connection, "table2")
+            self.assertEqual(get_table_names.call_count, 2)
+            # A missing table is reported.
+            with self.assertRaises(AssertionError):
+                hsql.dassert_table_exists(connection, "table3")
+            # Removing a table clears the cache.
+            hsql.remove_table(connection, "table2")
+            hsql.dassert_table_exists(connection, "table1")
+            self.assertEqual(get_table_names.call_count, 4)
+
+
+class TestExecuteCopyInsertQuery(hunitest.TestCase):
+    def test1(self) -> None:
+        """
+        Test that the float NaNs are copied as 'NaN' and `None` as NULL.
+        """
+        df = pd.DataFrame(
+            {
+                "id": [1, 2, 3],
+                "value": [1.5, np.nan, np.inf],
+                "name": ["a", None, "c"],
+            }
+        )
+        connection = umock.MagicMock()
+        cursor = connection.cursor.return_value.__enter__.return_value
+        copied_data = []
+        cursor.copy_expert.side_effect = lambda query, buffer: (
+            copied_data.append(buffer.getvalue())
+        )
+        with umock.patch.object(hsqlimpl, "dassert_table_exists"):
+            hsql.execute_copy_insert_query(connection, df, "table1")
+        # Check the copied data.
+        expected = "1,1.5,a\n2,nan,\n3,inf,c\n"
+        self.assertListEqual(copied_data, [expected])
+        # Check that the input df is not modified.
+        self.assertTrue(pd.api.types.is_float_dtype(df["value"]))
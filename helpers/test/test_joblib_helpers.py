@@ -3,6 +3,8 @@ import os
 import time
 from typing import Any, List, Optional, Union
 
+import numpy as np
+import pandas as pd
 import pytest
 
 import helpers.hjoblib as hjoblib
@@ -402,6 +404,135 @@ val1=4, val2=8, incremental=True, num_attempts=1, kwargs={'hello4': 'world8', 'g
             )
 
 
+# #############################################################################
+# Test_parallel_execute4
+# #############################################################################
+
+
+def df_workload_function(
+    val1: int,
+    #
+    **kwargs: Any,
+) -> Union[pd.DataFrame, int]:
+    """
+    Execute a test workload returning a dataframe or an int.
+    """
+    incremental = kwargs.pop("incremental")
+    num_attempts = kwargs.pop("num_attempts")
+    _ = incremental, num_attempts
+    if val1 == -1:
+        return val1
+    index = pd.date_range(
+        "2022-01-01 09:30", periods=3, freq="T", tz="America/New_York"
+    )
+    df = pd.DataFrame(
+        {"val1": [val1] * 3, "val2": [0.5, 1.5, np.nan], "str": ["a", "b", "c"]},
+        index=index,
+    )
+    return df
+
+
+def get_workload4() -> hjoblib.Workload:
+    """
+    Return a workload for `df_workload_function()` with 3 tasks.
+    """
+    tasks = [((i,), {}) for i in (0, 1, -1)]
+    workload: hjoblib.Workload = (
+        df_workload_function,
+        "df_workload_function",
+        tasks,
+    )
+    return workload
+
+
+class Test_parallel_execute4(hunitest.TestCase):
+    """
+    Transport the results of the tasks as Arrow IPC files.
+    """
+
+    def test_serial1(self) -> None:
+        num_threads = "serial"
+        backend = ""
+        self._run_test(num_threads, backend)
+
+    def test_parallel_loky1(self) -> None:
+        num_threads = "2"
+        backend = "loky"
+        self._run_test(num_threads, backend)
+
+    def test_parallel_threading1(self) -> None:
+        num_threads = "2"
+        backend = "threading"
+        self._run_test(num_threads, backend)
+
+    def test_parallel_asyncio_threading1(self) -> None:
+        num_threads = "2"
+        backend = "asyncio_threading"
+        self._run_test(num_threads, backend)
+
+    def test_zero_copy1(self) -> None:
+        """
+        Check that the columns that don't need a conversion are not copied.
+        """
+        workload = get_workload4()
+        scratch_dir = self.get_scratch_space()
+        log_file = os.path.join(scratch_dir, "log.txt")
+        res = hjoblib.parallel_execute(
+            workload,
+            False,
+            "serial",
+            True,
+            True,
+            1,
+            log_file,
+            result_transport="arrow_ipc",
+            result_transport_dir=os.path.join(scratch_dir, "results"),
+        )
+        # The integer column is a read-only view of the memory-mapped file.
+        self.assertFalse(res[0]["val1"].to_numpy().flags.writeable)
+        # The float column with missing values is converted.
+        self.assertTrue(res[0]["val2"].to_numpy().flags.writeable)
+
+    def _run_test(self, num_threads: Union[str, int], backend: str) -> None:
+        workload = get_workload4()
+        dry_run = False
+        incremental = True
+        abort_on_error = True
+        num_attempts = 1
+        scratch_dir = self.get_scratch_space()
+        log_file = os.path.join(scratch_dir, "log.txt")
+        result_transport_dir = os.path.join(scratch_dir, "results")
+        res = hjoblib.parallel_execute(
+            workload,
+            dry_run,
+            num_threads,
+            incremental,
+            abort_on_error,
+            num_attempts,
+            log_file,
+            backend=backend,
+            result_transport="arrow_ipc",
+            result_transport_dir=result_transport_dir,
+        )
+        # Check the results, which can be out of order with some backends.
+        self.assertEqual(len(res), 3)
+        dfs = [res_tmp for res_tmp in res if isinstance(res_tmp, pd.DataFrame)]
+        self.assertEqual(len(dfs), 2)
+        dfs = sorted(dfs, key=lambda df: df["val1"].iloc[0])
+        for val1, df in enumerate(dfs):
+            expected = df_workload_function(
+                val1, incremental=incremental, num_attempts=num_attempts
+            )
+            pd.testing.assert_frame_equal(df, expected)
+        # The results that are not dataframes are pickled.
+        others = [
+            res_tmp for res_tmp in res if not isinstance(res_tmp, pd.DataFrame)
+        ]
+        self.assertEqual(others, [-1])
+        # Check that the results have been removed.
+        self.assertEqual(os.listdir(result_transport_dir), [])
+
+
 # #############################################################################
 
 
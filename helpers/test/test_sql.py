@@ -1,6 +1,7 @@
 import logging
 import pprint
 
+import numpy as np
 import pandas as pd
 import psycopg2.errors as perrors
 import pytest
@@ -119,6 +120,124 @@ class TestSql1(imvcddbut.TestImDbHelper):
         # Delete the table.
         hsql.remove_table(self.connection, "test_table")
 
+    @pytest.mark.slow("16 seconds.")
+    def test_execute_copy_insert_query1(self) -> None:
+        """
+        Verify that the duplicates are skipped with `on_conflict="do_nothing"`.
+        """
+        self._create_test_table()
+        test_data = self._get_test_data()
+        hsql.execute_insert_query(self.connection, test_data, "test_table")
+        # Insert the updated rows and a new row.
+        new_data = self._get_new_data()
+        hsql.execute_copy_insert_query(
+            self.connection,
+            new_data,
+            "test_table",
+            unique_columns=["id"],
+            on_conflict="do_nothing",
+        )
+        # Check that only the new row is inserted.
+        df = hsql.execute_query_to_df(
+            self.connection, "SELECT * FROM test_table ORDER BY id"
+        )
+        self.assertListEqual(df["id"].tolist(), [1, 2, 3, 4, 5, 6])
+        expected = test_data["column_2"].tolist() + ["new_string_6"]
+        self.assertListEqual(df["column_2"].tolist(), expected)
+        # Delete the table.
+        hsql.remove_table(self.connection, "test_table")
+
+    @pytest.mark.slow("16 seconds.")
+    def test_execute_copy_insert_query2(self) -> None:
+        """
+        Verify that the duplicates are updated with `on_conflict="update"`.
+        """
+        self._create_test_table()
+        test_data = self._get_test_data()
+        hsql.execute_insert_query(self.connection, test_data, "test_table")
+        # Insert the updated rows and a new row.
+        new_data = self._get_new_data()
+        hsql.execute_copy_insert_query(
+            self.connection,
+            new_data,
+            "test_table",
+            unique_columns=["id"],
+            on_conflict="update",
+        )
+        # Check that the rows are updated and the new row is inserted.
+        df = hsql.execute_query_to_df(
+            self.connection, "SELECT * FROM test_table ORDER BY id"
+        )
+        self.assertListEqual(df["id"].tolist(), [1, 2, 3, 4, 5, 6])
+        expected = [
+            "test_string_1",
+            "test_string_2",
+            "test_string_3",
+            "new_string_4",
+            "new_string_5",
+            "new_string_6",
+        ]
+        self.assertListEqual(df["column_2"].tolist(), expected)
+        # Delete the table.
+        hsql.remove_table(self.connection, "test_table")
+
+    @pytest.mark.slow("16 seconds.")
+    def test_execute_copy_insert_query3(self) -> None:
+        """
+        Verify that NaNs and missing values are saved like with
+        `execute_insert_query()`.
+        """
+        test_data = pd.DataFrame(
+            {
+                "id": [1, 2, 3],
+                "value": [1.5, np.nan, np.inf],
+                "name": ["a", None, "c"],
+            }
+        )
+        for table_name in ["test_table_insert", "test_table_copy"]:
+            query = f"""CREATE TABLE IF NOT EXISTS {table_name}(
+                        id INT PRIMARY KEY,
+                        value DOUBLE PRECISION,
+                        name VARCHAR(255)
+                        )
+                        """
+            self.connection.cursor().execute(query)
+        hsql.execute_insert_query(
+            self.connection, test_data, "test_table_insert"
+        )
+        hsql.execute_copy_insert_query(
+            self.connection,
+            test_data,
+            "test_table_copy",
+            unique_columns=["id"],
+            on_conflict="do_nothing",
+        )
+        # Check that the NaN is saved as 'NaN', and `None` as NULL.
+        query = """SELECT
+                    id,
+                    value,
+                    value = 'NaN' AS is_nan,
+                    value IS NULL AS is_value_null,
+                    name IS NULL AS is_name_null
+                    FROM {} ORDER BY id"""
+        expected = hsql.execute_query_to_df(
+            self.connection, query.format("test_table_insert")
+        )
+        actual = hsql.execute_query_to_df(
+            self.connection, query.format("test_table_copy")
+        )
+        self.assert_equal(str(actual), str(expected))
+        self.assertListEqual(actual["is_nan"].tolist(), [False, True, False])
+        self.assertListEqual(
+            actual["is_value_null"].tolist(), [False, False, False]
+        )
+        self.assertListEqual(
+            actual["is_name_null"].tolist(), [False, True, False]
+        )
+        # Delete the tables.
+        hsql.remove_table(self.connection, "test_table_insert")
+        hsql.remove_table(self.connection, "test_table_copy")
+
     @pytest.mark.slow("9 seconds.")
     def test_duplicate_removal1(self) -> None:
         """
@@ -196,6 +315,34 @@ class TestSql1(imvcddbut.TestImDbHelper):
         )
         return test_data
 
+    @staticmethod
+    def _get_new_data() -> pd.DataFrame:
+        """
+        Get test data with rows conflicting with `_get_test_data()` and a new
+        row.
+        """
+        test_data = pd.DataFrame(
+            columns=["id", "column_1", "column_2"],
+            data=[
+                [
+                    4,
+                    2003,
+                    "new_string_4",
+                ],
+                [
+                    5,
+                    2004,
+                    "new_string_5",
+                ],
+                [
+                    6,
+                    2005,
+                    "new_string_6",
+                ],
+            ],
+        )
+        return test_data
+
     @staticmethod
     def _get_duplicated_data() -> pd.DataFrame:
         """
@@ -427,6 +427,7 @@ class CcxtHistoricalPqByTileClient(
         tag: str = "",
         aws_profile: Optional[str] = None,
         resample_1min: bool = False,
+        max_concurrent_reads: int = 8,
     ) -> None:
         """
         Constructor.
@@ -447,4 +448,5 @@ class CcxtHistoricalPqByTileClient(
             tag=tag,
             aws_profile=aws_profile,
             resample_1min=resample_1min,
+            max_concurrent_reads=max_concurrent_reads,
         )
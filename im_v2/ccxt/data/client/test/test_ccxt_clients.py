@@ -1800,6 +1800,8 @@ class TestCcxtHistoricalPqByTileClient1(icdc.ImClientTestCase):
             _infer_exchange_id='True' <bool>
             _partition_mode='by_year_month' <str>
             _aws_profile='ck' <str>
+            _max_concurrent_reads='8' <int>
+            _use_manifest='True' <bool>
             _dataset='ohlcv' <str>
             _contract_type='spot' <str>
             _data_snapshot='20220705' <str>
@@ -1816,7 +1818,7 @@ class TestCcxtHistoricalPqByTileClient1(icdc.ImClientTestCase):
         resample_1min = True
         im_client = self.get_im_client(resample_1min)
         expected_str = r"""
-        CcxtHistoricalPqByTileClient at 0x=(_vendor=CCXT <str>, _universe_version=small <str>, _resample_1min=True <bool>, _timestamp_col_name=timestamp <str>, _full_symbol_col_name=None <NoneType>, _asset_id_to_full_symbol_mapping={1467591036: 'binance::BTC_USDT', 2002879833: 'gateio::XRP_USDT', 3187272957: 'kucoin::ETH_USDT'} <dict>, _root_dir=s3://cryptokaizen-unit-test/outcomes/TestCcxtHistoricalPqByTileClient1/input/historical.manual.pq <str>, _infer_exchange_id=True <bool>, _partition_mode=by_year_month <str>, _aws_profile=ck <str>, _dataset=ohlcv <str>, _contract_type=spot <str>, _data_snapshot=20220705 <str>, _download_mode=periodic_daily <str>, _downloading_entity=airflow <str>, _version= <str>, _download_universe_version=v7_3 <str>, _tag= <str>, _data_format=parquet <str>)
+        CcxtHistoricalPqByTileClient at 0x=(_vendor=CCXT <str>, _universe_version=small <str>, _resample_1min=True <bool>, _timestamp_col_name=timestamp <str>, _full_symbol_col_name=None <NoneType>, _asset_id_to_full_symbol_mapping={1467591036: 'binance::BTC_USDT', 2002879833: 'gateio::XRP_USDT', 3187272957: 'kucoin::ETH_USDT'} <dict>, _root_dir=s3://cryptokaizen-unit-test/outcomes/TestCcxtHistoricalPqByTileClient1/input/historical.manual.pq <str>, _infer_exchange_id=True <bool>, _partition_mode=by_year_month <str>, _aws_profile=ck <str>, _max_concurrent_reads=8 <int>, _use_manifest=True <bool>, _dataset=ohlcv <str>, _contract_type=spot <str>, _data_snapshot=20220705 <str>, _download_mode=periodic_daily <str>, _downloading_entity=airflow <str>, _version= <str>, _download_universe_version=v7_3 <str>, _tag= <str>, _data_format=parquet <str>)
         """
         self.run_test_str(im_client, expected_str)
 
@@ -2271,6 +2273,8 @@ class TestCcxtHistoricalPqByTileClient2(icdc.ImClientTestCase):
         _infer_exchange_id='True' <bool>
         _partition_mode='by_year_month' <str>
         _aws_profile='ck' <str>
+        _max_concurrent_reads='8' <int>
+        _use_manifest='True' <bool>
         _dataset='bid_ask' <str>
         _contract_type='futures' <str>
         _data_snapshot='20240314' <str>
@@ -2287,7 +2291,7 @@ class TestCcxtHistoricalPqByTileClient2(icdc.ImClientTestCase):
         resample_1min = True
         im_client = self.get_im_client(resample_1min)
         expected_str = r"""
-        CcxtHistoricalPqByTileClient at 0x=(_vendor=CCXT <str>, _universe_version=small <str>, _resample_1min=True <bool>, _timestamp_col_name=timestamp <str>, _full_symbol_col_name=None <NoneType>, _asset_id_to_full_symbol_mapping={1467591036: 'binance::BTC_USDT', 2002879833: 'gateio::XRP_USDT', 3187272957: 'kucoin::ETH_USDT'} <dict>, _root_dir=s3://cryptokaizen-unit-test/outcomes/TestCcxtHistoricalPqByTileClient2/input/historical.manual.pq <str>, _infer_exchange_id=True <bool>, _partition_mode=by_year_month <str>, _aws_profile=ck <str>, _dataset=bid_ask <str>, _contract_type=futures <str>, _data_snapshot=20240314 <str>, _download_mode=periodic_daily <str>, _downloading_entity=airflow <str>, _version= <str>, _download_universe_version=v8 <str>, _tag= <str>, _data_format=parquet <str>)
+        CcxtHistoricalPqByTileClient at 0x=(_vendor=CCXT <str>, _universe_version=small <str>, _resample_1min=True <bool>, _timestamp_col_name=timestamp <str>, _full_symbol_col_name=None <NoneType>, _asset_id_to_full_symbol_mapping={1467591036: 'binance::BTC_USDT', 2002879833: 'gateio::XRP_USDT', 3187272957: 'kucoin::ETH_USDT'} <dict>, _root_dir=s3://cryptokaizen-unit-test/outcomes/TestCcxtHistoricalPqByTileClient2/input/historical.manual.pq <str>, _infer_exchange_id=True <bool>, _partition_mode=by_year_month <str>, _aws_profile=ck <str>, _max_concurrent_reads=8 <int>, _use_manifest=True <bool>, _dataset=bid_ask <str>, _contract_type=futures <str>, _data_snapshot=20240314 <str>, _download_mode=periodic_daily <str>, _downloading_entity=airflow <str>, _version= <str>, _download_universe_version=v8 <str>, _tag= <str>, _data_format=parquet <str>)
         """
         self.run_test_str(im_client, expected_str)
 
@@ -8,6 +8,7 @@ import abc
 import logging
 from typing import Any, Dict, List, Optional
 
+import numpy as np
 import pandas as pd
 
 import core.finance.bid_ask as cfibiask
@@ -250,45 +251,29 @@ class ImClient(abc.ABC, hobject.PrintableMixin):
         )
         # Rename index.
         df.index.name = self._timestamp_col_name
-        # Normalize data for each symbol.
-        _LOG.debug("full_symbols=%s", df[full_symbol_col_name].unique())
-        dfs = []
-        for full_symbol, df_tmp in df.groupby(full_symbol_col_name):
-            _LOG.debug("apply_im_normalization: full_symbol=%s", full_symbol)
-            df_tmp = self._apply_im_normalizations(
-                df_tmp,
-                full_symbol_col_name,
-                self._resample_1min,
-                start_ts,
-                end_ts,
-            )
-            if not df_tmp.empty:
-                # Validate data that remained after normalization and append it
-                # to the result.
-                # TODO(gp): Difference between amp and cmamp.
-                self._dassert_output_data_is_valid(
-                    df_tmp,
-                    full_symbol_col_name,
-                    self._resample_1min,
-                    start_ts,
-                    end_ts,
-                    self._timestamp_col_name,
-                )
-                dfs.append(df_tmp)
-            else:
-                _LOG.debug("Df for full_symbol=%s is empty", full_symbol)
         hdbg.dassert_lt(0, df.shape[0], "Empty df=\n%s", df)
-        df = pd.concat(dfs, axis=0)
+        # Normalize the data for all the symbols at once.
+        _LOG.debug("full_symbols=%s", df[full_symbol_col_name].unique())
+        df = self._apply_im_normalizations(
+            df,
+            full_symbol_col_name,
+            self._resample_1min,
+            start_ts,
+            end_ts,
+        )
+        hdbg.dassert_lt(0, df.shape[0], "Empty df after normalization")
+        # Validate data that remained after normalization.
+        # TODO(gp): Difference between amp and cmamp.
+        self._dassert_output_data_is_valid(
+            df,
+            full_symbol_col_name,
+            self._resample_1min,
+            start_ts,
+            end_ts,
+        )
         _LOG.debug("After im_normalization: df=\n%s", hpandas.df_to_str(df))
-        # Sort by index and `full_symbol_col_name`.
-        # There is not a simple way to sort by index and columns in Pandas,
-        # so we convert the index into a column, sort, and convert back.
-        df = df.reset_index()
-        df = df.sort_values(by=[self._timestamp_col_name, full_symbol_col_name])
-        df = df.set_index(self._timestamp_col_name, drop=True)
         # The full_symbol should be a string.
         hdbg.dassert_isinstance(df[full_symbol_col_name].values[0], str)
-        _LOG.debug("After sorting: df=\n%s", hpandas.df_to_str(df))
         # Check that columns are the required ones.
         # TODO(gp): Difference between amp and cmamp.
         # TODO(gp): This makes a test in E8 fail.
@@ -351,9 +336,16 @@ class ImClient(abc.ABC, hobject.PrintableMixin):
         end_ts: Optional[pd.Timestamp],
     ) -> pd.DataFrame:
         """
-        Apply normalizations to IM data.
+        Apply normalizations to IM data in long format.
+
+        All the full symbols are processed together with vectorized
+        operations, instead of looping over the symbols.
+
+        :return: normalized data sorted by index and `full_symbol_col_name`
         """
         _LOG.debug(hprint.to_str("full_symbol_col_name start_ts end_ts"))
+        # Rows without a full symbol can't be assigned to any asset.
+        df = df[df[full_symbol_col_name].notna()].copy()
         # 1) Drop duplicated timestamps.
         use_index = True
         df = hpandas.drop_duplicates(df, use_index)
@@ -363,14 +355,16 @@ class ImClient(abc.ABC, hobject.PrintableMixin):
             duplicate_columns = [full_symbol_col_name]
             # Sort values by "knowledge_timestamp" to keep the latest ones while
             # removing duplicates.
-            df = df.sort_values("knowledge_timestamp", ascending=True)
+            df = df.sort_values(
+                "knowledge_timestamp", ascending=True, kind="stable"
+            )
             use_index = True
             df = hpandas.drop_duplicates(
                 df,
                 use_index,
                 column_subset=duplicate_columns,
                 keep="last",
-            ).sort_index()
+            )
         # 2) Trim the data keeping only the data with index in [start_ts, end_ts].
         # Trimming of the data is done because:
         # - some data sources can be only queried at day resolution, so we get
@@ -383,15 +377,63 @@ class ImClient(abc.ABC, hobject.PrintableMixin):
         df = hpandas.trim_df(
             df, ts_col_name, start_ts, end_ts, left_close, right_close
         )
-        # 3) Resample index to 1 min frequency if specified.
-        if resample_1min:
-            df = hpandas.resample_df(df, "T")
-            # Fill NaN values appeared after resampling in full symbol column.
-            # Combination of full symbol and timestamp is a unique identifier,
-            # so full symbol cannot be NaN.
-            df[full_symbol_col_name] = df[full_symbol_col_name].bfill()
-        # 4) Convert to UTC.
+        # 3) Resample index to 1 min frequency for each full symbol if specified.
+        if resample_1min and not df.empty:
+            df = ImClient._resample_1min_by_full_symbol(df, full_symbol_col_name)
+        # 4) Sort by index and `full_symbol_col_name`.
+        full_symbol_codes, _ = pd.factorize(df[full_symbol_col_name], sort=True)
+        idxs = np.lexsort((full_symbol_codes, df.index.asi8))
+        df = df.iloc[idxs]
+        # 5) Convert to UTC.
         df.index = df.index.tz_convert("UTC")
+        # Sorting by position can preserve the frequency of the index when the
+        # data contains a single full symbol, so reset it for consistency.
+        df.index.freq = None
+        return df
+
+    @staticmethod
+    def _resample_1min_by_full_symbol(
+        df: pd.DataFrame, full_symbol_col_name: str
+    ) -> pd.DataFrame:
+        """
+        Resample the data of each full symbol on a 1 min grid.
+
+        Like `hpandas.resample_df()`, the grid for a full symbol spans from
+        its first to its last timestamp and the missing rows are filled with
+        NaNs, except for `full_symbol_col_name`.
+        """
+        index_name = df.index.name
+        columns = df.columns
+        # Index the data by timestamp and full symbol.
+        df = df.set_index(full_symbol_col_name, append=True)
+        hdbg.dassert(
+            df.index.is_unique, "Index must have only unique values per symbol"
+        )
+        # Compute the grid boundaries for each full symbol.
+        full_symbol_codes, full_symbols = pd.factorize(
+            df.index.get_level_values(1)
+        )
+        ts_ns = pd.Series(df.index.get_level_values(0).asi8)
+        grouped_ts_ns = ts_ns.groupby(full_symbol_codes)
+        start_ns = grouped_ts_ns.min().to_numpy()
+        end_ns = grouped_ts_ns.max().to_numpy()
+        # Build the grid concatenating the 1 min ranges of all the full symbols.
+        step_ns = pd.Timedelta(minutes=1).value
+        n_points = (end_ns - start_ns) // step_ns + 1
+        offsets = np.cumsum(n_points) - n_points
+        grid_pos = np.arange(n_points.sum()) - np.repeat(offsets, n_points)
+        grid_ts_ns = np.repeat(start_ns, n_points) + grid_pos * step_ns
+        grid_ts = pd.DatetimeIndex(grid_ts_ns, tz="UTC").tz_convert(
+            df.index.levels[0].tz
+        )
+        grid = pd.MultiIndex.from_arrays(
+            [grid_ts, np.repeat(full_symbols, n_points)],
+            names=[index_name, full_symbol_col_name],
+        )
+        # Resample and restore the original layout.
+        df = df.reindex(grid)
+        df = df.reset_index(level=full_symbol_col_name)
+        df = df[columns]
         return df
 
     @staticmethod
@@ -401,21 +443,31 @@ class ImClient(abc.ABC, hobject.PrintableMixin):
         resample_1min: bool,
         start_ts: Optional[pd.Timestamp],
         end_ts: Optional[pd.Timestamp],
-        timestamp_col_name: str,
     ) -> None:
         """
-        Verify that the normalized data is valid.
+        Verify that the normalized data in long format is valid.
         """
         # TODO(Grisha): consider using `hpandas.dassert_time_indexed_df()`.
         # Check that data is not empty.
         hdbg.dassert_lt(0, df.shape[0])
         # Check that index is `pd.DatetimeIndex`.
         hpandas.dassert_index_is_datetime(df)
+        # Check that full symbol column has no NaNs.
+        hdbg.dassert(df[full_symbol_col_name].notna().all())
+        # Check that the data is sorted by index.
+        hdbg.dassert(df.index.is_monotonic_increasing)
         if resample_1min:
-            # Check that index is monotonic increasing.
-            hpandas.dassert_strictly_increasing_index(df)
-            # Verify that index frequency is 1 minute.
-            hdbg.dassert_eq(df.index.freq, "T")
+            # Verify that the index of each full symbol is strictly increasing
+            # with 1 minute frequency.
+            full_symbol_codes, _ = pd.factorize(df[full_symbol_col_name])
+            idxs = np.argsort(full_symbol_codes, kind="stable")
+            ts_diffs = np.diff(df.index.asi8[idxs])
+            is_same_full_symbol = np.diff(full_symbol_codes[idxs]) == 0
+            step_ns = pd.Timedelta(minutes=1).value
+            hdbg.dassert(
+                (ts_diffs[is_same_full_symbol] == step_ns).all(),
+                "The data is not on a 1 minute grid",
+            )
         # Check that timezone info is correct.
         expected_tz = ["UTC"]
         # Assume that the first value of an index is representative.
@@ -423,20 +475,18 @@ class ImClient(abc.ABC, hobject.PrintableMixin):
             df.index[0],
             expected_tz,
         )
-        # Check that full symbol column has no NaNs.
-        hdbg.dassert(df[full_symbol_col_name].notna().all())
         # Check that there are no duplicates in data by index and full symbol.
         n_duplicated_rows = (
-            df.reset_index()
-            .duplicated(subset=[timestamp_col_name, full_symbol_col_name])
+            pd.MultiIndex.from_arrays([df.index, df[full_symbol_col_name]])
+            .duplicated()
             .sum()
         )
         hdbg.dassert_eq(
             n_duplicated_rows, 0, msg="There are duplicated rows in the data"
         )
         # Ensure that all the data is in [start_ts, end_ts].
-        hdateti.dassert_timestamp_lte(start_ts, df.index.min())
-        hdateti.dassert_timestamp_lte(df.index.max(), end_ts)
+        hdateti.dassert_timestamp_lte(start_ts, df.index[0])
+        hdateti.dassert_timestamp_lte(df.index[-1], end_ts)
         if "knowledge_timestamp" in df.columns:
             # Assert that both timestamps have timezone info.
             hdateti.dassert_tz_compatible(
@@ -6,6 +6,7 @@ import im_v2.common.data.client.historical_pq_clients as imvcdchpcl
 
 import abc
 import collections
+import concurrent.futures
 import logging
 import os
 from typing import Any, Dict, List, Optional
@@ -56,6 +57,8 @@ class HistoricalPqByTileClient(
         aws_profile: Optional[str] = None,
         full_symbol_col_name: Optional[str] = None,
         resample_1min: bool = False,
+        max_concurrent_reads: int = 8,
+        use_manifest: bool = True,
     ):
         """
         Constructor.
@@ -72,6 +75,11 @@ class HistoricalPqByTileClient(
             multiple Parquet files on exchange. See CmTask #1533 "Add
             exchange to the ParquetDataset partition".
         :param aws_profile: AWS profile, e.g., "ck"
+        :param max_concurrent_reads: max number of root dirs (e.g., one per
+            exchange) to read concurrently; 1 reads them one after another
+        :param use_manifest: read a root dir with its dataset manifest, when
+            it has one, to prune the tiles without listing the root dir (see
+            `hparque.update_parquet_dataset_manifest()`)
         """
         super().__init__(
             vendor,
@@ -84,6 +92,9 @@ class HistoricalPqByTileClient(
         self._infer_exchange_id = infer_exchange_id
         self._partition_mode = partition_mode
         self._aws_profile = aws_profile
+        hdbg.dassert_lte(1, max_concurrent_reads)
+        self._max_concurrent_reads = max_concurrent_reads
+        self._use_manifest = use_manifest
 
     @staticmethod
     def get_metadata() -> pd.DataFrame:
@@ -166,86 +177,126 @@ class HistoricalPqByTileClient(
         root_dir_symbol_filter_dict = self._get_root_dirs_symbol_filters(
             full_symbols, full_symbol_col_name
         )
-        #
-        res_df_list = []
-        for root_dir, symbol_filter in root_dir_symbol_filter_dict.items():
-            # Build list of filters for a query and add them to kwargs.
-            filters = hparque.get_parquet_filters_from_timestamp_interval(
-                self._partition_mode,
+        # Read the data from the root dirs concurrently, since the reads are
+        # I/O bound and independent.
+        def _read(root_dir: str) -> pd.DataFrame:
+            return self._read_data_for_one_root_dir(
+                root_dir,
+                root_dir_symbol_filter_dict[root_dir],
                 start_ts,
                 end_ts,
-                additional_filters=[symbol_filter],
+                full_symbol_col_name,
+                **kwargs,
             )
-            kwargs["filters"] = filters
-            # Read Parquet data from a root dir.
-            root_dir_df = hparque.from_parquet(root_dir, **kwargs)
-            # TODO(Grisha): "Handle missing tiles" CmTask #1775.
-            # hdbg.dassert_lte(
-            #     1,
-            #     root_dir_df.shape[0],
-            #     "Can't find data for root_dir='%s' and symbol_filter='%s'",
-            #     root_dir,
-            #     symbol_filter,
-            # )
-            # Convert index to datetime.
-            root_dir_df.index = pd.to_datetime(root_dir_df.index)
-            # TODO(gp): IgHistoricalPqByTileTaqBarClient used a ctor param to rename a column.
-            #  Not sure if this is still needed.
-            #        # Rename column storing `full_symbols`, if needed.
-            #        hdbg.dassert_in(self._full_symbol_col_name, df.columns)
-            #        if full_symbol_col_name != self._full_symbol_col_name:
-            #            hdbg.dassert_not_in(full_symbol_col_name, df.columns)
-            #            df.rename(
-            #                columns={self._full_symbol_col_name: full_symbol_col_name},
-            #                inplace=True,
-            #            )
-            transformation_kwargs: Dict = {}
-            if self._infer_exchange_id:
-                # Infer `exchange_id` position in a file path.
-                s3_bucket_path = hs3.get_s3_bucket_path(self._aws_profile)
-                reorg_root_dir = os.path.join(s3_bucket_path, "reorg")
-                daily_staged_reorg_dir = os.path.join(
-                    reorg_root_dir, "daily_staged.airflow.pq"
-                )
-                if root_dir == daily_staged_reorg_dir:
-                    # E.g. "binance" from
-                    # "s3://cryptokaizen-data/reorg/daily_staged.airflow.pq/bid_ask-futures/crypto_chassis.downloaded_1min/binance/".
-                    exchange_loc = -1
-                else:
-                    # E.g. "binance" from
-                    # "s3://cryptokaizen-data/v3/periodic_daily/airflow/downloaded_1min/parquet/bid_ask/futures/v3/crypto_chassis/binance/v1_0_0/".
-                    exchange_loc = -2
-                # Infer `exchange_id` from a file path if it is not present in data.
-                # E.g., `s3://.../latest/ohlcv/ccxt/binance` -> `binance`.
-                transformation_kwargs["exchange_id"] = root_dir.split("/")[
-                    exchange_loc
-                ]
-            # Transform data.
-            root_dir_df = self._apply_transformations(
-                root_dir_df, full_symbol_col_name, **transformation_kwargs
-            )
-            # The columns are used just to partition the data but these columns
-            # are not included in the `ImClient` output.
-            current_columns = root_dir_df.columns.to_list()
-            month_column = "month"
-            if month_column in current_columns:
-                root_dir_df = root_dir_df.drop(month_column, axis=1)
-            year_column = "year"
-            if year_column in current_columns:
-                root_dir_df = root_dir_df.drop(year_column, axis=1)
-            # Column with name "timestamp" that stores epochs remains in most
-            # vendors data if no column filtering was done. Drop it since it
-            # replicates data from index and has the same name as index column
-            # which causes a break when we try to reset it.
-            timestamp_column = "timestamp"
-            if timestamp_column in current_columns:
-                root_dir_df = root_dir_df.drop(timestamp_column, axis=1)
-            #
-            res_df_list.append(root_dir_df)
+
+        root_dirs = list(root_dir_symbol_filter_dict.keys())
+        max_workers = min(self._max_concurrent_reads, len(root_dirs))
+        if max_workers <= 1:
+            res_df_list = [_read(root_dir) for root_dir in root_dirs]
+        else:
+            with concurrent.futures.ThreadPoolExecutor(
+                max_workers=max_workers
+            ) as executor:
+                # `map()` returns the results in the order of the root dirs so
+                # that the output is deterministic.
+                res_df_list = list(executor.map(_read, root_dirs))
         # Combine data from all root dirs into a single DataFrame.
         res_df = pd.concat(res_df_list, axis=0)
         return res_df
 
+    def _read_data_for_one_root_dir(
+        self,
+        root_dir: str,
+        symbol_filter: hparque.ParquetFilter,
+        start_ts: Optional[pd.Timestamp],
+        end_ts: Optional[pd.Timestamp],
+        full_symbol_col_name: str,
+        **kwargs: Any,
+    ) -> pd.DataFrame:
+        """
+        Read and transform the data from a single root dir.
+
+        :param root_dir: root dir to read the data from
+        :param symbol_filter: Parquet filter on the symbols to read
+        :param kwargs: kwargs for `hparque.from_parquet()`
+        """
+        # Build list of filters for a query and add them to kwargs.
+        filters = hparque.get_parquet_filters_from_timestamp_interval(
+            self._partition_mode,
+            start_ts,
+            end_ts,
+            additional_filters=[symbol_filter],
+        )
+        kwargs = {**kwargs, "filters": filters}
+        if self._use_manifest:
+            kwargs["use_manifest"] = hparque.has_parquet_dataset_manifest(
+                root_dir, aws_profile=kwargs["aws_profile"]
+            )
+        # Read Parquet data from a root dir.
+        root_dir_df = hparque.from_parquet(root_dir, **kwargs)
+        # TODO(Grisha): "Handle missing tiles" CmTask #1775.
+        # hdbg.dassert_lte(
+        #     1,
+        #     root_dir_df.shape[0],
+        #     "Can't find data for root_dir='%s' and symbol_filter='%s'",
+        #     root_dir,
+        #     symbol_filter,
+        # )
+        # Convert index to datetime.
+        root_dir_df.index = pd.to_datetime(root_dir_df.index)
+        # TODO(gp): IgHistoricalPqByTileTaqBarClient used a ctor param to rename a column.
+        #  Not sure if this is still needed.
+        #        # Rename column storing `full_symbols`, if needed.
+        #        hdbg.dassert_in(self._full_symbol_col_name, df.columns)
+        #        if full_symbol_col_name != self._full_symbol_col_name:
+        #            hdbg.dassert_not_in(full_symbol_col_name, df.columns)
+        #            df.rename(
+        #                columns={self._full_symbol_col_name: full_symbol_col_name},
+        #                inplace=True,
+        #            )
+        transformation_kwargs: Dict = {}
+        if self._infer_exchange_id:
+            # Infer `exchange_id` position in a file path.
+            s3_bucket_path = hs3.get_s3_bucket_path(self._aws_profile)
+            reorg_root_dir = os.path.join(s3_bucket_path, "reorg")
+            daily_staged_reorg_dir = os.path.join(
+                reorg_root_dir, "daily_staged.airflow.pq"
+            )
+            if root_dir == daily_staged_reorg_dir:
+                # E.g. "binance" from
+                # "s3://cryptokaizen-data/reorg/daily_staged.airflow.pq/bid_ask-futures/crypto_chassis.downloaded_1min/binance/".
+                exchange_loc = -1
+            else:
+                # E.g. "binance" from
+                # "s3://cryptokaizen-data/v3/periodic_daily/airflow/downloaded_1min/parquet/bid_ask/futures/v3/crypto_chassis/binance/v1_0_0/".
+                exchange_loc = -2
+            # Infer `exchange_id` from a file path if it is not present in data.
+            # E.g., `s3://.../latest/ohlcv/ccxt/binance` -> `binance`.
+            transformation_kwargs["exchange_id"] = root_dir.split("/")[
+                exchange_loc
+            ]
+        # Transform data.
+        root_dir_df = self._apply_transformations(
+            root_dir_df, full_symbol_col_name, **transformation_kwargs
+        )
+        # The columns are used just to partition the data but these columns
+        # are not included in the `ImClient` output.
+        current_columns = root_dir_df.columns.to_list()
+        month_column = "month"
+        if month_column in current_columns:
+            root_dir_df = root_dir_df.drop(month_column, axis=1)
+        year_column = "year"
+        if year_column in current_columns:
+            root_dir_df = root_dir_df.drop(year_column, axis=1)
+        # Column with name "timestamp" that stores epochs remains in most
+        # vendors data if no column filtering was done. Drop it since it
+        # replicates data from index and has the same name as index column
+        # which causes a break when we try to reset it.
+        timestamp_column = "timestamp"
+        if timestamp_column in current_columns:
+            root_dir_df = root_dir_df.drop(timestamp_column, axis=1)
+        return root_dir_df
+
     # TODO(Grisha): try to unify child classes with the base class, see CmTask #1696
     # "Refactor HistoricalPqByTileClient and its child classes".
     # TODO(Grisha): remove the hack that allows to read data for multiple exchanges in
@@ -316,6 +367,7 @@ class HistoricalPqByCurrencyPairTileClient(HistoricalPqByTileClient):
         tag: str = "",
         aws_profile: Optional[str] = None,
         resample_1min: bool = False,
+        max_concurrent_reads: int = 8,
     ) -> None:
         """
         Constructor.
@@ -341,6 +393,7 @@ class HistoricalPqByCurrencyPairTileClient(HistoricalPqByTileClient):
             infer_exchange_id,
             aws_profile=aws_profile,
             resample_1min=resample_1min,
+            max_concurrent_reads=max_concurrent_reads,
         )
         hdbg.dassert_in(
             dataset, ["bid_ask", "ohlcv"], f"Invalid dataset type='{dataset}'"
@@ -8,7 +8,7 @@ import im_v2.common.data.client.im_raw_data_client as imvcdcimrdc
 
 import logging
 import os
-from typing import List, Optional
+from typing import Iterator, List, Optional, Tuple
 
 import pandas as pd
 
@@ -68,6 +68,14 @@ class RawDataReader:
             version=self.args["universe"].replace("_", "."),
         )
         self.universe_list = universe_list[self.args["exchange_id"]]
+        # State of `load_db_table_tail()`.
+        # Parameters of the query the cached data corresponds to.
+        self._tail_query_params: Optional[Tuple] = None
+        # DB rows loaded so far, in long format.
+        self._tail_data: Optional[pd.DataFrame] = None
+        # Max timestamp and knowledge timestamp among the loaded rows.
+        self._tail_max_timestamp: Optional[int] = None
+        self._tail_max_knowledge_timestamp: Optional[pd.Timestamp] = None
         if self.args["data_format"] == "parquet":
             self.partition_mode = self._get_partition_mode()
         elif self.args["data_format"] == "postgres":
@@ -188,19 +196,160 @@ class RawDataReader:
             bid_ask_levels=bid_ask_levels,
             exchange_id=self.args["exchange_id"],
         )
-        if deduplicate:
-            hdbg.dassert_is_not(
-                subset,
-                None,
-                "subset kwarg must be provided when deduplicate=True",
+        data = self._transform_db_data(
+            data,
+            deduplicate=deduplicate,
+            bid_ask_format=bid_ask_format,
+            subset=subset,
+        )
+        return data
+
+    def load_db_table_tail(
+        self,
+        start_timestamp: pd.Timestamp,
+        end_timestamp: Optional[pd.Timestamp],
+        *,
+        deduplicate: bool = False,
+        currency_pairs: Optional[List[str]] = None,
+        bid_ask_levels: Optional[List[int]] = None,
+        bid_ask_format: str = "wide",
+        subset: Optional[List[str]] = None,
+        max_late_arrival: str = "5S",
+        new_rows_only: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Load data from a DB table in a time interval, querying only new rows.
+
+        Same as `load_db_table()` but meant to be called repeatedly with a
+        sliding time interval, e.g., by a real-time consumer. The rows loaded
+        by the previous calls are cached and only the rows written to the DB
+        after the last seen `knowledge_timestamp` are queried.
+
+        Rows can be committed to the DB out of order, so the query starts
+        `max_late_arrival` before the last seen timestamps and the rows that
+        were already loaded are dropped using the `id` primary key.
+
+        Refer to `read_data()` for the other parameter docs.
+
+        :param max_late_arrival: max delay between the timestamps of two rows
+            written to the DB in order
+        :param new_rows_only: return only the rows in the interval that were
+            not returned by the previous calls, e.g., to update a buffer of the
+            data, instead of all the rows in the interval
+        """
+        hdbg.dassert_in(bid_ask_format, ["wide", "long"])
+        hdbg.dassert_is_not(start_timestamp, None)
+        if not currency_pairs:
+            currency_pairs = self.universe_list
+        query_params = (
+            tuple(currency_pairs),
+            tuple(bid_ask_levels) if bid_ask_levels else None,
+        )
+        if query_params != self._tail_query_params:
+            # Reset the cache if the query changes.
+            self._tail_query_params = query_params
+            self._tail_data = None
+            self._tail_max_timestamp = None
+            self._tail_max_knowledge_timestamp = None
+        max_late_arrival = pd.Timedelta(max_late_arrival)
+        query_start_timestamp = start_timestamp
+        min_knowledge_timestamp = None
+        if self._tail_max_timestamp is not None:
+            # Query only the tail of the data.
+            last_timestamp = hdateti.convert_unix_epoch_to_timestamp(
+                self._tail_max_timestamp
             )
-            data = data.drop_duplicates(subset=subset)
-        if self.args["data_type"] == "bid_ask" and bid_ask_format == "wide":
-            # Set timestamp as index as required by the transform function.
-            data = data.set_index("timestamp", drop=True)
-            data = cfibiask.transform_bid_ask_long_data_to_wide(data, "timestamp")
+            query_start_timestamp = max(
+                start_timestamp, last_timestamp - max_late_arrival
+            )
+            min_knowledge_timestamp = (
+                self._tail_max_knowledge_timestamp - max_late_arrival
+            )
+        new_data = imvcddbut.load_db_data(
+            self.db_connection,
+            self.table_name,
+            query_start_timestamp,
+            end_timestamp,
+            currency_pairs=currency_pairs,
+            bid_ask_levels=bid_ask_levels,
+            exchange_id=self.args["exchange_id"],
+            min_knowledge_timestamp=min_knowledge_timestamp,
+        )
+        _LOG.debug(
+            "Loaded %s new rows since knowledge_timestamp=%s",
+            len(new_data),
+            min_knowledge_timestamp,
+        )
+        if self._tail_data is not None:
+            # Drop the rows that were already loaded.
+            is_new = ~new_data["id"].isin(self._tail_data["id"])
+            new_rows = new_data.loc[is_new]
+            new_data = pd.concat([self._tail_data, new_rows])
+        else:
+            new_rows = new_data
+        if not new_data.empty:
+            self._tail_max_timestamp = new_data["timestamp"].max()
+            self._tail_max_knowledge_timestamp = new_data[
+                "knowledge_timestamp"
+            ].max()
+        # Drop the rows before the start of the interval from the cache.
+        start_ts = hdateti.convert_timestamp_to_unix_epoch(
+            start_timestamp, unit="ms"
+        )
+        new_data = new_data.loc[new_data["timestamp"] >= start_ts]
+        self._tail_data = new_data.reset_index(drop=True)
+        if new_rows_only:
+            data = new_rows.loc[new_rows["timestamp"] >= start_ts]
+            data = data.reset_index(drop=True)
+        else:
+            data = self._tail_data
+        if end_timestamp is not None:
+            end_ts = hdateti.convert_timestamp_to_unix_epoch(
+                end_timestamp, unit="ms"
+            )
+            data = data.loc[data["timestamp"] <= end_ts]
+        data = self._transform_db_data(
+            data,
+            deduplicate=deduplicate,
+            bid_ask_format=bid_ask_format,
+            subset=subset,
+        )
         return data
 
+    def iterate_db_table(
+        self,
+        start_timestamp: Optional[pd.Timestamp],
+        end_timestamp: Optional[pd.Timestamp],
+        *,
+        chunk_size: int = 100000,
+        currency_pairs: Optional[List[str]] = None,
+        bid_ask_levels: Optional[List[int]] = None,
+    ) -> Iterator[pd.DataFrame]:
+        """
+        Load data from a DB table in a time interval in chunks.
+
+        The data is streamed from the DB through a server-side cursor in
+        chunks of rows ordered by timestamp. The chunks are returned in the
+        DB (i.e. long) format, since the rows for the same timestamp can be
+        split across chunks.
+
+        Refer to `read_data()` for the other parameter docs.
+
+        :param chunk_size: number of rows per chunk
+        """
+        if not currency_pairs:
+            currency_pairs = self.universe_list
+        yield from imvcddbut.iterate_db_data(
+            self.db_connection,
+            self.table_name,
+            start_timestamp,
+            end_timestamp,
+            chunk_size,
+            currency_pairs=currency_pairs,
+            bid_ask_levels=bid_ask_levels,
+            exchange_id=self.args["exchange_id"],
+        )
+
     def load_csv(
         self,
         currency_pair: str,
@@ -314,8 +463,17 @@ class RawDataReader:
             else:
                 filters.append(("level", "in", bid_ask_levels))
         s3_path = self._build_s3_pq_file_path()
+        # Prune the tiles with the dataset manifest, when there is one, instead
+        # of listing the dataset.
+        use_manifest = hparque.has_parquet_dataset_manifest(
+            s3_path, aws_profile="ck"
+        )
         data = hparque.from_parquet(
-            s3_path, filters=filters, columns=columns, aws_profile="ck"
+            s3_path,
+            filters=filters,
+            columns=columns,
+            aws_profile="ck",
+            use_manifest=use_manifest,
         )
         return data
 
@@ -323,6 +481,30 @@ class RawDataReader:
     # Private methods.
     # ///////////////////////////////////////////////////////////////////////////
 
+    def _transform_db_data(
+        self,
+        data: pd.DataFrame,
+        *,
+        deduplicate: bool,
+        bid_ask_format: str,
+        subset: Optional[List[str]],
+    ) -> pd.DataFrame:
+        """
+        Deduplicate and convert the data loaded from a DB table.
+        """
+        if deduplicate:
+            hdbg.dassert_is_not(
+                subset,
+                None,
+                "subset kwarg must be provided when deduplicate=True",
+            )
+            data = data.drop_duplicates(subset=subset)
+        if self.args["data_type"] == "bid_ask" and bid_ask_format == "wide":
+            # Set timestamp as index as required by the transform function.
+            data = data.set_index("timestamp", drop=True)
+            data = cfibiask.transform_bid_ask_long_data_to_wide(data, "timestamp")
+        return data
+
     def _setup_db_table_access(self) -> None:
         """
         Set up DB connection and get DB table name based on dataset signature.
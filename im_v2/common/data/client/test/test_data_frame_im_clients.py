@@ -3,6 +3,8 @@ from typing import List
 import pandas as pd
 
 import core.finance as cofinanc
+import helpers.hpandas as hpandas
+import helpers.hunit_test as hunitest
 import im_v2.common.data.client.data_frame_im_clients as imvcdcdfimc
 import im_v2.common.data.client.data_frame_im_clients_example as imvcdcdfimce
 import im_v2.common.data.client.im_client_test_case as imvcdcimctc
@@ -329,3 +331,97 @@ class TestDataFrameImClient1(imvcdcimctc.ImClientTestCase):
             expected_first_elements,
             expected_last_elements,
         )
+
+
+# #############################################################################
+# TestDataFrameImClient2
+# #############################################################################
+
+
+class TestDataFrameImClient2(hunitest.TestCase):
+    """
+    Test normalizing the data of multiple full symbols at once.
+    """
+
+    @staticmethod
+    def get_ImClient(resample_1min: bool) -> imvcdcdfimc.DataFrameImClient:
+        """
+        Build a client with unsorted data with gaps and duplicates.
+        """
+        universe = ["binance::BTC_USDT", "kucoin::ETH_USDT"]
+        timestamps = pd.to_datetime(
+            [
+                "2022-01-01 10:03:00",
+                "2022-01-01 10:01:00",
+                "2022-01-01 10:02:00",
+                "2022-01-01 10:00:00",
+                "2022-01-01 10:02:00",
+                "2022-01-01 10:04:00",
+                # Duplicate row.
+                "2022-01-01 10:00:00",
+            ],
+            utc=True,
+        )
+        data = {
+            "full_symbol": [
+                "kucoin::ETH_USDT",
+                "kucoin::ETH_USDT",
+                "binance::BTC_USDT",
+                "binance::BTC_USDT",
+                "kucoin::ETH_USDT",
+                "binance::BTC_USDT",
+                "binance::BTC_USDT",
+            ],
+            "close": [13, 11, 22, 20, 12, 24, 20],
+        }
+        df = pd.DataFrame(data, index=pd.Index(timestamps, name="timestamp"))
+        im_client = imvcdcdfimc.DataFrameImClient(
+            df, universe, resample_1min=resample_1min
+        )
+        return im_client
+
+    def helper(self, resample_1min: bool, expected: str) -> None:
+        im_client = self.get_ImClient(resample_1min)
+        full_symbols = ["binance::BTC_USDT", "kucoin::ETH_USDT"]
+        start_ts = pd.Timestamp("2022-01-01 10:00:00+00:00")
+        end_ts = pd.Timestamp("2022-01-01 10:03:00+00:00")
+        columns = None
+        filter_data_mode = "assert"
+        df = im_client.read_data(
+            full_symbols, start_ts, end_ts, columns, filter_data_mode
+        )
+        actual = hpandas.df_to_str(df, num_rows=None)
+        self.assert_equal(actual, expected, fuzzy_match=True)
+
+    def test_read_data1(self) -> None:
+        """
+        Check that the data is deduplicated, trimmed and sorted.
+        """
+        resample_1min = False
+        expected = r"""
+                                 full_symbol  close
+        timestamp
+        2022-01-01 10:00:00+00:00  binance::BTC_USDT     20
+        2022-01-01 10:01:00+00:00   kucoin::ETH_USDT     11
+        2022-01-01 10:02:00+00:00  binance::BTC_USDT     22
+        2022-01-01 10:02:00+00:00   kucoin::ETH_USDT     12
+        2022-01-01 10:03:00+00:00   kucoin::ETH_USDT     13
+        """
+        self.helper(resample_1min, expected)
+
+    def test_read_data2(self) -> None:
+        """
+        Check that the data of each full symbol is resampled separately.
+        """
+        resample_1min = True
+        expected = r"""
+                                 full_symbol  close
+        timestamp
+        2022-01-01 10:00:00+00:00  binance::BTC_USDT   20.0
+        2022-01-01 10:01:00+00:00  binance::BTC_USDT    NaN
+        2022-01-01 10:01:00+00:00   kucoin::ETH_USDT   11.0
+        2022-01-01 10:02:00+00:00  binance::BTC_USDT   22.0
+        2022-01-01 10:02:00+00:00   kucoin::ETH_USDT   12.0
+        2022-01-01 10:03:00+00:00   kucoin::ETH_USDT   13.0
+        """
+        self.helper(resample_1min, expected)
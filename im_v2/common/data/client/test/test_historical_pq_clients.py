@@ -1,13 +1,17 @@
 import logging
+import os
 import random
-from typing import List, Tuple
+from typing import Dict, List, Tuple
 
 import pandas as pd
 import pytest
 
 import helpers.hdatetime as hdateti
+import helpers.hparquet as hparque
+import helpers.hunit_test as hunitest
 import im_v2.common.data.client as icdc
 import im_v2.common.data.client.historical_pq_clients_example as imvcdchpce
+import im_v2.common.test as imvct
 import im_v2.common.universe as ivcu
 
 _LOG = logging.getLogger(__name__)
@@ -831,3 +835,87 @@ class TestHistoricalPqByTileClient3(icdc.ImClientTestCase):
         self.assert_equal(str(actual_df.shape[0]), str(expected_length))
         self.assert_equal(str(actual_df.index[0]), str(start_ts))
         self.assert_equal(str(actual_df.index[-1]), str(end_ts))
+
+
+# #############################################################################
+# TestHistoricalPqByTileClient4
+# #############################################################################
+
+
+class _MockHistoricalByTileClientWithRootDirPerExchange(
+    imvcdchpce.MockHistoricalByTileClient
+):
+    """
+    Store the data for each exchange in a separate root dir.
+    """
+
+    def _get_root_dirs_symbol_filters(
+        self, full_symbols: List[ivcu.FullSymbol], full_symbol_col_name: str
+    ) -> Dict[str, hparque.ParquetFilter]:
+        res_dict = {}
+        for full_symbol in full_symbols:
+            exchange, _ = ivcu.parse_full_symbol(full_symbol)
+            root_dir = os.path.join(self._root_dir, exchange)
+            res_dict[root_dir] = (full_symbol_col_name, "in", [full_symbol])
+        return res_dict
+
+
+class TestHistoricalPqByTileClient4(hunitest.TestCase):
+    """
+    Test reading the data from multiple root dirs concurrently.
+    """
+
+    def get_im_client(
+        self, max_concurrent_reads: int
+    ) -> imvcdchpce.MockHistoricalByTileClient:
+        partition_mode = "by_year_month"
+        root_dir = self.get_scratch_space()
+        for full_symbol in ["binance::BTC_USDT", "kucoin::FIL_USDT"]:
+            exchange, _ = ivcu.parse_full_symbol(full_symbol)
+            imvct.generate_parquet_files(
+                "2021-12-30",
+                "2022-01-02",
+                [full_symbol],
+                "full_symbol",
+                os.path.join(root_dir, exchange),
+                freq="1H",
+                output_type="cm_task_1103",
+                partition_mode=partition_mode,
+            )
+        vendor = "mock"
+        universe_version = "small"
+        infer_exchange_id = False
+        im_client = _MockHistoricalByTileClientWithRootDirPerExchange(
+            vendor,
+            universe_version,
+            root_dir,
+            partition_mode,
+            infer_exchange_id,
+            max_concurrent_reads=max_concurrent_reads,
+        )
+        return im_client
+
+    def test_read_data1(self) -> None:
+        """
+        Check that concurrent and serial reads return the same data.
+        """
+        full_symbols = ["kucoin::FIL_USDT", "binance::BTC_USDT"]
+        start_ts = pd.Timestamp("2021-12-31 22:00:00+00:00")
+        end_ts = pd.Timestamp("2022-01-01 01:00:00+00:00")
+        columns = None
+        filter_data_mode = "assert"
+        # Read the data from the root dirs one after another.
+        im_client = self.get_im_client(max_concurrent_reads=1)
+        expected = im_client.read_data(
+            full_symbols, start_ts, end_ts, columns, filter_data_mode
+        )
+        # Read the data from the root dirs concurrently.
+        im_client = self.get_im_client(max_concurrent_reads=4)
+        actual = im_client.read_data(
+            full_symbols, start_ts, end_ts, columns, filter_data_mode
+        )
+        self.assertEqual(actual.shape, (8, 2))
+        self.assertEqual(
+            sorted(actual["full_symbol"].unique()), sorted(full_symbols)
+        )
+        pd.testing.assert_frame_equal(actual, expected)
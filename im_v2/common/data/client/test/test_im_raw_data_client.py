@@ -2,7 +2,7 @@ import logging
 import os
 import pprint
 import unittest.mock as umock
-from typing import List, Optional
+from typing import Callable, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
@@ -715,6 +715,128 @@ class TestImRawDataClient3(hunitest.TestCase):
         """
         self.assert_equal(actual_error, expected_error, fuzzy_match=True)
 
+    def test_load_db_table_tail1(self) -> None:
+        """
+        Test that load_db_table_tail queries only the new rows and returns the
+        same data as load_db_table.
+        """
+        obj, commit_rows = self._get_tail_reader()
+        start_timestamp = self.start_timestamp
+        obj.load_db_table_tail(
+            start_timestamp, self.end_timestamp, bid_ask_format="long"
+        )
+        # Commit the remaining rows and slide the interval.
+        commit_rows()
+        start_timestamp = self.start_timestamp + pd.Timedelta(seconds=2)
+        actual = obj.load_db_table_tail(
+            start_timestamp, self.end_timestamp, bid_ask_format="long"
+        )
+        # Check the tail query.
+        kwargs = self.mock_load_db_data.call_args.kwargs
+        knowledge_timestamp = self.start_timestamp + pd.Timedelta(minutes=1)
+        self.assertEqual(
+            kwargs["min_knowledge_timestamp"],
+            knowledge_timestamp - pd.Timedelta(seconds=5),
+        )
+        self.assertEqual(
+            self.mock_load_db_data.call_args.args[2], start_timestamp
+        )
+        # Compare with the data loaded at once.
+        expected = obj.load_db_table(
+            start_timestamp, self.end_timestamp, bid_ask_format="long"
+        )
+        self.assertListEqual(actual["id"].tolist(), [2, 3, 4, 5])
+        self.assert_equal(
+            str(actual.sort_values("id").reset_index(drop=True)),
+            str(expected.sort_values("id").reset_index(drop=True)),
+        )
+
+    def test_load_db_table_tail2(self) -> None:
+        """
+        Test that load_db_table_tail returns only the rows that were not
+        returned before with `new_rows_only=True`.
+        """
+        obj, commit_rows = self._get_tail_reader()
+        actual = obj.load_db_table_tail(
+            self.start_timestamp,
+            self.end_timestamp,
+            bid_ask_format="long",
+            new_rows_only=True,
+        )
+        self.assertListEqual(actual["id"].tolist(), [1, 2, 3])
+        # Commit the remaining rows, including a late one.
+        commit_rows()
+        actual = obj.load_db_table_tail(
+            self.start_timestamp,
+            self.end_timestamp,
+            bid_ask_format="long",
+            new_rows_only=True,
+        )
+        self.assertListEqual(actual["id"].tolist(), [4, 5])
+        # No new rows.
+        actual = obj.load_db_table_tail(
+            self.start_timestamp,
+            self.end_timestamp,
+            bid_ask_format="long",
+            new_rows_only=True,
+        )
+        self.assertTrue(actual.empty)
+
+    def _get_tail_reader(
+        self,
+    ) -> Tuple[imvcdcimrdc.RawDataReader, Callable[[], None]]:
+        """
+        Build a reader of a mocked DB table where rows are committed later.
+
+        Rows are written in two batches, the second one containing a row that
+        is committed late.
+
+        :return: reader and function committing the second batch of rows
+        """
+        signature = "realtime.airflow.downloaded_200ms.postgres.bid_ask.futures.v7.ccxt.binance.v1_0_0"
+        obj = imvcdcimrdc.RawDataReader(signature)
+        obj.db_connection = None
+        obj.table_name = None
+        start_ts = hdateti.convert_timestamp_to_unix_epoch(self.start_timestamp)
+        knowledge_timestamp = self.start_timestamp + pd.Timedelta(minutes=1)
+        db_data = pd.DataFrame(
+            {
+                "id": [1, 2, 3, 4, 5],
+                "timestamp": [
+                    start_ts + 1000,
+                    start_ts + 2000,
+                    start_ts + 3000,
+                    start_ts + 4000,
+                    start_ts + 2500,
+                ],
+                "currency_pair": ["WAVES_USDT"] * 5,
+                "level": [1] * 5,
+                "bid_price": [100, 200, 300, 400, 250],
+                "knowledge_timestamp": [knowledge_timestamp] * 3
+                + [knowledge_timestamp + pd.Timedelta(seconds=2)] * 2,
+            }
+        )
+        num_committed_rows = 3
+
+        def _load_db_data(*args, **kwargs) -> pd.DataFrame:
+            # Emulate the DB query.
+            start_timestamp, end_timestamp = args[2:4]
+            data = db_data.iloc[:num_committed_rows]
+            start_ts = hdateti.convert_timestamp_to_unix_epoch(start_timestamp)
+            end_ts = hdateti.convert_timestamp_to_unix_epoch(end_timestamp)
+            mask = (data["timestamp"] >= start_ts) & (data["timestamp"] <= end_ts)
+            min_knowledge_timestamp = kwargs.get("min_knowledge_timestamp")
+            if min_knowledge_timestamp is not None:
+                mask &= data["knowledge_timestamp"] > min_knowledge_timestamp
+            return data.loc[mask]
+
+        def _commit_rows() -> None:
+            nonlocal num_committed_rows
+            num_committed_rows = len(db_data)
+
+        self.mock_load_db_data.side_effect = _load_db_data
+        return obj, _commit_rows
+
 
 class TestImRawDataClient4(hunitest.TestCase):
     """
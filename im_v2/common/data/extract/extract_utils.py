@@ -580,7 +580,6 @@ async def _download_websocket_realtime_for_one_exchange_periodically(
         tz=tz,
     )
     _LOG.info("Subscribed to %s websocket data successfully", exchange_id)
-    db_connection = imvcddbut.DbConnectionManager.get_connection(args["db_stage"])
     db_table = args["db_table"]
     # In order not to bombard the database with many small insert operations
     # a buffer is created, its size is determined by the config specific to each
@@ -601,97 +600,111 @@ async def _download_websocket_realtime_for_one_exchange_periodically(
     next_bid_ask_resampling_threshold = pd.Timestamp.now(tz).replace(
         second=0, microsecond=0
     ) + pd.Timedelta(minutes=1)
-    while pd.Timestamp.now(tz) < stop_time:
-        if data_type == "bid_ask" and args.get("vendor") == "ccxt":
-            try:
-                await _subscribe_to_websocket_data(
-                    args,
-                    exchange,
-                    currency_pairs,
-                    bid_ask_depth=args.get("bid_ask_depth"),
-                    tz=tz,
+    # Save the data from a background thread, so that the download loop is not
+    # blocked by the DB inserts. The thread uses its own DB connection.
+    db_connection = imvcddbut.DbConnectionManager.get_new_connection(
+        args["db_stage"]
+    )
+    db_writer = imvcddbut.DbWriter(data_type, db_connection, db_table, str(tz))
+    try:
+        while pd.Timestamp.now(tz) < stop_time:
+            if data_type == "bid_ask" and args.get("vendor") == "ccxt":
+                try:
+                    await _subscribe_to_websocket_data(
+                        args,
+                        exchange,
+                        currency_pairs,
+                        bid_ask_depth=args.get("bid_ask_depth"),
+                        tz=tz,
+                    )
+                except Exception as e:
+                    _LOG.info("Subscription to symbols failed %s", e)
+                    # Handling potential issues: Sometimes the order book may fall out of sync,
+                    # leading to an error like "handleOrderBook received an out-of-order nonce".
+                    # Sleeping for 1 second to allow the system to catch up and get back in sync.
+                    # ref. https://github.com/ccxt/ccxt/issues/17827#issuecomment-1537532598
+                    await exchange.sleep(1000)
+            iter_start_time = pd.Timestamp.now(tz)
+            for curr_pair in currency_pairs:
+                data_point = exchange.download_websocket_data(
+                    data_type, exchange_id, curr_pair
                 )
-            except Exception as e:
-                _LOG.info("Subscription to symbols failed %s", e)
-                # Handling potential issues: Sometimes the order book may fall out of sync,
-                # leading to an error like "handleOrderBook received an out-of-order nonce".
-                # Sleeping for 1 second to allow the system to catch up and get back in sync.
-                # ref. https://github.com/ccxt/ccxt/issues/17827#issuecomment-1537532598
-                await exchange.sleep(1000)
-        iter_start_time = pd.Timestamp.now(tz)
-        for curr_pair in currency_pairs:
-            data_point = exchange.download_websocket_data(
-                data_type, exchange_id, curr_pair
+                # Check if the data point is not a duplicate one.
+                is_fresh, timestamps_dict, data_point = _is_fresh_data_point(
+                    curr_pair, data_point, data_type, timestamps_dict
+                )
+                if is_fresh:
+                    data_buffer.append(data_point)
+            download_time = (
+                pd.Timestamp.now(tz) - iter_start_time
+            ).total_seconds() * 1000
+            # If the buffer is full or this is the last iteration, process and save buffered data.
+            is_buffer_full = (
+                len(data_buffer) >= WEBSOCKET_CONFIG[data_type]["max_buffer_size"]
             )
-            # Check if the data point is not a duplicate one.
-            is_fresh, timestamps_dict, data_point = _is_fresh_data_point(
-                curr_pair, data_point, data_type, timestamps_dict
+            is_last_iteration = pd.Timestamp.now(tz) >= stop_time
+            is_non_empty_buffer = len(data_buffer) > 0
+            # Save the data if the download was faster.
+            is_download_fast = (
+                download_time
+                < WEBSOCKET_CONFIG[data_type]["sleep_between_iter_in_ms"] / 2
+                and args["db_saving_mode"] == "on_sufficient_time"
             )
-            if is_fresh:
-                data_buffer.append(data_point)
-        download_time = (
-            pd.Timestamp.now(tz) - iter_start_time
-        ).total_seconds() * 1000
-        # If the buffer is full or this is the last iteration, process and save buffered data.
-        is_buffer_full = (
-            len(data_buffer) >= WEBSOCKET_CONFIG[data_type]["max_buffer_size"]
-        )
-        is_last_iteration = pd.Timestamp.now(tz) >= stop_time
-        is_non_empty_buffer = len(data_buffer) > 0
-        # Save the data if the download was faster.
-        is_download_fast = (
-            download_time
-            < WEBSOCKET_CONFIG[data_type]["sleep_between_iter_in_ms"] / 2
-            and args["db_saving_mode"] == "on_sufficient_time"
-        )
-        if (
-            is_buffer_full or is_last_iteration or is_download_fast
-        ) and is_non_empty_buffer:
-            df = imvcdttrut.transform_raw_websocket_data(
-                data_buffer,
-                data_type,
-                exchange_id,
-                max_num_levels=args.get("bid_ask_depth"),
+            if (
+                is_buffer_full or is_last_iteration or is_download_fast
+            ) and is_non_empty_buffer:
+                df = imvcdttrut.transform_raw_websocket_data(
+                    data_buffer,
+                    data_type,
+                    exchange_id,
+                    max_num_levels=args.get("bid_ask_depth"),
+                )
+                # Store the names of currency pairs that were successfully downloaded
+                # to log missing symbols every iteration.
+                downloaded_currency_pairs = df['currency_pair'].unique().tolist()
+                hdbg.dassert_set_eq(currency_pairs, downloaded_currency_pairs, only_warning=True)
+                # TODO(Juraj): experimental feature, the problem is speed for now.
+                # data_buffer_to_resample.append(df)
+                # Drop the data instead of blocking the event loop, if the DB
+                # can't keep up with the download.
+                db_writer.put_nowait(df)
+                # TODO(Juraj): experimental feature, the problem is speed for now.
+                # if args.resample_bid_ask_data_to_1min and pd.Timestamp.now(tz) > next_bid_ask_resampling_threshold:
+                #    with htimer.TimedScope(logging.DEBUG, "# Resample 1-minute of raw data"):
+                #        df_resampled = imvcdttrut.transform_and_resample_rt_bid_ask_data(
+                #            pd.concat(data_buffer_to_resample)
+                #        )
+                # imvcddbut.save_data_to_db(
+                #    df_resampled, data_type, db_connection, db_resampled_table, str(tz), add_knowledge_timestamp=False
+                # )
+                # Reset resampling variables to start over.
+                # data_buffer_to_resample = []
+                # next_bid_ask_resampling_threshold += pd.Timedelta(minutes=1)
+                # Empty buffer after persisting the data.
+                data_buffer = []
+            # Determine actual sleep time needed based on the difference
+            # between value set in config and actual time it took to complete
+            # an iteration, this provides an "time align" mechanism.
+            iter_length = (
+                pd.Timestamp.now(tz) - iter_start_time
+            ).total_seconds() * 1000
+            actual_sleep_time = max(
+                0,
+                WEBSOCKET_CONFIG[data_type]["sleep_between_iter_in_ms"] - iter_length,
             )
-            # Store the names of currency pairs that were successfully downloaded
-            # to log missing symbols every iteration.
-            downloaded_currency_pairs = df['currency_pair'].unique().tolist()
-            hdbg.dassert_set_eq(currency_pairs, downloaded_currency_pairs, only_warning=True)
-            # TODO(Juraj): experimental feature, the problem is speed for now.
-            # data_buffer_to_resample.append(df)
-            imvcddbut.save_data_to_db(
-                df, data_type, db_connection, db_table, str(tz)
+            _LOG.info(
+                "Iteration took %i ms, waiting between iterations for %i ms",
+                iter_length,
+                actual_sleep_time,
             )
-            # TODO(Juraj): experimental feature, the problem is speed for now.
-            # if args.resample_bid_ask_data_to_1min and pd.Timestamp.now(tz) > next_bid_ask_resampling_threshold:
-            #    with htimer.TimedScope(logging.DEBUG, "# Resample 1-minute of raw data"):
-            #        df_resampled = imvcdttrut.transform_and_resample_rt_bid_ask_data(
-            #            pd.concat(data_buffer_to_resample)
-            #        )
-            # imvcddbut.save_data_to_db(
-            #    df_resampled, data_type, db_connection, db_resampled_table, str(tz), add_knowledge_timestamp=False
-            # )
-            # Reset resampling variables to start over.
-            # data_buffer_to_resample = []
-            # next_bid_ask_resampling_threshold += pd.Timedelta(minutes=1)
-            # Empty buffer after persisting the data.
-            data_buffer = []
-        # Determine actual sleep time needed based on the difference
-        # between value set in config and actual time it took to complete
-        # an iteration, this provides an "time align" mechanism.
-        iter_length = (
-            pd.Timestamp.now(tz) - iter_start_time
-        ).total_seconds() * 1000
-        actual_sleep_time = max(
-            0,
-            WEBSOCKET_CONFIG[data_type]["sleep_between_iter_in_ms"] - iter_length,
-        )
-        _LOG.info(
-            "Iteration took %i ms, waiting between iterations for %i ms",
-            iter_length,
-            actual_sleep_time,
-        )
-        await exchange.sleep(actual_sleep_time)
+            await exchange.sleep(actual_sleep_time)
+    finally:
+        # Wait for the pending data to be saved and stop the writer thread,
+        # also when the download fails.
+        try:
+            db_writer.stop()
+        finally:
+            db_connection.close()
     _LOG.info("Websocket download finished at %s", pd.Timestamp.now(tz))
 
 
@@ -880,6 +893,7 @@ def save_parquet(
     drop_columns: List[str] = ["end_download_timestamp"],
     mode: str = "list_and_merge",
     partition_mode: str = "by_year_month",
+    update_manifest: bool = True,
 ) -> None:
     """
     Save Parquet dataset.
@@ -892,6 +906,9 @@ def save_parquet(
     :param drop_columns: list of columns to drop
     :param mode: mode of saving, e.g. "list_and_merge", "append"
     :param partition_mode: partition mode, e.g. "by_year_month"
+    :param update_manifest: update the dataset manifest after saving, so that
+        the readers can prune the tiles without listing the dataset (see
+        `hparque.update_parquet_dataset_manifest()`)
     """
     hdbg.dassert_in(mode, ["list_and_merge", "append"])
     # Update indexing and add partition columns.
@@ -920,6 +937,10 @@ def save_parquet(
             aws_profile=aws_profile,
             drop_duplicates_mode=data_type,
         )
+    if update_manifest:
+        hparque.update_parquet_dataset_manifest(
+            path_to_dataset, aws_profile=aws_profile
+        )
 
 
 def handle_empty_data(assert_on_missing_data: bool, currency_pair: str) -> None:
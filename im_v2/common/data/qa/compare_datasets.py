@@ -0,0 +1,379 @@
+"""
+Columnar comparison of two datasets for cross-dataset QA checks.
+
+The datasets are outer joined on the key columns (e.g., `timestamp` and
+`currency_pair`) chunk by chunk, so that two long datasets, e.g., a day of
+bid/ask data loaded with `RawDataReader.iterate_db_table()`, can be compared
+without holding both of them in memory.
+
+Import as:
+
+import im_v2.common.data.qa.compare_datasets as imvcdqcoda
+"""
+
+import logging
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+import helpers.hdbg as hdbg
+
+_LOG = logging.getLogger(__name__)
+
+# A dataset is either a single dataframe or an iterable of dataframes sorted by
+# the timestamp column.
+Dataset = Union[pd.DataFrame, Iterable[pd.DataFrame]]
+
+# Name of the column added by `pd.merge(..., indicator=...)`.
+MERGE_INDICATOR_COL = "_merge"
+
+
+def iterate_outer_merge(
+    dataset1: Dataset,
+    dataset2: Dataset,
+    key_cols: List[str],
+    *,
+    timestamp_col: str = "timestamp",
+    suffixes: Tuple[str, str] = ("_A", "_B"),
+) -> Iterator[pd.DataFrame]:
+    """
+    Outer join two datasets on the key columns chunk by chunk.
+
+    The chunks of each dataset need to be sorted by `timestamp_col`, i.e. the
+    timestamps of a chunk cannot be smaller than the ones of the previous
+    chunk, while the rows inside a chunk can be in any order. At each step
+    only the rows with a timestamp smaller than the last timestamp loaded
+    from both datasets are joined, since all the rows matching them have
+    already been loaded.
+
+    :param dataset1: dataframe or iterable of dataframes
+    :param dataset2: dataframe or iterable of dataframes
+    :param key_cols: columns to join on, e.g. `["timestamp", "currency_pair"]`
+    :param timestamp_col: column the chunks are sorted by, it must be one of
+        `key_cols`
+    :param suffixes: suffixes for the overlapping non-key columns
+    :return: joined chunks with a `_merge` column with values "both",
+        "left_only", "right_only"
+    """
+    hdbg.dassert_in(timestamp_col, key_cols)
+    iterators = [_to_chunks(dataset1), _to_chunks(dataset2)]
+    buffers: List[Optional[pd.DataFrame]] = [None, None]
+    is_exhausted = [False, False]
+    while not all(is_exhausted):
+        # Read the next chunk from the dataset that lags behind.
+        idx = _get_lagging_dataset_idx(buffers, is_exhausted, timestamp_col)
+        chunk = next(iterators[idx], None)
+        if chunk is None:
+            is_exhausted[idx] = True
+        elif not chunk.empty:
+            buffer = buffers[idx]
+            if buffer is not None and not buffer.empty:
+                hdbg.dassert_lte(
+                    buffer[timestamp_col].max(),
+                    chunk[timestamp_col].min(),
+                    "Chunks are not sorted by '%s'",
+                    timestamp_col,
+                )
+                chunk = pd.concat([buffer, chunk], ignore_index=True)
+            buffers[idx] = chunk
+        # Compute the timestamp before which both datasets are fully loaded.
+        watermark = None
+        is_ready = True
+        for buffer, is_exhausted_ in zip(buffers, is_exhausted):
+            if is_exhausted_:
+                continue
+            if buffer is None or buffer.empty:
+                is_ready = False
+                break
+            last_timestamp = buffer[timestamp_col].max()
+            if watermark is None or last_timestamp < watermark:
+                watermark = last_timestamp
+        if not is_ready or watermark is None:
+            continue
+        # Join the rows before the watermark and keep the rest.
+        heads = []
+        for i, buffer in enumerate(buffers):
+            if buffer is None:
+                heads.append(None)
+                continue
+            mask = buffer[timestamp_col] < watermark
+            heads.append(buffer.loc[mask])
+            buffers[i] = buffer.loc[~mask]
+        merged = _outer_merge(heads, key_cols, suffixes)
+        if merged is not None:
+            yield merged
+    # Join the remaining rows.
+    merged = _outer_merge(buffers, key_cols, suffixes)
+    if merged is not None:
+        yield merged
+
+
+def compare_columns(
+    merged: pd.DataFrame,
+    value_cols: List[str],
+    *,
+    suffixes: Tuple[str, str] = ("_A", "_B"),
+    rtol: float = 0.0,
+    atol: float = 0.0,
+) -> pd.DataFrame:
+    """
+    Compare the values of two joined datasets column by column.
+
+    Missing values are always considered different, consistently with
+    `pd.Series.ne()`.
+
+    :param merged: joined data, e.g. as returned by `iterate_outer_merge()`
+    :param value_cols: columns to compare, without suffixes
+    :param suffixes: suffixes of the columns of the two datasets
+    :param rtol: relative tolerance, as in `np.isclose()`
+    :param atol: absolute tolerance, as in `np.isclose()`
+    :return: boolean dataframe with `value_cols` as columns and True where
+        the values differ
+    """
+    hdbg.dassert_lte(0, rtol)
+    hdbg.dassert_lte(0, atol)
+    is_exact = rtol == 0 and atol == 0
+    is_different = {}
+    for col in value_cols:
+        values1 = merged[col + suffixes[0]]
+        values2 = merged[col + suffixes[1]]
+        if is_exact:
+            is_different[col] = values1.ne(values2).to_numpy()
+        else:
+            is_different[col] = ~np.isclose(
+                values1.to_numpy(dtype=float),
+                values2.to_numpy(dtype=float),
+                rtol=rtol,
+                atol=atol,
+            )
+    df = pd.DataFrame(is_different, index=merged.index, columns=value_cols)
+    return df
+
+
+# #############################################################################
+# DatasetDiff
+# #############################################################################
+
+
+class DatasetDiff:
+    """
+    Summary of the differences between two datasets.
+
+    Only the counts and the first `max_example_rows` differing rows are
+    stored, so that the summary size doesn't depend on the size of the
+    datasets.
+    """
+
+    def __init__(
+        self,
+        key_cols: List[str],
+        value_cols: List[str],
+        *,
+        suffixes: Tuple[str, str] = ("_A", "_B"),
+        max_example_rows: int = 10,
+    ) -> None:
+        """
+        Constructor.
+
+        :param key_cols: columns the datasets are joined on
+        :param value_cols: compared columns, without suffixes
+        :param suffixes: suffixes of the columns of the two datasets
+        :param max_example_rows: max number of differing rows to keep
+        """
+        hdbg.dassert_lte(0, max_example_rows)
+        self._key_cols = key_cols
+        self._value_cols = value_cols
+        self._suffixes = suffixes
+        self._max_example_rows = max_example_rows
+        self.num_rows = 0
+        # Number of rows present only in one of the datasets.
+        self.num_missing_rows = {suffixes[0]: 0, suffixes[1]: 0}
+        # Number of rows present in both datasets with different values.
+        self.num_differing_rows = 0
+        self.num_differing_rows_by_col: Dict[str, int] = {
+            col: 0 for col in value_cols
+        }
+        self._examples: List[pd.DataFrame] = []
+        self._num_example_rows = 0
+
+    @property
+    def num_failed_rows(self) -> int:
+        """
+        Return the number of rows that are missing or differ.
+        """
+        num_missing_rows = sum(self.num_missing_rows.values())
+        return num_missing_rows + self.num_differing_rows
+
+    def update(self, merged: pd.DataFrame, is_different: pd.DataFrame) -> None:
+        """
+        Add a joined chunk to the summary.
+
+        :param merged: chunk returned by `iterate_outer_merge()`
+        :param is_different: result of `compare_columns()` on `merged`
+        """
+        self.num_rows += len(merged)
+        indicator = merged[MERGE_INDICATOR_COL]
+        is_both = (indicator == "both").to_numpy()
+        # Rows missing in the 1st dataset are present only in the 2nd one.
+        self.num_missing_rows[self._suffixes[0]] += int(
+            (indicator == "right_only").sum()
+        )
+        self.num_missing_rows[self._suffixes[1]] += int(
+            (indicator == "left_only").sum()
+        )
+        is_different_both = is_different.loc[is_both]
+        self.num_differing_rows += int(is_different_both.any(axis=1).sum())
+        for col, num_rows in is_different_both.sum().items():
+            self.num_differing_rows_by_col[col] += int(num_rows)
+        # Store examples of failed rows.
+        num_rows_to_add = self._max_example_rows - self._num_example_rows
+        if num_rows_to_add > 0:
+            is_failed = ~is_both | is_different.any(axis=1).to_numpy()
+            examples = merged.loc[is_failed].head(num_rows_to_add)
+            if not examples.empty:
+                cols = self._key_cols + [
+                    col + suffix
+                    for col in self._value_cols
+                    for suffix in self._suffixes
+                ]
+                self._examples.append(examples[cols])
+                self._num_example_rows += len(examples)
+
+    def get_examples(self) -> pd.DataFrame:
+        """
+        Return the stored examples of failed rows.
+        """
+        if not self._examples:
+            return pd.DataFrame()
+        examples = pd.concat(self._examples, ignore_index=True)
+        return examples
+
+    def to_str(self) -> str:
+        """
+        Return a summary of the differences in a human-readable format.
+        """
+        txt = []
+        txt.append(
+            f"num_rows={self.num_rows} num_failed_rows={self.num_failed_rows}"
+        )
+        for suffix, num_rows in self.num_missing_rows.items():
+            txt.append(f"num_rows_missing{suffix}={num_rows}")
+        txt.append(f"num_differing_rows={self.num_differing_rows}")
+        for col, num_rows in self.num_differing_rows_by_col.items():
+            if num_rows > 0:
+                txt.append(f"  {col}: {num_rows}")
+        if self._num_example_rows > 0:
+            txt.append(
+                f"first {self._num_example_rows} failed rows:\n"
+                + self.get_examples().to_string()
+            )
+        txt = "\n".join(txt)
+        return txt
+
+
+def compare_datasets(
+    dataset1: Dataset,
+    dataset2: Dataset,
+    value_cols: List[str],
+    *,
+    key_cols: Optional[List[str]] = None,
+    suffixes: Tuple[str, str] = ("_A", "_B"),
+    rtol: float = 0.0,
+    atol: float = 0.0,
+    max_example_rows: int = 10,
+) -> DatasetDiff:
+    """
+    Compare the values of two datasets joined on the key columns.
+
+    :param dataset1: dataframe or iterable of dataframes sorted by timestamp
+    :param dataset2: same as `dataset1`
+    :param value_cols: columns to compare
+    :param key_cols: columns to join on, by default `timestamp` and
+        `currency_pair`
+    :param suffixes: suffixes for the columns of the two datasets
+    :param rtol: relative tolerance, see `compare_columns()`
+    :param atol: absolute tolerance, see `compare_columns()`
+    :param max_example_rows: max number of failed rows to report
+    :return: summary of the differences
+    """
+    if key_cols is None:
+        key_cols = ["timestamp", "currency_pair"]
+    diff = DatasetDiff(
+        key_cols,
+        value_cols,
+        suffixes=suffixes,
+        max_example_rows=max_example_rows,
+    )
+    for merged in iterate_outer_merge(
+        dataset1, dataset2, key_cols, suffixes=suffixes
+    ):
+        is_different = compare_columns(
+            merged, value_cols, suffixes=suffixes, rtol=rtol, atol=atol
+        )
+        diff.update(merged, is_different)
+    return diff
+
+
+# #############################################################################
+
+
+def _to_chunks(dataset: Dataset) -> Iterator[pd.DataFrame]:
+    if isinstance(dataset, pd.DataFrame):
+        return iter([dataset])
+    return iter(dataset)
+
+
+def _get_lagging_dataset_idx(
+    buffers: List[Optional[pd.DataFrame]],
+    is_exhausted: List[bool],
+    timestamp_col: str,
+) -> int:
+    """
+    Return the index of the dataset to read the next chunk from.
+
+    This is the dataset with no buffered data or with the smallest last
+    timestamp among the ones that are not exhausted.
+    """
+    idx = None
+    min_timestamp = None
+    for i, (buffer, is_exhausted_) in enumerate(zip(buffers, is_exhausted)):
+        if is_exhausted_:
+            continue
+        if buffer is None or buffer.empty:
+            return i
+        last_timestamp = buffer[timestamp_col].max()
+        if min_timestamp is None or last_timestamp < min_timestamp:
+            idx = i
+            min_timestamp = last_timestamp
+    hdbg.dassert_is_not(idx, None)
+    return idx
+
+
+def _outer_merge(
+    dfs: List[Optional[pd.DataFrame]],
+    key_cols: List[str],
+    suffixes: Tuple[str, str],
+) -> Optional[pd.DataFrame]:
+    """
+    Outer join two dataframes, one of which can be missing.
+
+    :return: joined data or None if there are no rows to join
+    """
+    if all(df is None or df.empty for df in dfs):
+        return None
+    # Use the schema of the other dataframe for a missing one.
+    df1, df2 = dfs
+    if df1 is None:
+        df1 = df2.iloc[0:0]
+    if df2 is None:
+        df2 = df1.iloc[0:0]
+    merged = pd.merge(
+        df1,
+        df2,
+        on=key_cols,
+        how="outer",
+        suffixes=suffixes,
+        indicator=MERGE_INDICATOR_COL,
+    )
+    return merged
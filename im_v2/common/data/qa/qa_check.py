@@ -13,6 +13,7 @@ import core.config as cconfig
 import helpers.hdatetime as hdateti
 import helpers.hdbg as hdbg
 import helpers.hpandas as hpandas
+import im_v2.common.data.qa.compare_datasets as imvcdqcoda
 import im_v2.common.data.transform.transform_utils as imvcdttrut
 import sorrentum_sandbox.common.validate as ssacoval
 
@@ -314,35 +315,38 @@ class OuterCrossOHLCVDataCheck(ssacoval.QaCheck):
     This QA check performs a full outer join on two DataFrames based on the 
     'timestamp' and 'currency_pair' columns. It compares the OHLCV data in 
     the joined DataFrame, and if any differences are found, the check fails.
+
+    Each dataset can also be passed as an iterable of DataFrames sorted by
+    'timestamp', in which case the datasets are joined chunk by chunk.
     """
 
-    def check(self, datasets: List[pd.DataFrame]) -> bool:
+    def __init__(self, *, max_example_rows: int = 10) -> None:
+        """
+        :param max_example_rows: max number of differing rows to report
+        """
+        self.max_example_rows = max_example_rows
+
+    def check(self, datasets: List[imvcdqcoda.Dataset]) -> bool:
         """
         :param datasets: List of Pandas dataframe
         :return: True if both datasets are similar, False
             otherwise.
         """
         hdbg.dassert_eq(len(datasets), 2)
-        # Perform a full outer join
-        merged_df = pd.merge(datasets[0], datasets[1], on=['timestamp', 'currency_pair'], how='outer', suffixes=('_A', '_B'))
-        merged_df["QAcheck"] = merged_df.apply(self._is_valid_row, axis=1)
-        qa_check_failed = merged_df[merged_df["QAcheck"] == False]
-        if len(qa_check_failed) > 0:
-            qa_check_failed = qa_check_failed.to_string()
-            self._status = f"FAILED: Different data found:\n\t{qa_check_failed}"
+        cols = ["open", "high", "low", "close", "volume"]
+        diff = imvcdqcoda.compare_datasets(
+            datasets[0],
+            datasets[1],
+            cols,
+            suffixes=("_A", "_B"),
+            max_example_rows=self.max_example_rows,
+        )
+        if diff.num_failed_rows > 0:
+            self._status = f"FAILED: Different data found:\n\t{diff.to_str()}"
             return False
         self._status = "PASSED"
         return True
 
-    def _is_valid_row(self, row: pd.Series) -> bool:
-        """
-        Check if the OHLCV is similar.
-        """
-        cols = ["open", "high", "low", "close", "volume"]
-        for col in cols:
-            if row[col + "_A"] != row[col + "_B"]:
-                return False
-        return True
 
 class BidAskDataFramesSimilarityCheck(ssacoval.QaCheck):
     """
@@ -363,34 +367,18 @@ class BidAskDataFramesSimilarityCheck(ssacoval.QaCheck):
         """
         self.accuracy_threshold_dict = accuracy_threshold_dict
 
-    def check(self, datasets: List[pd.DataFrame]) -> bool:
+    def check(self, datasets: List[imvcdqcoda.Dataset]) -> bool:
         """
         Perform an analysis based on relative differences between column. If
         the relative difference is higher than a desired threshold, the checks
         fails.
 
-        :param datasets: list of pandas dataframes to check
+        :param datasets: list of pandas dataframes to check, or iterables
+            of dataframes sorted by 'timestamp'
         :return: analysis result
         """
-        data = self._preprocess_datasets(datasets)
-        bid_ask_cols = get_multilevel_bid_ask_column_names()
-        # Each bid ask value will have a notional and a relative difference between two sources.
-        for col in bid_ask_cols:
-            # Notional difference: Dataset1 - Dataset2.
-            data[f"{col}_diff"] = data[f"{col}_cc"] - data[f"{col}_ccxt"]
-            # Relative value: (Dataset1 - Dataset2)/Dataset1.
-            data[f"{col}_relative_diff_pct"] = (
-                100
-                * (data[f"{col}_cc"] - data[f"{col}_ccxt"])
-                / data[f"{col}_ccxt"]
-            )
-        # Calculate the mean value of differences for each coin.
-        diff_stats = []
-        grouper = data.groupby(["currency_pair"])
-        for col in bid_ask_cols:
-            diff_stats.append(grouper[f"{col}_diff"].mean())
-            diff_stats.append(grouper[f"{col}_relative_diff_pct"].mean())
-        diff_stats = pd.concat(diff_stats, axis=1)
+        hdbg.dassert_eq(len(datasets), 2)
+        diff_stats = self._compute_mean_relative_diffs(datasets)
         error_message = []
         # Log the difference.
         for index, row in diff_stats.iterrows():
@@ -410,31 +398,50 @@ class BidAskDataFramesSimilarityCheck(ssacoval.QaCheck):
             self._status = "PASSED"
         return self._status == "PASSED"
 
-    def _preprocess_datasets(self, datasets: List[pd.DataFrame]) -> pd.DataFrame:
+    def _compute_mean_relative_diffs(
+        self, datasets: List[imvcdqcoda.Dataset]
+    ) -> pd.DataFrame:
         """
-        Merge two datasets in order to compute column-wise comparison of
-        values.
+        Compute the mean relative difference of each column per coin.
+
+        The datasets are joined chunk by chunk, accumulating the sums and the
+        counts of the differences, so that the full datasets are not joined
+        at once.
+
+        :return: mean relative differences indexed by currency pair
         """
-        datasets = list(
-            map(
-                lambda data: data.set_index(
-                    ["timestamp", "currency_pair"], drop=True
-                ),
-                datasets,
-            )
-        )
-        # TODO(Juraj): for now we perform comparison on the intersection
-        #  of both universes
-        data = datasets[0].merge(
+        bid_ask_cols = get_multilevel_bid_ask_column_names()
+        sums = []
+        counts = []
+        for data in imvcdqcoda.iterate_outer_merge(
+            datasets[0],
             datasets[1],
-            left_index=True,
-            right_index=True,
+            ["timestamp", "currency_pair"],
             # TODO(Juraj) handle the suffixes better.
             suffixes=("_ccxt", "_cc"),
-        )
-        # Move the same metrics from two vendors together.
-        data = data.reindex(sorted(data.columns), axis=1)
-        return data
+        ):
+            # TODO(Juraj): for now we perform comparison on the intersection
+            #  of both universes
+            data = data.loc[data[imvcdqcoda.MERGE_INDICATOR_COL] == "both"]
+            relative_diffs = {}
+            for col in bid_ask_cols:
+                # Relative value: (Dataset1 - Dataset2)/Dataset1.
+                relative_diffs[f"{col}_relative_diff_pct"] = (
+                    100
+                    * (data[f"{col}_cc"] - data[f"{col}_ccxt"])
+                    / data[f"{col}_ccxt"]
+                )
+            relative_diffs = pd.DataFrame(relative_diffs)
+            grouper = relative_diffs.groupby(data["currency_pair"])
+            sums.append(grouper.sum())
+            counts.append(grouper.count())
+        if not sums:
+            return pd.DataFrame()
+        # Calculate the mean value of differences for each coin.
+        sums = pd.concat(sums).groupby(level=0).sum()
+        counts = pd.concat(counts).groupby(level=0).sum()
+        diff_stats = sums / counts
+        return diff_stats
 
 
 class DuplicateDifferingOhlcvCheck(ssacoval.QaCheck):
@@ -459,6 +466,12 @@ class DuplicateDifferingOhlcvCheck(ssacoval.QaCheck):
         ```
     """
 
+    def __init__(self, *, max_example_rows: int = 10) -> None:
+        """
+        :param max_example_rows: max number of duplicate rows to report
+        """
+        self.max_example_rows = max_example_rows
+
     def check(self, datasets: List[pd.DataFrame]) -> bool:
         """
         :param datasets: List of Pandas dataframe
@@ -481,9 +494,14 @@ class DuplicateDifferingOhlcvCheck(ssacoval.QaCheck):
                 dataset.duplicated(["timestamp", "currency_pair"], keep=False)
             ]
             if not duplicates.empty:
-                duplicates_str = duplicates.to_string()
+                duplicates_str = duplicates.head(
+                    self.max_example_rows
+                ).to_string()
                 self._status = (
-                    f"FAILED: Duplicate table contents:\n\t{duplicates_str}"
+                    f"FAILED: Duplicate table contents:\n\t"
+                    f"num_rows={len(duplicates)}, first "
+                    f"{min(len(duplicates), self.max_example_rows)} rows:\n"
+                    f"{duplicates_str}"
                 )
                 return False
         self._status = "PASSED"
@@ -0,0 +1,101 @@
+import pandas as pd
+
+import helpers.hunit_test as hunitest
+import im_v2.common.data.qa.compare_datasets as imvcdqcoda
+
+
+def _get_data(num_timestamps: int, value: float) -> pd.DataFrame:
+    """
+    Build data with 2 currency pairs per timestamp.
+    """
+    data = pd.DataFrame(
+        {
+            "timestamp": [ts for ts in range(num_timestamps) for _ in range(2)],
+            "currency_pair": ["BTC_USDT", "ETH_USDT"] * num_timestamps,
+            "close": value,
+        }
+    )
+    return data
+
+
+def _split(data: pd.DataFrame, chunk_size: int) -> list:
+    chunks = [
+        data.iloc[i : i + chunk_size] for i in range(0, len(data), chunk_size)
+    ]
+    return chunks
+
+
+class TestIterateOuterMerge(hunitest.TestCase):
+    def test1(self) -> None:
+        """
+        Check that merging chunks of different sizes is equivalent to merging
+        the full datasets.
+        """
+        data1 = _get_data(10, 1.0).drop(index=[3, 4])
+        data2 = _get_data(12, 2.0).drop(index=[7])
+        key_cols = ["timestamp", "currency_pair"]
+        merged = imvcdqcoda.iterate_outer_merge(
+            _split(data1, 3), _split(data2, 5), key_cols
+        )
+        actual = pd.concat(merged)
+        actual = actual.sort_values(key_cols).reset_index(drop=True)
+        expected = pd.merge(
+            data1,
+            data2,
+            on=key_cols,
+            how="outer",
+            suffixes=("_A", "_B"),
+            indicator=True,
+        )
+        expected = expected.sort_values(key_cols).reset_index(drop=True)
+        self.assert_equal(str(actual), str(expected))
+
+    def test2(self) -> None:
+        """
+        Check that unsorted chunks are detected.
+        """
+        data = _get_data(4, 1.0)
+        chunks = [data.iloc[4:], data.iloc[:4]]
+        merged = imvcdqcoda.iterate_outer_merge(
+            chunks, _split(data, 2), ["timestamp", "currency_pair"]
+        )
+        with self.assertRaises(AssertionError):
+            list(merged)
+
+
+class TestCompareDatasets(hunitest.TestCase):
+    def test1(self) -> None:
+        """
+        Check the summary of missing and differing rows.
+        """
+        data1 = _get_data(5, 1.0)
+        data2 = _get_data(6, 1.0).drop(index=[0])
+        data2.loc[[2, 5], "close"] = 1.01
+        diff = imvcdqcoda.compare_datasets(
+            _split(data1, 4), data2, ["close"], max_example_rows=3
+        )
+        actual = diff.to_str()
+        expected = r"""
+        num_rows=12 num_failed_rows=5
+        num_rows_missing_A=2
+        num_rows_missing_B=1
+        num_differing_rows=2
+          close: 2
+        first 3 failed rows:
+           timestamp currency_pair  close_A  close_B
+        0          0      BTC_USDT      1.0      NaN
+        1          1      BTC_USDT      1.0     1.01
+        2          2      ETH_USDT      1.0     1.01
+        """
+        self.assert_equal(actual, expected, dedent=True, fuzzy_match=True)
+
+    def test2(self) -> None:
+        """
+        Check that differences within the tolerance are ignored.
+        """
+        data1 = _get_data(5, 1.0)
+        data2 = _get_data(5, 1.001)
+        diff = imvcdqcoda.compare_datasets(data1, data2, ["close"], rtol=1e-2)
+        self.assertEqual(diff.num_failed_rows, 0)
+        diff = imvcdqcoda.compare_datasets(data1, data2, ["close"], rtol=1e-4)
+        self.assertEqual(diff.num_failed_rows, 10)
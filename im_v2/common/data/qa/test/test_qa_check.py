@@ -306,3 +306,39 @@ class TestDuplicateDifferingOhlcvCheck(QAChecksTestCase):
         # Check results.
         self.assertFalse(check_result)
         self.assertIn("FAILED", check_instance.get_status())
+
+
+class TestOuterCrossOHLCVDataCheck(QAChecksTestCase):
+    def test_identical_datasets(self) -> None:
+        """
+        Check that identical datasets pass the check.
+        """
+        # Prepare data.
+        start_timestamp = pd.Timestamp("2023-01-15T00:00:00+00:00")
+        dataset = self._get_data(start_timestamp, 5)
+        # Execute.
+        check_instance = imvcdqqach.OuterCrossOHLCVDataCheck()
+        check_result = check_instance.check([dataset, dataset])
+        # Check results.
+        self.assertTrue(check_result)
+        self.assertIn("PASSED", check_instance.get_status())
+
+    def test_different_datasets(self) -> None:
+        """
+        Check that a missing row and a differing row fail the check.
+        """
+        # Prepare data.
+        start_timestamp = pd.Timestamp("2023-01-15T00:00:00+00:00")
+        dataset1 = self._get_data(start_timestamp, 5)
+        dataset2 = dataset1.drop(index=[0])
+        dataset2.loc[3, "volume"] = 100
+        # Execute.
+        check_instance = imvcdqqach.OuterCrossOHLCVDataCheck(
+            max_example_rows=1
+        )
+        check_result = check_instance.check([dataset1, dataset2])
+        # Check results.
+        self.assertFalse(check_result)
+        actual = check_instance.get_status()
+        self.assertIn("num_rows=6 num_failed_rows=2", actual)
+        self.assertIn("first 1 failed rows", actual)
@@ -12,7 +12,8 @@ This assumes that the underlying data is sampled at a 1 second resolution.
     --src_signature 'periodic_daily.airflow.downloaded_1sec.csv.bid_ask.futures.v3.crypto_chassis.binance.v1_0_0' \
     --src_s3_path 's3://cryptokaizen-data-test/' \
     --dst_signature 'periodic_daily.airflow.resampled_1min.parquet.bid_ask.futures.v3.crypto_chassis.binance.v1_0_0' \
-    --dst_s3_path 's3://cryptokaizen-data-test/'
+    --dst_s3_path 's3://cryptokaizen-data-test/' \
+    --num_threads 4
 
 Import as:
 
@@ -20,7 +21,9 @@ import im_v2.common.data.transform.resample_daily_bid_ask_data as imvcdtrdba
 """
 import argparse
 import logging
-from typing import Callable, List, Optional, Tuple
+import os
+import tempfile
+from typing import Any, Callable, List, Optional, Tuple, Union
 
 import pandas as pd
 
@@ -28,6 +31,7 @@ import core.finance.bid_ask as cfibiask
 import data_schema.dataset_schema_utils as dsdascut
 import helpers.hdatetime as hdateti
 import helpers.hdbg as hdbg
+import helpers.hjoblib as hjoblib
 import helpers.hpandas as hpandas
 import helpers.hparquet as hparque
 import helpers.hparser as hparser
@@ -101,6 +105,79 @@ def _get_s3_path_from_signature(signature: str, base_s3_path: str) -> str:
     return s3_path
 
 
+def _resample_currency_pair(
+    data: pd.DataFrame,
+    currency_pair: str,
+    bid_ask_levels: int,
+    **kwargs: Any,
+) -> pd.DataFrame:
+    """
+    Resample the bid/ask data of a single currency pair to 1 minute.
+
+    :param data: bid/ask data for `currency_pair`
+    :param bid_ask_levels: number of levels of the order book to resample
+    :param kwargs: `hjoblib` params, unused
+    :return: resampled data with a `currency_pair` column
+    """
+    _ = kwargs
+    data_resampled = imvcdttrut.resample_multilevel_bid_ask_data_to_1min(
+        data, number_levels_of_order_book=bid_ask_levels
+    )
+    if not data_resampled.empty:
+        data_resampled["currency_pair"] = currency_pair
+    return data_resampled
+
+
+def _resample_currency_pairs(
+    data: pd.DataFrame,
+    bid_ask_levels: int,
+    num_threads: Union[str, int],
+) -> List[Tuple[str, pd.DataFrame]]:
+    """
+    Resample the bid/ask data of each currency pair to 1 minute.
+
+    The data is split by currency pair in a single pass and each currency
+    pair is resampled in a separate task.
+
+    :param data: bid/ask data for multiple currency pairs
+    :param bid_ask_levels: number of levels of the order book to resample
+    :param num_threads: number of processes to use, "serial" to run in the
+        current process
+    :return: currency pairs and the corresponding resampled data, in order of
+        appearance in `data`
+    """
+    tasks = []
+    for currency_pair, data_single in data.groupby(
+        "currency_pair", sort=False
+    ):
+        task: hjoblib.Task = (
+            (data_single, currency_pair, bid_ask_levels),
+            {},
+        )
+        tasks.append(task)
+    currency_pairs = [task[0][1] for task in tasks]
+    func_name = "_resample_currency_pair"
+    workload = (_resample_currency_pair, func_name, tasks)
+    hdbg.dassert(hjoblib.validate_workload(workload))
+    dry_run = False
+    incremental = False
+    abort_on_error = True
+    num_attempts = 1
+    log_file = os.path.join(
+        tempfile.gettempdir(), "resample_daily_bid_ask_data.parallel_execute.log"
+    )
+    data_resampled = hjoblib.parallel_execute(
+        workload,
+        dry_run,
+        num_threads,
+        incremental,
+        abort_on_error,
+        num_attempts,
+        log_file,
+    )
+    return list(zip(currency_pairs, data_resampled))
+
+
 def _run(args: argparse.Namespace, aws_profile: hs3.AwsProfile = "ck") -> None:
     # Get arguments from the dataset signatures.
     dataset_schema = dsdascut.get_dataset_schema()
@@ -152,21 +229,13 @@ def _run(args: argparse.Namespace, aws_profile: hs3.AwsProfile = "ck") -> None:
     data = _preprocess_src_data(scr_signature_args["action_tag"], data)
     data_resampled = []
     input_currency_pairs = data["currency_pair"].unique()
-    for currency_pair in input_currency_pairs:
-        data_single = data[data["currency_pair"] == currency_pair]
-        if data_single.empty:
-            _LOG.warning(
-                "Empty Dataframe: no data for %s in %s-%s time period",
-                currency_pair,
-                args.start_timestamp,
-                args.end_timestamp,
-            )
-            continue
-        data_resampled_single = imvcdttrut.resample_multilevel_bid_ask_data_to_1min(
-            data_single, number_levels_of_order_book=args.bid_ask_levels
-        )
+    num_threads = args.num_threads
+    if num_threads != "serial":
+        num_threads = int(num_threads)
+    for currency_pair, data_resampled_single in _resample_currency_pairs(
+        data, args.bid_ask_levels, num_threads
+    ):
         if not data_resampled_single.empty:
-            data_resampled_single["currency_pair"] = currency_pair
             data_resampled.append(data_resampled_single)
         else:
             _LOG.warning(
@@ -194,8 +263,10 @@ def _run(args: argparse.Namespace, aws_profile: hs3.AwsProfile = "ck") -> None:
                     add_space=True,
                 ),
             )
-        data_resampled["timestamp"] = data_resampled["timestamp"].apply(
-            lambda x: hdateti.convert_timestamp_to_unix_epoch(x, epoch_unit)
+        data_resampled[
+            "timestamp"
+        ] = imvcdttrut.convert_timestamp_column_to_unix_epoch(
+            data_resampled["timestamp"], epoch_unit
         )
         data_resampled = imvcdttrut.add_knowledge_timestamp_col(
             data_resampled, "UTC"
@@ -285,6 +356,15 @@ def _parse() -> argparse.ArgumentParser:
         type=int,
         help='Filter data to get top "n" levels of bid-ask data.',
     )
+    parser.add_argument(
+        "--num_threads",
+        default="serial",
+        action="store",
+        required=False,
+        type=str,
+        help="Number of processes to resample the currency pairs with, "
+        "'-1' to use all CPUs, 'serial' to run in the current process",
+    )
     parser = hparser.add_verbosity_arg(parser)
     return parser
 
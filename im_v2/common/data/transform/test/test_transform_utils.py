@@ -1,10 +1,12 @@
 import os
 import unittest.mock as umock
 
+import numpy as np
 import pandas as pd
 import pytest
 
 import data_schema.dataset_schema_utils as dsdascut
+import helpers.hdatetime as hdateti
 import helpers.hdbg as hdbg
 import helpers.hmoto as hmoto
 import helpers.hpandas as hpandas
@@ -776,3 +778,142 @@ class TestResampleBidAskData2(hunitest.TestCase):
         scratch_dir = self.get_scratch_space()
         aws_profile = "ck"
         hs3.copy_data_from_s3_to_local_dir(s3_input_dir, scratch_dir, aws_profile)
+
+
+class TestResampleBidAskDataTo1minInChunks(hunitest.TestCase):
+    @staticmethod
+    def get_test_data(num_ticks: int, seed: int) -> pd.DataFrame:
+        """
+        Build bid/ask data with irregular ticks.
+
+        The gaps between ticks include ticks in the same grid interval, ticks
+        on the grid and gaps longer than the forward fill limit.
+        """
+        rng = np.random.default_rng(seed)
+        gaps_in_ms = rng.choice(
+            [1, 30, 100, 250, 5000, 61000, 130000],
+            size=num_ticks,
+            p=[0.1, 0.3, 0.2, 0.2, 0.1, 0.05, 0.05],
+        )
+        start_timestamp = pd.Timestamp("2023-05-05 14:00:00.050", tz="UTC")
+        index = start_timestamp + pd.to_timedelta(np.cumsum(gaps_in_ms), "ms")
+        data = pd.DataFrame(
+            {
+                "bid_size": rng.integers(1, 10, num_ticks).astype(float),
+                "bid_price": rng.integers(100, 105, num_ticks).astype(float),
+                "ask_size": rng.integers(1, 10, num_ticks).astype(float),
+                "ask_price": rng.integers(105, 110, num_ticks).astype(float),
+            },
+            index=pd.DatetimeIndex(index, name="timestamp"),
+        )
+        return data
+
+    def test1(self) -> None:
+        """
+        Verify that the data is resampled as in
+        `resample_bid_ask_data_to_1min()`, regardless of the chunks.
+        """
+        data = self.get_test_data(2000, seed=1)
+        expected = imvcdttrut.resample_bid_ask_data_to_1min(data.copy())
+        for num_chunks in [1, 9, 100]:
+            chunks = [
+                data.iloc[idxs]
+                for idxs in np.array_split(np.arange(len(data)), num_chunks)
+            ]
+            actual = pd.concat(
+                imvcdttrut.resample_bid_ask_data_to_1min_in_chunks(chunks)
+            )
+            self.assertEqual(actual.index.freq, expected.index.freq)
+            pd.testing.assert_frame_equal(actual, expected, check_freq=False)
+
+    def test2(self) -> None:
+        """
+        Verify that a bar is returned only when it can't change.
+        """
+        data = self.get_test_data(4, seed=2)
+        data.index = pd.DatetimeIndex(
+            [
+                "2023-05-05 14:00:10.000+00:00",
+                "2023-05-05 14:01:30.030+00:00",
+                # Same grid interval as the previous tick.
+                "2023-05-05 14:01:30.060+00:00",
+                "2023-05-05 14:02:10.000+00:00",
+            ],
+            name="timestamp",
+        )
+        chunks = [data.iloc[:2], data.iloc[2:3], data.iloc[3:]]
+        iterator = imvcdttrut.resample_bid_ask_data_to_1min_in_chunks(chunks)
+        actual = [df.index.strftime("%H:%M").tolist() for df in iterator]
+        expected = [["14:01"], ["14:02"], ["14:03"]]
+        self.assertListEqual(actual, expected)
+        actual = pd.concat(
+            imvcdttrut.resample_bid_ask_data_to_1min_in_chunks(chunks)
+        )
+        expected = imvcdttrut.resample_bid_ask_data_to_1min(data.copy())
+        pd.testing.assert_frame_equal(actual, expected, check_freq=False)
+
+    def test3(self) -> None:
+        """
+        Verify that the missing values are skipped and forward filled column
+        by column as in `resample_bid_ask_data_to_1min()`.
+        """
+        data = self.get_test_data(2000, seed=3)
+        rng = np.random.default_rng(3)
+        # Set missing values in each column, including runs of ticks longer
+        # than the forward fill limit and ticks with all the values missing.
+        for col in data.columns:
+            data.loc[rng.random(len(data)) < 0.2, col] = np.nan
+            start = rng.integers(0, len(data) - 100)
+            data.iloc[start : start + 100, data.columns.get_loc(col)] = np.nan
+        data.iloc[10:20] = np.nan
+        expected = imvcdttrut.resample_bid_ask_data_to_1min(data.copy())
+        for num_chunks in [1, 9, 100]:
+            chunks = [
+                data.iloc[idxs]
+                for idxs in np.array_split(np.arange(len(data)), num_chunks)
+            ]
+            actual = pd.concat(
+                imvcdttrut.resample_bid_ask_data_to_1min_in_chunks(chunks)
+            )
+            pd.testing.assert_frame_equal(actual, expected, check_freq=False)
+
+
+class TestResampleMultilevelBidAskDataTo1min(hunitest.TestCase):
+    def test1(self) -> None:
+        """
+        Verify that empty data is resampled to an empty df.
+        """
+        columns = ["exchange_id"] + [
+            f"{col}_l1" for col in imvcdttrut.BID_ASK_COLS
+        ]
+        data = pd.DataFrame(
+            columns=columns,
+            index=pd.DatetimeIndex([], tz="UTC", name="timestamp"),
+        )
+        actual = imvcdttrut.resample_multilevel_bid_ask_data_to_1min(
+            data, number_levels_of_order_book=1
+        )
+        self.assertTrue(actual.empty)
+        self.assertEqual(len(actual.columns), 40)
+        self.assertIn("level_1.bid_price.open", actual.columns)
+        self.assertEqual(actual.columns[-1], "exchange_id")
+
+
+class TestConvertTimestampColumnToUnixEpoch(hunitest.TestCase):
+    def test1(self) -> None:
+        """
+        Verify that the conversion matches the one of a single timestamp.
+        """
+        timestamps = pd.Series(
+            pd.date_range(
+                "2023-05-05 14:00:00.0015", periods=5, freq="333ms", tz="UTC"
+            )
+        )
+        for unit in ["ms", "s"]:
+            actual = imvcdttrut.convert_timestamp_column_to_unix_epoch(
+                timestamps, unit
+            )
+            expected = timestamps.apply(
+                lambda x: hdateti.convert_timestamp_to_unix_epoch(x, unit)
+            )
+            self.assert_equal(str(actual), str(expected))
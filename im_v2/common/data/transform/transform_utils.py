@@ -7,7 +7,7 @@ import im_v2.common.data.transform.transform_utils as imvcdttrut
 """
 
 import logging
-from typing import Dict, List
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
@@ -95,6 +95,26 @@ def convert_timestamp_column(
     return converted_datetime_col
 
 
+def convert_timestamp_column_to_unix_epoch(
+    timestamps: pd.Series,
+    unit: str = "ms",
+) -> pd.Series:
+    """
+    Convert a series of timestamps into Unix epochs.
+
+    This is a vectorized version of `hdateti.convert_timestamp_to_unix_epoch()`.
+
+    :param timestamps: series containing datetimes
+    :param unit: the unit of unix epoch
+    :return: series containing unix epochs as int
+    """
+    if timestamps.dt.tz is not None:
+        # Convert to UTC and make the timestamps tz-naive.
+        timestamps = timestamps.dt.tz_convert(None)
+    epochs = (timestamps - pd.Timestamp("1970-01-01")) // pd.Timedelta("1" + unit)
+    return epochs
+
+
 def reindex_on_datetime(
     df: pd.DataFrame, datetime_col_name: str, unit: str = "ms"
 ) -> pd.DataFrame:
@@ -527,6 +547,452 @@ def resample_bid_ask_data_to_1min(
     return data_1min
 
 
+# Point-in-time columns aggregated by `resample_bid_ask_data_to_1min()`.
+_BID_ASK_RESAMPLING_COLS = [
+    "bid_price",
+    "bid_size",
+    "ask_price",
+    "ask_size",
+    "bid_ask_midpoint",
+    "half_spread",
+    "log_size_imbalance",
+]
+# Max number of grid points a value is forward filled to.
+_BID_ASK_FFILL_LIMIT = 601
+
+
+def resample_bid_ask_data_to_1min_in_chunks(
+    chunks: Iterable[pd.DataFrame],
+    time_resolution_in_ms: int = 200,
+) -> Iterator[pd.DataFrame]:
+    """
+    Resample single level of bid/ask data to 1 minute interval in chunks.
+
+    Same as `resample_bid_ask_data_to_1min()`, but the data is processed in
+    chunks without materializing the forward filled data on the
+    `time_resolution_in_ms / 2` grid.
+
+    On the grid, the last non-missing value of each column is held until the
+    next tick with a non-missing value in the column (up to the forward fill
+    limit), so the aggregates are computed column by column by weighting each
+    tick with the number of grid points it covers in each minute, and the
+    variance and autocovariance terms are non-zero only where a new tick
+    starts.
+
+    The state is carried across chunks, so a minute is returned only once
+    the data of the following chunks can't change it.
+
+    :param chunks: bid/ask data for a single symbol in the format expected
+        by `resample_bid_ask_data_to_1min()`, with chunks in chronological
+        order
+    :param time_resolution_in_ms: same as in `resample_bid_ask_data_to_1min()`
+    :return: iterator over data resampled to 1 minute bars
+    """
+    rule = str(int(time_resolution_in_ms / 2)) + "ms"
+    step = pd.Timedelta(rule).value
+    minute = pd.Timedelta("1T").value
+    hdbg.dassert_eq(minute % step, 0, "Invalid time resolution")
+    num_steps_per_minute = minute // step
+    # Grid points and values of the ticks of each column that can still
+    # affect the next bars.
+    ticks: Optional[List[Tuple[np.ndarray, np.ndarray]]] = None
+    # Last grid point with a tick, including the ticks with missing values.
+    last_grid_idx: Optional[int] = None
+    # Index of the first minute that is not returned yet.
+    next_minute_idx: Optional[int] = None
+    tz = None
+    index_name = None
+    for chunk in chunks:
+        if chunk.empty:
+            continue
+        hdbg.dassert_set_eq(BID_ASK_COLS, chunk.columns)
+        tz = chunk.index.tz
+        index_name = chunk.index.name
+        chunk_grid_idxs, chunk_ticks = _get_bid_ask_ticks_on_grid(chunk, step)
+        if ticks is not None:
+            hdbg.dassert_lte(
+                last_grid_idx,
+                chunk_grid_idxs[0],
+                "Chunks are not in chronological order",
+            )
+            chunk_ticks = [
+                _keep_last_tick_per_grid_idx(
+                    np.concatenate([grid_idxs, chunk_grid_idxs_]),
+                    np.concatenate([values, chunk_values]),
+                )
+                for (grid_idxs, values), (chunk_grid_idxs_, chunk_values) in zip(
+                    ticks, chunk_ticks
+                )
+            ]
+        ticks = chunk_ticks
+        last_grid_idx = chunk_grid_idxs[-1]
+        if next_minute_idx is None:
+            next_minute_idx = _ceil_div(chunk_grid_idxs[0], num_steps_per_minute)
+        # The bar containing the last tick can change with the next chunk,
+        # since the last tick can be updated or forward filled.
+        last_minute_idx = _ceil_div(last_grid_idx, num_steps_per_minute)
+        if next_minute_idx < last_minute_idx:
+            yield _resample_bid_ask_ticks_on_grid_to_1min(
+                ticks,
+                last_grid_idx,
+                next_minute_idx,
+                last_minute_idx,
+                num_steps_per_minute,
+                step,
+                tz,
+                index_name,
+                rule,
+            )
+            next_minute_idx = last_minute_idx
+        # Keep only the ticks that can be forward filled into the bars to
+        # return, plus the 2 previous ones to compute the time diffs.
+        first_grid_idx = (next_minute_idx - 1) * num_steps_per_minute + 1
+        first_grid_idx -= _BID_ASK_FFILL_LIMIT
+        trimmed_ticks = []
+        for grid_idxs, values in ticks:
+            idx = np.searchsorted(grid_idxs, first_grid_idx, side="left")
+            idx = max(0, idx - 2)
+            trimmed_ticks.append((grid_idxs[idx:], values[idx:]))
+        ticks = trimmed_ticks
+    if ticks is not None:
+        # Return the remaining bars.
+        last_minute_idx = _ceil_div(last_grid_idx, num_steps_per_minute)
+        yield _resample_bid_ask_ticks_on_grid_to_1min(
+            ticks,
+            last_grid_idx,
+            next_minute_idx,
+            last_minute_idx + 1,
+            num_steps_per_minute,
+            step,
+            tz,
+            index_name,
+            rule,
+        )
+
+
+def _ceil_div(a: np.ndarray, b: int) -> np.ndarray:
+    return -(-a // b)
+
+
+def _get_bid_ask_ticks_on_grid(
+    data: pd.DataFrame, step: int
+) -> Tuple[np.ndarray, List[Tuple[np.ndarray, np.ndarray]]]:
+    """
+    Compute the point-in-time columns and the grid points of the ticks.
+
+    :param data: bid/ask data for a single symbol
+    :param step: grid step in ns
+    :return:
+        - sorted grid points of all the ticks, as number of steps since
+          epoch, each one labeling the interval `(grid_idx - 1, grid_idx]`
+        - for each column of `_BID_ASK_RESAMPLING_COLS`, the sorted grid
+          points with a non-missing value and the last non-missing value for
+          each of them
+    """
+    data = data.sort_index(kind="stable")
+    bid_price = data["bid_price"].to_numpy(dtype=np.float64)
+    bid_size = data["bid_size"].to_numpy(dtype=np.float64)
+    ask_price = data["ask_price"].to_numpy(dtype=np.float64)
+    ask_size = data["ask_size"].to_numpy(dtype=np.float64)
+    values = [
+        bid_price,
+        bid_size,
+        ask_price,
+        ask_size,
+        0.5 * (ask_price + bid_price),
+        0.5 * (ask_price - bid_price),
+        np.log(bid_size) - np.log(ask_size),
+    ]
+    grid_idxs = _ceil_div(data.index.asi8, step)
+    # Keep the last non-missing value of each column for each grid point,
+    # like `resample().last()`.
+    ticks = []
+    for col_values in values:
+        mask = ~np.isnan(col_values)
+        ticks.append(
+            _keep_last_tick_per_grid_idx(grid_idxs[mask], col_values[mask])
+        )
+    return grid_idxs, ticks
+
+
+def _keep_last_tick_per_grid_idx(
+    grid_idxs: np.ndarray, values: np.ndarray
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Keep the last tick for each grid point.
+
+    :param grid_idxs: sorted grid points of the ticks
+    :param values: values of the ticks
+    """
+    if len(grid_idxs) == 0:
+        return grid_idxs, values
+    is_last = np.append(grid_idxs[1:] != grid_idxs[:-1], True)
+    return grid_idxs[is_last], values[is_last]
+
+
+def _resample_bid_ask_ticks_on_grid_to_1min(
+    ticks: List[Tuple[np.ndarray, np.ndarray]],
+    last_grid_idx: int,
+    start_minute_idx: int,
+    end_minute_idx: int,
+    num_steps_per_minute: int,
+    step: int,
+    tz: Optional[str],
+    index_name: Optional[str],
+    rule: str,
+) -> pd.DataFrame:
+    """
+    Compute the 1 minute bars in `[start_minute_idx, end_minute_idx)`.
+
+    :param last_grid_idx: last grid point with a tick, which the values are
+        forward filled up to
+    See `_get_bid_ask_ticks_on_grid()` for the other params.
+    """
+    num_minutes = end_minute_idx - start_minute_idx
+    num_cols = len(_BID_ASK_RESAMPLING_COLS)
+    open_ = np.full((num_minutes, num_cols), np.nan)
+    close = np.full((num_minutes, num_cols), np.nan)
+    high = np.full((num_minutes, num_cols), np.nan)
+    low = np.full((num_minutes, num_cols), np.nan)
+    mean = np.full((num_minutes, num_cols), np.nan)
+    sum_ = np.zeros((num_minutes, 4))
+    for col_idx, (grid_idxs, values) in enumerate(ticks):
+        if len(grid_idxs) == 0:
+            continue
+        # Split the interval covered by each tick by minute.
+        (
+            tick_idxs,
+            minute_idxs,
+            counts,
+            is_tick_start,
+        ) = _split_bid_ask_ticks_by_minute(
+            grid_idxs,
+            last_grid_idx,
+            start_minute_idx,
+            end_minute_idx,
+            num_steps_per_minute,
+        )
+        if len(minute_idxs) == 0:
+            continue
+        # Aggregate the pieces by minute.
+        group_starts = np.flatnonzero(
+            np.append(True, minute_idxs[1:] != minute_idxs[:-1])
+        )
+        group_ends = np.append(group_starts[1:], len(minute_idxs)) - 1
+        rows = minute_idxs[group_starts] - start_minute_idx
+        piece_values = values[tick_idxs]
+        open_[rows, col_idx] = piece_values[group_starts]
+        close[rows, col_idx] = piece_values[group_ends]
+        high[rows, col_idx] = np.maximum.reduceat(piece_values, group_starts)
+        low[rows, col_idx] = np.minimum.reduceat(piece_values, group_starts)
+        mean[rows, col_idx] = np.add.reduceat(
+            piece_values * counts, group_starts
+        ) / np.add.reduceat(counts, group_starts)
+        # Compute the sums of the time diff columns.
+        col = _BID_ASK_RESAMPLING_COLS[col_idx]
+        if col == "bid_ask_midpoint":
+            sums = _get_bid_ask_midpoint_time_diff_sums(
+                grid_idxs, values, tick_idxs, is_tick_start
+            )
+            sum_[rows, :2] = np.add.reduceat(sums, group_starts, axis=0)
+        elif col == "log_size_imbalance":
+            sums = _get_log_size_imbalance_time_diff_sums(
+                grid_idxs, values, tick_idxs, counts, is_tick_start
+            )
+            sum_[rows, 2:] = np.add.reduceat(sums, group_starts, axis=0)
+    # Build the output in the same format as `resample_bid_ask_data_to_1min()`.
+    minute_timestamps = (
+        np.arange(start_minute_idx, end_minute_idx) * num_steps_per_minute * step
+    )
+    index = pd.DatetimeIndex(minute_timestamps.astype("datetime64[ns]"))
+    if tz is not None:
+        index = index.tz_localize("UTC").tz_convert(tz)
+    index = pd.DatetimeIndex(index, freq="T", name=index_name)
+    size_cols = ["bid_size", "ask_size"]
+    high_cols = [
+        f"{col}.max" if col in size_cols or i > 3 else f"{col}.high"
+        for i, col in enumerate(_BID_ASK_RESAMPLING_COLS)
+    ]
+    low_cols = [
+        f"{col}.min" if col in size_cols or i > 3 else f"{col}.low"
+        for i, col in enumerate(_BID_ASK_RESAMPLING_COLS)
+    ]
+    columns = (
+        [f"{col}.open" for col in _BID_ASK_RESAMPLING_COLS]
+        + [f"{col}.close" for col in _BID_ASK_RESAMPLING_COLS]
+        + high_cols
+        + low_cols
+        + [f"{col}.mean" for col in _BID_ASK_RESAMPLING_COLS]
+        + [
+            f"bid_ask_midpoint_var.{rule}",
+            f"bid_ask_midpoint_autocovar.{rule}",
+            f"log_size_imbalance_var.{rule}",
+            f"log_size_imbalance_autocovar.{rule}",
+        ]
+    )
+    data = np.concatenate([open_, close, high, low, mean, sum_], axis=1)
+    data_1min = pd.DataFrame(data, index=index, columns=columns)
+    return data_1min
+
+
+def _get_empty_bid_ask_data_1min(
+    index: pd.DatetimeIndex, time_resolution_in_ms: int = 200
+) -> pd.DataFrame:
+    """
+    Build data resampled to 1 minute bars with no bars.
+
+    :param index: index of the data to resample, used for the timezone and
+        the name of the index
+    """
+    rule = str(int(time_resolution_in_ms / 2)) + "ms"
+    step = pd.Timedelta(rule).value
+    num_steps_per_minute = pd.Timedelta("1T").value // step
+    ticks = [(np.array([], dtype=np.int64), np.array([]))] * len(
+        _BID_ASK_RESAMPLING_COLS
+    )
+    data_1min = _resample_bid_ask_ticks_on_grid_to_1min(
+        ticks,
+        0,
+        0,
+        0,
+        num_steps_per_minute,
+        step,
+        index.tz,
+        index.name,
+        rule,
+    )
+    return data_1min
+
+
+def _split_bid_ask_ticks_by_minute(
+    grid_idxs: np.ndarray,
+    last_grid_idx: int,
+    start_minute_idx: int,
+    end_minute_idx: int,
+    num_steps_per_minute: int,
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Split the grid points covered by the ticks of a column by minute.
+
+    A tick covers the grid points until the next tick, up to the forward fill
+    limit and to `last_grid_idx`.
+
+    :return: for each piece in the requested minutes, sorted by minute:
+        - index of the tick
+        - minute index
+        - number of grid points covered
+        - whether the piece starts at the grid point of the tick
+    """
+    num_ticks = len(grid_idxs)
+    # Compute the number of grid points covered by each tick.
+    lengths = np.empty(num_ticks, dtype=np.int64)
+    lengths[:-1] = np.minimum(np.diff(grid_idxs), _BID_ASK_FFILL_LIMIT + 1)
+    lengths[-1] = min(last_grid_idx - grid_idxs[-1] + 1, _BID_ASK_FFILL_LIMIT + 1)
+    first_grid_idxs = grid_idxs
+    last_grid_idxs = grid_idxs + lengths - 1
+    first_minute_idxs = _ceil_div(first_grid_idxs, num_steps_per_minute)
+    last_minute_idxs = _ceil_div(last_grid_idxs, num_steps_per_minute)
+    num_pieces = last_minute_idxs - first_minute_idxs + 1
+    tick_idxs = np.repeat(np.arange(num_ticks), num_pieces)
+    piece_offsets = np.arange(len(tick_idxs)) - np.repeat(
+        np.cumsum(num_pieces) - num_pieces, num_pieces
+    )
+    minute_idxs = first_minute_idxs[tick_idxs] + piece_offsets
+    # Keep only the pieces in the requested bars.
+    mask = (minute_idxs >= start_minute_idx) & (minute_idxs < end_minute_idx)
+    tick_idxs = tick_idxs[mask]
+    minute_idxs = minute_idxs[mask]
+    piece_first_grid_idxs = np.maximum(
+        first_grid_idxs[tick_idxs], (minute_idxs - 1) * num_steps_per_minute + 1
+    )
+    piece_last_grid_idxs = np.minimum(
+        last_grid_idxs[tick_idxs], minute_idxs * num_steps_per_minute
+    )
+    counts = (piece_last_grid_idxs - piece_first_grid_idxs + 1).astype(np.float64)
+    is_tick_start = piece_first_grid_idxs == first_grid_idxs[tick_idxs]
+    return tick_idxs, minute_idxs, counts, is_tick_start
+
+
+def _is_contiguous_tick(grid_idxs: np.ndarray) -> np.ndarray:
+    """
+    Return whether the previous tick is forward filled up to each tick.
+    """
+    is_contiguous = np.zeros(len(grid_idxs), dtype=bool)
+    is_contiguous[1:] = np.diff(grid_idxs) <= _BID_ASK_FFILL_LIMIT + 1
+    return is_contiguous
+
+
+def _get_bid_ask_midpoint_time_diff_sums(
+    grid_idxs: np.ndarray,
+    midpoint: np.ndarray,
+    tick_idxs: np.ndarray,
+    is_tick_start: np.ndarray,
+) -> np.ndarray:
+    """
+    Compute the sums of the midpoint variance and autocovariance by piece.
+
+    See `_split_bid_ask_ticks_by_minute()` for the pieces.
+    """
+    num_ticks = len(grid_idxs)
+    # The time diffs on the grid are non-zero only at the grid point of a
+    # tick.
+    midpoint_diff = np.full(num_ticks, np.nan)
+    midpoint_diff[1:] = np.where(
+        _is_contiguous_tick(grid_idxs)[1:], midpoint[1:] - midpoint[:-1], np.nan
+    )
+    # The autocovariance is non-zero only if the previous grid point is also
+    # a tick.
+    midpoint_autocovar = np.full(num_ticks, np.nan)
+    midpoint_autocovar[1:] = np.where(
+        np.diff(grid_idxs) == 1, midpoint_diff[1:] * midpoint_diff[:-1], np.nan
+    )
+    piece_midpoint_var = np.where(is_tick_start, midpoint_diff[tick_idxs] ** 2, 0)
+    piece_midpoint_autocovar = np.where(
+        is_tick_start, midpoint_autocovar[tick_idxs], 0
+    )
+    sums = np.column_stack(
+        [
+            np.nan_to_num(piece_midpoint_var),
+            np.nan_to_num(piece_midpoint_autocovar),
+        ]
+    )
+    return sums
+
+
+def _get_log_size_imbalance_time_diff_sums(
+    grid_idxs: np.ndarray,
+    log_size_imbalance: np.ndarray,
+    tick_idxs: np.ndarray,
+    counts: np.ndarray,
+    is_tick_start: np.ndarray,
+) -> np.ndarray:
+    """
+    Compute the sums of the log size imbalance variance and autocovariance by
+    piece.
+
+    See `_split_bid_ask_ticks_by_minute()` for the pieces.
+    """
+    log_size_imbalance_lag = np.full(len(grid_idxs), np.nan)
+    log_size_imbalance_lag[1:] = np.where(
+        _is_contiguous_tick(grid_idxs)[1:], log_size_imbalance[:-1], np.nan
+    )
+    piece_log_size_imbalance = log_size_imbalance[tick_idxs]
+    piece_log_size_imbalance_var = counts * piece_log_size_imbalance**2
+    # The first grid point of a tick is multiplied by the previous tick.
+    piece_log_size_imbalance_autocovar = np.where(
+        is_tick_start,
+        (counts - 1) * piece_log_size_imbalance**2
+        + np.nan_to_num(
+            piece_log_size_imbalance * log_size_imbalance_lag[tick_idxs]
+        ),
+        counts * piece_log_size_imbalance**2,
+    )
+    sums = np.column_stack(
+        [piece_log_size_imbalance_var, piece_log_size_imbalance_autocovar]
+    )
+    return sums
+
+
 def resample_multilevel_bid_ask_data_to_1min(
     data: pd.DataFrame,
     *,
@@ -550,13 +1016,24 @@ def resample_multilevel_bid_ask_data_to_1min(
         data_one_level = data[bid_ask_cols_level]
         # Canonize column name for resampling function.
         data_one_level.columns = BID_ASK_COLS
-        data_one_level = resample_bid_ask_data_to_1min(data_one_level)
+        # Resample without forward filling the data on the sub-second grid.
+        data_one_level_1min = list(
+            resample_bid_ask_data_to_1min_in_chunks([data_one_level])
+        )
+        if data_one_level_1min:
+            data_one_level = pd.concat(data_one_level_1min)
+        else:
+            # There is no data to resample.
+            data_one_level = _get_empty_bid_ask_data_1min(data_one_level.index)
         # Uncanonize the column levels back.
         data_one_level = data_one_level.rename(columns=lambda x: f"level_{i}.{x}")
         all_levels_resampled.append(data_one_level)
     data_resampled = pd.concat(all_levels_resampled, axis=1)
     # Insert exchange_id column
-    data_resampled["exchange_id"] = data["exchange_id"].iloc[0]
+    if not data.empty:
+        data_resampled["exchange_id"] = data["exchange_id"].iloc[0]
+    else:
+        data_resampled["exchange_id"] = pd.Series(dtype=object)
     return data_resampled
 
 
@@ -634,11 +1111,9 @@ def transform_and_resample_rt_bid_ask_data(
     # Resetting index is needed before inserting to RDS,
     # because the column is passed to the query.
     df_resampled = df_resampled.reset_index()
-    # TODO(Juraj): librarize this, we tend to use .apply(hdateti.convert_timestamp_to_unix_epoch) but that's
-    # slow.
-    df_resampled["timestamp"] = (
-        df_resampled["timestamp"] - pd.Timestamp("1970-01-01")
-    ) // pd.Timedelta("1ms")
+    df_resampled["timestamp"] = convert_timestamp_column_to_unix_epoch(
+        df_resampled["timestamp"]
+    )
     # Add back level column because DB table is in long format.
     df_resampled["level"] = 1
     return df_resampled
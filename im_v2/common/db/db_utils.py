@@ -9,8 +9,11 @@ import abc
 import argparse
 import logging
 import os
+import queue
+import threading
+import time
 from datetime import timedelta
-from typing import List, Optional, Union
+from typing import Any, Dict, Iterator, List, Optional, Union
 
 import pandas as pd
 import psycopg2 as psycop
@@ -88,6 +91,20 @@ class DbConnectionManager:
         cls.db_stage = db_stage
         return cls.connection
 
+    @classmethod
+    def get_new_connection(cls, db_stage: str) -> hsql.DbConnection:
+        """
+        Create a DB connection that is not shared with the other callers.
+
+        E.g., a background thread needs its own connection, since a
+        connection can't be used by multiple threads at the same time.
+
+        :param db_stage: same as in `get_connection()`
+        :return: DbConnection owned by the caller
+        """
+        connection = cls._get_new_connection(db_stage)
+        return connection
+
     # #########################################################################
     # Private helpers.
     # #########################################################################
@@ -373,7 +390,8 @@ def load_db_data(
     limit: Optional[int] = None,
     bid_ask_levels: Optional[List[int]] = None,
     exchange_id: Optional[str] = None,
-    time_interval_closed: Union[bool, str] = True
+    time_interval_closed: Union[bool, str] = True,
+    min_knowledge_timestamp: Optional[pd.Timestamp] = None,
 ) -> pd.DataFrame:
     """
     Load database data from a specified table given an opened DB connection.
@@ -383,6 +401,7 @@ def load_db_data(
     column is present)
         - currency pairs (assuming `currency_pair` column is present)
         - bid_ask_levels (assuming `level` column exists)
+        - knowledge timestamp (assuming `knowledge_timestamp` column exists)
 
     Timestamp interval is applied as: [start_ts, end_ts].
 
@@ -401,12 +420,93 @@ def load_db_data(
      False: (start_ts, end_ts)
      "left": <start_ts, end_ts)
      "right": (start_ts, end_ts>
+    :param min_knowledge_timestamp: load only the rows with a knowledge
+     timestamp strictly greater than this, if None all rows are loaded
     :return DataFrame with data loaded from `src_table`
     """
+    query = _build_load_db_data_query(
+        src_table,
+        start_ts,
+        end_ts,
+        currency_pairs=currency_pairs,
+        bid_ask_levels=bid_ask_levels,
+        exchange_id=exchange_id,
+        time_interval_closed=time_interval_closed,
+        min_knowledge_timestamp=min_knowledge_timestamp,
+    )
+    if limit:
+        query += f" ORDER BY timestamp DESC LIMIT {limit}"
+    _LOG.info(f"Executing query: \n\t{query}")
+    return hsql.execute_query_to_df(db_connection, query)
+
+
+def iterate_db_data(
+    db_connection: hsql.DbConnection,
+    src_table: str,
+    start_ts: Optional[pd.Timestamp],
+    end_ts: Optional[pd.Timestamp],
+    chunk_size: int,
+    *,
+    currency_pairs: Optional[List[str]] = None,
+    bid_ask_levels: Optional[List[int]] = None,
+    exchange_id: Optional[str] = None,
+    time_interval_closed: Union[bool, str] = True,
+) -> Iterator[pd.DataFrame]:
+    """
+    Load database data from a specified table in chunks ordered by timestamp.
+
+    Same as `load_db_data()` but the data is streamed from the DB in chunks
+    of `chunk_size` rows, so that large time intervals can be processed
+    without holding all the data in memory.
+
+    :param chunk_size: number of rows per chunk
+    :return: iterator over dfs with the data loaded from `src_table`
+    """
+    query = _build_load_db_data_query(
+        src_table,
+        start_ts,
+        end_ts,
+        currency_pairs=currency_pairs,
+        bid_ask_levels=bid_ask_levels,
+        exchange_id=exchange_id,
+        time_interval_closed=time_interval_closed,
+    )
+    query += " ORDER BY timestamp"
+    _LOG.info(f"Executing query: \n\t{query}")
+    yield from hsql.execute_query_to_df_in_chunks(
+        db_connection, query, chunk_size
+    )
+
+
+def _build_load_db_data_query(
+    src_table: str,
+    start_ts: Optional[pd.Timestamp],
+    end_ts: Optional[pd.Timestamp],
+    *,
+    currency_pairs: Optional[List[str]] = None,
+    bid_ask_levels: Optional[List[int]] = None,
+    exchange_id: Optional[str] = None,
+    time_interval_closed: Union[bool, str] = True,
+    min_knowledge_timestamp: Optional[pd.Timestamp] = None,
+) -> str:
+    """
+    Build the query selecting the data for `load_db_data()`.
+
+    See `load_db_data()` for the param description.
+    """
     hdbg.dassert_in(time_interval_closed, [True, False, "left", "right"])
     query = f"SELECT * FROM {src_table}"
     and_query = []
-    if any([start_ts, end_ts, currency_pairs, bid_ask_levels, exchange_id]):
+    if any(
+        [
+            start_ts,
+            end_ts,
+            currency_pairs,
+            bid_ask_levels,
+            exchange_id,
+            min_knowledge_timestamp,
+        ]
+    ):
         query += " WHERE "
     if start_ts:
         start_ts = hdateti.convert_timestamp_to_unix_epoch(start_ts, unit="ms")
@@ -425,11 +525,13 @@ def load_db_data(
         and_query.append(f"level IN ({levels})")
     if exchange_id:
         and_query.append(f"exchange_id = '{exchange_id}'")
+    if min_knowledge_timestamp:
+        hdateti.dassert_has_tz(min_knowledge_timestamp)
+        and_query.append(
+            f"knowledge_timestamp > '{min_knowledge_timestamp.isoformat()}'"
+        )
     query += " AND ".join(and_query)
-    if limit:
-        query += f" ORDER BY timestamp DESC LIMIT {limit}"
-    _LOG.info(f"Executing query: \n\t{query}")
-    return hsql.execute_query_to_df(db_connection, query)
+    return query
 
 
 def fetch_data_by_age(
@@ -586,6 +688,7 @@ def save_data_to_db(
     time_zone: str,
     *,
     add_knowledge_timestamp: bool = True,
+    use_copy: bool = False,
 ) -> None:
     """
     Save data into specified database table.
@@ -598,6 +701,8 @@ def save_data_to_db(
     :param db_table: name of the table to insert to.
     :param add_knowledge_timestamp: if True, adds a column with the value of current time
     :param time_zone: time zone used to add correct knowledge_timestamp to the data
+    :param use_copy: if True, insert the data with `COPY` through a staging
+        table instead of a multi-row `INSERT`
     """
     if data.empty:
         _LOG.warning("The DataFrame is empty, nothing to insert.")
@@ -612,12 +717,193 @@ def save_data_to_db(
         unique_columns = TRADES_UNIQUE_COLUMNS
     else:
         raise ValueError(f"Invalid data_type='{data_type}'")
-    hsql.execute_insert_on_conflict_do_nothing_query(
-        connection=db_connection,
-        obj=data,
-        table_name=db_table,
-        unique_columns=unique_columns,
-    )
+    if use_copy:
+        hsql.execute_copy_insert_on_conflict_do_nothing_query(
+            connection=db_connection,
+            df=data,
+            table_name=db_table,
+            unique_columns=unique_columns,
+        )
+    else:
+        hsql.execute_insert_on_conflict_do_nothing_query(
+            connection=db_connection,
+            obj=data,
+            table_name=db_table,
+            unique_columns=unique_columns,
+        )
+
+
+# #############################################################################
+# DbWriter
+# #############################################################################
+
+
+class DbWriter:
+    """
+    Save data to a DB table from a background thread.
+
+    The producer (e.g., a websocket download loop) enqueues dataframes into a
+    bounded queue and is not blocked by the DB, unless the queue is full.
+    A producer that must never block (e.g., a coroutine in an event loop)
+    uses `put_nowait()`, which drops the data when the queue is full.
+    The writer thread drains all the queued dataframes and saves them in a
+    single batch with `save_data_to_db()`.
+
+    The DB connection is used only by the writer thread, so it should not
+    be shared with other threads.
+
+    Errors are raised to the producer at the next `put()` or in `stop()`.
+    """
+
+    # Object signaling the end of the data.
+    _SENTINEL = None
+
+    def __init__(
+        self,
+        data_type: str,
+        db_connection: hsql.DbConnection,
+        db_table: str,
+        time_zone: str,
+        *,
+        max_queue_size: int = 100,
+        use_copy: bool = True,
+    ) -> None:
+        """
+        Constructor.
+
+        :param data_type, db_connection, db_table, time_zone: same as in
+            `save_data_to_db()`
+        :param max_queue_size: max number of dataframes waiting to be saved
+        :param use_copy: same as in `save_data_to_db()`
+        """
+        self._data_type = data_type
+        self._db_connection = db_connection
+        self._db_table = db_table
+        self._time_zone = time_zone
+        self._use_copy = use_copy
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue_size)
+        self._thread = threading.Thread(
+            target=self._run, name="DbWriter", daemon=True
+        )
+        self._exception: Optional[BaseException] = None
+        # Statistics about the flushes.
+        self._num_flushes = 0
+        self._num_rows = 0
+        self._last_flush_latency_in_secs: Optional[float] = None
+        self._max_flush_latency_in_secs = 0.0
+        # Statistics about the data dropped by `put_nowait()`.
+        self._num_dropped_dfs = 0
+        self._num_dropped_rows = 0
+        self._thread.start()
+
+    def put(self, data: pd.DataFrame) -> None:
+        """
+        Enqueue data to be saved.
+
+        Block if the queue is full.
+        """
+        self._raise_if_failed()
+        if self._queue.full():
+            _LOG.warning(
+                "DbWriter queue is full with %s items, waiting for the DB",
+                self._queue.qsize(),
+            )
+        self._queue.put(data)
+
+    def put_nowait(self, data: pd.DataFrame) -> bool:
+        """
+        Enqueue data to be saved without blocking.
+
+        If the queue is full, the data is dropped and counted in the stats.
+
+        :return: whether the data was enqueued
+        """
+        self._raise_if_failed()
+        try:
+            self._queue.put_nowait(data)
+        except queue.Full:
+            self._num_dropped_dfs += 1
+            self._num_dropped_rows += len(data)
+            _LOG.warning(
+                "DbWriter queue is full with %s items, dropped %s rows: "
+                "num_dropped_dfs=%s num_dropped_rows=%s",
+                self._queue.qsize(),
+                len(data),
+                self._num_dropped_dfs,
+                self._num_dropped_rows,
+            )
+            return False
+        return True
+
+    def stop(self) -> None:
+        """
+        Save the remaining data and stop the writer thread.
+        """
+        self._queue.put(self._SENTINEL)
+        self._thread.join()
+        _LOG.info("DbWriter stopped: %s", self.get_stats())
+        self._raise_if_failed()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Return the queue depth and statistics about the flushes.
+        """
+        stats = {
+            "queue_depth": self._queue.qsize(),
+            "num_flushes": self._num_flushes,
+            "num_rows": self._num_rows,
+            "last_flush_latency_in_secs": self._last_flush_latency_in_secs,
+            "max_flush_latency_in_secs": self._max_flush_latency_in_secs,
+            "num_dropped_dfs": self._num_dropped_dfs,
+            "num_dropped_rows": self._num_dropped_rows,
+        }
+        return stats
+
+    def _raise_if_failed(self) -> None:
+        if self._exception is not None:
+            raise RuntimeError("DbWriter failed") from self._exception
+
+    def _run(self) -> None:
+        is_done = False
+        while not is_done:
+            # Wait for data and then drain the queue to batch the inserts.
+            items = [self._queue.get()]
+            while not self._queue.empty():
+                items.append(self._queue.get_nowait())
+            is_done = any(item is self._SENTINEL for item in items)
+            dfs = [item for item in items if item is not self._SENTINEL]
+            if not dfs or self._exception is not None:
+                continue
+            try:
+                self._flush(dfs)
+            except Exception as e:  # pylint: disable=broad-except
+                _LOG.error("DbWriter failed to save data: %s", str(e))
+                self._exception = e
+
+    def _flush(self, dfs: List[pd.DataFrame]) -> None:
+        data = pd.concat(dfs, ignore_index=True)
+        start_time = time.time()
+        save_data_to_db(
+            data,
+            self._data_type,
+            self._db_connection,
+            self._db_table,
+            self._time_zone,
+            use_copy=self._use_copy,
+        )
+        latency_in_secs = time.time() - start_time
+        self._num_flushes += 1
+        self._num_rows += len(data)
+        self._last_flush_latency_in_secs = latency_in_secs
+        self._max_flush_latency_in_secs = max(
+            self._max_flush_latency_in_secs, latency_in_secs
+        )
+        _LOG.info(
+            "Saved %s rows in %.3f secs, queue_depth=%s",
+            len(data),
+            latency_in_secs,
+            self._queue.qsize(),
+        )
 
 
 # #############################################################################
@@ -1,3 +1,5 @@
+import asyncio
+import threading
 import unittest.mock as umock
 
 import pandas as pd
@@ -144,3 +146,97 @@ class TestSaveDataToDb(hunitest.TestCase):
         imvcddbut.save_data_to_db(
             data, data_type, db_connection, db_table, time_zone
         )
+
+
+class TestDbWriter(hunitest.TestCase):
+    def test_put1(self) -> None:
+        """
+        Check that all the enqueued data is saved before `stop()` returns.
+        """
+        dfs = [
+            pd.DataFrame({"timestamp": [i], "value": [10 * i]}) for i in range(5)
+        ]
+        with umock.patch.object(imvcddbut, "save_data_to_db") as save_data_to_db:
+            db_writer = imvcddbut.DbWriter(
+                "bid_ask", umock.MagicMock(), "mock_table", "UTC"
+            )
+            for df in dfs:
+                db_writer.put(df)
+            db_writer.stop()
+        # Check the saved data.
+        saved_dfs = [call.args[0] for call in save_data_to_db.call_args_list]
+        actual = pd.concat(saved_dfs, ignore_index=True)
+        expected = pd.concat(dfs, ignore_index=True)
+        self.assert_equal(str(actual), str(expected))
+        for call in save_data_to_db.call_args_list:
+            self.assertEqual(call.args[1], "bid_ask")
+            self.assertEqual(call.args[3:], ("mock_table", "UTC"))
+            self.assertTrue(call.kwargs["use_copy"])
+        # Check the stats.
+        stats = db_writer.get_stats()
+        self.assertEqual(stats["queue_depth"], 0)
+        self.assertEqual(stats["num_rows"], 5)
+        self.assertEqual(stats["num_flushes"], save_data_to_db.call_count)
+
+    def test_stop1(self) -> None:
+        """
+        Check that a failure in the writer thread is raised to the caller.
+        """
+        with umock.patch.object(
+            imvcddbut, "save_data_to_db", side_effect=ValueError("mock error")
+        ):
+            db_writer = imvcddbut.DbWriter(
+                "bid_ask", umock.MagicMock(), "mock_table", "UTC"
+            )
+            db_writer.put(pd.DataFrame({"timestamp": [1]}))
+            with self.assertRaises(RuntimeError) as cm:
+                db_writer.stop()
+        self.assertIsInstance(cm.exception.__cause__, ValueError)
+
+    def test_put_nowait1(self) -> None:
+        """
+        Check that `put_nowait()` doesn't block the event loop when the queue
+        is full and that it counts the dropped data.
+        """
+        is_db_released = threading.Event()
+
+        def _save_data_to_db(*args, **kwargs) -> None:
+            # Simulate a DB that doesn't keep up with the producer.
+            _ = args, kwargs
+            is_db_released.wait()
+
+        num_dfs = 10
+        dfs = [pd.DataFrame({"timestamp": [i]}) for i in range(num_dfs)]
+
+        async def _produce(db_writer: imvcddbut.DbWriter) -> int:
+            num_enqueued = 0
+            for df in dfs:
+                num_enqueued += db_writer.put_nowait(df)
+                # Let the other tasks run, as a download loop does.
+                await asyncio.sleep(0)
+            return num_enqueued
+
+        with umock.patch.object(
+            imvcddbut, "save_data_to_db", side_effect=_save_data_to_db
+        ) as save_data_to_db:
+            db_writer = imvcddbut.DbWriter(
+                "bid_ask",
+                umock.MagicMock(),
+                "mock_table",
+                "UTC",
+                max_queue_size=2,
+            )
+            # The producer finishes while the DB is blocked.
+            num_enqueued = asyncio.run(
+                asyncio.wait_for(_produce(db_writer), timeout=5)
+            )
+            is_db_released.set()
+            db_writer.stop()
+        # Check that the data is either saved or dropped.
+        stats = db_writer.get_stats()
+        self.assertGreater(stats["num_dropped_dfs"], 0)
+        self.assertEqual(stats["num_dropped_dfs"], num_dfs - num_enqueued)
+        self.assertEqual(stats["num_dropped_rows"], num_dfs - num_enqueued)
+        self.assertEqual(stats["num_rows"], num_enqueued)
+        saved_dfs = [call.args[0] for call in save_data_to_db.call_args_list]
+        self.assertEqual(sum(len(df) for df in saved_dfs), num_enqueued)
@@ -39,6 +39,7 @@ class CryptoChassisHistoricalPqByTileClient(
         tag: str = "",
         aws_profile: Optional[str] = None,
         resample_1min: bool = False,
+        max_concurrent_reads: int = 8,
     ) -> None:
         """
         Constructor.
@@ -60,4 +61,5 @@ class CryptoChassisHistoricalPqByTileClient(
             tag=tag,
             aws_profile=aws_profile,
             resample_1min=resample_1min,
+            max_concurrent_reads=max_concurrent_reads,
         )
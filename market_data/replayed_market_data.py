@@ -4,12 +4,14 @@ Import as:
 import market_data.replayed_market_data as mdremada
 """
 
+import datetime
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
+import numpy as np
 import pandas as pd
 
-import core.real_time as creatime
+import helpers.hdatetime as hdateti
 import helpers.hdbg as hdbg
 import helpers.hpandas as hpandas
 import helpers.hprint as hprint
@@ -78,6 +80,11 @@ class ReplayedMarketData(mdabmada.MarketData):
             self._df.sort_values(
                 [self._end_time_col_name, self._asset_id_col], inplace=True
             )
+        # Index the data once so that each query doesn't need to scan the
+        # entire df.
+        self._as_of_index = _AsOfIndex(
+            self._df, self._knowledge_datetime_col_name, self._asset_id_col
+        )
 
     def should_be_online(self, wall_clock_time: pd.Timestamp) -> bool:
         return True
@@ -105,42 +112,39 @@ class ReplayedMarketData(mdabmada.MarketData):
             delay_in_secs = 0
         else:
             delay_in_secs = self._delay_in_secs
-        # TODO(gp): This assertion seems very slow. Move this check in a
-        #  centralized place instead of calling it every time, if possible.
         if asset_ids is not None:
             # Make sure that the requested asset_ids are in the df at some point.
             # This avoids mistakes when mocking data for certain assets, but request
             # data for assets that don't exist, which can make us wait for data that
             # will never come.
-            hdbg.dassert_is_subset(
-                asset_ids, self._df[self._asset_id_col].unique()
-            )
-        # Filter the data by the current time.
+            hdbg.dassert_is_subset(asset_ids, self._as_of_index.asset_ids)
+        # Handle `columns`.
+        if self._columns is not None:
+            hdbg.dassert_is_subset(self._columns, self._df.columns)
+            hdbg.dassert_in(ts_col_name, self._columns)
+        hdbg.dassert_in(ts_col_name, self._df.columns)
+        # Filter the data by the current time, by `period`, and by `asset_ids`.
         wall_clock_time = self.get_wall_clock_time()
         if _TRACE:
             _LOG.trace(hprint.to_str("wall_clock_time"))
-        df_tmp = creatime.get_data_as_of_datetime(
-            self._df,
-            self._knowledge_datetime_col_name,
-            wall_clock_time,
-            delay_in_secs=delay_in_secs,
+        # E.g., if the wall clock time is `2021-07-13 13:01:00` and the simulated
+        # system takes 4 seconds to respond, all and only data before
+        # `2021-07-13 13:00:56` is returned.
+        hdbg.dassert_lte(0, delay_in_secs)
+        knowledge_ts = wall_clock_time - datetime.timedelta(seconds=delay_in_secs)
+        row_idxs = self._as_of_index.get_row_idxs(
+            ts_col_name,
+            start_ts,
+            end_ts,
+            left_close,
+            right_close,
+            asset_ids,
+            knowledge_ts,
         )
+        df_tmp = self._df.iloc[row_idxs]
         # Handle `columns`.
         if self._columns is not None:
-            hdbg.dassert_is_subset(self._columns, df_tmp.columns)
             df_tmp = df_tmp[self._columns]
-        # Handle `period`.
-        hdbg.dassert_in(ts_col_name, df_tmp.columns)
-        df_tmp = hpandas.trim_df(
-            df_tmp, ts_col_name, start_ts, end_ts, left_close, right_close
-        )
-        # Handle `asset_ids`
-        if _TRACE:
-            _LOG.trace("before df_tmp=\n%s", hpandas.df_to_str(df_tmp))
-        if asset_ids is not None:
-            hdbg.dassert_in(self._asset_id_col, df_tmp.columns)
-            mask = df_tmp[self._asset_id_col].isin(set(asset_ids))
-            df_tmp = df_tmp[mask]
         if _TRACE:
             _LOG.trace("after df_tmp=\n%s", hpandas.df_to_str(df_tmp))
         # Handle `limit`.
@@ -169,6 +173,167 @@ class ReplayedMarketData(mdabmada.MarketData):
         return ret
 
 
+# #############################################################################
+# _AsOfIndex
+# #############################################################################
+
+
+# Value representing `NaT` in the index.
+_NAT_AS_INT = np.iinfo(np.int64).max
+
+
+def _to_epoch_in_ns(srs: pd.Series) -> np.ndarray:
+    """
+    Convert a datetime series into an array of nanoseconds since epoch.
+
+    Tz-aware values are converted to UTC, naive values are used as they are,
+    consistently with `pd.Timestamp.value`. `NaT` is converted to
+    `_NAT_AS_INT` so that it is sorted after any timestamp.
+    """
+    srs = pd.to_datetime(srs)
+    if srs.dt.tz is not None:
+        srs = srs.dt.tz_convert(None)
+    values = srs.to_numpy(dtype="datetime64[ns]").view("int64").copy()
+    values[srs.isna().to_numpy()] = _NAT_AS_INT
+    return values
+
+
+class _AsOfIndex:
+    """
+    Index the rows of a df to filter them by knowledge time, timestamp and
+    asset id in O(log n + k), where k is the number of returned rows.
+
+    For each timestamp column, the row positions are sorted by asset id and
+    then by timestamp, so that the rows of an asset are a contiguous segment
+    that can be searched with a binary search. The knowledge time filter is
+    then applied only to the selected rows.
+    """
+
+    def __init__(
+        self,
+        df: pd.DataFrame,
+        knowledge_datetime_col_name: str,
+        asset_id_col: str,
+    ) -> None:
+        """
+        Constructor.
+
+        :param df: df to index. The df should not be modified afterwards
+        :param knowledge_datetime_col_name: column with the knowledge time
+        :param asset_id_col: column with the asset ids
+        """
+        hdbg.dassert_in(knowledge_datetime_col_name, df.columns)
+        hdbg.dassert_in(asset_id_col, df.columns)
+        self._df = df
+        self._knowledge_datetime_col_name = knowledge_datetime_col_name
+        self._knowledge_ts = _to_epoch_in_ns(df[knowledge_datetime_col_name])
+        # Map each asset id to an integer code.
+        asset_codes, asset_ids = pd.factorize(df[asset_id_col])
+        self._asset_codes = asset_codes
+        self._asset_id_to_code = {
+            asset_id: code for code, asset_id in enumerate(asset_ids)
+        }
+        # Timestamp column -> sorted timestamps, row positions, asset offsets.
+        # The offsets are computed lazily since the queries typically use one
+        # or two timestamp columns.
+        self._ts_index: Dict[str, Tuple[np.ndarray, np.ndarray, np.ndarray]] = {}
+
+    @property
+    def asset_ids(self) -> List[Any]:
+        return list(self._asset_id_to_code.keys())
+
+    def get_row_idxs(
+        self,
+        ts_col_name: str,
+        start_ts: Optional[pd.Timestamp],
+        end_ts: Optional[pd.Timestamp],
+        left_close: bool,
+        right_close: bool,
+        asset_ids: Optional[List[Any]],
+        knowledge_ts: pd.Timestamp,
+    ) -> np.ndarray:
+        """
+        Return the positions of the rows matching the filters, in df order.
+
+        The semantic is the same as applying `creatime.get_data_as_of_datetime()`
+        with `knowledge_ts`, `hpandas.trim_df()` on `ts_col_name`, and filtering
+        by `asset_ids`.
+
+        :param asset_ids: asset ids to keep. `None` means all the assets
+        """
+        if self._knowledge_ts.size > 0:
+            hdateti.dassert_tz_compatible_timestamp_with_df(
+                knowledge_ts, self._df, self._knowledge_datetime_col_name
+            )
+        if start_ts is not None and end_ts is not None:
+            hdateti.dassert_tz_compatible(start_ts, end_ts)
+            hdbg.dassert_lte(start_ts, end_ts)
+        sorted_ts, sorted_row_idxs, asset_offsets = self._get_ts_index(
+            ts_col_name
+        )
+        # Find the segments of sorted rows to select.
+        if asset_ids is None:
+            asset_codes = range(len(self._asset_id_to_code))
+        else:
+            asset_codes = sorted(
+                set(self._asset_id_to_code[id_] for id_ in asset_ids)
+            )
+        segments = [
+            (asset_offsets[code], asset_offsets[code + 1]) for code in asset_codes
+        ]
+        row_idxs = []
+        for begin, end in segments:
+            # Restrict each segment to the requested interval.
+            if start_ts is not None:
+                side = "left" if left_close else "right"
+                begin += np.searchsorted(
+                    sorted_ts[begin:end], pd.Timestamp(start_ts).value, side=side
+                )
+            if end_ts is not None:
+                side = "right" if right_close else "left"
+                end = begin + np.searchsorted(
+                    sorted_ts[begin:end], pd.Timestamp(end_ts).value, side=side
+                )
+            elif start_ts is not None:
+                # Exclude the rows with `NaT`, which are at the end of the
+                # segment, since they don't belong to any interval.
+                end = begin + np.searchsorted(
+                    sorted_ts[begin:end], _NAT_AS_INT, side="left"
+                )
+            row_idxs.append(sorted_row_idxs[begin:end])
+        row_idxs = np.concatenate(row_idxs) if row_idxs else np.array([], int)
+        # Filter the selected rows by knowledge time.
+        mask = self._knowledge_ts[row_idxs] < _NAT_AS_INT
+        mask &= self._knowledge_ts[row_idxs] <= pd.Timestamp(knowledge_ts).value
+        row_idxs = np.sort(row_idxs[mask])
+        return row_idxs
+
+    def _get_ts_index(
+        self, ts_col_name: str
+    ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Return the index for `ts_col_name`, building it if needed.
+
+        :return:
+            - timestamps sorted by asset and then by time
+            - corresponding row positions
+            - offsets of the segment of each asset, i.e., the rows of the asset
+              with code `i` are in `[offsets[i], offsets[i + 1])`
+        """
+        if ts_col_name not in self._ts_index:
+            ts = _to_epoch_in_ns(self._df[ts_col_name])
+            # Sort by asset and then by timestamp. The sort is stable so rows
+            # with the same timestamp are kept in df order.
+            row_idxs = np.lexsort((ts, self._asset_codes))
+            sorted_ts = ts[row_idxs]
+            num_assets = len(self._asset_id_to_code)
+            asset_offsets = np.searchsorted(
+                self._asset_codes[row_idxs], np.arange(num_assets + 1)
+            )
+            self._ts_index[ts_col_name] = (sorted_ts, row_idxs, asset_offsets)
+        return self._ts_index[ts_col_name]
+
+
 # #############################################################################
 # Serialize / deserialize example of DB.
 # #############################################################################
@@ -1,8 +1,9 @@
 import logging
-from typing import Any, Callable, Tuple, Union
+from typing import Any, Callable, List, Optional, Tuple, Union
 
 import pandas as pd
 
+import core.real_time as creatime
 import helpers.hasyncio as hasynci
 import helpers.hdatetime as hdateti
 import helpers.hpandas as hpandas
@@ -733,3 +734,101 @@ class TestReplayedMarketData4(hunitest.TestCase):
                 event_loop=event_loop,
             )
         return start_time, end_time, num_iter
+
+
+# #############################################################################
+# Test_AsOfIndex1
+# #############################################################################
+
+
+class Test_AsOfIndex1(hunitest.TestCase):
+    """
+    Check that `_AsOfIndex` selects the same rows as filtering the df.
+    """
+
+    @staticmethod
+    def get_df() -> pd.DataFrame:
+        """
+        Build a df with 2 assets where the knowledge time is not sorted and
+        some timestamps are missing.
+        """
+        end_time = pd.date_range(
+            "2000-01-01 09:31:00-05:00", periods=4, freq="T"
+        ).repeat(2)
+        knowledge_timestamp = end_time + pd.to_timedelta(
+            [10, 70, 20, 5, 15, 130, 10, 10], unit="s"
+        )
+        df = pd.DataFrame(
+            {
+                "asset_id": [1000, 2000] * 4,
+                "end_time": end_time,
+                "knowledge_timestamp": knowledge_timestamp,
+            }
+        )
+        df.loc[3, "knowledge_timestamp"] = pd.NaT
+        df.loc[4, "end_time"] = pd.NaT
+        return df
+
+    def check_row_idxs(
+        self,
+        start_ts: pd.Timestamp,
+        end_ts: pd.Timestamp,
+        left_close: bool,
+        right_close: bool,
+        asset_ids: Optional[List[int]],
+        knowledge_ts: pd.Timestamp,
+    ) -> None:
+        df = self.get_df()
+        index = mdremada._AsOfIndex(df, "knowledge_timestamp", "asset_id")
+        row_idxs = index.get_row_idxs(
+            "end_time",
+            start_ts,
+            end_ts,
+            left_close,
+            right_close,
+            asset_ids,
+            knowledge_ts,
+        )
+        # Compute the expected rows filtering the df.
+        expected = creatime.get_data_as_of_datetime(
+            df, "knowledge_timestamp", knowledge_ts
+        )
+        expected = hpandas.trim_df(
+            expected, "end_time", start_ts, end_ts, left_close, right_close
+        )
+        if asset_ids is not None:
+            expected = expected[expected["asset_id"].isin(asset_ids)]
+        self.assertListEqual(row_idxs.tolist(), expected.index.tolist())
+
+    def test1(self) -> None:
+        """
+        Query all the assets with a closed interval.
+        """
+        start_ts = pd.Timestamp("2000-01-01 09:31:00-05:00")
+        end_ts = pd.Timestamp("2000-01-01 09:33:00-05:00")
+        knowledge_ts = pd.Timestamp("2000-01-01 09:33:30-05:00")
+        self.check_row_idxs(start_ts, end_ts, True, True, None, knowledge_ts)
+
+    def test2(self) -> None:
+        """
+        Query one asset with an open interval.
+        """
+        start_ts = pd.Timestamp("2000-01-01 09:31:00-05:00")
+        end_ts = pd.Timestamp("2000-01-01 09:34:00-05:00")
+        knowledge_ts = pd.Timestamp("2000-01-01 09:35:00-05:00")
+        self.check_row_idxs(start_ts, end_ts, False, False, [2000], knowledge_ts)
+
+    def test3(self) -> None:
+        """
+        Query without interval boundaries.
+        """
+        knowledge_ts = pd.Timestamp("2000-01-01 09:34:00-05:00")
+        self.check_row_idxs(None, None, True, True, [1000, 2000], knowledge_ts)
+
+    def test4(self) -> None:
+        """
+        Query with only the left boundary.
+        """
+        start_ts = pd.Timestamp("2000-01-01 09:32:00-05:00")
+        knowledge_ts = pd.Timestamp("2000-01-01 09:40:00-05:00")
+        self.check_row_idxs(start_ts, None, True, True, None, knowledge_ts)
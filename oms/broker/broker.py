@@ -775,6 +775,12 @@ class Broker(abc.ABC, hobject.PrintableMixin):
         """
         ...
 
+    def close(self) -> None:
+        """
+        Release the resources of the broker (e.g., the open log files) at the
+        end of the run.
+        """
+
     # //////////////////////////////////////////////////////////////////////////////
     # Private methods.
     # //////////////////////////////////////////////////////////////////////////////
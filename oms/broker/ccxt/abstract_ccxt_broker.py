@@ -28,6 +28,7 @@ import im_v2.common.data.client as icdc
 import im_v2.common.data.client.im_raw_data_client as imvcdcimrdc
 import im_v2.common.universe as ivcu
 import oms.broker.broker as obrobrok
+import oms.broker.ccxt.ccxt_bid_ask_buffer as obccbiasbu
 import oms.broker.ccxt.ccxt_logger as obcccclo
 import oms.broker.ccxt.ccxt_utils as obccccut
 import oms.fill as omfill
@@ -42,6 +43,9 @@ _MAX_EXCHANGE_REQUEST_RETRIES = 1
 # Sleep time in sec between request retries.
 _REQUEST_RETRY_SLEEP_TIME_IN_SEC = 0.5
 
+# Max number of trades returned by the exchange in a single request.
+_MAX_TRADES_PER_REQUEST = 1000
+
 CcxtData = Dict[str, Any]
 
 # Added because of "RuntimeError: This event loop is already running"
@@ -76,6 +80,7 @@ class AbstractCcxtBroker(obrobrok.Broker):
         bid_ask_raw_data_reader: Optional[imvcdcimrdc.RawDataReader] = None,
         bid_ask_lookback: str = "60S",
         sanity_check_cached_open_positions: bool = False,
+        max_concurrent_trade_requests: int = 10,
         **kwargs: Any,
     ) -> None:
         """
@@ -98,6 +103,8 @@ class AbstractCcxtBroker(obrobrok.Broker):
         :param bid_ask_lookback: lookback period in pd.Timedelta-compatible string format, e.g. '10S'
         :param sanity_check_cached_open_positions: compare cached open
             positions to the current value and raise if there is a mismatch
+        :param max_concurrent_trade_requests: max number of symbols to load
+            trades for concurrently
         :param *args: `obrobrok.Broker` positional arguments
         :param **kwargs: `obrobrok.Broker` keyword arguments
         """
@@ -172,6 +179,19 @@ class AbstractCcxtBroker(obrobrok.Broker):
                     are supported."
             )
         self.bid_ask_lookback = bid_ask_lookback
+        hdbg.dassert_lte(1, max_concurrent_trade_requests)
+        self._max_concurrent_trade_requests = max_concurrent_trade_requests
+        # Keep the bid/ask data for the last `bid_ask_lookback` in memory, so
+        # that only the new data is loaded from the DB.
+        self._bid_ask_buffer: Optional[obccbiasbu.CcxtBidAskBuffer] = None
+        if self._bid_ask_raw_data_reader is not None:
+            self._bid_ask_buffer = obccbiasbu.CcxtBidAskBuffer(
+                self._bid_ask_raw_data_reader,
+                self.bid_ask_lookback,
+                self._exchange_id,
+                self._contract_type,
+                self.ccxt_symbol_to_asset_id_mapping,
+            )
         leverage = 1
         self._set_leverage_for_all_symbols(leverage)
 
@@ -250,59 +270,25 @@ class AbstractCcxtBroker(obrobrok.Broker):
             2023-08-11 12:49:52.845000+00:00      SOL_USDT     binance 2023-08-11 12:49:52.979713+00:00 2023-08-11 12:49:53.205151+00:00        258.0        467.0  ...       24.4110       24.4100  ...        629.0        151.0  ...       24.4120       24.4130 ...  SOL/USDT:USDT  2237530510
             ```
         """
-        # Get the first and last timestamp of the period.
+        # Get the last timestamp of the period.
         end_timestamp = pd.Timestamp.utcnow()
-        start_timestamp = end_timestamp - pd.Timedelta(self.bid_ask_lookback)
-        # Load raw data.
-        bid_ask_data = self._bid_ask_raw_data_reader.load_db_table(
-            start_timestamp,
-            end_timestamp,
-            bid_ask_levels=[1],
-            # At this point we drop fully duplicated data entries.
-            deduplicate=True,
-            subset=[
-                "timestamp",
-                "currency_pair",
-                "bid_price",
-                "bid_size",
-                "ask_price",
-                "ask_size",
-                "level",
-            ],
-        )
-        self._logger.log_bid_ask_data(self._get_wall_clock_time, bid_ask_data)
-        # Drop duplicates from the bid/ask data.
-        bid_ask_data, _ = obccccut.drop_bid_ask_duplicates(bid_ask_data)
-        # Filter loaded data to only the broker's universe symbols.
-        # Convert currency pairs to full CCXT symbol format, e.g. 'BTC_USDT' ->
-        # 'BTC/USDT:USDT'
-        bid_ask_data["ccxt_symbols"] = bid_ask_data["currency_pair"].apply(
-            imv2ccuti.convert_currency_pair_to_ccxt_format,
-            args=(self._exchange_id, self._contract_type),
-        )
-        # Map CCXT symbols to asset IDs.
-        bid_ask_data = bid_ask_data.loc[
-            bid_ask_data["ccxt_symbols"].isin(
-                self.ccxt_symbol_to_asset_id_mapping
-            )
-        ]
-        bid_ask_data["asset_id"] = bid_ask_data["ccxt_symbols"].apply(
-            lambda x: self.ccxt_symbol_to_asset_id_mapping[x]
-        )
+        # Load only the data that is not in the buffer yet.
+        hdbg.dassert_is_not(self._bid_ask_buffer, None)
+        self._bid_ask_buffer.update(end_timestamp)
+        # Log the raw data for the entire period, not only the new rows.
+        raw_bid_ask_data = self._bid_ask_buffer.get_raw_data()
+        self._logger.log_bid_ask_data(self._get_wall_clock_time, raw_bid_ask_data)
+        # Get the data for the period, which is already deduplicated, filtered
+        # by the broker's universe symbols and annotated with CCXT symbols and
+        # asset ids.
+        bid_ask_data = self._bid_ask_buffer.get_data()
         # When creating a set from a dictionary, only the keys are included
         # in the set by default.
         hdbg.dassert_set_eq(
             self.ccxt_symbol_to_asset_id_mapping,
-            bid_ask_data["ccxt_symbols"],
+            bid_ask_data["ccxt_symbols"].unique(),
             "Bid/Ask data is missing symbols",
         )
-        # Convert original index from unix epoch to Timestamp, e.g.
-        # 1691758182667 ->
-        #   pd.Timestamp('2023-08-11 12:50:01.987000+0000', tz='UTC')
-        bid_ask_data.index = bid_ask_data.index.to_series().apply(
-            lambda x: hdateti.convert_unix_epoch_to_timestamp(x)
-        )
-        bid_ask_data = bid_ask_data.sort_index()
         return bid_ask_data
 
     # ////////////////////////////////////////////////////////////////////////
@@ -479,9 +465,16 @@ class AbstractCcxtBroker(obrobrok.Broker):
         # Get trades for each symbol provided in the list of orders.
         # The trades are loaded for each symbol separately and then filtered
         # to leave only those corresponding to provided CCXT orders.
+        # The symbols are processed concurrently, limiting the number of
+        # in-flight requests to avoid hitting the exchange rate limits.
+        semaphore = asyncio.Semaphore(self._max_concurrent_trade_requests)
+
+        async def _get_trades(orders: List[CcxtData]) -> List[CcxtData]:
+            async with semaphore:
+                return await self._get_ccxt_trades_for_one_symbol(orders)
+
         tasks = [
-            self._get_ccxt_trades_for_one_symbol(orders)
-            for _, orders in symbol_to_order_mapping.items()
+            _get_trades(orders) for orders in symbol_to_order_mapping.values()
         ]
         trades = await asyncio.gather(*tasks)
         # Each task returns a list of trades, flatten it via list comprehension.
@@ -550,6 +543,12 @@ class AbstractCcxtBroker(obrobrok.Broker):
         ]
         await asyncio.gather(*tasks)
 
+    def close(self) -> None:
+        """
+        Close the logs being written, e.g., the segments in `arrow` format.
+        """
+        self._logger.close()
+
     def cancel_open_orders(self, currency_pair: str) -> None:
         """
         Cancel all the open orders for the given currency pair.
@@ -1139,15 +1138,29 @@ class AbstractCcxtBroker(obrobrok.Broker):
         #  'fee': {'cost': 0.00808755, 'currency': 'USDT'},
         #  'fees': [{'currency': 'USDT', 'cost': 0.00808755}]}
         # ```
-        symbol_trades = {}
-        symbol_trades = await self._async_exchange.fetchMyTrades(
-            symbol, limit=1000
-        )
-        # Map from symbol t
+        order_timestamps = [
+            ccxt_order.get("timestamp") for ccxt_order in ccxt_orders
+        ]
+        if None in order_timestamps:
+            # Without the order creation time, load the last trades. By
+            # default, the trades for symbol are loaded for the past 7 days.
+            _LOG.warning(
+                "Missing order timestamps for symbol=%s: loading the last %s "
+                "trades",
+                symbol,
+                _MAX_TRADES_PER_REQUEST,
+            )
+            symbol_trades = await self._async_exchange.fetchMyTrades(
+                symbol, limit=_MAX_TRADES_PER_REQUEST
+            )
+        else:
+            # A trade cannot happen before its order is created, so load only
+            # the trades since the earliest order.
+            since = min(order_timestamps)
+            symbol_trades = await self._fetch_ccxt_trades_since(symbol, since)
         # Filter the trades based on CCXT order IDs.
         #
         # Select CCXT IDs and filter orders by them.
-        # By default, the trades for symbol are loaded for the past 7 days.
         # To get trades corresponding to a Broker session, the trades are
         # filtered out by order ID. It is assumed that the input CCXT orders
         # are already closed orders for the given Broker iteration.
@@ -1173,6 +1186,72 @@ class AbstractCcxtBroker(obrobrok.Broker):
 
         return symbol_trades_with_asset_ids
 
+    async def _fetch_ccxt_trades_since(
+        self, symbol: str, since: int
+    ) -> List[CcxtData]:
+        """
+        Load all the trades for a symbol since a timestamp.
+
+        The trades are loaded in pages of `_MAX_TRADES_PER_REQUEST` trades in
+        chronological order, until a page is not full. A page starts at the
+        timestamp of the last trade of the previous page or, if all the trades
+        of the previous page have the same timestamp, at the trade id after
+        the last one, so that no trade is skipped.
+
+        :param symbol: CCXT symbol, e.g. 'BTC/USDT'
+        :param since: unix epoch in ms to load the trades from (included)
+        :return: list of dicts of trades
+        """
+        trades: List[CcxtData] = []
+        trade_ids = set()
+        # Trade id to load the next page from, when paginating by id.
+        from_id: Optional[int] = None
+        while True:
+            if from_id is None:
+                page = await self._async_exchange.fetchMyTrades(
+                    symbol, since=since, limit=_MAX_TRADES_PER_REQUEST
+                )
+            else:
+                # Binance doesn't accept `fromId` together with a start time.
+                page = await self._async_exchange.fetchMyTrades(
+                    symbol,
+                    limit=_MAX_TRADES_PER_REQUEST,
+                    params={"fromId": from_id},
+                )
+            _LOG.debug(
+                "Loaded %s trades for symbol=%s since=%s from_id=%s",
+                len(page),
+                symbol,
+                since,
+                from_id,
+            )
+            # The next page starts at the timestamp of the last trade, since
+            # multiple trades can share the same timestamp, so skip the trades
+            # that were already loaded.
+            for trade in page:
+                if trade["id"] not in trade_ids:
+                    trade_ids.add(trade["id"])
+                    trades.append(trade)
+            if len(page) < _MAX_TRADES_PER_REQUEST:
+                break
+            last_timestamp = page[-1]["timestamp"]
+            if last_timestamp > since:
+                since = last_timestamp
+                from_id = None
+            else:
+                # The entire page has the same timestamp, so loading the page
+                # since the same timestamp would return the same trades:
+                # continue from the next trade id.
+                last_id = page[-1]["id"]
+                if not str(last_id).isdigit():
+                    raise ValueError(
+                        f"Can't paginate trades for symbol={symbol} with "
+                        f"{len(page)} trades at timestamp={last_timestamp} "
+                        f"by non-numeric trade id={last_id}"
+                    )
+                from_id = int(last_id) + 1
+        return trades
+
     def _get_ccxt_trades_for_time_period(
         self,
         start_timestamp: pd.Timestamp,
@@ -461,8 +461,7 @@ def load_bid_ask_data(
     bid_ask_reader = obredare.ReplayDataReader(bid_ask_files)
     dataframes = []
     for file in bid_ask_files:
-        df = bid_ask_reader._read_csv_file(file)
-        dataframes.append(df)
+        dataframes.extend(bid_ask_reader.read_file(file))
     bid_ask = pd.concat(dataframes)
     hdbg.dassert(not bid_ask.empty, "Requested bid-ask data not available.")
     # Check bid/ask data for duplicates and drop if present.
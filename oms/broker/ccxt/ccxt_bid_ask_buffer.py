@@ -0,0 +1,217 @@
+"""
+Import as:
+
+import oms.broker.ccxt.ccxt_bid_ask_buffer as obccbiasbu
+"""
+
+import logging
+from typing import Dict, Optional
+
+import pandas as pd
+
+import helpers.hdatetime as hdateti
+import helpers.hdbg as hdbg
+import im_v2.ccxt.utils as imv2ccuti
+import im_v2.common.data.client.im_raw_data_client as imvcdcimrdc
+import oms.broker.ccxt.ccxt_utils as obccccut
+
+_LOG = logging.getLogger(__name__)
+
+
+# #############################################################################
+# CcxtBidAskBuffer
+# #############################################################################
+
+
+class CcxtBidAskBuffer:
+    """
+    Keep the bid/ask data for the last `lookback` period in memory.
+
+    Instead of reloading the entire lookback window from the DB, each update
+    loads only the rows that are newer than the last seen ones with
+    `RawDataReader.load_db_table_tail()` and appends them to a time-bounded
+    buffer per asset.
+
+    The raw data for the lookback window, as returned by
+    `RawDataReader.load_db_table()`, is also kept, e.g., to log it.
+    """
+
+    def __init__(
+        self,
+        raw_data_reader: imvcdcimrdc.RawDataReader,
+        lookback: str,
+        exchange_id: str,
+        contract_type: str,
+        ccxt_symbol_to_asset_id_mapping: Dict[str, int],
+        *,
+        max_late_arrival: str = "5S",
+    ) -> None:
+        """
+        Constructor.
+
+        :param raw_data_reader: reader of the bid/ask data from the DB
+        :param lookback: period of data to keep in pd.Timedelta-compatible
+            string format, e.g. '10S'
+        :param exchange_id: name of the exchange, e.g. 'binance'
+        :param contract_type: "spot" or "futures"
+        :param ccxt_symbol_to_asset_id_mapping: mapping from CCXT symbols to
+            asset ids for the universe of the broker
+        :param max_late_arrival: same as in
+            `RawDataReader.load_db_table_tail()`
+        """
+        self._raw_data_reader = raw_data_reader
+        self._lookback = pd.Timedelta(lookback)
+        self._exchange_id = exchange_id
+        self._contract_type = contract_type
+        self._ccxt_symbol_to_asset_id_mapping = ccxt_symbol_to_asset_id_mapping
+        self._max_late_arrival = max_late_arrival
+        # Map currency pairs to CCXT symbols, e.g. 'BTC_USDT' -> 'BTC/USDT:USDT'.
+        # The mapping is filled in lazily with the currency pairs in the data.
+        self._currency_pair_to_ccxt_symbol: Dict[str, str] = {}
+        # Bid/ask data per asset id, indexed by the exchange timestamp.
+        self._buffers: Dict[int, pd.DataFrame] = {}
+        # Raw data for the lookback window, indexed by the exchange timestamp
+        # as unix epoch in ms.
+        self._raw_data: Optional[pd.DataFrame] = None
+
+    def update(self, end_timestamp: pd.Timestamp) -> pd.DataFrame:
+        """
+        Load the rows newer than the last seen ones and trim the buffers.
+
+        :param end_timestamp: end of the period to keep in the buffer
+        :return: new raw data as returned by
+            `RawDataReader.load_db_table_tail()`
+        """
+        start_timestamp = end_timestamp - self._lookback
+        raw_data = self._raw_data_reader.load_db_table_tail(
+            start_timestamp,
+            end_timestamp,
+            bid_ask_levels=[1],
+            # At this point we drop fully duplicated data entries.
+            deduplicate=True,
+            subset=[
+                "timestamp",
+                "currency_pair",
+                "bid_price",
+                "bid_size",
+                "ask_price",
+                "ask_size",
+                "level",
+            ],
+            max_late_arrival=self._max_late_arrival,
+            new_rows_only=True,
+        )
+        _LOG.debug(
+            "Loaded %s new rows in [%s, %s]",
+            len(raw_data),
+            start_timestamp,
+            end_timestamp,
+        )
+        if not raw_data.empty:
+            data = self._transform(raw_data)
+            self._add_to_buffers(data)
+        self._trim_buffers(start_timestamp)
+        self._update_raw_data(raw_data, start_timestamp)
+        return raw_data
+
+    def get_raw_data(self) -> pd.DataFrame:
+        """
+        Return the raw data for the lookback window.
+
+        :return: same data as `RawDataReader.load_db_table()` for the last
+            updated window, i.e., deduplicated, but not annotated
+        """
+        hdbg.dassert_is_not(self._raw_data, None, "No bid/ask data loaded")
+        return self._raw_data.copy()
+
+    def get_data(self, *, asset_id: Optional[int] = None) -> pd.DataFrame:
+        """
+        Return the bid/ask data in the buffer.
+
+        :param asset_id: asset to return the data for, if None return the
+            data for all the assets
+        :return: data indexed and sorted by the exchange timestamp, in the
+            same format as `AbstractCcxtBroker.get_bid_ask_data_for_last_period()`
+        """
+        if asset_id is not None:
+            hdbg.dassert_in(asset_id, self._buffers)
+            return self._buffers[asset_id].copy()
+        hdbg.dassert_lt(0, len(self._buffers), "No bid/ask data loaded")
+        data = pd.concat(self._buffers.values())
+        data = data.sort_index()
+        return data
+
+    # ///////////////////////////////////////////////////////////////////////////
+    # Private methods.
+    # ///////////////////////////////////////////////////////////////////////////
+
+    def _transform(self, data: pd.DataFrame) -> pd.DataFrame:
+        """
+        Deduplicate and annotate the new rows with CCXT symbols and asset ids.
+        """
+        # Drop duplicates from the bid/ask data.
+        data, _ = obccccut.drop_bid_ask_duplicates(data)
+        # Convert currency pairs to full CCXT symbol format, e.g. 'BTC_USDT' ->
+        # 'BTC/USDT:USDT', once per currency pair.
+        for currency_pair in data["currency_pair"].unique():
+            if currency_pair not in self._currency_pair_to_ccxt_symbol:
+                ccxt_symbol = imv2ccuti.convert_currency_pair_to_ccxt_format(
+                    currency_pair, self._exchange_id, self._contract_type
+                )
+                self._currency_pair_to_ccxt_symbol[currency_pair] = ccxt_symbol
+        data["ccxt_symbols"] = data["currency_pair"].map(
+            self._currency_pair_to_ccxt_symbol
+        )
+        # Filter loaded data to only the broker's universe symbols and map CCXT
+        # symbols to asset IDs.
+        data = data.loc[
+            data["ccxt_symbols"].isin(self._ccxt_symbol_to_asset_id_mapping)
+        ]
+        data["asset_id"] = data["ccxt_symbols"].map(
+            self._ccxt_symbol_to_asset_id_mapping
+        )
+        # Convert original index from unix epoch to Timestamp, e.g.
+        # 1691758182667 ->
+        #   pd.Timestamp('2023-08-11 12:50:01.987000+0000', tz='UTC')
+        data.index = pd.to_datetime(data.index, unit="ms", utc=True).rename(
+            data.index.name
+        )
+        return data
+
+    def _add_to_buffers(self, data: pd.DataFrame) -> None:
+        for asset_id, asset_data in data.groupby("asset_id", sort=False):
+            buffer = self._buffers.get(asset_id)
+            if buffer is not None and not buffer.empty:
+                asset_data = pd.concat([buffer, asset_data])
+                # Keep the last data point for the same timestamp, consistently
+                # with `drop_bid_ask_duplicates()`.
+                asset_data = asset_data.loc[
+                    ~asset_data.index.duplicated(keep="last")
+                ]
+            self._buffers[asset_id] = asset_data.sort_index(kind="stable")
+
+    def _trim_buffers(self, start_timestamp: pd.Timestamp) -> None:
+        for asset_id, buffer in self._buffers.items():
+            # The buffers are sorted, so trimming the head is a slice.
+            idx = buffer.index.searchsorted(start_timestamp, side="left")
+            self._buffers[asset_id] = buffer.iloc[idx:]
+
+    def _update_raw_data(
+        self, raw_data: pd.DataFrame, start_timestamp: pd.Timestamp
+    ) -> None:
+        if self._raw_data is not None:
+            raw_data = pd.concat([self._raw_data, raw_data])
+            # Drop the new rows duplicating the data of the rows already in
+            # the window, as a deduplicated query of the window does.
+            columns = [
+                column
+                for column in raw_data.columns
+                if column
+                not in ("id", "end_download_timestamp", "knowledge_timestamp")
+            ]
+            is_duplicated = raw_data[columns].reset_index().duplicated()
+            raw_data = raw_data.loc[~is_duplicated.values]
+        start_ts = hdateti.convert_timestamp_to_unix_epoch(
+            start_timestamp, unit="ms"
+        )
+        self._raw_data = raw_data.loc[raw_data.index >= start_ts]
@@ -35,6 +35,8 @@ def get_CcxtBroker_exchange_only_instance1(
     universe_version: str,
     secret_identifier: omssec.SecretIdentifier,
     log_dir: str,
+    *,
+    log_format: str = "json",
 ) -> obccccbr.CcxtBroker:
     """
     Build a `CcxtBroker` for exchange only operations or tests.
@@ -43,6 +45,8 @@ def get_CcxtBroker_exchange_only_instance1(
     - No RawDataReader
     - MarketData object is present because of dependence on
     the wall clock and lower level interface
+
+    :param log_format: format of the broker logs, see `CcxtLogger`
     """
     # Strategy ID is a dummy value
     strategy_id = "C1b"
@@ -55,7 +59,7 @@ def get_CcxtBroker_exchange_only_instance1(
     contract_type = "swap"
     portfolio_id = "ccxt_portfolio_1"
     # Build logger.
-    logger = obcccclo.CcxtLogger(log_dir, mode="write")
+    logger = obcccclo.CcxtLogger(log_dir, mode="write", log_format=log_format)
     # Build ImClient.
     secret_identifier.stage
     # bid_ask_table = "ccxt_bid_ask_futures_raw"
@@ -114,6 +118,9 @@ def get_CcxtBroker_prod_instance1(
 ) -> obccccbr.CcxtBroker:
     """
     Build a `CcxtBroker` for production.
+
+    :param broker_config: config to initialize `Broker` with, the format of
+        the logs is read from the optional `log_format` key (see `CcxtLogger`)
     """
     # E.g., exchange_id = "binance"
     exchange_id = secret_identifier.exchange_id
@@ -124,7 +131,8 @@ def get_CcxtBroker_prod_instance1(
     contract_type = "swap"
     portfolio_id = "ccxt_portfolio_1"
     # Build logger.
-    logger = obcccclo.CcxtLogger(log_dir, mode="write")
+    log_format = broker_config.get("log_format", "json")
+    logger = obcccclo.CcxtLogger(log_dir, mode="write", log_format=log_format)
     # Build ImClient.
     bid_ask_table = "ccxt_bid_ask_futures_raw"
     db_stage = stage
@@ -190,9 +198,13 @@ def get_CcxtReplayedExchangeBroker_instance1(
     log_dir: str,
     replayed_dir: str,
     volatility_multiple: Union[float, List[float]],
+    *,
+    log_format: str = "json",
 ) -> obccccbr.CcxtBroker:
     """
     Build a `CcxtBroker` for production.
+
+    :param log_format: format of the broker logs, see `CcxtLogger`
     """
     exchange_id = secret_identifier.exchange_id
     # E.g., exchange_id = "binance"
@@ -203,7 +215,7 @@ def get_CcxtReplayedExchangeBroker_instance1(
     contract_type = "futures"
     portfolio_id = "ccxt_portfolio_1"
     # Build logger.
-    logger = obcccclo.CcxtLogger(log_dir, mode="write")
+    logger = obcccclo.CcxtLogger(log_dir, mode="write", log_format=log_format)
     # Read logged data.
     reader = obcccclo.CcxtLogger(replayed_dir, mode="read")
     log_data = reader.load_all_data(
@@ -4,12 +4,16 @@ Import as:
 import oms.broker.ccxt.ccxt_logger as obcccclo
 """
 
+import collections
+import json
 import logging
 import os
-from typing import Any, Callable, Dict, List, Optional, Union
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
 
+import jsonpickle
 import numpy as np
 import pandas as pd
+import pyarrow as pa
 from tqdm.autonotebook import tqdm
 
 import core.config as cconfig
@@ -27,6 +31,26 @@ CcxtData = Dict[str, Any]
 
 _LOG = logging.getLogger(__name__)
 
+# Arrow types of the typed columns in the segments of the logs in `arrow`
+# format.
+_ARROW_TYPES = {
+    str: pa.string(),
+    int: pa.int64(),
+    float: pa.float64(),
+    bool: pa.bool_(),
+    pd.Timestamp: pa.timestamp("ns", tz="UTC"),
+}
+# NumPy scalars stored in the typed columns of the segments, mapped to the
+# type of the column.
+_NUMPY_TYPES = {np.int64: int, np.float64: float}
+# Tags of the NumPy scalars in the data of the segments serialized as JSON.
+_NUMPY_JSON_TAGS = {np.int64: "np.int64", np.float64: "np.float64"}
+
+# Segment of the logs being written in `arrow` format.
+_LogSegment = collections.namedtuple(
+    "_LogSegment", ["date", "schema", "sink", "writer"]
+)
+
 
 # TODO(gp): This should go after CcxtLogger.
 def load_oms_fills(logs_dir: str) -> List[List[omfill.Fill]]:
@@ -85,6 +109,17 @@ class CcxtLogger:
     - CCXT order responses for all children orders
     - Submitted child orders
 
+    The logs can be written as:
+    - `json`: one JSON file per logged object
+    - `arrow`: an append-only log of segments in Arrow IPC stream format, one
+      per day and data type, where each record batch stores the content of
+      the corresponding JSON file indexed by wall clock time, with one row
+      per logged dict and the common scalar fields as typed columns
+    The logs in both formats are read by the same `load_*()` methods.
+
+    The bid/ask data is logged as one CSV file per bar or, in `arrow` format,
+    as one record batch per bar in daily segments.
+
     For more info on logs structure, see
     `docs/trade_execution/ck.ccxt_broker_logs_schema.reference.md`
     """
@@ -108,8 +143,64 @@ class CcxtLogger:
     BALANCES = "balances"
     BROKER_CONFIG = "broker_config.json"
     ARGS_FILE = "args.json"
+    # Extension of the segments of the logs in `arrow` format.
+    SEGMENT_EXTENSION = ".arrow"
+    # Scalar fields of the logged dicts (e.g., CCXT orders and trades, OMS
+    # orders and fills) stored as typed columns in the segments, instead of
+    # being serialized, mapped to their type.
+    SEGMENT_FIELDS = {
+        "id": str,
+        "clientOrderId": str,
+        "order": str,
+        "symbol": str,
+        "type": str,
+        "side": str,
+        "status": str,
+        "timeInForce": str,
+        "takerOrMaker": str,
+        "timestamp": int,
+        "lastTradeTimestamp": int,
+        "asset_id": int,
+        "datetime": pd.Timestamp,
+        "price": float,
+        "stopPrice": float,
+        "amount": float,
+        "cost": float,
+        "average": float,
+        "filled": float,
+        "remaining": float,
+        "postOnly": bool,
+        "reduceOnly": bool,
+    }
+    # Schema of the segments of the logs in `arrow` format:
+    # - `kind`: how the logged object is stored, i.e. "dict" for a dict,
+    #   "list" for a list of dicts with one row per dict, "object" otherwise
+    # - `keys`: keys of each logged dict, in the original order
+    # - `numpy_fields`: fields in `SEGMENT_FIELDS` stored from NumPy scalars
+    # - `data.{field}`: the fields in `SEGMENT_FIELDS`
+    # - `data`: the rest of each dict or the entire object if it's not a dict,
+    #   or null if nothing is left
+    # - `data_format`: how `data` is serialized, i.e. "json" for data made
+    #   only of JSON types and NumPy scalars, "jsonpickle" otherwise
+    SEGMENT_SCHEMA = pa.schema(
+        [
+            ("timestamp", pa.timestamp("ns", tz="UTC")),
+            ("file_name", pa.string()),
+            ("kind", pa.string()),
+            ("keys", pa.list_(pa.string())),
+            ("numpy_fields", pa.list_(pa.string())),
+            *[
+                (f"data.{field}", _ARROW_TYPES[type_])
+                for field, type_ in SEGMENT_FIELDS.items()
+            ],
+            ("data", pa.string()),
+            ("data_format", pa.string()),
+        ]
+    )
 
-    def __init__(self, log_dir: str, *, mode: str = "read"):
+    def __init__(
+        self, log_dir: str, *, mode: str = "read", log_format: str = "json"
+    ):
         """
         Constructor.
 
@@ -118,9 +209,14 @@ class CcxtLogger:
         :param mode: there are two modes:
             - write: the logger will write log files in `log_dir`
             - read: the logger will read log files from `log_dir`
+        :param log_format: format used to write the logs, i.e. `json` or `arrow`
         """
         self._log_dir = log_dir
         hdbg.dassert_is_not(self._log_dir, None)
+        hdbg.dassert_in(log_format, ["json", "arrow"])
+        self._log_format = log_format
+        # Map a log dir to the segment currently being written in that dir.
+        self._log_segments: Dict[str, _LogSegment] = {}
         if mode == "read":
             fields = [
                 "args",
@@ -243,7 +339,9 @@ class CcxtLogger:
             f"{order_asset_id}_{bar_timestamp}.{wall_clock_time_str}.json"
         )
         oms_order_file_name = os.path.join(oms_order_log_dir, oms_order_file_name)
-        hio.to_json(oms_order_file_name, logged_oms_child_order, use_types=True)
+        self._write_log_file(
+            oms_order_file_name, logged_oms_child_order, get_wall_clock_time
+        )
         _LOG.debug(
             "Saved OMS child orders log file %s",
             hprint.to_str("oms_order_file_name"),
@@ -257,7 +355,9 @@ class CcxtLogger:
             f"{order_asset_id}_{bar_timestamp}.{wall_clock_time_str}.json"
         )
         response_file_name = os.path.join(ccxt_log_dir, response_file_name)
-        hio.to_json(response_file_name, ccxt_child_order_response, use_types=True)
+        self._write_log_file(
+            response_file_name, ccxt_child_order_response, get_wall_clock_time
+        )
         _LOG.debug(
             "Saved CCXT child order response log file %s",
             hprint.to_str("response_file_name"),
@@ -291,7 +391,9 @@ class CcxtLogger:
             self._log_dir, self.CCXT_FILLS, f"ccxt_fills_{timestamp_str}.json"
         )
         _LOG.debug(hprint.to_str("ccxt_fills_file_name"))
-        hio.to_json(ccxt_fills_file_name, ccxt_fills, use_types=True)
+        self._write_log_file(
+            ccxt_fills_file_name, ccxt_fills, get_wall_clock_time
+        )
 
     def log_ccxt_trades(
         self,
@@ -320,7 +422,7 @@ class CcxtLogger:
             f"ccxt_trades_{timestamp_str}.json",
         )
         _LOG.debug(hprint.to_str("ccxt_trades_file_name"))
-        hio.to_json(ccxt_trades_file_name, ccxt_trades, use_types=True)
+        self._write_log_file(ccxt_trades_file_name, ccxt_trades, wall_clock_time)
 
     def log_oms_fills(
         self, get_wall_clock_time: Callable, oms_fills: List[omfill.Fill]
@@ -349,7 +451,7 @@ class CcxtLogger:
             f"oms_fills_{timestamp_str}.json",
         )
         _LOG.debug(hprint.to_str("oms_fills_file_name"))
-        hio.to_json(oms_fills_file_name, oms_fills, use_types=True)
+        self._write_log_file(oms_fills_file_name, oms_fills, get_wall_clock_time)
 
     # TODO(gp): Reorganize the format to be a bit regular
     # 1) always OMS data before than CCXT
@@ -443,10 +545,12 @@ class CcxtLogger:
             f"leverage_info.{wall_clock_time}.json",
         )
         # Create enclosing dir.
-        hio.to_json(
-            exchange_market_log_filename, exchange_markets, use_types=True
+        self._write_log_file(
+            exchange_market_log_filename, exchange_markets, get_wall_clock_time
+        )
+        self._write_log_file(
+            leverage_info_log_filename, leverage_info, get_wall_clock_time
         )
-        hio.to_json(leverage_info_log_filename, leverage_info, use_types=True)
         _LOG.debug(hprint.to_str("exchange_market_log_filename"))
 
     def log_bid_ask_data(
@@ -464,15 +568,24 @@ class CcxtLogger:
         :param get_wall_clock_time: retrieve the current wall clock time
         :param bid_ask_data: data frame received from `RawDataReader`
         """
+        dir_name = os.path.join(
+            self._log_dir,
+            self.BID_ASK_FULL if log_full_experiment_data else self.BID_ASK,
+        )
+        if self._log_format == "arrow":
+            # Each bar is stored in a record batch of the segment of the day.
+            batch = pa.RecordBatch.from_pandas(bid_ask_data, preserve_index=True)
+            self._append_batch_to_segment(
+                batch, dir_name, get_wall_clock_time()
+            )
+            return
         # Generate file name based on the bar timestamp.
         wall_clock_time = hdateti.timestamp_to_str(get_wall_clock_time())
         bar_timestamp = hwacltim.get_current_bar_timestamp(
             as_str=True, include_msec=True
         )
         bid_ask_log_filename = os.path.join(
-            self._log_dir,
-            self.BID_ASK_FULL if log_full_experiment_data else self.BID_ASK,
-            f"{bar_timestamp}.{wall_clock_time}.csv",
+            dir_name, f"{bar_timestamp}.{wall_clock_time}.csv"
         )
         # Create enclosing dir.
         hio.create_enclosing_dir(bid_ask_log_filename, incremental=True)
@@ -527,6 +640,19 @@ class CcxtLogger:
         file_name_tag = "balance"
         self._log_raw_data(dir_name, file_name_tag, get_wall_clock_time, balance)
 
+    def close(self) -> None:
+        """
+        Close the segments being written when the logs are in `arrow` format.
+
+        The segments that are not closed, e.g., because the process was
+        interrupted, can still be read.
+        """
+        for segment in self._log_segments.values():
+            # Closing the writer doesn't close the file it writes to.
+            segment.writer.close()
+            segment.sink.close()
+        self._log_segments = {}
+
     # #########################################################################
     # Read logs
     # #########################################################################
@@ -1071,8 +1197,9 @@ class CcxtLogger:
         """
         Load the list of bid ask file paths.
 
-        Bid ask files are in CSV format, these contain the raw data logged
-        directly from `RawDataReader` prior to any transformations.
+        Bid ask files are in CSV format or segments in `arrow` format, these
+        contain the raw data logged directly from `RawDataReader` prior to any
+        transformations. Both are read by `ReplayDataReader`.
 
         :param abort_on_missing_data: same interface as `load_all_data()`.
         :param load_data_for_full_period: if True loads data fetched for the
@@ -1099,6 +1226,7 @@ class CcxtLogger:
             self._fatal_missing_data(data_key, abort_on_missing_data)
             return []
         files = self._get_files(bid_ask_dir)
+        files.extend(self._get_segment_files(bid_ask_dir))
         return files
 
     def load_exchange_markets(
@@ -1279,9 +1407,47 @@ class CcxtLogger:
         files: List[str] = hio.listdir(
             log_dir, pattern, only_files, use_relative_paths
         )
+        # The segments of the logs in `arrow` format are loaded separately.
+        files = [
+            file
+            for file in files
+            if not file.endswith(CcxtLogger.SEGMENT_EXTENSION)
+        ]
         files.sort()
         return files
 
+    @staticmethod
+    def _get_segment_files(log_dir: str) -> List[str]:
+        """
+        Get a list of the segments of the logs in `arrow` format.
+        """
+        pattern = "*" + CcxtLogger.SEGMENT_EXTENSION
+        only_files = True
+        use_relative_paths = False
+        files: List[str] = hio.listdir(
+            log_dir, pattern, only_files, use_relative_paths
+        )
+        files.sort()
+        return files
+
+    @staticmethod
+    def _load_segments(log_dir: str) -> List[Tuple[str, Any]]:
+        """
+        Load the segments of the logs in `arrow` format from a dir.
+
+        :return: objects stored in the segments with the names of the
+            corresponding JSON files, e.g.,
+            ```
+            [("ccxt_fills_20230315-123538.json", [{"id": ...}, ...]), ...]
+            ```
+        """
+        records = []
+        for file_name in CcxtLogger._get_segment_files(log_dir):
+            with pa.memory_map(file_name, "r") as source:
+                table = pa.ipc.open_stream(source).read_all()
+            records.extend(CcxtLogger._from_segment_table(table))
+        return records
+
     @staticmethod
     def _convert_ccxt_order_structures_to_dataframe(
         ccxt_order_structures: List[CcxtData],
@@ -1884,10 +2050,285 @@ class CcxtLogger:
             dir_name,
             f"{file_name_tag}.{wall_clock_time}.json",
         )
-        # Create enclosing dir.
-        hio.to_json(log_filename, data, use_types=True)
+        self._write_log_file(log_filename, data, get_wall_clock_time)
         _LOG.debug(hprint.to_str("log_filename"))
 
+    def _write_log_file(
+        self, file_name: str, data: Any, get_wall_clock_time: Callable
+    ) -> None:
+        """
+        Write data to a log file or, for logs in `arrow` format, to the segment
+        of its dir.
+
+        :param file_name: path of the JSON file to write
+        :param data: data to write
+        :param get_wall_clock_time: retrieve the current wall clock time
+        """
+        if self._log_format == "json":
+            hio.to_json(file_name, data, use_types=True)
+            return
+        wall_clock_time = get_wall_clock_time()
+        batch = self._to_segment_batch(
+            wall_clock_time, os.path.basename(file_name), data
+        )
+        self._append_batch_to_segment(
+            batch, os.path.dirname(file_name), wall_clock_time
+        )
+
+    def _append_batch_to_segment(
+        self,
+        batch: pa.RecordBatch,
+        dir_name: str,
+        wall_clock_time: pd.Timestamp,
+    ) -> None:
+        """
+        Append a record batch to the segment of the day in `dir_name`.
+
+        A new segment is started every day, after a restart and when the
+        schema changes, e.g., when the columns of the bid/ask data change.
+        """
+        date = wall_clock_time.date()
+        if dir_name in self._log_segments:
+            segment = self._log_segments[dir_name]
+            if segment.date != date or not segment.schema.equals(
+                batch.schema
+            ):
+                segment.writer.close()
+                segment.sink.close()
+                del self._log_segments[dir_name]
+        if dir_name not in self._log_segments:
+            hio.create_dir(dir_name, incremental=True)
+            wall_clock_time_str = hdateti.timestamp_to_str(wall_clock_time)
+            segment_file_name = os.path.join(
+                dir_name,
+                f"segment.{wall_clock_time_str}{self.SEGMENT_EXTENSION}",
+            )
+            hdbg.dassert_path_not_exists(segment_file_name)
+            # Each batch is written to disk as soon as it's logged, so that the
+            # segment can be read even if it's not closed.
+            sink = pa.OSFile(segment_file_name, "wb")
+            writer = pa.ipc.new_stream(sink, batch.schema)
+            self._log_segments[dir_name] = _LogSegment(
+                date, batch.schema, sink, writer
+            )
+            _LOG.debug(hprint.to_str("segment_file_name"))
+        self._log_segments[dir_name].writer.write_batch(batch)
+
+    @staticmethod
+    def _to_segment_batch(
+        wall_clock_time: pd.Timestamp, file_name: str, data: Any
+    ) -> pa.RecordBatch:
+        """
+        Convert a logged object into a record batch of a segment.
+
+        See `SEGMENT_SCHEMA` for the format.
+        """
+        if CcxtLogger._is_segment_dict(data):
+            kind = "dict"
+            dicts = [data]
+        elif (
+            isinstance(data, list)
+            and data
+            and all(CcxtLogger._is_segment_dict(item) for item in data)
+        ):
+            kind = "list"
+            dicts = data
+        else:
+            kind = "object"
+            dicts = [None]
+        columns: Dict[str, List[Any]] = {
+            name: [] for name in CcxtLogger.SEGMENT_SCHEMA.names
+        }
+        for dict_ in dicts:
+            columns["timestamp"].append(wall_clock_time)
+            columns["file_name"].append(file_name)
+            columns["kind"].append(kind)
+            if dict_ is None:
+                columns["keys"].append(None)
+                columns["numpy_fields"].append(None)
+                for field in CcxtLogger.SEGMENT_FIELDS:
+                    columns[f"data.{field}"].append(None)
+                data_format, txt = CcxtLogger._encode_segment_data(data)
+                columns["data"].append(txt)
+                columns["data_format"].append(data_format)
+                continue
+            columns["keys"].append(list(dict_.keys()))
+            rest = dict(dict_)
+            numpy_fields = []
+            for field, type_ in CcxtLogger.SEGMENT_FIELDS.items():
+                value = rest.get(field)
+                is_typed = CcxtLogger._is_segment_field_value(value, type_)
+                if is_typed and type(value) in _NUMPY_TYPES:
+                    numpy_fields.append(field)
+                columns[f"data.{field}"].append(
+                    rest.pop(field) if is_typed else None
+                )
+            columns["numpy_fields"].append(numpy_fields)
+            if rest:
+                data_format, txt = CcxtLogger._encode_segment_data(rest)
+            else:
+                # The dict is stored entirely in the typed columns.
+                data_format, txt = None, None
+            columns["data"].append(txt)
+            columns["data_format"].append(data_format)
+        batch = pa.record_batch(
+            [
+                pa.array(columns[field.name], type=field.type)
+                for field in CcxtLogger.SEGMENT_SCHEMA
+            ],
+            schema=CcxtLogger.SEGMENT_SCHEMA,
+        )
+        return batch
+
+    @staticmethod
+    def _is_segment_field_value(value: Any, type_: type) -> bool:
+        """
+        Check whether a value can be stored in a typed column of a segment.
+
+        Only the values of the same type are stored, e.g., not `None` or a
+        bool as an int, so that the same data is loaded back.
+        """
+        value_type = _NUMPY_TYPES.get(type(value), type(value))
+        if value_type is not type_:
+            return False
+        if type_ is int:
+            return -(2**63) <= value < 2**63
+        if type_ is pd.Timestamp:
+            # The timestamps are stored in UTC, so only the UTC ones are
+            # loaded back with the same timezone.
+            return str(value.tz) == "UTC"
+        return True
+
+    @staticmethod
+    def _from_segment_table(table: pa.Table) -> List[Tuple[str, Any]]:
+        """
+        Convert the record batches of a segment back into the logged objects.
+
+        Each column is converted at once for the entire segment, and only the
+        fields that are not stored in the typed columns are deserialized.
+
+        :return: names of the corresponding JSON files and logged objects
+        """
+        columns: Dict[str, List[Any]] = {}
+        for field in table.schema:
+            column = table.column(field.name)
+            if pa.types.is_timestamp(field.type):
+                # Convert to `pd.Timestamp` and not to `datetime`.
+                columns[field.name] = column.to_pandas().tolist()
+            else:
+                columns[field.name] = column.to_pylist()
+        numpy_types = {type_: np_type for np_type, type_ in _NUMPY_TYPES.items()}
+        records = []
+        # Each record batch stores a logged object.
+        start = 0
+        for chunk in table.column(0).chunks:
+            end = start + len(chunk)
+            file_name = columns["file_name"][start]
+            kind = columns["kind"][start]
+            if kind == "object":
+                data = CcxtLogger._decode_segment_data(
+                    columns["data_format"][start], columns["data"][start]
+                )
+                records.append((file_name, data))
+                start = end
+                continue
+            dicts = []
+            for row in range(start, end):
+                rest = CcxtLogger._decode_segment_data(
+                    columns["data_format"][row], columns["data"][row]
+                )
+                dict_ = {}
+                # Restore the keys in the original order.
+                for key in columns["keys"][row]:
+                    if rest is not None and key in rest:
+                        dict_[key] = rest[key]
+                    else:
+                        dict_[key] = columns[f"data.{key}"][row]
+                for field in columns["numpy_fields"][row]:
+                    type_ = CcxtLogger.SEGMENT_FIELDS[field]
+                    dict_[field] = numpy_types[type_](dict_[field])
+                dicts.append(dict_)
+            data = dicts[0] if kind == "dict" else dicts
+            records.append((file_name, data))
+            start = end
+        return records
+
+    @staticmethod
+    def _encode_segment_data(data: Any) -> Tuple[str, str]:
+        """
+        Serialize the data stored in the `data` column of a segment.
+
+        The data made only of JSON types and NumPy scalars, e.g., the `info`
+        field of the CCXT structures, is serialized as JSON, which is much
+        faster to parse than with `jsonpickle`.
+
+        :return: format of the serialized data and serialized data
+        """
+        try:
+            json_data = CcxtLogger._to_json_data(data)
+        except TypeError:
+            return "jsonpickle", jsonpickle.encode(data)
+        return "json", json.dumps(json_data)
+
+    @staticmethod
+    def _decode_segment_data(data_format: Optional[str], txt: str) -> Any:
+        """
+        Deserialize the data stored in the `data` column of a segment.
+        """
+        if data_format is None:
+            return None
+        if data_format == "json":
+            return json.loads(txt, object_hook=CcxtLogger._json_to_numpy)
+        hdbg.dassert_eq(data_format, "jsonpickle")
+        return jsonpickle.decode(txt)
+
+    @staticmethod
+    def _to_json_data(data: Any) -> Any:
+        """
+        Convert data to JSON types, replacing NumPy scalars with tagged dicts.
+
+        :raises TypeError: if the data can't be loaded back the same from
+            JSON, e.g., it contains tuples or objects
+        """
+        if type(data) is dict:
+            if len(data) == 1 and set(data) & set(_NUMPY_JSON_TAGS.values()):
+                raise TypeError("Dict loaded back as a NumPy scalar")
+            json_data = {}
+            for key, value in data.items():
+                if type(key) is not str:
+                    raise TypeError(f"Invalid key type={type(key)}")
+                json_data[key] = CcxtLogger._to_json_data(value)
+            return json_data
+        if type(data) is list:
+            return [CcxtLogger._to_json_data(value) for value in data]
+        if type(data) in _NUMPY_JSON_TAGS:
+            # `json` would serialize `np.float64` as `float`.
+            return {_NUMPY_JSON_TAGS[type(data)]: data.item()}
+        if data is None or type(data) in (str, int, float, bool):
+            return data
+        raise TypeError(f"Invalid type={type(data)}")
+
+    @staticmethod
+    def _json_to_numpy(dict_: Dict[str, Any]) -> Any:
+        """
+        Load back a NumPy scalar serialized by `_to_json_data()`.
+        """
+        if len(dict_) == 1:
+            for numpy_type, tag in _NUMPY_JSON_TAGS.items():
+                if tag in dict_:
+                    return numpy_type(dict_[tag])
+        return dict_
+
+    @staticmethod
+    def _is_segment_dict(data: Any) -> bool:
+        """
+        Check whether an object can be stored as a dict in a segment.
+        """
+        is_dict = isinstance(data, dict) and all(
+            isinstance(key, str) for key in data
+        )
+        return is_dict
+
     def _load_raw_data(
         self,
         dir_name: str,
@@ -1895,15 +2336,25 @@ class CcxtLogger:
         append_list: bool = True,
     ) -> List[Dict[str, Any]]:
         """
-        Load raw data from the JSON files in the log directory.
+        Load raw data from the JSON files and the segments in the log
+        directory.
 
         :param append_list: Set to True for DataFrame.extend() or False
             for DataFrame.append().
         """
         files = self._get_files(dir_name)
+        segments = self._load_segments(dir_name)
+        # Each record of a segment is equivalent to a JSON file, so the data is
+        # loaded in the same order of the file names in both cases.
+        entries = [(os.path.basename(path), path, None) for path in files]
+        entries.extend(
+            (file_name, None, data) for file_name, data in segments
+        )
+        entries.sort(key=lambda entry: entry[0])
         data_list = []
-        for path in tqdm(files, desc=f"Loading '{dir_name}'"):
-            data = hio.from_json(path, use_types=True)
+        for _, path, data in tqdm(entries, desc=f"Loading '{dir_name}'"):
+            if path is not None:
+                data = hio.from_json(path, use_types=True)
             if append_list:
                 data_list.append(data)
             else:
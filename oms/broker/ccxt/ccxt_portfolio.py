@@ -48,6 +48,8 @@ def get_CcxtPortfolio_prod_instance1(
     broker_config: Dict[str, Any],
     log_dir: str,
     mark_to_market_col: str,
+    *,
+    log_format: str = "csv",
 ) -> CcxtPortfolio:
     """
     Initialize the `CcxtPortfolio` with cash using `CcxtBroker`.
@@ -62,6 +64,7 @@ def get_CcxtPortfolio_prod_instance1(
     :param asset_ids: see `Portfolio.from_cash()`
     :param broker_config: config to initialize `Broker` with
     :param log_dir: directory for portfolio logging
+    :param log_format: format of the Portfolio state, see `Portfolio` ctor
     """
     # We prefer to configure code statically (e.g., without switches) but in this
     # case the prod Portfolio vs its paper-trading version are so close (and we
@@ -118,5 +121,6 @@ def get_CcxtPortfolio_prod_instance1(
         pricing_method,
         initial_cash=initial_cash,
         asset_ids=asset_ids,
+        log_format=log_format,
     )
     return portfolio
@@ -114,16 +114,37 @@ class MockCcxtExchange:
         self._trades = {}
 
     async def fetchMyTrades(
-        self, symbol: str, *, limit: Optional[int] = None
+        self,
+        symbol: str,
+        *,
+        since: Optional[int] = None,
+        limit: Optional[int] = None,
+        params: Optional[ParamsDict] = None,
     ) -> List[CcxtOrderStructure]:
         """
         Fetch trades from exchange.
 
+        :param since: return the first `limit` trades since this unix
+            epoch in ms, if None return the last `limit` trades
         :param limit: return of to the last limit orders, if None return
             all
+        :param params: exchange-specific params, only `fromId` is supported
+            to return the first `limit` trades from this trade id, like
+            Binance does
         """
         trades = self._trades[symbol]
-        if limit:
+        if params and "fromId" in params:
+            # Binance doesn't accept `fromId` together with a start time.
+            hdbg.dassert_is(since, None)
+            from_id = int(params["fromId"])
+            trades = [trade for trade in trades if int(trade["id"]) >= from_id]
+            if limit:
+                trades = trades[:limit]
+        elif since is not None:
+            trades = [trade for trade in trades if trade["timestamp"] >= since]
+            if limit:
+                trades = trades[:limit]
+        elif limit:
             # In the simulated logic trades are appended one after another,
             # meaning the newest trade is the last in the list.
             adjusted_limit = min(len(trades), limit)
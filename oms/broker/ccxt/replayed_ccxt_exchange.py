@@ -189,9 +189,17 @@ class ReplayedCcxtExchange(obcmccex.MockCcxtExchange):
         self,
         symbol: str,
         limit: float,
+        *,
+        since: Optional[int] = None,
+        params: Optional[obcmccex.ParamsDict] = None,
     ) -> List[obcmccex.CcxtOrderStructure]:
         """
         Fetch trades from logs.
+
+        :param since: unix epoch in ms to return the trades from, if None
+            return all the trades
+        :param params: exchange-specific params, only `fromId` is supported
+            to return the trades from this trade id
         """
         # The method generates trade information that offers a glimpse into the
         # future, but the broker's algorithm ensures that only the desired
@@ -199,6 +207,12 @@ class ReplayedCcxtExchange(obcmccex.MockCcxtExchange):
         # logic here would be redundant because it's already embedded within the
         # broker.
         trades = self._ccxt_trades[symbol]
+        if params and "fromId" in params:
+            hdbg.dassert_is(since, None)
+            from_id = int(params["fromId"])
+            trades = [trade for trade in trades if int(trade["id"]) >= from_id]
+        elif since is not None:
+            trades = [trade for trade in trades if trade["timestamp"] >= since]
         return trades
 
     def fetchBalance(self) -> Dict[str, Any]:
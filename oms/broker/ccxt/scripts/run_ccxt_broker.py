@@ -418,6 +418,13 @@ def _parse() -> argparse.ArgumentParser:
         type=hparser.str_to_bool,
         help="Flag to control inclusion of BTC_USDT in the experiment.",
     )
+    parser.add_argument(
+        "--log_format",
+        required=False,
+        default="json",
+        type=str,
+        help="Format of the broker logs, i.e. 'json' or 'arrow'",
+    )
     parser = hparser.add_verbosity_arg(parser)
     return parser
 
@@ -546,6 +553,7 @@ def _main(parser: argparse.ArgumentParser) -> None:
         "limit_price_computer_kwargs": {
             "volatility_multiple": args.volatility_multiple,
         },
+        "log_format": args.log_format,
     }
     broker = obccbrin.get_CcxtBroker(
         secret_id,
@@ -602,6 +610,7 @@ def _main(parser: argparse.ArgumentParser) -> None:
                 dry_run=False,
                 assert_on_non_zero_positions=False,
             )
+        broker.close()
 
 
 if __name__ == "__main__":
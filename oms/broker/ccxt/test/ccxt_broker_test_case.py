@@ -30,6 +30,7 @@ import oms.broker.ccxt.ccxt_broker as obccccbr
 import oms.broker.ccxt.ccxt_broker_instances as obccbrin
 import oms.broker.ccxt.ccxt_logger as obcccclo
 import oms.broker.ccxt.ccxt_utils as obccccut
+import oms.broker.ccxt.mock_ccxt_exchange as obcmccex
 import oms.broker.ccxt.test.test_ccxt_utils as obcttcut
 import oms.fill as omfill
 import oms.hsecrets.secret_identifier as ohsseide
@@ -789,6 +790,102 @@ class TestCcxtBroker_TestCase(hunitest.TestCase, abc.ABC):
             trades = hasynci.run(coroutine, event_loop=event_loop)
         self.assertListEqual(trades, [None] * len(orders))
 
+    def test_get_ccxt_trades2(self) -> None:
+        """
+        Verify that the trades are loaded in pages since the earliest order.
+        """
+        broker = self._get_local_test_broker()
+        symbol = list(broker.ccxt_symbol_to_asset_id_mapping.keys())[0]
+        # Generate 2 trades per ms, so that the pages split trades with the
+        # same timestamp. The trades before the first order at 1000 ms belong
+        # to another order.
+        all_trades = []
+        for i in range(5000):
+            if i < 2000:
+                order_id = "1"
+            elif i < 3500:
+                order_id = "3"
+            else:
+                order_id = "4"
+            trade = {
+                "info": {"orderId": order_id},
+                "timestamp": i // 2,
+                "symbol": symbol,
+                "id": str(i),
+            }
+            all_trades.append(trade)
+        orders = [
+            {"id": "3", "symbol": symbol, "timestamp": 1000},
+            {"id": "4", "symbol": symbol, "timestamp": 1100},
+        ]
+
+        async def _fetch_my_trades(
+            symbol: str, *, since: int, limit: int
+        ) -> List[Dict[str, Any]]:
+            trades = [
+                trade for trade in all_trades if trade["timestamp"] >= since
+            ]
+            return trades[:limit]
+
+        broker._async_exchange = umock.MagicMock()
+        broker._async_exchange.fetchMyTrades = umock.AsyncMock(
+            side_effect=_fetch_my_trades
+        )
+        with hasynci.solipsism_context() as event_loop:
+            coroutine = broker.get_ccxt_trades(orders)
+            trades = hasynci.run(coroutine, event_loop=event_loop)
+        # Check that all the trades for the orders are loaded once.
+        actual_ids = [trade["id"] for trade in trades]
+        expected_ids = [str(i) for i in range(2000, 5000)]
+        self.assertListEqual(actual_ids, expected_ids)
+        # Check that only the trades since the first order are requested.
+        actual_since = [
+            call.kwargs["since"]
+            for call in broker._async_exchange.fetchMyTrades.call_args_list
+        ]
+        self.assertListEqual(actual_since, [1000, 1499, 1998, 2497])
+
+    def test_get_ccxt_trades3(self) -> None:
+        """
+        Verify that the trades are loaded by id when a full page has the same
+        timestamp.
+        """
+        broker = self._get_local_test_broker()
+        symbol = list(broker.ccxt_symbol_to_asset_id_mapping.keys())[0]
+        # Generate 2500 trades at the same ms and 10 trades after it.
+        all_trades = []
+        for i in range(2510):
+            trade = {
+                "info": {"orderId": "3"},
+                "timestamp": 1000 if i < 2500 else 1001,
+                "symbol": symbol,
+                "id": str(i),
+            }
+            all_trades.append(trade)
+        orders = [{"id": "3", "symbol": symbol, "timestamp": 1000}]
+        with hasynci.solipsism_context() as event_loop:
+            # Load the trades from a mock exchange supporting `fromId`.
+            exchange = obcmccex.MockCcxtExchange(
+                0, event_loop, broker._get_wall_clock_time, 1.0
+            )
+            exchange._trades = {symbol: all_trades}
+            broker._async_exchange = umock.MagicMock()
+            broker._async_exchange.fetchMyTrades = umock.AsyncMock(
+                wraps=exchange.fetchMyTrades
+            )
+            coroutine = broker.get_ccxt_trades(orders)
+            trades = hasynci.run(coroutine, event_loop=event_loop)
+        # Check that all the trades are loaded once.
+        actual_ids = [trade["id"] for trade in trades]
+        expected_ids = [str(i) for i in range(2510)]
+        self.assertListEqual(actual_ids, expected_ids)
+        # Check that the pages after the first one are loaded by id.
+        actual_from_ids = [
+            call.kwargs.get("params", {}).get("fromId")
+            for call in broker._async_exchange.fetchMyTrades.call_args_list
+        ]
+        self.assertListEqual(actual_from_ids, [None, 1000, 2000])
+
     # #########################################################################
 
     def test_get_open_positions1(self) -> None:
@@ -1300,7 +1397,7 @@ class TestCcxtBroker_TestCase(hunitest.TestCase, abc.ABC):
         )
         if use_mock_data_reader:
             mock_data_reader = umock.MagicMock()
-            mock_data_reader.load_db_table = (
+            mock_data_reader.load_db_table_tail = (
                 obcttcut._generate_raw_data_reader_bid_ask_data
             )
         else:
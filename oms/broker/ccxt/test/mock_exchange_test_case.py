@@ -127,7 +127,7 @@ def _get_test_broker(
     ):
         # Inject mock raw data reader
         mock_data_reader = umock.MagicMock()
-        mock_data_reader.load_db_table = (
+        mock_data_reader.load_db_table_tail = (
             obcttcut._generate_raw_data_reader_bid_ask_data
         )
         # Create logger.
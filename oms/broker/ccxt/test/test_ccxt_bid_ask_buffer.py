@@ -0,0 +1,136 @@
+import unittest.mock as umock
+from typing import Any
+
+import pandas as pd
+
+import helpers.hdatetime as hdateti
+import helpers.hdbg as hdbg
+import helpers.hunit_test as hunitest
+import oms.broker.ccxt.ccxt_bid_ask_buffer as obccbiasbu
+import oms.broker.ccxt.test.test_ccxt_utils as obcttcut
+
+
+class TestCcxtBidAskBuffer(hunitest.TestCase):
+    def test_update1(self) -> None:
+        """
+        Check that the buffer loads only the new rows and returns the same
+        data as a full reload.
+        """
+        raw_data_reader = self._get_mock_raw_data_reader()
+        buffer = self._get_buffer(raw_data_reader)
+        end_timestamp1 = pd.Timestamp("2023-09-13 15:30:00", tz="UTC")
+        raw_data1 = buffer.update(end_timestamp1)
+        # Advance the time and update the buffer.
+        end_timestamp2 = pd.Timestamp("2023-09-13 15:30:10", tz="UTC")
+        raw_data2 = buffer.update(end_timestamp2)
+        # Check the queried intervals.
+        actual_intervals = [
+            call.args
+            for call in raw_data_reader.load_db_table_tail.call_args_list
+        ]
+        expected_intervals = [
+            (pd.Timestamp("2023-09-13 15:29:00", tz="UTC"), end_timestamp1),
+            (pd.Timestamp("2023-09-13 15:29:10", tz="UTC"), end_timestamp2),
+        ]
+        self.assertListEqual(actual_intervals, expected_intervals)
+        # Check that only the new rows are returned.
+        self.assertEqual(len(raw_data1), 3 * 121)
+        self.assertEqual(len(raw_data2), 3 * 20)
+        # Compare with a buffer loading the entire period at once.
+        expected_buffer = self._get_buffer(self._get_mock_raw_data_reader())
+        expected_buffer.update(end_timestamp2)
+        expected = expected_buffer.get_data()
+        actual = buffer.get_data()
+        self.assert_equal(str(actual), str(expected))
+        self.assertEqual(
+            actual.index.min(), pd.Timestamp("2023-09-13 15:29:10", tz="UTC")
+        )
+        self.assertEqual(actual.index.max(), end_timestamp2)
+        self.assertEqual(len(actual), 2 * 121)
+
+    def test_get_raw_data1(self) -> None:
+        """
+        Check that the raw data is the same as the raw data loaded for the
+        entire period at once.
+        """
+        buffer = self._get_buffer(self._get_mock_raw_data_reader())
+        buffer.update(pd.Timestamp("2023-09-13 15:30:00", tz="UTC"))
+        end_timestamp = pd.Timestamp("2023-09-13 15:30:10", tz="UTC")
+        buffer.update(end_timestamp)
+        actual = buffer.get_raw_data()
+        expected = obcttcut._generate_raw_data_reader_bid_ask_data(
+            end_timestamp - pd.Timedelta("60S"),
+            end_timestamp,
+            bid_ask_levels=[1],
+            subset=None,
+        )
+        # The rows are in the order they were loaded.
+        columns = ["timestamp", "currency_pair"]
+        actual = actual.reset_index().sort_values(columns, ignore_index=True)
+        expected = expected.reset_index().sort_values(columns, ignore_index=True)
+        self.assertEqual(len(actual), 3 * 121)
+        self.assert_equal(str(actual), str(expected))
+
+    def test_get_data1(self) -> None:
+        """
+        Check the data for a single asset.
+        """
+        buffer = self._get_buffer(self._get_mock_raw_data_reader())
+        buffer.update(pd.Timestamp("2023-09-13 15:30:00", tz="UTC"))
+        actual = buffer.get_data(asset_id=1464553467)
+        self.assertEqual(actual["ccxt_symbols"].unique().tolist(), ["ETH/USDT"])
+        self.assertEqual(actual["asset_id"].unique().tolist(), [1464553467])
+        self.assertTrue(actual.index.is_monotonic_increasing)
+        self.assertEqual(len(actual), 121)
+
+    @staticmethod
+    def _get_mock_raw_data_reader() -> umock.MagicMock:
+        """
+        Build a reader returning only the rows after the last returned one.
+        """
+        last_end_timestamp = None
+
+        def _load_db_table_tail(
+            start_timestamp: pd.Timestamp,
+            end_timestamp: pd.Timestamp,
+            **kwargs: Any,
+        ) -> pd.DataFrame:
+            nonlocal last_end_timestamp
+            hdbg.dassert(kwargs["new_rows_only"])
+            kwargs = {
+                key: kwargs[key]
+                for key in ["bid_ask_levels", "deduplicate", "subset"]
+            }
+            data = obcttcut._generate_raw_data_reader_bid_ask_data(
+                start_timestamp, end_timestamp, **kwargs
+            )
+            if last_end_timestamp is not None:
+                last_end_ts = hdateti.convert_timestamp_to_unix_epoch(
+                    last_end_timestamp
+                )
+                data = data.loc[data.index > last_end_ts]
+            last_end_timestamp = end_timestamp
+            return data
+
+        raw_data_reader = umock.MagicMock()
+        raw_data_reader.load_db_table_tail = umock.MagicMock(
+            side_effect=_load_db_table_tail
+        )
+        return raw_data_reader
+
+    @staticmethod
+    def _get_buffer(
+        raw_data_reader: umock.MagicMock,
+    ) -> obccbiasbu.CcxtBidAskBuffer:
+        ccxt_symbol_to_asset_id_mapping = {
+            "BTC/USDT": 1467591036,
+            "ETH/USDT": 1464553467,
+        }
+        buffer = obccbiasbu.CcxtBidAskBuffer(
+            raw_data_reader,
+            "60S",
+            "binance",
+            "spot",
+            ccxt_symbol_to_asset_id_mapping,
+        )
+        return buffer
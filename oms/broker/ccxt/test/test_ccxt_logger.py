@@ -5,6 +5,7 @@ from typing import Any, Dict, List, Tuple
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
 import pytest
 
 import core.real_time as creatime
@@ -14,8 +15,10 @@ import helpers.hpandas as hpandas
 import helpers.hprint as hprint
 import helpers.hsystem as hsystem
 import helpers.hunit_test as hunitest
+import helpers.hwall_clock_time as hwacltim
 import oms.broker.ccxt.abstract_ccxt_broker as obcaccbr
 import oms.broker.ccxt.ccxt_logger as obcccclo
+import oms.broker.replayed_data_reader as obredare
 import oms.fill as omfill
 import oms.order.order as oordorde
 
@@ -2792,6 +2795,122 @@ class TestCcxtLogger2(hunitest.TestCase):
         self.assert_equal(actual, expected_ccxt_order_response, fuzzy_match=True)
 
 
+# #############################################################################
+# TestCcxtLogger3
+# #############################################################################
+
+
+class TestCcxtLogger3(hunitest.TestCase):
+    """
+    Verify that the logs in `arrow` format are loaded like the JSON logs.
+    """
+
+    def test_load_logs1(self) -> None:
+        scratch_dir = self.get_scratch_space()
+        json_log_dir = os.path.join(scratch_dir, "json")
+        self._log_data(json_log_dir, "json")
+        arrow_log_dir = os.path.join(scratch_dir, "arrow")
+        self._log_data(arrow_log_dir, "arrow")
+        # Check that there is one segment per day.
+        ccxt_fills_dir = os.path.join(
+            arrow_log_dir, obcccclo.CcxtLogger.CCXT_FILLS
+        )
+        files = hio.listdir(ccxt_fills_dir, "*", True, True)
+        self.assertEqual(len(files), 2)
+        for file in files:
+            self.assertTrue(file.endswith(obcccclo.CcxtLogger.SEGMENT_EXTENSION))
+        # Check that the scalar fields of the fills are stored as typed columns.
+        with pa.memory_map(os.path.join(ccxt_fills_dir, files[0]), "r") as src:
+            table = pa.ipc.open_stream(src).read_all()
+        self.assertEqual(table.num_rows, 4)
+        self.assertEqual(table["kind"].unique().to_pylist(), ["list"])
+        for column in [
+            "data.symbol",
+            "data.side",
+            "data.timestamp",
+            "data.datetime",
+            "data.price",
+            "data.amount",
+            "data.reduceOnly",
+        ]:
+            self.assertEqual(table[column].null_count, 0)
+        # Check that the data is the same.
+        json_reader = obcccclo.CcxtLogger(json_log_dir)
+        arrow_reader = obcccclo.CcxtLogger(arrow_log_dir)
+        for convert_to_dataframe in [False, True]:
+            for load_func_name in [
+                "load_ccxt_fills",
+                "load_ccxt_trades",
+                "load_positions",
+                "load_balances",
+            ]:
+                expected = getattr(json_reader, load_func_name)(
+                    convert_to_dataframe=convert_to_dataframe
+                )
+                actual = getattr(arrow_reader, load_func_name)(
+                    convert_to_dataframe=convert_to_dataframe
+                )
+                self.assertGreater(len(expected), 0)
+                self.assert_equal(
+                    pprint.pformat(actual), pprint.pformat(expected)
+                )
+        # Check that the types of the values, e.g., NumPy scalars, are the
+        # same, since they are not visible in the string representation.
+        expected = json_reader.load_ccxt_fills()[0]
+        actual = arrow_reader.load_ccxt_fills()[0]
+        for key in ["id", "datetime", "price", "amount", "fee", "reduceOnly"]:
+            self.assertIs(type(actual[key]), type(expected[key]), msg=key)
+        for key, value in expected["info"].items():
+            self.assertIs(type(actual["info"][key]), type(value), msg=key)
+        # Check that the bid/ask data of each bar is replayed in the same way.
+        expected_reader = obredare.ReplayDataReader(
+            json_reader.load_bid_ask_files()
+        )
+        actual_reader = obredare.ReplayDataReader(
+            arrow_reader.load_bid_ask_files()
+        )
+        for _ in range(3):
+            expected = expected_reader.load_db_table(None, None)
+            actual = actual_reader.load_db_table(None, None)
+            self.assert_equal(
+                hpandas.df_to_str(actual, num_rows=None),
+                hpandas.df_to_str(expected, num_rows=None),
+            )
+            self.assert_equal(str(actual.dtypes), str(expected.dtypes))
+
+    @staticmethod
+    def _log_data(log_dir: str, log_format: str) -> None:
+        """
+        Log CCXT data for 2 bars of a day and 1 bar of the next day.
+        """
+        logger = obcccclo.CcxtLogger(log_dir, mode="write", log_format=log_format)
+        bar_timestamps = [
+            pd.Timestamp("2023-03-15 12:35:00+00:00"),
+            pd.Timestamp("2023-03-15 12:40:00+00:00"),
+            pd.Timestamp("2023-03-16 12:35:00+00:00"),
+        ]
+        ccxt_fills = _get_dummy_ccxt_fills()
+        ccxt_trades = _get_dummy_ccxt_trades()
+        positions = _get_dummy_ccxt_positions()
+        balance = _get_dummy_ccxt_balance()
+        bid_ask_data = _get_dummy_bid_ask_data()
+        try:
+            for idx, bar_timestamp in enumerate(bar_timestamps):
+                hwacltim.set_current_bar_timestamp(bar_timestamp)
+                wall_clock_time = bar_timestamp + pd.Timedelta(seconds=5)
+                get_wall_clock_time = lambda: wall_clock_time
+                logger.log_ccxt_fills(get_wall_clock_time, ccxt_fills[idx % 2])
+                logger.log_ccxt_trades(get_wall_clock_time, ccxt_trades[idx % 2])
+                logger.log_positions(get_wall_clock_time, positions)
+                logger.log_balance(get_wall_clock_time, balance)
+                logger.log_bid_ask_data(
+                    get_wall_clock_time, bid_ask_data.iloc[: idx + 1]
+                )
+        finally:
+            hwacltim.reset_current_bar_timestamp()
+            logger.close()
+
+
 @pytest.mark.skip("CMTask5079: Disabled due to obsolete data format.")
 class Test_read_rt_data1(hunitest.TestCase):
     """
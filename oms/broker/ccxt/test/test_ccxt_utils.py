@@ -280,10 +280,12 @@ def _generate_raw_data_reader_bid_ask_data(
     *,
     bid_ask_levels: List[int] = None,
     random_seed: int = 0,
-    # This function is used to mock RawDataReader's load_db_table,
-    # the parameters are added to match its signature.
+    # This function is used to mock RawDataReader's load_db_table and
+    # load_db_table_tail, the parameters are added to match their signature.
     deduplicate: bool = True,
     subset: Optional[List[str]],
+    max_late_arrival: str = "5S",
+    new_rows_only: bool = False,
 ) -> pd.DataFrame:
     """
     Return dummy bid/ask data for the given period.
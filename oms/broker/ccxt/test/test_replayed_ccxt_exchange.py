@@ -941,3 +941,50 @@ class TestReplayedCcxtExchange3(hunitest.TestCase):
                 execution_freq="1T",
             )
             orders = hasynci.run(coroutine, event_loop=event_loop)
+
+
+class TestReplayedCcxtExchange4(hunitest.TestCase):
+    """
+    Test loading the trades from the logs.
+    """
+
+    def test_fetch_my_trades1(self) -> None:
+        """
+        Check that the trades are loaded from a trade id with `fromId`.
+        """
+        symbol = "ETH/USDT"
+        # Generate trades at the same ms.
+        ccxt_trades_list = [
+            {"id": str(i), "symbol": symbol, "timestamp": 1000}
+            for i in range(10, 15)
+        ]
+        replayed_ccxt_exchange = obcrccex.ReplayedCcxtExchange(
+            [],
+            [],
+            ccxt_trades_list,
+            None,
+            None,
+            [],
+            None,
+            None,
+            0,
+            None,
+            None,
+            [1.0],
+        )
+        # Load the trades by timestamp.
+        trades = asyncio.run(
+            replayed_ccxt_exchange.fetchMyTrades(symbol, 1000, since=1000)
+        )
+        self.assertListEqual(
+            [trade["id"] for trade in trades], ["10", "11", "12", "13", "14"]
+        )
+        # Load the trades by id.
+        trades = asyncio.run(
+            replayed_ccxt_exchange.fetchMyTrades(
+                symbol, 1000, params={"fromId": 12}
+            )
+        )
+        self.assertListEqual(
+            [trade["id"] for trade in trades], ["12", "13", "14"]
+        )
@@ -7,6 +7,9 @@ from datetime import datetime
 from typing import List, Optional
 
 import pandas as pd
+import pyarrow as pa
+
+import oms.broker.ccxt.ccxt_logger as obcccclo
 
 
 # TODO(gp): -> ReplayedRawDataReader
@@ -26,9 +29,23 @@ class ReplayDataReader:
         Initialize ReplayDataReader.
 
         :param bid_ask_data_log_file_names: sorted list of paths to
-            bid_ask_data log files.
+            bid_ask_data log files, i.e. CSV files with the data of a bar or
+            segments in `arrow` format with the data of multiple bars
         """
         self._bid_ask_data_log_file_names = bid_ask_data_log_file_names
+        # Data of the bars read from the current log file that have not been
+        # replayed yet.
+        self._bid_ask_data: List[pd.DataFrame] = []
+
+    def read_file(self, path: str) -> List[pd.DataFrame]:
+        """
+        Read the data of all the bars stored in a log file.
+        """
+        if path.endswith(obcccclo.CcxtLogger.SEGMENT_EXTENSION):
+            dfs = self._read_segment(path)
+        else:
+            dfs = [self._read_csv_file(path)]
+        return dfs
 
     # TODO(gp): Why all these params.
     def load_db_table(
@@ -49,15 +66,63 @@ class ReplayDataReader:
         `RawDataReader.load_db_table()` in order to allow replayed
         behavior.
         """
-        bid_ask_data = self._read_csv_file(
-            self._bid_ask_data_log_file_names.pop(0)
-        )
+        bid_ask_data = self._get_next_bid_ask_data()
+        return bid_ask_data
+
+    def load_db_table_tail(
+        self,
+        start_timestamp: pd.Timestamp,
+        end_timestamp: Optional[pd.Timestamp],
+        *,
+        deduplicate: bool = False,
+        currency_pairs: Optional[List[str]] = None,
+        bid_ask_levels: Optional[List[int]] = None,
+        bid_ask_format: str = "wide",
+        subset: Optional[List[str]] = None,
+        max_late_arrival: str = "5S",
+        new_rows_only: bool = False,
+    ) -> pd.DataFrame:
+        """
+        Load DB table data from a next log file in line.
+
+        This method has the same signature as
+        `RawDataReader.load_db_table_tail()` in order to allow replayed
+        behavior.
+        """
+        bid_ask_data = self._get_next_bid_ask_data()
         return bid_ask_data
 
     # ///////////////////////////////////////////////////////////////////////////
     # Private interface.
     # ///////////////////////////////////////////////////////////////////////////
 
+    def _get_next_bid_ask_data(self) -> pd.DataFrame:
+        """
+        Get the data of the next bar, reading the next log file if needed.
+        """
+        while not self._bid_ask_data:
+            path = self._bid_ask_data_log_file_names.pop(0)
+            self._bid_ask_data = self.read_file(path)
+        return self._bid_ask_data.pop(0)
+
+    @staticmethod
+    def _read_segment(path: str) -> List[pd.DataFrame]:
+        """
+        Read the data of the bars from a segment in `arrow` format.
+        """
+        with pa.memory_map(path, "r") as source:
+            # Each record batch stores the data of a bar.
+            batches = list(pa.ipc.open_stream(source))
+        dfs = []
+        for batch in batches:
+            df = batch.to_pandas()
+            # Parse the timestamps in the same way as in the CSV files, in case
+            # they were logged as strings.
+            for col in ["knowledge_timestamp", "end_download_timestamp"]:
+                df[col] = pd.to_datetime(df[col], format="ISO8601")
+            dfs.append(df)
+        return dfs
+
     # TODO(gp): Convert to staticmethod
     def _read_csv_file(self, path: str) -> pd.DataFrame:
         """
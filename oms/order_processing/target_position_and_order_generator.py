@@ -4,6 +4,7 @@ Import as:
 import oms.order_processing.target_position_and_order_generator as ooptpaoge
 """
 
+import concurrent.futures
 import logging
 import os
 from typing import Any, Dict, List, Optional
@@ -156,9 +157,15 @@ class TargetPositionAndOrderGenerator(hobject.PrintableMixin):
         *,
         tz: str = "America/New_York",
         rename_col_map: Optional[Dict[str, str]] = None,
+        max_concurrent_reads: int = 10,
     ) -> pd.DataFrame:
         """
         Parse logged `target_position` dataframes.
+
+        The target positions are saved either in one CSV file per bar or in
+        daily segments in `arrow` format, depending on the log format of the
+        Portfolio. The files are read and pivoted in parallel, at most
+        `max_concurrent_reads` at a time.
         :return a dataframe indexed by datetimes and with two column levels. E.g.,
 
         ```
@@ -168,11 +175,16 @@ class TargetPositionAndOrderGenerator(hobject.PrintableMixin):
         """
         sub_dir = "target_positions"
         files = TargetPositionAndOrderGenerator._get_files(log_dir, sub_dir)
-        dfs = []
-        for path in tqdm(files, desc=f"Loading `{sub_dir}` files..."):
-            df = pd.read_csv(
-                path, index_col=0, parse_dates=["wall_clock_timestamp"]
-            )
+
+        def _read(path: str) -> Optional[pd.DataFrame]:
+            if path.endswith(oporport.Portfolio.SEGMENT_EXTENSION):
+                # A segment contains the target positions of all the bars
+                # logged in a day.
+                df = oporport.Portfolio.read_segment(path)
+            else:
+                df = pd.read_csv(
+                    path, index_col=0, parse_dates=["wall_clock_timestamp"]
+                )
             # Change the index from `asset_id` to the timestamp.
             df = df.reset_index().set_index("wall_clock_timestamp")
             # TODO(Dan): Research why column names are being incorrect sometimes
@@ -182,11 +194,26 @@ class TargetPositionAndOrderGenerator(hobject.PrintableMixin):
             hpandas.dassert_series_type_is(df["asset_id"], np.int64)
             if not isinstance(df.index, pd.DatetimeIndex):
                 _LOG.info("Skipping file_name=%s", path)
-                continue
+                return None
             df.index = df.index.tz_convert(tz)
             # Pivot to multiple column levels.
             df = df.pivot(columns="asset_id")
-            dfs.append(df)
+            return df
+
+        max_workers = max(1, min(max_concurrent_reads, len(files)))
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers
+        ) as executor:
+            # `map()` returns the results in the order of the files so that
+            # the output is deterministic.
+            dfs = list(
+                tqdm(
+                    executor.map(_read, files),
+                    total=len(files),
+                    desc=f"Loading `{sub_dir}` files...",
+                )
+            )
+        dfs = [df for df in dfs if df is not None]
         df = pd.concat(dfs)
         return df
 
@@ -391,17 +418,14 @@ class TargetPositionAndOrderGenerator(hobject.PrintableMixin):
         wall_clock_time_str = wall_clock_time.strftime("%Y%m%d_%H%M%S")
         bar_timestamp = hwacltim.get_current_bar_timestamp(as_str=True)
         filename = f"{bar_timestamp}.{wall_clock_time_str}.csv"
-        # Log the last target position.
+        # Log the last target position in the same format as the Portfolio
+        # state.
         if self._target_positions:
             _, last_target_positions = self._target_positions.peek()
             # TODO(gp): Check that last_key matches the current bar timestamp.
-            last_target_positions_filename = os.path.join(
-                self._log_dir, "target_positions", filename
-            )
-            hio.create_enclosing_dir(
-                last_target_positions_filename, incremental=True
+            self._portfolio.log_df(
+                last_target_positions, self._log_dir, "target_positions"
             )
-            last_target_positions.to_csv(last_target_positions_filename)
         # Log the orders.
         if self._orders:
             _, last_orders = self._orders.peek()
@@ -1,4 +1,6 @@
+import asyncio
 import logging
+import os
 
 import pandas as pd
 import pytest
@@ -10,6 +12,7 @@ import oms.fill as omfill
 import oms.order.order as oordorde
 import oms.order_processing.target_position_and_order_generator as ooptpaoge
 import oms.order_processing.target_position_and_order_generator_example as otpaogeex
+import oms.portfolio.portfolio_example as opopoexa
 
 _LOG = logging.getLogger(__name__)
 
@@ -181,3 +184,66 @@ class TestTargetPositionAndOrderGenerator2(hunitest.TestCase):
             purify_text=True,
             fuzzy_match=True,
         )
+
+
+# #############################################################################
+# TestTargetPositionAndOrderGenerator3
+# #############################################################################
+
+
+class TestTargetPositionAndOrderGenerator3(hunitest.TestCase):
+    """
+    Test loading the target positions logged in the Portfolio log format.
+    """
+
+    def log_target_positions(self, log_dir: str, log_format: str) -> None:
+        """
+        Log the target positions of a few bars through a Portfolio.
+        """
+        with hasynci.solipsism_context() as event_loop:
+            (
+                market_data,
+                _,
+            ) = mdata.get_ReplayedTimeMarketData_example3(event_loop)
+            portfolio = opopoexa.get_DataFramePortfolio_example1(
+                event_loop, market_data=market_data, log_format=log_format
+            )
+
+            async def _log() -> None:
+                for i in range(3):
+                    wall_clock_time = market_data.get_wall_clock_time()
+                    target_positions = pd.DataFrame(
+                        {
+                            "price": [1000.0 + i, 2000.0],
+                            "wall_clock_timestamp": [wall_clock_time] * 2,
+                            "target_holdings_shares": [float(i), -1.0],
+                        },
+                        index=pd.Index([101, 202], name="asset_id"),
+                    )
+                    portfolio.log_df(
+                        target_positions, log_dir, "target_positions"
+                    )
+                    await asyncio.sleep(60)
+
+            hasynci.run(_log(), event_loop=event_loop)
+            portfolio.close_log()
+
+    def test_load_target_positions1(self) -> None:
+        """
+        Check that the target positions logged as CSV files and as `arrow`
+        segments are loaded in the same way.
+        """
+        scratch_dir = self.get_scratch_space()
+        csv_log_dir = os.path.join(scratch_dir, "csv")
+        self.log_target_positions(csv_log_dir, "csv")
+        arrow_log_dir = os.path.join(scratch_dir, "arrow")
+        self.log_target_positions(arrow_log_dir, "arrow")
+        # Check that all the bars are in a single segment.
+        files = os.listdir(os.path.join(arrow_log_dir, "target_positions"))
+        self.assertEqual(files, ["20000101_093500.arrow"])
+        # Check the loaded target positions.
+        tpog_cls = ooptpaoge.TargetPositionAndOrderGenerator
+        expected = tpog_cls.load_target_positions(csv_log_dir)
+        actual = tpog_cls.load_target_positions(arrow_log_dir)
+        self.assert_equal(str(expected.shape), "(3, 4)")
+        self.assert_dfs_close(actual, expected)
@@ -6,12 +6,14 @@ import oms.portfolio.portfolio as oporport
 
 import abc
 import collections
+import concurrent.futures
 import logging
 import os
 from typing import Any, Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
+import pyarrow as pa
 from tqdm.autonotebook import tqdm
 
 import core.key_sorted_ordered_dict as cksoordi
@@ -25,6 +27,11 @@ import oms.broker.broker as obrobrok
 
 _LOG = logging.getLogger(__name__)
 
+# Segment of the Portfolio state being written in `arrow` format.
+_LogSegment = collections.namedtuple(
+    "_LogSegment", ["date", "file_name", "schema", "sink", "writer"]
+)
+
 
 # #############################################################################
 # Portfolio
@@ -67,6 +74,9 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
     # TODO(Paul): Change "value" to "holdings_notional".
     PRICE_COLS = ["price", "value"]
 
+    # Extension of the segments of the state in `arrow` format.
+    SEGMENT_EXTENSION = ".arrow"
+
     def __init__(
         self,
         broker: obrobrok.Broker,
@@ -76,6 +86,7 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         *,
         retrieve_initial_holdings_from_db: bool = False,
         max_num_bars: Optional[int] = 100,
+        log_format: str = "csv",
     ):
         """
         Constructor.
@@ -95,6 +106,10 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
             holdings_shares must be a subset of the index of `initial_holdings`.
         :param max_num_bars: maximum number of market data bars to store in memory;
             if `None`, then impose no restriction
+        :param log_format: format of the state saved by `log_state()`
+            - "csv": one CSV file per bar
+            - "arrow": one segment per day in Arrow IPC stream format, with
+              the rows of each bar appended to it as a record batch
         """
         if _LOG.isEnabledFor(logging.DEBUG):
             _LOG.debug(
@@ -104,7 +119,8 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
                     "pricing_method "
                     "initial_holdings_shares "
                     "retrieve_initial_holdings_from_db "
-                    "max_num_bars"
+                    "max_num_bars "
+                    "log_format"
                 )
             )
         # Set and unpack broker.
@@ -126,6 +142,11 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         # At each call to `mark_to_market()`, we capture `wall_clock_time` and
         # perform a sequence of updates to the following dictionaries.
         self._max_num_bars = max_num_bars
+        hdbg.dassert_in(log_format, ["csv", "arrow"])
+        self._log_format = log_format
+        # Map the dir of each logged dataframe to the segment currently being
+        # written for it.
+        self._log_segments: Dict[str, _LogSegment] = {}
         # We use `KeySortedOrderedDict` keyed `timestamp` to:
         # - enforce that inserted new keys are always increasing according to the
         #   key order (i.e., increasing in time)
@@ -289,24 +310,40 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         *,
         tz: str = "America/New_York",
         cast_asset_ids_to_int: bool = True,
+        start_timestamp: Optional[pd.Timestamp] = None,
+        end_timestamp: Optional[pd.Timestamp] = None,
+        max_concurrent_reads: int = 10,
     ) -> Tuple[pd.DataFrame, pd.DataFrame]:
         """
         Read and process logged Portfolio state.
 
+        The state can be logged in any of the formats supported by
+        `log_state()`.
+
         :param log_dir: store the state of a Portfolio in terms of its
             components, one per dir
+        :param start_timestamp: load the state from this timestamp included,
+            if `None` from the beginning
+        :param end_timestamp: load the state up to this timestamp included,
+            if `None` up to the end
+        :param max_concurrent_reads: max number of files to read in parallel
         """
+        load_kwargs = {
+            "start_timestamp": start_timestamp,
+            "end_timestamp": end_timestamp,
+            "max_concurrent_reads": max_concurrent_reads,
+        }
         holdings_shares_df = Portfolio._load_df_from_files(
-            log_dir, "holdings_shares", tz
+            log_dir, "holdings_shares", tz, **load_kwargs
         )
         holdings_notional_df = Portfolio._load_df_from_files(
-            log_dir, "holdings_notional", tz
+            log_dir, "holdings_notional", tz, **load_kwargs
         )
         executed_trades_shares_df = Portfolio._load_df_from_files(
-            log_dir, "executed_trades_shares", tz
+            log_dir, "executed_trades_shares", tz, **load_kwargs
         )
         executed_trades_notional_df = Portfolio._load_df_from_files(
-            log_dir, "executed_trades_notional", tz
+            log_dir, "executed_trades_notional", tz, **load_kwargs
         )
         # Cast asset ids to int for all the dfs, if needed.
         if cast_asset_ids_to_int:
@@ -334,7 +371,9 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         }
         portfolio_df = pd.concat(dfs.values(), axis=1, keys=dfs.keys())
         #
-        stats_df = Portfolio._load_df_from_files(log_dir, "statistics", tz)
+        stats_df = Portfolio._load_df_from_files(
+            log_dir, "statistics", tz, **load_kwargs
+        )
         return portfolio_df, stats_df
 
     @classmethod
@@ -691,44 +730,81 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
     # /////////////////////////////////////////////////////////////////////////////
 
     def log_state(self, log_dir: str, *, num_periods: Optional[int] = 1) -> str:
+        """
+        Save the last `num_periods` of the state in `log_dir`.
+
+        Each component of the state is saved in a separate dir, e.g.,
+        `{log_dir}/holdings_shares`, in the format specified by `log_format`
+        in the constructor.
+
+        :return: name of the file the state is saved in, i.e., the CSV file
+            or the segment in `arrow` format
+        """
         hdbg.dassert(log_dir, "Must specify `log_dir` to log state.")
         #
-        bar_timestamp = hwacltim.get_current_bar_timestamp(as_str=True)
-        #
         wall_clock_time = self._get_wall_clock_time()
+        bar_timestamp = hwacltim.get_current_bar_timestamp(as_str=True)
         wall_clock_time_str = wall_clock_time.strftime("%Y%m%d_%H%M%S")
         file_name = f"{bar_timestamp}.{wall_clock_time_str}.csv"
         #
-        holdings_shares_df = self.get_historical_holdings_shares(num_periods)
-        Portfolio._write_df(
-            holdings_shares_df, log_dir, "holdings_shares", file_name
-        )
-        #
-        holdings_notional_df = self.get_historical_holdings_notional(num_periods)
-        Portfolio._write_df(
-            holdings_notional_df, log_dir, "holdings_notional", file_name
-        )
-        #
-        executed_trades_shares = self.get_historical_executed_trades_shares(
-            num_periods
-        )
-        Portfolio._write_df(
-            executed_trades_shares, log_dir, "executed_trades_shares", file_name
-        )
-        executed_trades_notional_df = (
-            self.get_historical_executed_trades_notional(num_periods)
-        )
-        Portfolio._write_df(
-            executed_trades_notional_df,
-            log_dir,
-            "executed_trades_notional",
-            file_name,
-        )
-        #
-        stats_df = self.get_historical_statistics(num_periods)
-        Portfolio._write_df(stats_df, log_dir, "statistics", file_name)
+        dfs = {
+            "holdings_shares": self.get_historical_holdings_shares(
+                num_periods
+            ),
+            "holdings_notional": self.get_historical_holdings_notional(
+                num_periods
+            ),
+            "executed_trades_shares": (
+                self.get_historical_executed_trades_shares(num_periods)
+            ),
+            "executed_trades_notional": (
+                self.get_historical_executed_trades_notional(num_periods)
+            ),
+            "statistics": self.get_historical_statistics(num_periods),
+        }
+        for name, df in dfs.items():
+            if self._log_format == "csv":
+                Portfolio._write_df(df, log_dir, name, file_name)
+            else:
+                file_name = self._append_df_to_segment(
+                    df, log_dir, name, wall_clock_time
+                )
         return file_name
 
+    def log_df(self, df: pd.DataFrame, log_dir: str, name: str) -> str:
+        """
+        Save `df` in `log_dir/name` in the same format as the state.
+
+        This allows to log data computed together with the state, e.g., the
+        target positions, in the same segments that are closed by
+        `close_log()`.
+
+        :return: same as `log_state()`
+        """
+        wall_clock_time = self._get_wall_clock_time()
+        if self._log_format == "csv":
+            bar_timestamp = hwacltim.get_current_bar_timestamp(as_str=True)
+            wall_clock_time_str = wall_clock_time.strftime("%Y%m%d_%H%M%S")
+            file_name = f"{bar_timestamp}.{wall_clock_time_str}.csv"
+            Portfolio._write_df(df, log_dir, name, file_name)
+        else:
+            file_name = self._append_df_to_segment(
+                df, log_dir, name, wall_clock_time
+            )
+        return file_name
+
+    def close_log(self) -> None:
+        """
+        Close the segments being written when the state is in `arrow` format.
+
+        The segments that are not closed, e.g., because the process was
+        interrupted, can still be read.
+        """
+        for segment in self._log_segments.values():
+            segment.writer.close()
+            segment.sink.close()
+        self._log_segments = {}
+
     def price_assets(self, asset_ids: List[int]) -> pd.Series:
         """
         Wrap `portfolio.market_data()` and packages output.
@@ -770,6 +846,10 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         log_dir: str,
         name: str,
         tz: str,
+        *,
+        start_timestamp: Optional[pd.Timestamp] = None,
+        end_timestamp: Optional[pd.Timestamp] = None,
+        max_concurrent_reads: int = 10,
     ) -> pd.DataFrame:
         # Find the files under `log_dir/{name}`.
         dir_name = os.path.join(log_dir, name)
@@ -777,14 +857,50 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         only_files = True
         use_relative_paths = True
         files = hio.listdir(dir_name, pattern, only_files, use_relative_paths)
+        files = [
+            file_name
+            for file_name in files
+            if os.path.splitext(file_name)[1]
+            in (".csv", Portfolio.SEGMENT_EXTENSION)
+        ]
         files.sort()
+        # Skip the files outside of the requested interval, based on the
+        # timestamp in their name.
+        if start_timestamp is not None or end_timestamp is not None:
+            files = [
+                file_name
+                for file_name in files
+                if Portfolio._is_file_in_interval(
+                    file_name, start_timestamp, end_timestamp
+                )
+            ]
+        hdbg.dassert_lt(0, len(files), "No files to load for `%s`", name)
         # Read each file as dataframe.
-        dfs = []
-        for file_name in tqdm(files, desc=f"Loading `{name}` files..."):
-            df = Portfolio._read_df(log_dir, name, file_name, tz)
-            dfs.append(df)
+        read = lambda file_name: Portfolio._read_df(log_dir, name, file_name, tz)
+        max_workers = min(max_concurrent_reads, len(files))
+        with concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_workers
+        ) as executor:
+            # `map()` returns the results in the order of the files so that
+            # the output is deterministic.
+            dfs = list(
+                tqdm(
+                    executor.map(read, files),
+                    total=len(files),
+                    desc=f"Loading `{name}` files...",
+                )
+            )
         # Concatenate.
         df = pd.concat(dfs)
+        if start_timestamp is not None or end_timestamp is not None:
+            df = hpandas.trim_df(
+                df,
+                None,
+                start_timestamp,
+                end_timestamp,
+                left_close=True,
+                right_close=True,
+            )
         hdbg.dassert(
             not df.index.has_duplicates,
             "Duplicated indices for `%s`=\n%s",
@@ -801,13 +917,69 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         tz: str,
     ) -> pd.DataFrame:
         path = os.path.join(log_dir, name, file_name)
-        df = pd.read_csv(path, index_col=0, parse_dates=True)
+        if file_name.endswith(Portfolio.SEGMENT_EXTENSION):
+            df = Portfolio.read_segment(path)
+        else:
+            df = pd.read_csv(path, index_col=0, parse_dates=True)
         # TODO(Paul): Add better checks. The first trades dataframes do not
         #  have rows, and so when parsed do not have a DatetimeIndex.
         if isinstance(df.index, pd.DatetimeIndex):
             df.index = df.index.tz_convert(tz)
         return df
 
+    @staticmethod
+    def read_segment(path: str) -> pd.DataFrame:
+        """
+        Read all the batches of a segment written in `arrow` format.
+        """
+        with pa.memory_map(path, "r") as source:
+            table = pa.ipc.open_stream(source).read_all()
+        df = table.to_pandas()
+        # Remove the column names that are not stored in the CSV files.
+        df.columns.name = None
+        return df
+
+    @staticmethod
+    def _is_file_in_interval(
+        file_name: str,
+        start_timestamp: Optional[pd.Timestamp],
+        end_timestamp: Optional[pd.Timestamp],
+    ) -> bool:
+        """
+        Check whether a logged file can contain data in the interval.
+
+        The name of a file starts with a timestamp, e.g.,
+        `20230815_094000.20230815_094005.csv` for the bar at `09:40:00` or
+        `20230815_094005.arrow` for a segment started at `09:40:05`, which
+        contains data until the end of the day.
+        """
+        try:
+            file_timestamp = pd.to_datetime(
+                file_name.split(".")[0], format="%Y%m%d_%H%M%S"
+            )
+        except ValueError:
+            # Keep the files without a timestamp, e.g., when the bar timestamp
+            # is not set.
+            return True
+        if file_name.endswith(Portfolio.SEGMENT_EXTENSION):
+            file_end_timestamp = file_timestamp.normalize() + pd.Timedelta(
+                days=1
+            )
+        else:
+            file_end_timestamp = file_timestamp
+        # The timestamps in the file names are in the timezone of the
+        # Portfolio, which is unknown, so we keep an extra day on each side.
+        one_day = pd.Timedelta(days=1)
+        if start_timestamp is not None:
+            start = start_timestamp.tz_localize(None) - one_day
+            if file_end_timestamp < start:
+                return False
+        if end_timestamp is not None:
+            end = end_timestamp.tz_localize(None) + one_day
+            if file_timestamp > end:
+                return False
+        return True
+
     @staticmethod
     def _write_df(
         df: pd.DataFrame,
@@ -819,6 +991,56 @@ class Portfolio(abc.ABC, hobject.PrintableMixin):
         hio.create_enclosing_dir(path, incremental=True)
         df.to_csv(path)
 
+    def _append_df_to_segment(
+        self,
+        df: pd.DataFrame,
+        log_dir: str,
+        name: str,
+        wall_clock_time: pd.Timestamp,
+    ) -> str:
+        """
+        Append the rows of `df` to the segment of the day in `log_dir/name`.
+
+        A new segment is started every day, after a restart and when the
+        columns change, e.g., when a new asset is traded.
+
+        :return: name of the segment
+        """
+        # Asset ids are saved as strings as in the CSV files.
+        df = df.copy(deep=False)
+        df.columns = df.columns.astype(str)
+        batch = pa.RecordBatch.from_pandas(df, preserve_index=True)
+        date = wall_clock_time.date()
+        dir_name = os.path.join(log_dir, name)
+        if dir_name in self._log_segments:
+            segment = self._log_segments[dir_name]
+            if df.empty and segment.date == date:
+                # The first trades dataframes do not have rows, so we don't
+                # append them to avoid starting a new segment.
+                return segment.file_name
+            if segment.date != date or not segment.schema.equals(
+                batch.schema, check_metadata=False
+            ):
+                segment.writer.close()
+                segment.sink.close()
+                del self._log_segments[dir_name]
+        if dir_name not in self._log_segments:
+            wall_clock_time_str = wall_clock_time.strftime("%Y%m%d_%H%M%S")
+            file_name = f"{wall_clock_time_str}{self.SEGMENT_EXTENSION}"
+            path = os.path.join(dir_name, file_name)
+            hio.create_enclosing_dir(path, incremental=True)
+            hdbg.dassert_path_not_exists(path)
+            # Each batch is written to disk as soon as it's logged, so that the
+            # segment can be read even if it's not closed.
+            sink = pa.OSFile(path, "wb")
+            writer = pa.ipc.new_stream(sink, batch.schema)
+            self._log_segments[dir_name] = _LogSegment(
+                date, file_name, batch.schema, sink, writer
+            )
+        segment = self._log_segments[dir_name]
+        segment.writer.write_batch(batch)
+        return segment.file_name
+
     # //////////////////////////////////////////////////////////////////////////////
 
     @staticmethod
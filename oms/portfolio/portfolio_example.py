@@ -37,12 +37,15 @@ def get_DataFramePortfolio_example1(
     timestamp_col: str = "end_datetime",
     asset_ids: Optional[List[int]] = None,
     column_remap: Optional[Dict[str, str]] = None,
+    log_format: str = "csv",
 ) -> opodapor.DataFramePortfolio:
     """
     Contain:
     - a `DataFramePortfolio` (i.e., a portfolio backed by a dataframe to keep
       track of the state)
     - a `DataFrameBroker` (i.e., a broker that executes the orders immediately)
+
+    :param log_format: see `Portfolio` ctor
     """
     # Build a DataFrameBroker.
     broker = obrbrexa.get_DataFrameBroker_example1(
@@ -61,6 +64,7 @@ def get_DataFramePortfolio_example1(
         #
         initial_cash=initial_cash,
         asset_ids=asset_ids,
+        log_format=log_format,
     )
     return portfolio
 
@@ -160,11 +164,14 @@ def get_DatabasePortfolio_example1(
     timestamp_col: str = "end_datetime",
     asset_ids: Optional[List[int]] = None,
     broker_log_dir: Optional[str] = None,
+    log_format: str = "csv",
 ) -> opdapor.DatabasePortfolio:
     """
     Contain:
     - a `DatabasePortfolio`
     - a `DatabaseBroker`
+
+    :param log_format: see `Portfolio` ctor
     """
     # Build DatabaseBroker.
     broker = obrbrexa.get_DatabaseBroker_example1(
@@ -184,6 +191,7 @@ def get_DatabasePortfolio_example1(
         #
         initial_cash=initial_cash,
         asset_ids=asset_ids,
+        log_format=log_format,
     )
     return portfolio
 
@@ -1,5 +1,7 @@
+import asyncio
 import io
 import logging
+import os
 
 import pandas as pd
 
@@ -242,3 +244,111 @@ class TestDataFramePortfolio2(hunitest.TestCase):
             leverage                            0.0"""
             actual = portfolio.get_historical_statistics().transpose()
             self.assert_equal(str(actual), expected, fuzzy_match=True)
+
+
+# #############################################################################
+# TestDataFramePortfolio3
+# #############################################################################
+
+
+class TestDataFramePortfolio3(hunitest.TestCase):
+    """
+    Test the `log_state()` / `read_state()` round trip.
+    """
+
+    def log_state(self, log_format: str) -> str:
+        """
+        Log the state of a Portfolio for 3 bars.
+
+        :return: log dir
+        """
+        log_dir = os.path.join(self.get_scratch_space(), log_format)
+        with hasynci.solipsism_context() as event_loop:
+            market_data, _ = mdata.get_ReplayedTimeMarketData_example3(
+                event_loop
+            )
+            broker = obrbrexa.get_DataFrameBroker_example1(
+                event_loop, market_data=market_data
+            )
+            holdings_dict = {101: 727.5, 202: 1040.3, -1: 10000}
+            portfolio = opodapor.DataFramePortfolio.from_dict(
+                broker,
+                "price",
+                "last",
+                holdings_shares_dict=holdings_dict,
+                log_format=log_format,
+            )
+
+            async def _log_state() -> None:
+                for _ in range(3):
+                    portfolio.mark_to_market()
+                    portfolio.log_state(log_dir)
+                    await asyncio.sleep(60 * 5)
+
+            hasynci.run(_log_state(), event_loop=event_loop)
+        return log_dir
+
+    def test1(self) -> None:
+        """
+        Check that the state logged in Arrow format is the same as in CSV.
+        """
+        portfolio_df, stats_df = opodapor.DataFramePortfolio.read_state(
+            self.log_state("arrow")
+        )
+        expected_portfolio_df, expected_stats_df = (
+            opodapor.DataFramePortfolio.read_state(self.log_state("csv"))
+        )
+        self.assertEqual(len(portfolio_df), 3)
+        self.assert_equal(str(portfolio_df), str(expected_portfolio_df))
+        self.assert_equal(str(stats_df), str(expected_stats_df))
+        # Check that the bars are appended to a single segment per day.
+        files = os.listdir(
+            os.path.join(self.get_scratch_space(), "arrow", "statistics")
+        )
+        self.assertListEqual(files, ["20000101_093500.arrow"])
+
+    def test2(self) -> None:
+        """
+        Check loading the state in a time interval.
+        """
+        start_timestamp = pd.Timestamp(
+            "2000-01-01 09:40:00-05:00", tz="America/New_York"
+        )
+        for log_format in ["csv", "arrow"]:
+            portfolio_df, stats_df = opodapor.DataFramePortfolio.read_state(
+                self.log_state(log_format), start_timestamp=start_timestamp
+            )
+            self.assertEqual(portfolio_df.index[0], start_timestamp)
+            self.assertEqual(len(portfolio_df), 2)
+            self.assertEqual(len(stats_df), 2)
+
+    def test3(self) -> None:
+        """
+        Check that the files outside of the interval are skipped by name.
+        """
+        start_timestamp = pd.Timestamp("2000-01-05 09:40:00", tz="UTC")
+        end_timestamp = pd.Timestamp("2000-01-05 10:00:00", tz="UTC")
+        file_names = [
+            "20000101_094000.20000101_094005.csv",
+            "20000104_094000.20000104_094005.csv",
+            "20000105_094000.20000105_094005.csv",
+            "20000107_094000.20000107_094005.csv",
+            "20000103_093500.arrow",
+            "20000104_093500.arrow",
+            "20000107_093500.arrow",
+            "None.20000101_094005.csv",
+        ]
+        actual = [
+            file_name
+            for file_name in file_names
+            if opodapor.DataFramePortfolio._is_file_in_interval(
+                file_name, start_timestamp, end_timestamp
+            )
+        ]
+        expected = [
+            "20000104_094000.20000104_094005.csv",
+            "20000105_094000.20000105_094005.csv",
+            "20000104_093500.arrow",
+            "None.20000101_094005.csv",
+        ]
+        self.assertListEqual(actual, expected)
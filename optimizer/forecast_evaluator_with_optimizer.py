@@ -154,8 +154,18 @@ class ForecastEvaluatorWithOptimizer:
         burn_in_days: int = 0,
         compute_extended_stats: bool = False,
         asset_id_to_share_decimals: Optional[Dict[int, int]] = None,
+        reuse_optimization_problem: bool = False,
         **kwargs: Dict[str, Any],
     ) -> Dict[str, pd.DataFrame]:
+        """
+        Compute target positions, PnL, and portfolio stats bar by bar.
+
+        :param df: as in `annotate_forecasts()`
+        :param reuse_optimization_problem: build the optimization problem once
+            and solve it for each bar by updating its data, instead of building
+            a new problem for each bar (see
+            `osipeopt.ParameterizedProblem`)
+        """
         _LOG.debug("df=\n%s", hpandas.df_to_str(df, print_shape_info=True))
         self._validate_df(df)
         # Record index in case we reindex the results.
@@ -197,6 +207,10 @@ class ForecastEvaluatorWithOptimizer:
         eod_timestamps = cofinanc.retrieve_end_of_day_timestamps(
             df[self._price_col]
         )
+        if reuse_optimization_problem:
+            parameterized_problem = osipeopt.ParameterizedProblem()
+        else:
+            parameterized_problem = None
         # Process the DAG row by row.
         for idx, (timestamp, dag_data) in tqdm(iter_, total=num_rows):
             if idx + 1 < num_rows:
@@ -246,6 +260,7 @@ class ForecastEvaluatorWithOptimizer:
                 quantization,
                 asset_id_to_share_decimals,
                 liquidate_holdings,
+                parameterized_problem,
             )
             # If the time step is not the last one, set the next-period
             # share holdings and executed trades in shares (assuming orders
@@ -359,6 +374,7 @@ class ForecastEvaluatorWithOptimizer:
         quantization,
         asset_id_to_share_decimals,
         liquidate_holdings,
+        parameterized_problem: Optional[osipeopt.ParameterizedProblem],
     ) -> pd.Series:
         # Prepare data for the optimizer.
         holdings_df = pd.concat([holdings_shares, holdings_notional], axis=1)
@@ -373,6 +389,7 @@ class ForecastEvaluatorWithOptimizer:
             quantization=quantization,
             asset_id_to_share_decimals=asset_id_to_share_decimals,
             liquidate_holdings=liquidate_holdings,
+            parameterized_problem=parameterized_problem,
         )
         return output_df
 
@@ -5,7 +5,7 @@ import optimizer.single_period_optimization as osipeopt
 """
 
 import logging
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 import numpy as np
 import pandas as pd
@@ -34,16 +34,57 @@ _LOG = logging.getLogger(__name__)
 def optimize(
     config_dict: dict,
     df: pd.DataFrame,
+    *,
+    parameterized_problem: Optional["ParameterizedProblem"] = None,
     **kwargs: Dict[str, Any],
 ) -> pd.DataFrame:
     """
     Wrapper around `SinglePeriodOptimizer`.
     """
-    spo = SinglePeriodOptimizer(config_dict, df)
+    spo = SinglePeriodOptimizer(
+        config_dict, df, parameterized_problem=parameterized_problem
+    )
     output_df = spo.optimize(**kwargs)
     return output_df
 
 
+class ParameterizedProblem:
+    """
+    Store a cvxpy problem that is built once and solved for different data.
+
+    The data that change from one bar to the next (i.e., predictions,
+    volatility, and current weights) are represented with `cvx.Parameter`s, so
+    that solving the problem for new data only requires to update the values
+    of the parameters, skipping building and canonicalizing the problem, and
+    the previous solution is used to warm-start the solver.
+
+    The problem is built by the first `SinglePeriodOptimizer` using the object
+    and it is rebuilt if the assets or the optimizer config change.
+    """
+
+    def __init__(self) -> None:
+        # Assets and optimizer config that the problem was built for.
+        self.asset_ids: Optional[List[int]] = None
+        self.config_dict: Optional[dict] = None
+        #
+        self.problem: Optional[cvx.Problem] = None
+        self.target_weights: Optional[cvx.Variable] = None
+        self.target_weight_diffs: Optional[cvx.Variable] = None
+        # Map the name of the data (e.g., "volatility") to its parameter.
+        self.parameters: Dict[str, cvx.Parameter] = {}
+
+    def is_built_for(self, asset_ids: List[int], config_dict: dict) -> bool:
+        """
+        Return whether the problem can be reused for the passed data.
+        """
+        ret = (
+            self.problem is not None
+            and self.asset_ids == asset_ids
+            and self.config_dict == config_dict
+        )
+        return ret
+
+
 class SinglePeriodOptimizer:
     def __init__(
         self,
@@ -51,6 +92,7 @@ class SinglePeriodOptimizer:
         df: pd.DataFrame,
         *,
         restrictions: Optional[pd.DataFrame] = None,
+        parameterized_problem: Optional[ParameterizedProblem] = None,
     ) -> None:
         """
         Single period optimization constructor.
@@ -62,6 +104,9 @@ class SinglePeriodOptimizer:
             - asset volatility is needed to generate a risk constraint
             - some restriction constraints are position-dependent
         :param restrictions: restrictions dataframe
+        :param parameterized_problem: if not `None`, solve the problem stored
+            in it (building it, if needed) after setting the data of `df`,
+            instead of building a new problem (see `ParameterizedProblem`)
         """
         # Process `config_dict` and extract parameters.
         self._dollar_neutrality_penalty = config_dict["dollar_neutrality_penalty"]
@@ -84,6 +129,11 @@ class SinglePeriodOptimizer:
         if restrictions is not None:
             SinglePeriodOptimizer._validate_restrictions_df(restrictions)
         self._restrictions = restrictions
+        if parameterized_problem is not None:
+            # Restrictions are position-dependent and thus are not
+            # parameterized.
+            hdbg.dassert_is(restrictions, None)
+        self._parameterized_problem = parameterized_problem
         #
         self._asset_ids = self._df["asset_id"]
         self._n_assets = df.shape[0]
@@ -270,19 +320,67 @@ class SinglePeriodOptimizer:
             normalized by current GMV.
         """
         # Determine the current GMV and GMV-normalized weights.
-        # Create a placeholder for (current) GMV-normalized weight adjustments.
-        target_weight_diffs = cvx.Variable(self._n_assets)
         current_weights = self._current_weights.to_numpy()
         _LOG.debug("current_weights=\n%s", current_weights)
-        target_weights = current_weights + target_weight_diffs
-        # Create a placeholder for predicted returns (to maximize subject to
-        # constraints).
+        # Compute the predicted returns (to maximize subject to constraints).
         predictions = self._df["prediction"] * self._df["volatility"]
-        predicted_returns = cvx.multiply(predictions.values, target_weights)
+        volatility = self._df["volatility"]
+        if self._parameterized_problem is None:
+            problem, target_weights, target_weight_diffs = self._build_problem(
+                predictions.values, volatility, current_weights
+            )
+        else:
+            parameterized_problem = self._get_parameterized_problem()
+            # Update the data of the problem.
+            parameters = parameterized_problem.parameters
+            parameters["predictions"].value = predictions.values
+            parameters["volatility"].value = volatility.values
+            parameters["current_weights"].value = current_weights
+            problem = parameterized_problem.problem
+            target_weights = parameterized_problem.target_weights
+            target_weight_diffs = parameterized_problem.target_weight_diffs
+        # Optimize.
+        optimal_value = problem.solve(
+            self._solver, verbose=self._verbose, warm_start=True
+        )
+        if problem.status != "optimal":
+            _LOG.warning("problem.status=%s", problem.status)
+        _LOG.debug("`optimal_value`=%0.2f", optimal_value)
+        # TODO(Paul): Compute estimates for PnL, costs.
+        return target_weights, target_weight_diffs
+
+    def _build_problem(
+        self,
+        predictions: Union[np.ndarray, cvx.Parameter],
+        volatility: Union[pd.Series, cvx.Parameter],
+        current_weights: Union[np.ndarray, cvx.Parameter],
+    ) -> Tuple[cvx.Problem, cvx.Variable, cvx.Variable]:
+        """
+        Create the cvx optimization problem.
+
+        :param predictions: predicted returns
+        :param volatility: asset volatility
+        :param current_weights: GMV-normalized current weights
+        :return: problem, target weights, and weight diffs
+        """
+        # Create a placeholder for (current) GMV-normalized weight adjustments.
+        target_weight_diffs = cvx.Variable(self._n_assets)
+        if isinstance(current_weights, cvx.Parameter):
+            # Use a variable for the target weights to keep all the expressions
+            # linear in the parameters, so that cvxpy can reuse the
+            # canonicalization of the problem.
+            target_weights = cvx.Variable(self._n_assets)
+            constraints = [
+                target_weights == current_weights + target_weight_diffs
+            ]
+        else:
+            target_weights = current_weights + target_weight_diffs
+            constraints = []
+        predicted_returns = cvx.multiply(predictions, target_weights)
         mu = cvx.sum(predicted_returns)
         hdbg.dassert(mu.is_concave())
         # Get constraints.
-        soft_constraints = self._get_soft_constraints()
+        soft_constraints = self._get_soft_constraints(volatility)
         hard_constraints = self._get_hard_constraints()
         # Convert constraints into cvxpy expressions.
         soft_constraint_cvx_expr = [
@@ -300,20 +398,42 @@ class SinglePeriodOptimizer:
         # Create the cvxpy problem.
         problem = cvx.Problem(
             cvx.Maximize(mu - sum(soft_constraint_cvx_expr)),
-            hard_constraint_cvx_expr,
+            hard_constraint_cvx_expr + constraints,
         )
-        # Optimize.
-        optimal_value = problem.solve(self._solver, verbose=self._verbose)
-        if problem.status != "optimal":
-            _LOG.warning("problem.status=%s", problem.status)
-        _LOG.debug("`optimal_value`=%0.2f", optimal_value)
-        # TODO(Paul): Compute estimates for PnL, costs.
-        return target_weights, target_weight_diffs
+        return problem, target_weights, target_weight_diffs
 
-    def _get_soft_constraints(self) -> List[opbase.Expression]:
+    def _get_parameterized_problem(self) -> ParameterizedProblem:
+        """
+        Return the parameterized problem, building it if it can't be reused.
+        """
+        parameterized_problem = self._parameterized_problem
+        asset_ids = self._asset_ids.tolist()
+        if not parameterized_problem.is_built_for(asset_ids, self._config_dict):
+            _LOG.debug("Building parameterized problem")
+            parameters = {
+                "predictions": cvx.Parameter(self._n_assets),
+                "volatility": cvx.Parameter(self._n_assets, nonneg=True),
+                "current_weights": cvx.Parameter(self._n_assets),
+            }
+            problem, target_weights, target_weight_diffs = self._build_problem(
+                parameters["predictions"],
+                parameters["volatility"],
+                parameters["current_weights"],
+            )
+            hdbg.dassert(problem.is_dpp())
+            parameterized_problem.asset_ids = asset_ids
+            parameterized_problem.config_dict = self._config_dict.copy()
+            parameterized_problem.problem = problem
+            parameterized_problem.target_weights = target_weights
+            parameterized_problem.target_weight_diffs = target_weight_diffs
+            parameterized_problem.parameters = parameters
+        return parameterized_problem
+
+    def _get_soft_constraints(
+        self, volatility: Union[pd.Series, cvx.Parameter]
+    ) -> List[opbase.Expression]:
         # Create soft constraints
         soft_constraints = []
-        volatility = self._df["volatility"]
         # Maybe add constant correlation risk constraint.
         if "constant_correlation" in self._config_dict:
             constant_correlation = self._config_dict["constant_correlation"]
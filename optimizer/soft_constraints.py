@@ -6,6 +6,7 @@ import optimizer.soft_constraints as osofcons
 
 import abc
 import logging
+from typing import Any, Union
 
 import pandas as pd
 
@@ -22,6 +23,19 @@ cvx = pytest.importorskip("cvxpy")
 _LOG = logging.getLogger(__name__)
 
 
+def _get_values(data: Union[pd.Series, cvx.Parameter]) -> Any:
+    """
+    Return the values of `data` to use in a cvxpy expression.
+
+    A `cvx.Parameter` is returned as it is, so that the problem can be solved
+    again after updating the value of the parameter.
+    """
+    if isinstance(data, pd.Series):
+        return data.values
+    hdbg.dassert_isinstance(data, cvx.Parameter)
+    return data
+
+
 # #############################################################################
 # Class and builder for objective function costs.
 # #############################################################################
@@ -56,6 +70,11 @@ class SoftConstraint(abc.ABC):
     def get_expr(self, target_weights, target_weight_diffs, gmv) -> opbase.EXPR:
         expr = self._estimate(target_weights, target_weight_diffs, gmv)
         self.expr = expr.copy()
+        if expr.parameters():
+            # Multiplying two parameters makes the problem not DPP, which
+            # prevents cvxpy from reusing its canonicalization, so use the
+            # current value of the multiplier.
+            return self.gamma.value * expr
         return self.gamma * expr
 
     @abc.abstractmethod
@@ -109,7 +128,10 @@ class ConstantCorrelationRiskModel(SoftConstraint):
     """
 
     def __init__(
-        self, correlation: float, volatility: pd.Series, gamma: float = 1.0
+        self,
+        correlation: float,
+        volatility: Union[pd.Series, cvx.Parameter],
+        gamma: float = 1.0,
     ) -> None:
         self._correlation = correlation
         self._volatility = volatility
@@ -118,12 +140,11 @@ class ConstantCorrelationRiskModel(SoftConstraint):
     def _estimate(self, target_weights, target_weight_diffs, gmv) -> opbase.EXPR:
         _ = target_weight_diffs
         _ = gmv
+        volatility = _get_values(self._volatility)
         expr1 = (1 - self._correlation) * cvx.sum_squares(
-            cvx.multiply(target_weights, self._volatility.values)
-        )
-        expr2 = self._correlation * cvx.power(
-            target_weights @ self._volatility.values, 2
+            cvx.multiply(target_weights, volatility)
         )
+        expr2 = self._correlation * cvx.power(target_weights @ volatility, 2)
         expr = expr1 + expr2
         return expr
 
@@ -148,15 +169,17 @@ class SpreadCost(SoftConstraint):
 
 
 class TransactionCost(SoftConstraint):
-    def __init__(self, volatility: pd.Series, gamma: float = 1.0) -> None:
-        hdbg.dassert_isinstance(volatility, pd.Series)
+    def __init__(
+        self, volatility: Union[pd.Series, cvx.Parameter], gamma: float = 1.0
+    ) -> None:
+        hdbg.dassert_isinstance(volatility, (pd.Series, cvx.Parameter))
         self._volatility = volatility
         super().__init__(gamma)
 
     def _estimate(self, target_weights, target_weight_diffs, gmv) -> opbase.EXPR:
         _ = target_weights
         _ = gmv
-        expr = self._volatility.values @ cvx.abs(target_weight_diffs).T
+        expr = _get_values(self._volatility) @ cvx.abs(target_weight_diffs).T
         return expr
 
 
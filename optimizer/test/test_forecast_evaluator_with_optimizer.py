@@ -335,3 +335,30 @@ class TestForecastEvaluatorWithOptimizer2(hunitest.TestCase):
 2022-01-05 16:00:00-05:00 -36.72     100280.69      124.56       0.00    0.00
 """
         self.assert_equal(actual, expected, fuzzy_match=True)
+
+
+class TestForecastEvaluatorWithOptimizer3(hunitest.TestCase):
+    """
+    Check that reusing the optimization problem across bars returns the same
+    results as building a new problem for each bar.
+    """
+
+    def test_reuse_optimization_problem1(self) -> None:
+        data = TestForecastEvaluatorWithOptimizer1.get_data(
+            pd.Timestamp("2022-01-03 09:30:00", tz="America/New_York"),
+            pd.Timestamp("2022-01-03 11:00:00", tz="America/New_York"),
+            asset_ids=[101, 201, 301],
+        )
+        config_dict = TestForecastEvaluatorWithOptimizer2.get_config_dict()
+        forecast_evaluator = ofevwiop.ForecastEvaluatorWithOptimizer(
+            price_col="price",
+            volatility_col="volatility",
+            prediction_col="prediction",
+            optimizer_config_dict=config_dict,
+        )
+        actual = forecast_evaluator.compute_portfolio(
+            data, quantization=0, reuse_optimization_problem=True
+        )
+        expected = forecast_evaluator.compute_portfolio(data, quantization=0)
+        for key in ["holdings_shares", "executed_trades_shares"]:
+            self.assert_dfs_close(actual[key], expected[key], atol=1.0)
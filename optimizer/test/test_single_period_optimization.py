@@ -357,3 +357,77 @@ class TestSinglePeriodOptimizer1(hunitest.TestCase):
         """
         # pylint: enable=line-too-long
         self.assert_equal(actual, expected, fuzzy_match=True)
+
+
+# #############################################################################
+# TestSinglePeriodOptimizer2
+# #############################################################################
+
+
+class TestSinglePeriodOptimizer2(hunitest.TestCase):
+    """
+    Check that solving a `ParameterizedProblem` returns the same results as
+    solving a new problem.
+    """
+
+    @staticmethod
+    def get_config_dict() -> dict:
+        dict_ = {
+            "dollar_neutrality_penalty": 0.1,
+            "constant_correlation": 0.8,
+            "constant_correlation_penalty": 0.5,
+            "relative_holding_penalty": 0.0,
+            "relative_holding_max_frac_of_gmv": 1.0,
+            "target_gmv": 3000,
+            "target_gmv_upper_bound_penalty": 0.0,
+            "target_gmv_hard_upper_bound_multiple": 1.01,
+            "transaction_cost_penalty": 0.1,
+            "solver": "ECOS",
+        }
+        return dict_
+
+    def test_reuse1(self) -> None:
+        """
+        Solve the same problem for different data.
+        """
+        config_dict = self.get_config_dict()
+        parameterized_problem = osipeopt.ParameterizedProblem()
+        df = TestSinglePeriodOptimizer1.get_prediction_df()
+        problem = None
+        for prediction_sign in [1, -1, 1]:
+            df["prediction"] = prediction_sign * df["prediction"]
+            actual = osipeopt.optimize(
+                config_dict,
+                df,
+                parameterized_problem=parameterized_problem,
+                quantization=0,
+            )
+            expected = osipeopt.optimize(config_dict, df, quantization=0)
+            self.assert_dfs_close(actual, expected, atol=1.0)
+            # Check that the problem is built only once.
+            if problem is None:
+                problem = parameterized_problem.problem
+            self.assertIs(parameterized_problem.problem, problem)
+
+    def test_rebuild1(self) -> None:
+        """
+        Check that the problem is rebuilt when the assets change.
+        """
+        config_dict = self.get_config_dict()
+        parameterized_problem = osipeopt.ParameterizedProblem()
+        df = TestSinglePeriodOptimizer1.get_prediction_df()
+        osipeopt.optimize(
+            config_dict, df, parameterized_problem=parameterized_problem
+        )
+        problem = parameterized_problem.problem
+        df = df.iloc[:2]
+        actual = osipeopt.optimize(
+            config_dict,
+            df,
+            parameterized_problem=parameterized_problem,
+            quantization=0,
+        )
+        self.assertIsNot(parameterized_problem.problem, problem)
+        self.assertListEqual(parameterized_problem.asset_ids, [1, 2])
+        expected = osipeopt.optimize(config_dict, df, quantization=0)
+        self.assert_dfs_close(actual, expected, atol=1.0)
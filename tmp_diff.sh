@@ -0,0 +1,8 @@
+#!/bin/bash
+if [[ $1 == "wrap" ]]; then
+    cmd='vimdiff -c "windo set wrap"'
+else
+    cmd='vimdiff'
+fi;
+cmd="$cmd dataflow/core/test/outcomes/Test_get_df_info_as_string.test1/tmp.final.actual.txt dataflow/core/test/outcomes/Test_get_df_info_as_string.test1/tmp.final.expected.txt"
+eval $cmd